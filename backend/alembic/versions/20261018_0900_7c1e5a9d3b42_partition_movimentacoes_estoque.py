@@ -0,0 +1,195 @@
+"""Partition movimentacoes_estoque by month and add archive snapshots
+
+Revision ID: 7c1e5a9d3b42
+Revises: 14f15512080a
+Create Date: 2026-10-18 09:00:00.000000
+
+Em PostgreSQL converte movimentacoes_estoque em tabela particionada por faixa
+mensal de created_at (chave primária passa a ser (id, created_at)), cria a
+função criar_particao_movimentacoes_estoque(date), as partições do histórico
+existente até 3 meses à frente e uma partição DEFAULT.
+
+Em todos os bancos cria as tabelas de snapshots de saldo e de registro dos
+períodos arquivados.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5a9d3b42'
+down_revision: Union[str, None] = '14f15512080a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUNAS = (
+    "id, produto_id, tipo, quantidade, custo_unitario, valor_total, "
+    "documento_referencia, observacao, usuario_id, created_at"
+)
+
+
+def _create_movimentacao_indexes() -> None:
+    op.create_index('idx_movimentacao_data_tipo', 'movimentacoes_estoque', ['created_at', 'tipo'], unique=False)
+    op.create_index('idx_movimentacao_produto_data', 'movimentacoes_estoque', ['produto_id', 'created_at'], unique=False)
+    op.create_index('idx_movimentacao_produto_tipo', 'movimentacoes_estoque', ['produto_id', 'tipo'], unique=False)
+    op.create_index(op.f('ix_movimentacoes_estoque_created_at'), 'movimentacoes_estoque', ['created_at'], unique=False)
+    op.create_index(op.f('ix_movimentacoes_estoque_documento_referencia'), 'movimentacoes_estoque', ['documento_referencia'], unique=False)
+    op.create_index(op.f('ix_movimentacoes_estoque_id'), 'movimentacoes_estoque', ['id'], unique=False)
+    op.create_index(op.f('ix_movimentacoes_estoque_produto_id'), 'movimentacoes_estoque', ['produto_id'], unique=False)
+    op.create_index(op.f('ix_movimentacoes_estoque_tipo'), 'movimentacoes_estoque', ['tipo'], unique=False)
+
+
+def upgrade() -> None:
+    op.create_table('snapshots_saldo_estoque',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('produto_id', sa.Integer(), nullable=False),
+    sa.Column('periodo', sa.Date(), nullable=False),
+    sa.Column('quantidade_entradas', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('quantidade_saidas', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('quantidade_ajustes', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('total_movimentacoes', sa.Integer(), nullable=False),
+    sa.Column('saldo_acumulado', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['produto_id'], ['produtos.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_snapshot_produto_periodo', 'snapshots_saldo_estoque', ['produto_id', 'periodo'], unique=True)
+    op.create_index(op.f('ix_snapshots_saldo_estoque_id'), 'snapshots_saldo_estoque', ['id'], unique=False)
+    op.create_index(op.f('ix_snapshots_saldo_estoque_periodo'), 'snapshots_saldo_estoque', ['periodo'], unique=False)
+    op.create_index(op.f('ix_snapshots_saldo_estoque_produto_id'), 'snapshots_saldo_estoque', ['produto_id'], unique=False)
+
+    op.create_table('arquivos_movimentacao_estoque',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('periodo', sa.Date(), nullable=False),
+    sa.Column('formato', sa.String(length=10), nullable=False),
+    sa.Column('caminho_arquivo', sa.String(length=500), nullable=False),
+    sa.Column('total_registros', sa.Integer(), nullable=False),
+    sa.Column('tamanho_bytes', sa.Integer(), nullable=False),
+    sa.Column('checksum_sha256', sa.String(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_arquivos_movimentacao_estoque_id'), 'arquivos_movimentacao_estoque', ['id'], unique=False)
+    op.create_index(op.f('ix_arquivos_movimentacao_estoque_periodo'), 'arquivos_movimentacao_estoque', ['periodo'], unique=True)
+
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # Preserva a tabela atual e libera os nomes de constraint/sequence
+    op.execute("ALTER TABLE movimentacoes_estoque RENAME TO movimentacoes_estoque_legado")
+    op.execute(
+        "ALTER TABLE movimentacoes_estoque_legado "
+        "RENAME CONSTRAINT movimentacoes_estoque_pkey TO movimentacoes_estoque_legado_pkey"
+    )
+    op.execute("ALTER SEQUENCE movimentacoes_estoque_id_seq OWNED BY NONE")
+
+    op.execute("""
+        CREATE TABLE movimentacoes_estoque (
+            id INTEGER NOT NULL DEFAULT nextval('movimentacoes_estoque_id_seq'),
+            produto_id INTEGER NOT NULL REFERENCES produtos (id),
+            tipo tipomovimentacao NOT NULL,
+            quantidade NUMERIC(10, 2) NOT NULL,
+            custo_unitario NUMERIC(10, 2) NOT NULL,
+            valor_total NUMERIC(10, 2) NOT NULL,
+            documento_referencia VARCHAR(100),
+            observacao VARCHAR(500),
+            usuario_id INTEGER,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT movimentacoes_estoque_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION criar_particao_movimentacoes_estoque(periodo DATE)
+        RETURNS VOID AS $$
+        DECLARE
+            inicio DATE := date_trunc('month', periodo)::DATE;
+            fim DATE := (date_trunc('month', periodo) + INTERVAL '1 month')::DATE;
+            nome TEXT := 'movimentacoes_estoque_p' || to_char(inicio, 'YYYYMM');
+        BEGIN
+            IF to_regclass(nome) IS NULL THEN
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF movimentacoes_estoque FOR VALUES FROM (%L) TO (%L)',
+                    nome, inicio, fim
+                );
+            END IF;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute("""
+        DO $$
+        DECLARE
+            mes DATE;
+        BEGIN
+            FOR mes IN
+                SELECT generate_series(
+                    date_trunc('month', COALESCE((SELECT min(created_at) FROM movimentacoes_estoque_legado), now())),
+                    date_trunc('month', now()) + INTERVAL '3 months',
+                    INTERVAL '1 month'
+                )::DATE
+            LOOP
+                PERFORM criar_particao_movimentacoes_estoque(mes);
+            END LOOP;
+        END $$
+    """)
+    op.execute(
+        "CREATE TABLE movimentacoes_estoque_default "
+        "PARTITION OF movimentacoes_estoque DEFAULT"
+    )
+
+    op.execute(
+        f"INSERT INTO movimentacoes_estoque ({COLUNAS}) "
+        f"SELECT {COLUNAS} FROM movimentacoes_estoque_legado"
+    )
+    op.execute("DROP TABLE movimentacoes_estoque_legado")
+    op.execute("ALTER SEQUENCE movimentacoes_estoque_id_seq OWNED BY movimentacoes_estoque.id")
+
+    _create_movimentacao_indexes()
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE movimentacoes_estoque RENAME TO movimentacoes_estoque_particionada")
+        op.execute(
+            "ALTER TABLE movimentacoes_estoque_particionada "
+            "RENAME CONSTRAINT movimentacoes_estoque_pkey TO movimentacoes_estoque_particionada_pkey"
+        )
+        op.execute("ALTER SEQUENCE movimentacoes_estoque_id_seq OWNED BY NONE")
+
+        op.execute("""
+            CREATE TABLE movimentacoes_estoque (
+                id INTEGER NOT NULL DEFAULT nextval('movimentacoes_estoque_id_seq'),
+                produto_id INTEGER NOT NULL REFERENCES produtos (id),
+                tipo tipomovimentacao NOT NULL,
+                quantidade NUMERIC(10, 2) NOT NULL,
+                custo_unitario NUMERIC(10, 2) NOT NULL,
+                valor_total NUMERIC(10, 2) NOT NULL,
+                documento_referencia VARCHAR(100),
+                observacao VARCHAR(500),
+                usuario_id INTEGER,
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                CONSTRAINT movimentacoes_estoque_pkey PRIMARY KEY (id)
+            )
+        """)
+        op.execute(
+            f"INSERT INTO movimentacoes_estoque ({COLUNAS}) "
+            f"SELECT {COLUNAS} FROM movimentacoes_estoque_particionada"
+        )
+        op.execute("DROP TABLE movimentacoes_estoque_particionada CASCADE")
+        op.execute("DROP FUNCTION IF EXISTS criar_particao_movimentacoes_estoque(DATE)")
+        op.execute("ALTER SEQUENCE movimentacoes_estoque_id_seq OWNED BY movimentacoes_estoque.id")
+
+        _create_movimentacao_indexes()
+
+    op.drop_index(op.f('ix_arquivos_movimentacao_estoque_periodo'), table_name='arquivos_movimentacao_estoque')
+    op.drop_index(op.f('ix_arquivos_movimentacao_estoque_id'), table_name='arquivos_movimentacao_estoque')
+    op.drop_table('arquivos_movimentacao_estoque')
+    op.drop_index(op.f('ix_snapshots_saldo_estoque_produto_id'), table_name='snapshots_saldo_estoque')
+    op.drop_index(op.f('ix_snapshots_saldo_estoque_periodo'), table_name='snapshots_saldo_estoque')
+    op.drop_index(op.f('ix_snapshots_saldo_estoque_id'), table_name='snapshots_saldo_estoque')
+    op.drop_index('idx_snapshot_produto_periodo', table_name='snapshots_saldo_estoque')
+    op.drop_table('snapshots_saldo_estoque')
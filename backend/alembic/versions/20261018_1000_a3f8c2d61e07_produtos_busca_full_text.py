@@ -0,0 +1,91 @@
+"""Full-text and trigram search on produtos
+
+Revision ID: a3f8c2d61e07
+Revises: 7c1e5a9d3b42
+Create Date: 2026-10-18 10:00:00.000000
+
+Somente PostgreSQL (em outros bancos a busca usa o índice n-grama em
+memória de app/modules/produtos/busca.py):
+
+- Extensões pg_trgm e unaccent
+- Função f_unaccent(text) IMMUTABLE (unaccent() é STABLE e não pode ser
+  usada em índices)
+- Configuração de text search portuguese_unaccent (stemming português sem
+  acentos)
+- Coluna gerada produtos.busca_vetor (descrição peso A, código de barras
+  peso B) com índice GIN
+- Índices GIN trigrama sobre f_unaccent(lower(descricao)) e codigo_barras,
+  atendendo LIKE '%termo%' e o operador de similaridade %
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f8c2d61e07'
+down_revision: Union[str, None] = '7c1e5a9d3b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS
+        $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        """
+    )
+
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'portuguese_unaccent') THEN
+                CREATE TEXT SEARCH CONFIGURATION portuguese_unaccent (COPY = portuguese);
+                ALTER TEXT SEARCH CONFIGURATION portuguese_unaccent
+                    ALTER MAPPING FOR hword, hword_part, word
+                    WITH unaccent, portuguese_stem;
+            END IF;
+        END
+        $$
+        """
+    )
+
+    op.execute(
+        """
+        ALTER TABLE produtos ADD COLUMN busca_vetor tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('portuguese_unaccent'::regconfig, coalesce(descricao, '')), 'A') ||
+            setweight(to_tsvector('simple'::regconfig, coalesce(codigo_barras, '')), 'B')
+        ) STORED
+        """
+    )
+    op.execute("CREATE INDEX idx_produto_busca_vetor ON produtos USING gin (busca_vetor)")
+    op.execute(
+        "CREATE INDEX idx_produto_descricao_trgm ON produtos "
+        "USING gin (f_unaccent(lower(descricao)) gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX idx_produto_codigo_barras_trgm ON produtos "
+        "USING gin (codigo_barras gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("DROP INDEX IF EXISTS idx_produto_codigo_barras_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_produto_descricao_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_produto_busca_vetor")
+    op.execute("ALTER TABLE produtos DROP COLUMN IF EXISTS busca_vetor")
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS portuguese_unaccent")
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
@@ -0,0 +1,69 @@
+"""Bulk product update batches and price history
+
+Revision ID: 5d9e2b7f4c18
+Revises: a3f8c2d61e07
+Create Date: 2026-10-18 11:00:00.000000
+
+Tabelas de auditoria da atualização em lote de produtos: cabeçalho do lote
+(filtros, alterações, usuário e motivo) e valores anteriores/novos de cada
+produto alterado.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d9e2b7f4c18'
+down_revision: Union[str, None] = 'a3f8c2d61e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('lotes_atualizacao_produtos',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('filtros', sa.Text(), nullable=False),
+    sa.Column('alteracoes', sa.Text(), nullable=False),
+    sa.Column('total_produtos', sa.Integer(), nullable=False),
+    sa.Column('motivo', sa.String(length=500), nullable=True),
+    sa.Column('usuario_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_lotes_atualizacao_produtos_created_at'), 'lotes_atualizacao_produtos', ['created_at'], unique=False)
+    op.create_index(op.f('ix_lotes_atualizacao_produtos_id'), 'lotes_atualizacao_produtos', ['id'], unique=False)
+
+    op.create_table('historico_precos_produto',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('lote_id', sa.Integer(), nullable=False),
+    sa.Column('produto_id', sa.Integer(), nullable=False),
+    sa.Column('preco_custo_anterior', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('preco_custo_novo', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('preco_venda_anterior', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('preco_venda_novo', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('ativo_anterior', sa.Boolean(), nullable=False),
+    sa.Column('ativo_novo', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['lote_id'], ['lotes_atualizacao_produtos.id'], ),
+    sa.ForeignKeyConstraint(['produto_id'], ['produtos.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_historico_preco_lote_produto', 'historico_precos_produto', ['lote_id', 'produto_id'], unique=True)
+    op.create_index('idx_historico_preco_produto_data', 'historico_precos_produto', ['produto_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_historico_precos_produto_id'), 'historico_precos_produto', ['id'], unique=False)
+    op.create_index(op.f('ix_historico_precos_produto_lote_id'), 'historico_precos_produto', ['lote_id'], unique=False)
+    op.create_index(op.f('ix_historico_precos_produto_produto_id'), 'historico_precos_produto', ['produto_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_historico_precos_produto_produto_id'), table_name='historico_precos_produto')
+    op.drop_index(op.f('ix_historico_precos_produto_lote_id'), table_name='historico_precos_produto')
+    op.drop_index(op.f('ix_historico_precos_produto_id'), table_name='historico_precos_produto')
+    op.drop_index('idx_historico_preco_produto_data', table_name='historico_precos_produto')
+    op.drop_index('idx_historico_preco_lote_produto', table_name='historico_precos_produto')
+    op.drop_table('historico_precos_produto')
+    op.drop_index(op.f('ix_lotes_atualizacao_produtos_id'), table_name='lotes_atualizacao_produtos')
+    op.drop_index(op.f('ix_lotes_atualizacao_produtos_created_at'), table_name='lotes_atualizacao_produtos')
+    op.drop_table('lotes_atualizacao_produtos')
@@ -0,0 +1,42 @@
+"""Delta catalog sync: updated_at keyset index and product tombstones
+
+Revision ID: 8b41f6c2a9d3
+Revises: 5d9e2b7f4c18
+Create Date: 2026-10-18 12:00:00.000000
+
+- Índice (updated_at, id) em produtos para a leitura por keyset da
+  sincronização incremental do catálogo
+- Tabela produtos_removidos com os tombstones de produtos excluídos
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b41f6c2a9d3'
+down_revision: Union[str, None] = '5d9e2b7f4c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_produto_updated_at_id', 'produtos', ['updated_at', 'id'], unique=False)
+
+    op.create_table('produtos_removidos',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('produto_id', sa.Integer(), nullable=False),
+    sa.Column('codigo_barras', sa.String(length=50), nullable=True),
+    sa.Column('removido_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_produtos_removidos_id'), 'produtos_removidos', ['id'], unique=False)
+    op.create_index(op.f('ix_produtos_removidos_produto_id'), 'produtos_removidos', ['produto_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_produtos_removidos_produto_id'), table_name='produtos_removidos')
+    op.drop_index(op.f('ix_produtos_removidos_id'), table_name='produtos_removidos')
+    op.drop_table('produtos_removidos')
+    op.drop_index('idx_produto_updated_at_id', table_name='produtos')
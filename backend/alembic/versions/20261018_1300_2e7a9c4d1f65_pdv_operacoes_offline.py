@@ -0,0 +1,57 @@
+"""PDV offline queue: idempotency table for batch sync
+
+Revision ID: 2e7a9c4d1f65
+Revises: 8b41f6c2a9d3
+Create Date: 2026-10-18 13:00:00.000000
+
+- Tabela operacoes_offline_pdv com as operações recebidas na sincronização
+  em lote do PDV (id_cliente único = chave de idempotência) e os conflitos
+  aguardando revisão
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e7a9c4d1f65'
+down_revision: Union[str, None] = '8b41f6c2a9d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('operacoes_offline_pdv',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('id_cliente', sa.String(length=64), nullable=False),
+    sa.Column('terminal', sa.String(length=50), nullable=True),
+    sa.Column('operador_id', sa.Integer(), nullable=False),
+    sa.Column('caixa_id', sa.Integer(), nullable=False),
+    sa.Column('tipo', sa.Enum('VENDA', 'SANGRIA', 'SUPRIMENTO', name='tipooperacaooffline'), nullable=False),
+    sa.Column('status', sa.Enum('APLICADA', 'CONFLITO', name='statusoperacaooffline'), nullable=False),
+    sa.Column('registrado_em', sa.DateTime(), nullable=False),
+    sa.Column('venda_id', sa.Integer(), nullable=True),
+    sa.Column('movimentacao_caixa_id', sa.Integer(), nullable=True),
+    sa.Column('motivo', sa.String(length=500), nullable=True),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['caixa_id'], ['caixas.id'], ),
+    sa.ForeignKeyConstraint(['venda_id'], ['vendas.id'], ),
+    sa.ForeignKeyConstraint(['movimentacao_caixa_id'], ['movimentacoes_caixa.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id_cliente')
+    )
+    op.create_index(op.f('ix_operacoes_offline_pdv_id'), 'operacoes_offline_pdv', ['id'], unique=False)
+    op.create_index(op.f('ix_operacoes_offline_pdv_caixa_id'), 'operacoes_offline_pdv', ['caixa_id'], unique=False)
+    op.create_index('idx_operacao_offline_status_operador', 'operacoes_offline_pdv', ['status', 'operador_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_operacao_offline_status_operador', table_name='operacoes_offline_pdv')
+    op.drop_index(op.f('ix_operacoes_offline_pdv_caixa_id'), table_name='operacoes_offline_pdv')
+    op.drop_index(op.f('ix_operacoes_offline_pdv_id'), table_name='operacoes_offline_pdv')
+    op.drop_table('operacoes_offline_pdv')
+    sa.Enum(name='statusoperacaooffline').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='tipooperacaooffline').drop(op.get_bind(), checkfirst=True)
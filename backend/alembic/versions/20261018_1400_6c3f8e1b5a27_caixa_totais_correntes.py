@@ -0,0 +1,47 @@
+"""Running totals per movement type on caixas
+
+Revision ID: 6c3f8e1b5a27
+Revises: 2e7a9c4d1f65
+Create Date: 2026-10-18 14:00:00.000000
+
+- Colunas total_entradas, total_saidas, total_sangrias e total_suprimentos
+  em caixas, mantidas a cada movimentação
+- Backfill a partir de movimentacoes_caixa
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c3f8e1b5a27'
+down_revision: Union[str, None] = '2e7a9c4d1f65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TOTAIS = {
+    'total_entradas': 'ENTRADA',
+    'total_saidas': 'SAIDA',
+    'total_sangrias': 'SANGRIA',
+    'total_suprimentos': 'SUPRIMENTO',
+}
+
+
+def upgrade() -> None:
+    for coluna in _TOTAIS:
+        op.add_column('caixas', sa.Column(coluna, sa.Numeric(precision=12, scale=2), server_default='0', nullable=False))
+
+    op.execute(
+        "UPDATE caixas SET "
+        + ", ".join(
+            f"{coluna} = COALESCE((SELECT SUM(m.valor) FROM movimentacoes_caixa m "
+            f"WHERE m.caixa_id = caixas.id AND m.tipo = '{tipo}'), 0)"
+            for coluna, tipo in _TOTAIS.items()
+        )
+    )
+
+
+def downgrade() -> None:
+    for coluna in reversed(list(_TOTAIS)):
+        op.drop_column('caixas', coluna)
@@ -0,0 +1,65 @@
+"""Daily cash-flow projection table
+
+Revision ID: 9d2b7e4a3c18
+Revises: 6c3f8e1b5a27
+Create Date: 2026-10-18 15:00:00.000000
+
+- Tabela fluxo_caixa_diario (previsto/realizado de entradas e saídas por dia),
+  mantida pelos eventos de ContaPagar/ContaReceber
+- Backfill a partir de contas_pagar e contas_receber
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2b7e4a3c18'
+down_revision: Union[str, None] = '6c3f8e1b5a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('fluxo_caixa_diario',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('data', sa.Date(), nullable=False),
+    sa.Column('previsto_entradas', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('previsto_saidas', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('realizado_entradas', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('realizado_saidas', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('data')
+    )
+    op.create_index(op.f('ix_fluxo_caixa_diario_id'), 'fluxo_caixa_diario', ['id'], unique=False)
+
+    op.execute("""
+        INSERT INTO fluxo_caixa_diario
+            (data, previsto_entradas, previsto_saidas, realizado_entradas, realizado_saidas, updated_at)
+        SELECT data, SUM(pe), SUM(ps), SUM(re), SUM(rs), CURRENT_TIMESTAMP
+        FROM (
+            SELECT data_vencimento AS data, valor_original - valor_recebido AS pe, 0 AS ps, 0 AS re, 0 AS rs
+            FROM contas_receber
+            WHERE status IN ('PENDENTE', 'ATRASADA') AND valor_original > valor_recebido
+            UNION ALL
+            SELECT data_recebimento, 0, 0, valor_recebido, 0
+            FROM contas_receber
+            WHERE valor_recebido > 0 AND data_recebimento IS NOT NULL
+            UNION ALL
+            SELECT data_vencimento, 0, valor_original - valor_pago, 0, 0
+            FROM contas_pagar
+            WHERE status IN ('PENDENTE', 'ATRASADA') AND valor_original > valor_pago
+            UNION ALL
+            SELECT data_pagamento, 0, 0, 0, valor_pago
+            FROM contas_pagar
+            WHERE valor_pago > 0 AND data_pagamento IS NOT NULL
+        ) movimentos
+        GROUP BY data
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_fluxo_caixa_diario_id'), table_name='fluxo_caixa_diario')
+    op.drop_table('fluxo_caixa_diario')
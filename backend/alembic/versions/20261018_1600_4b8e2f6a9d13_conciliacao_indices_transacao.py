@@ -0,0 +1,35 @@
+"""Indexes for looking up conciliations by PIX transaction and boleto
+
+Revision ID: 4b8e2f6a9d13
+Revises: 9d2b7e4a3c18
+Create Date: 2026-10-18 16:00:00.000000
+
+- A conciliação automática em lote ignora transações PIX e boletos que já
+  possuem conciliação (NOT EXISTS por transacao_pix_id/boleto_id)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8e2f6a9d13'
+down_revision: Union[str, None] = '9d2b7e4a3c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f('ix_conciliacoes_bancarias_transacao_pix_id'),
+        'conciliacoes_bancarias', ['transacao_pix_id'], unique=False
+    )
+    op.create_index(
+        op.f('ix_conciliacoes_bancarias_boleto_id'),
+        'conciliacoes_bancarias', ['boleto_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_conciliacoes_bancarias_boleto_id'), table_name='conciliacoes_bancarias')
+    op.drop_index(op.f('ix_conciliacoes_bancarias_transacao_pix_id'), table_name='conciliacoes_bancarias')
@@ -0,0 +1,46 @@
+"""Value/date reconciliation against receivables
+
+Revision ID: 7a1c5e9b2d48
+Revises: 4b8e2f6a9d13
+Create Date: 2026-10-18 17:00:00.000000
+
+- Tabela conciliacoes_contas_receber (N contas a receber por conciliação)
+- conciliacoes_bancarias.confianca (score do matching por valor e data)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a1c5e9b2d48'
+down_revision: Union[str, None] = '4b8e2f6a9d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('conciliacoes_bancarias', sa.Column('confianca', sa.Numeric(precision=5, scale=4), nullable=True))
+
+    op.create_table('conciliacoes_contas_receber',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('conciliacao_id', sa.Integer(), nullable=False),
+    sa.Column('conta_receber_id', sa.Integer(), nullable=False),
+    sa.Column('valor', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['conciliacao_id'], ['conciliacoes_bancarias.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['conta_receber_id'], ['contas_receber.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_conciliacoes_contas_receber_id'), 'conciliacoes_contas_receber', ['id'], unique=False)
+    op.create_index(op.f('ix_conciliacoes_contas_receber_conciliacao_id'), 'conciliacoes_contas_receber', ['conciliacao_id'], unique=False)
+    op.create_index(op.f('ix_conciliacoes_contas_receber_conta_receber_id'), 'conciliacoes_contas_receber', ['conta_receber_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_conciliacoes_contas_receber_conta_receber_id'), table_name='conciliacoes_contas_receber')
+    op.drop_index(op.f('ix_conciliacoes_contas_receber_conciliacao_id'), table_name='conciliacoes_contas_receber')
+    op.drop_index(op.f('ix_conciliacoes_contas_receber_id'), table_name='conciliacoes_contas_receber')
+    op.drop_table('conciliacoes_contas_receber')
+    op.drop_column('conciliacoes_bancarias', 'confianca')
@@ -0,0 +1,29 @@
+"""Content hash for idempotent bank statement import
+
+Revision ID: c3d9a6f1e5b7
+Revises: 7a1c5e9b2d48
+Create Date: 2026-10-18 18:00:00.000000
+
+- extratos_bancarios.hash_conteudo (SHA-256 do lançamento, único)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d9a6f1e5b7'
+down_revision: Union[str, None] = '7a1c5e9b2d48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('extratos_bancarios', sa.Column('hash_conteudo', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_extratos_bancarios_hash_conteudo'), 'extratos_bancarios', ['hash_conteudo'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_extratos_bancarios_hash_conteudo'), table_name='extratos_bancarios')
+    op.drop_column('extratos_bancarios', 'hash_conteudo')
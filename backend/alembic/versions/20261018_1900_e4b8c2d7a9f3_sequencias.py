@@ -0,0 +1,33 @@
+"""Counter table for contention-free document numbering
+
+Revision ID: e4b8c2d7a9f3
+Revises: c3d9a6f1e5b7
+Create Date: 2026-10-18 19:00:00.000000
+
+- sequencias (último número reservado por sequência: nosso número, NFC-e, pedidos)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8c2d7a9f3'
+down_revision: Union[str, None] = 'c3d9a6f1e5b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sequencias',
+        sa.Column('nome', sa.String(length=100), nullable=False),
+        sa.Column('valor', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('nome'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('sequencias')
@@ -0,0 +1,26 @@
+"""Index for the PIX expiry sweep
+
+Revision ID: a8f2e6c4b1d9
+Revises: e4b8c2d7a9f3
+Create Date: 2026-10-18 20:00:00.000000
+
+- transacoes_pix.data_expiracao indexada (varredura de vencimentos)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8f2e6c4b1d9'
+down_revision: Union[str, None] = 'e4b8c2d7a9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_transacoes_pix_data_expiracao'), 'transacoes_pix', ['data_expiracao'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_transacoes_pix_data_expiracao'), table_name='transacoes_pix')
@@ -0,0 +1,49 @@
+"""Inbox table for payment gateway webhooks
+
+Revision ID: b5d1f7a3c9e2
+Revises: a8f2e6c4b1d9
+Create Date: 2026-10-18 21:00:00.000000
+
+- webhooks_recebidos (caixa de entrada; único por gateway + evento_id)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d1f7a3c9e2'
+down_revision: Union[str, None] = 'a8f2e6c4b1d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'webhooks_recebidos',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('gateway', sa.String(length=20), nullable=False),
+        sa.Column('evento_id', sa.String(length=150), nullable=False),
+        sa.Column('pagamento_id', sa.String(length=150), nullable=True),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('headers', sa.Text(), nullable=True),
+        sa.Column('status', sa.Enum('PENDENTE', 'PROCESSADO', 'ERRO', 'FALHOU', name='statuswebhookrecebido'), nullable=False),
+        sa.Column('tentativas', sa.Integer(), nullable=False),
+        sa.Column('erro', sa.Text(), nullable=True),
+        sa.Column('recebido_em', sa.DateTime(), nullable=False),
+        sa.Column('processado_em', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('gateway', 'evento_id', name='uq_webhooks_recebidos_gateway_evento'),
+    )
+    op.create_index(op.f('ix_webhooks_recebidos_id'), 'webhooks_recebidos', ['id'], unique=False)
+    op.create_index(op.f('ix_webhooks_recebidos_pagamento_id'), 'webhooks_recebidos', ['pagamento_id'], unique=False)
+    op.create_index(op.f('ix_webhooks_recebidos_status'), 'webhooks_recebidos', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_webhooks_recebidos_status'), table_name='webhooks_recebidos')
+    op.drop_index(op.f('ix_webhooks_recebidos_pagamento_id'), table_name='webhooks_recebidos')
+    op.drop_index(op.f('ix_webhooks_recebidos_id'), table_name='webhooks_recebidos')
+    op.drop_table('webhooks_recebidos')
+    sa.Enum(name='statuswebhookrecebido').drop(op.get_bind(), checkfirst=True)
@@ -1,10 +1,11 @@
 """
 Redis Cache Service - Sistema de cache distribuído
 """
+import asyncio
 import logging
 import json
 import pickle
-from typing import Any, Optional, Callable
+from typing import Any, Optional, Callable, Awaitable, Dict, List, Iterable
 from functools import wraps
 from datetime import timedelta
 import hashlib
@@ -18,15 +19,25 @@ except ImportError:
     logger.warning("Redis não disponível. Cache em memória será usado.")
     REDIS_AVAILABLE = False
 
+# Mensagem de pub/sub que significa "tudo pode ter mudado"
+MENSAGEM_TODOS = "*"
+
 
 class CacheService:
     """Serviço de cache com suporte a Redis e fallback para memória"""
 
+    # Espera (segundos) entre tentativas de reconectar o pub/sub
+    ESPERA_RECONEXAO_MIN = 0.5
+    ESPERA_RECONEXAO_MAX = 30.0
+
     def __init__(self, redis_url: Optional[str] = None):
         self.redis_url = redis_url or "redis://localhost:6379/0"
         self._redis_client: Optional[redis.Redis] = None
         self._memory_cache: dict = {}  # Fallback para memória
         self._use_redis = REDIS_AVAILABLE and redis_url is not None
+        self._assinantes: Dict[str, List[Callable[[str], Awaitable[None]]]] = {}
+        self._pubsub = None
+        self._listener_task: Optional[asyncio.Task] = None
 
     async def connect(self):
         """Conecta ao Redis"""
@@ -51,6 +62,12 @@ class CacheService:
 
     async def disconnect(self):
         """Desconecta do Redis"""
+        if self._listener_task:
+            self._listener_task.cancel()
+            self._listener_task = None
+        if self._pubsub is not None:
+            await self._pubsub.close()
+            self._pubsub = None
         if self._redis_client:
             await self._redis_client.close()
             logger.info("Desconectado do Redis")
@@ -134,6 +151,32 @@ class CacheService:
                 return True
             return False
 
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Remove várias chaves em um único comando
+
+        Args:
+            keys: Chaves do cache
+
+        Returns:
+            Número de chaves removidas
+        """
+        keys = list(keys)
+        if not keys:
+            return 0
+        if self._use_redis and self._redis_client:
+            try:
+                return await self._redis_client.delete(*keys)
+            except Exception as e:
+                logger.error(f"Erro ao deletar do Redis: {str(e)}")
+                return 0
+        removidas = 0
+        for key in keys:
+            if key in self._memory_cache:
+                del self._memory_cache[key]
+                removidas += 1
+        return removidas
+
     async def exists(self, key: str) -> bool:
         """Verifica se chave existe no cache"""
         if self._use_redis and self._redis_client:
@@ -193,6 +236,117 @@ class CacheService:
         """
         return await self.clear(f"{prefix}*")
 
+    # ========== Pub/Sub ==========
+
+    async def subscribe(
+        self, canal: str, callback: Callable[[str], Awaitable[None]]
+    ):
+        """
+        Registra callback para mensagens publicadas em um canal
+
+        Com Redis as mensagens chegam de todos os workers (pub/sub); sem Redis
+        apenas as publicadas pelo próprio processo. Se a conexão do pub/sub
+        cai, as mensagens do intervalo se perdem: o callback recebe
+        MENSAGEM_TODOS ao cair e de novo ao reassinar, e deve descartar o
+        que guarda em memória.
+
+        Args:
+            canal: Nome do canal (ex: "invalidacao:produtos")
+            callback: Coroutine chamada com a mensagem (str)
+        """
+        novo_canal = canal not in self._assinantes
+        self._assinantes.setdefault(canal, []).append(callback)
+
+        if not (self._use_redis and self._redis_client and novo_canal):
+            return
+        if self._listener_task is not None and self._pubsub is None:
+            # Listener reconectando: assina todos os canais ao voltar
+            return
+        try:
+            if self._pubsub is None:
+                self._pubsub = self._redis_client.pubsub()
+            await self._pubsub.subscribe(canal)
+        except Exception as e:
+            logger.error(f"Erro ao assinar canal {canal} no Redis: {str(e)}")
+        if self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._escutar())
+
+    def unsubscribe(self, canal: str, callback: Callable[[str], Awaitable[None]]):
+        """Remove callback registrado em um canal"""
+        assinantes = self._assinantes.get(canal, [])
+        if callback in assinantes:
+            assinantes.remove(callback)
+
+    async def publish(self, canal: str, mensagem: str) -> None:
+        """Publica mensagem em um canal (Redis pub/sub ou assinantes locais)"""
+        if self._use_redis and self._redis_client:
+            try:
+                await self._redis_client.publish(canal, mensagem)
+                return
+            except Exception as e:
+                logger.error(f"Erro ao publicar no Redis: {str(e)}")
+        await self._notificar(canal, mensagem)
+
+    async def _notificar(self, canal: str, mensagem: str):
+        for callback in list(self._assinantes.get(canal, [])):
+            try:
+                await callback(mensagem)
+            except Exception as e:
+                logger.error(f"Erro no assinante do canal {canal}: {str(e)}")
+
+    async def _notificar_todos(self):
+        for canal in list(self._assinantes):
+            await self._notificar(canal, MENSAGEM_TODOS)
+
+    async def _fechar_pubsub(self):
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.close()
+            except Exception:
+                pass
+
+    async def _escutar(self):
+        """
+        Repassa mensagens do Redis para os assinantes locais
+
+        Se a conexão cai, reassina os canais com espera exponencial
+        (ESPERA_RECONEXAO_MIN até ESPERA_RECONEXAO_MAX segundos).
+        """
+        espera = self.ESPERA_RECONEXAO_MIN
+        interrompido = False
+        while True:
+            try:
+                if self._pubsub is None:
+                    self._pubsub = self._redis_client.pubsub()
+                    await self._pubsub.subscribe(*self._assinantes)
+                    logger.info("Listener de pub/sub do Redis reconectado")
+                    espera = self.ESPERA_RECONEXAO_MIN
+                    if interrompido:
+                        interrompido = False
+                        await self._notificar_todos()
+                async for mensagem in self._pubsub.listen():
+                    if mensagem.get("type") != "message":
+                        continue
+                    canal = mensagem["channel"]
+                    dados = mensagem["data"]
+                    if isinstance(canal, bytes):
+                        canal = canal.decode()
+                    if isinstance(dados, bytes):
+                        dados = dados.decode()
+                    await self._notificar(canal, dados)
+                raise ConnectionError("conexão de pub/sub encerrada")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await self._fechar_pubsub()
+                if not interrompido:
+                    interrompido = True
+                    logger.error(f"Listener de pub/sub do Redis interrompido: {str(e)}")
+                    await self._notificar_todos()
+                await asyncio.sleep(espera)
+                espera = min(espera * 2, self.ESPERA_RECONEXAO_MAX)
+
     def generate_key(self, *args, **kwargs) -> str:
         """
         Gera chave de cache baseada em argumentos
@@ -216,6 +370,9 @@ class CacheService:
 # Singleton global
 cache_service = CacheService()
 
+# Canal de eventos de invalidação de produtos (MENSAGEM_TODOS ou IDs separados por vírgula)
+CANAL_INVALIDACAO_PRODUTOS = "invalidacao:produtos"
+
 
 def cached(ttl: int = 300, prefix: str = "cache"):
     """
@@ -310,12 +467,23 @@ class CacheManager:
 
     async def invalidate_produto(self, produto_id: int):
         """Invalida cache de produto"""
-        key = f"produto:{produto_id}"
-        await self.cache.delete(key)
+        await self.invalidate_produtos([produto_id])
+
+    async def invalidate_produtos(self, produto_ids: Iterable[int]):
+        """Invalida cache de vários produtos e notifica os workers"""
+        ids = sorted(set(produto_ids))
+        if not ids:
+            return
+        await self.cache.delete_many(f"produto:{produto_id}" for produto_id in ids)
+        await self.cache.publish(
+            CANAL_INVALIDACAO_PRODUTOS, ",".join(str(i) for i in ids)
+        )
 
     async def invalidate_all_produtos(self):
         """Invalida cache de todos os produtos"""
-        return await self.cache.invalidate_prefix("produto:")
+        removidos = await self.cache.invalidate_prefix("produto:")
+        await self.cache.publish(CANAL_INVALIDACAO_PRODUTOS, MENSAGEM_TODOS)
+        return removidos
 
     # ========== Consultas ==========
 
@@ -2,13 +2,21 @@
 Celery Configuration - Tarefas Assíncronas e Webhooks
 """
 from celery import Celery
+from celery.schedules import crontab
 from app.core.config import settings
 
 # Configurar Celery
+# Os módulos de tasks são importados explicitamente: autodiscover_tasks
+# só procura app.tasks.tasks
 celery_app = Celery(
     "siscom",
     broker=settings.REDIS_URL or "redis://localhost:6379/1",
-    backend=settings.REDIS_URL or "redis://localhost:6379/1"
+    backend=settings.REDIS_URL or "redis://localhost:6379/1",
+    include=[
+        "app.tasks.webhooks",
+        "app.tasks.financeiro",
+        "app.tasks.pagamentos",
+    ]
 )
 
 # Configurações
@@ -24,5 +32,24 @@ celery_app.conf.update(
     worker_max_tasks_per_child=1000,
 )
 
+# Tarefas periódicas (celery beat)
+celery_app.conf.beat_schedule = {
+    # Marca como ATRASADA as contas PENDENTES vencidas, logo após a virada do dia
+    "financeiro-atualizar-status-vencidas": {
+        "task": "app.tasks.financeiro.atualizar_status_vencidas_task",
+        "schedule": crontab(hour=0, minute=5),
+    },
+    # Expira cobranças PIX e marca boletos vencidos (PIX expira em minutos)
+    "pagamentos-varrer-vencimentos": {
+        "task": "app.tasks.pagamentos.varrer_vencimentos_task",
+        "schedule": crontab(minute="*/5"),
+    },
+    # Processa os webhooks de pagamento gravados na inbox
+    "pagamentos-processar-webhooks": {
+        "task": "app.tasks.pagamentos.processar_webhooks_task",
+        "schedule": 10.0,
+    },
+}
+
 # Auto-discover tasks
 celery_app.autodiscover_tasks(["app.tasks"])
@@ -49,6 +49,30 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Estoque - arquivamento do ledger de movimentações
+    ESTOQUE_ARQUIVO_DIR: str = "storage/arquivo_estoque"
+    ESTOQUE_MESES_RETENCAO: int = 12
+
+    # Produtos - recarga do índice de busca em memória (bancos sem full-text)
+    PRODUTOS_BUSCA_INDICE_TTL: int = 300
+
+    # PDV - validade de cada entrada do índice de código de barras (segundos)
+    PDV_INDICE_CODIGO_BARRAS_TTL: int = 60
+
+    # Produtos - atraso do limite superior da sincronização incremental do catálogo
+    CATALOGO_SYNC_ATRASO_SEGUNDOS: int = 5
+
+    # Mercado Livre - sincronização de estoque
+    MERCADO_LIVRE_API_URL: str = "https://api.mercadolibre.com"
+    ML_SYNC_CONCORRENCIA: int = 8
+    ML_SYNC_DEBOUNCE_SEGUNDOS: float = 3.0
+    ML_SYNC_ESPERA_MAXIMA_SEGUNDOS: float = 15.0
+
+    # PIX - recebedor no BR Code e cache do QR Code de chave estática
+    PIX_RECEBEDOR_NOME: str = "ERP MATERIAIS CONSTRUCAO"
+    PIX_RECEBEDOR_CIDADE: str = "SAO PAULO"
+    PIX_QR_CODE_CACHE_TTL: int = 86400
+
     # Logging and Monitoring
     # URL do Sentry para monitoramento de erros (opcional)
     SENTRY_DSN: str = ""
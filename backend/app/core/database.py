@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
+from app.core.versionamento import publicar_versoes
 
 
 # Engine assíncrona
@@ -37,6 +38,9 @@ class Base(DeclarativeBase):
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency para obter sessão do banco de dados
+
+    As versões das tabelas alteradas (GET condicional) são publicadas antes
+    da resposta, inclusive de commits feitos pelos services.
     """
     async with AsyncSessionLocal() as session:
         try:
@@ -46,6 +50,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
             raise
         finally:
+            await publicar_versoes(session)
             await session.close()
 
 
@@ -0,0 +1,144 @@
+"""
+Numeração sequencial sem disputa (nosso número, NFC-e, pedidos)
+
+"Ler o último número e somar 1" colide quando dois documentos são criados ao
+mesmo tempo e, com lock, serializa todas as emissões. Aqui cada sequência é
+uma linha da tabela "sequencias", incrementada com UPDATE ... RETURNING:
+
+- Em PostgreSQL a reserva roda em transação própria, curta, e reserva um
+  bloco de números de uma vez; o bloco fica na memória do processo
+  (worker) e os próximos números saem sem ir ao banco. A linha da
+  sequência não fica bloqueada durante a transação de quem emite.
+- Em SQLite (um escritor por vez) a reserva é feita na própria sessão, um
+  número por vez, e segue o commit/rollback de quem emite.
+
+Consequências: números reservados e não usados (rollback, restart do
+worker) viram lacunas, e com vários workers a ordem dos números não segue a
+ordem de criação. Sequências fiscais (NF-e/NFC-e) usam bloco 1; lacunas são
+inutilizadas na SEFAZ como já acontece com notas rejeitadas.
+
+Sequências novas começam no valor devolvido por `inicial` (ex.: o maior
+número já gravado), então a troca do "MAX + 1" não repete números antigos.
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+# Números reservados por ida ao banco (por worker)
+BLOCO_PADRAO = 20
+
+ValorInicial = Callable[[Any], Awaitable[int]]
+
+
+class Sequencia(Base):
+    """Último número reservado de cada sequência"""
+
+    __tablename__ = "sequencias"
+
+    nome: Mapped[str] = mapped_column(String(100), primary_key=True)
+    valor: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<Sequencia(nome='{self.nome}', valor={self.valor})>"
+
+
+async def reservar(
+    executor, nome: str, quantidade: int = 1, inicial: Optional[ValorInicial] = None
+) -> int:
+    """
+    Avança a sequência em `quantidade` e devolve o último número reservado
+
+    Args:
+        executor: AsyncSession ou AsyncConnection
+        nome: Nome da sequência
+        quantidade: Tamanho do bloco
+        inicial: Valor atual de uma sequência ainda inexistente
+            (recebe o executor; só é chamado na primeira reserva)
+    """
+    tabela = Sequencia.__table__
+    avancar = (
+        tabela.update()
+        .where(tabela.c.nome == nome)
+        .values(valor=tabela.c.valor + quantidade, updated_at=datetime.utcnow())
+        .returning(tabela.c.valor)
+    )
+    valor = (await executor.execute(avancar)).scalar()
+    if valor is not None:
+        return valor
+
+    linha = {"nome": nome, "valor": await inicial(executor) if inicial else 0, "updated_at": datetime.utcnow()}
+    dialeto = executor.bind.dialect.name if isinstance(executor, AsyncSession) else executor.dialect.name
+    if dialeto in ("postgresql", "sqlite"):
+        insert = pg_insert if dialeto == "postgresql" else sqlite_insert
+        # Outro worker pode criar a mesma sequência ao mesmo tempo
+        await executor.execute(insert(tabela).values(**linha).on_conflict_do_nothing(index_elements=[tabela.c.nome]))
+    else:
+        await executor.execute(tabela.insert().values(**linha))
+    return (await executor.execute(avancar)).scalar_one()
+
+
+class AlocadorSequencias:
+    """Entrega números das sequências, com blocos pré-reservados por processo"""
+
+    # Bancos com um escritor por vez: reserva na transação de quem emite
+    dialetos_sem_bloco = ("sqlite",)
+
+    def __init__(self):
+        self._blocos: Dict[str, Tuple[int, int]] = {}  # nome -> (próximo, último reservado)
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def proximo(
+        self,
+        session: AsyncSession,
+        nome: str,
+        inicial: Optional[ValorInicial] = None,
+        bloco: int = BLOCO_PADRAO,
+    ) -> int:
+        """
+        Próximo número da sequência
+
+        Args:
+            session: Sessão de quem vai usar o número
+            nome: Nome da sequência (ex.: "pedido_venda", "nfce.serie.1")
+            inicial: Valor atual de uma sequência ainda inexistente
+            bloco: Números reservados por ida ao banco (1 = sem lacunas além de rollbacks)
+        """
+        engine = session.bind
+        if not isinstance(engine, AsyncEngine) or engine.dialect.name in self.dialetos_sem_bloco:
+            return await reservar(session, nome, 1, inicial)
+
+        lock = self._locks.setdefault(nome, asyncio.Lock())
+        async with lock:
+            proximo, ultimo = self._blocos.get(nome, (1, 0))
+            if proximo > ultimo:
+                async with engine.begin() as conn:
+                    ultimo = await reservar(conn, nome, bloco, inicial)
+                proximo = ultimo - bloco + 1
+            self._blocos[nome] = (proximo + 1, ultimo)
+            return proximo
+
+    def descartar_blocos(self):
+        """Esquece os blocos reservados (testes, troca de banco)"""
+        self._blocos.clear()
+
+
+alocador_sequencias = AlocadorSequencias()
+
+
+async def proximo_numero(
+    session: AsyncSession,
+    nome: str,
+    inicial: Optional[ValorInicial] = None,
+    bloco: int = BLOCO_PADRAO,
+) -> int:
+    """Próximo número da sequência (alocador compartilhado do processo)"""
+    return await alocador_sequencias.proximo(session, nome, inicial, bloco)
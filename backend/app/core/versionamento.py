@@ -0,0 +1,279 @@
+"""
+Versões de tabelas para GET condicional (ETag / Last-Modified)
+
+Dados de referência (categorias, condições de pagamento, produtos,
+localizações) mudam pouco e são lidos o tempo todo pelo frontend. Cada
+tabela registrada em TABELAS_VERSIONADAS tem um contador de versão,
+incrementado após o commit de qualquer escrita nela: o commit registra as
+tabelas na sessão e publicar_versoes() faz o incremento antes da resposta
+(get_db) ou do fim da task. O ETag de uma resposta
+é derivado das versões das tabelas que ela lê, da URL e do tenant. Um
+If-None-Match igual ao ETag atual responde 304 sem executar a consulta nem
+serializar o payload. As mesmas versões servem de chave para resumos
+cacheados no servidor (ex: fluxo de caixa do financeiro).
+
+- Com Redis os contadores ficam no hash "versoes:tabelas", compartilhado
+  entre os workers; sem Redis ficam na memória do processo e não valem
+  para os outros workers, então o GET condicional fica desligado
+- Contadores ausentes começam no instante atual em milissegundos, para que
+  um reset (restart sem Redis, FLUSHDB) não repita um ETag antigo
+- Escritas feitas pelo ORM são detectadas no flush. UPDATE/DELETE em lote
+  não disparam eventos por objeto: quem os executa chama
+  marcar_tabelas_alteradas()
+"""
+import hashlib
+import logging
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from itertools import chain
+from typing import Dict, Iterable, List, Tuple
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache_service, CacheService
+
+logger = logging.getLogger(__name__)
+
+TABELAS_VERSIONADAS = frozenset({
+    "categorias",
+    "condicoes_pagamento",
+    "contas_pagar",
+    "contas_receber",
+    "parcelas_padrao",
+    "produtos",
+    "localizacoes_estoque",
+    "produtos_localizacoes",
+})
+
+_CHAVE_REDIS = "versoes:tabelas"
+_CHAVE_SESSAO = "tabelas_alteradas"
+_CHAVE_A_PUBLICAR = "tabelas_a_publicar"
+
+
+class VersoesTabelas:
+    """Contadores de versão por tabela (Redis ou memória)"""
+
+    def __init__(self, cache: CacheService):
+        self.cache = cache
+        self._versoes: Dict[str, int] = {}
+        self._alteradas_em: Dict[str, float] = {}
+
+    @property
+    def _redis(self):
+        return self.cache._redis_client if self.cache._use_redis else None
+
+    @property
+    def compartilhadas(self) -> bool:
+        """True se as versões são as mesmas em todos os workers (Redis)"""
+        return self._redis is not None
+
+    def _inicializar(self, tabela: str):
+        if tabela not in self._versoes:
+            agora = time.time()
+            self._versoes[tabela] = int(agora * 1000)
+            self._alteradas_em[tabela] = agora
+
+    async def obter(self, tabelas: Iterable[str]) -> Tuple[List[int], float]:
+        """
+        Versões atuais das tabelas
+
+        Returns:
+            Tupla (versões na ordem das tabelas, instante da última alteração em epoch)
+        """
+        tabelas = list(tabelas)
+        redis = self._redis
+        if redis is None:
+            for tabela in tabelas:
+                self._inicializar(tabela)
+            return (
+                [self._versoes[t] for t in tabelas],
+                max(self._alteradas_em[t] for t in tabelas),
+            )
+
+        campos = [c for t in tabelas for c in (t, f"{t}:ts")]
+        valores = await redis.hmget(_CHAVE_REDIS, campos)
+        if any(v is None for v in valores):
+            agora = time.time()
+            for tabela in tabelas:
+                await redis.hsetnx(_CHAVE_REDIS, tabela, int(agora * 1000))
+                await redis.hsetnx(_CHAVE_REDIS, f"{tabela}:ts", agora)
+            valores = await redis.hmget(_CHAVE_REDIS, campos)
+        return [int(v) for v in valores[0::2]], max(float(v) for v in valores[1::2])
+
+    def incrementar_local(self, tabelas: Iterable[str]):
+        """Incrementa as versões em memória"""
+        agora = time.time()
+        for tabela in tabelas:
+            self._inicializar(tabela)
+            self._versoes[tabela] += 1
+            self._alteradas_em[tabela] = agora
+
+    async def incrementar(self, tabelas: Iterable[str]):
+        """Incrementa as versões das tabelas"""
+        redis = self._redis
+        if redis is None:
+            self.incrementar_local(tabelas)
+            return
+        agora = time.time()
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for tabela in tabelas:
+                    pipe.hsetnx(_CHAVE_REDIS, tabela, int(agora * 1000))
+                    pipe.hincrby(_CHAVE_REDIS, tabela, 1)
+                    pipe.hset(_CHAVE_REDIS, f"{tabela}:ts", agora)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Erro ao incrementar versões de tabelas: {str(e)}")
+
+
+versoes_tabelas = VersoesTabelas(cache_service)
+
+
+# ==================== GET CONDICIONAL ====================
+
+
+def _gerar_etag(request: Request, tabelas: Iterable[str], versoes: List[int]) -> str:
+    partes = [
+        request.url.path,
+        "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items())),
+        request.headers.get("X-Tenant-ID", ""),
+        ",".join(f"{t}:{v}" for t, v in zip(tabelas, versoes)),
+    ]
+    return f'W/"{hashlib.sha1("|".join(partes).encode()).hexdigest()[:20]}"'
+
+
+def _nao_modificado(request: Request, etag: str, alterado_em: float) -> bool:
+    """If-None-Match tem precedência sobre If-Modified-Since (RFC 7232)"""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        recebidas = {e.strip().removeprefix("W/") for e in if_none_match.split(",")}
+        return "*" in recebidas or etag.removeprefix("W/") in recebidas
+
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since is None:
+        return False
+    try:
+        desde = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(alterado_em) <= desde
+
+
+def requisicao_condicional(*tabelas: str):
+    """
+    Dependency de GET condicional pelas versões das tabelas lidas no endpoint
+
+    Responde 304 (sem executar o endpoint) quando o cliente já tem a versão
+    atual; caso contrário adiciona ETag/Last-Modified à resposta. Sem Redis
+    não faz nada: cada worker teria as próprias versões.
+
+    Uso:
+        @router.get("/", dependencies=[Depends(requisicao_condicional("categorias"))])
+
+    Args:
+        tabelas: Tabelas de TABELAS_VERSIONADAS das quais a resposta depende
+    """
+    desconhecidas = set(tabelas) - TABELAS_VERSIONADAS
+    if desconhecidas:
+        raise ValueError(f"Tabelas não versionadas: {', '.join(sorted(desconhecidas))}")
+
+    async def verificar(request: Request, response: Response):
+        if not versoes_tabelas.compartilhadas:
+            return
+        try:
+            versoes, alterado_em = await versoes_tabelas.obter(tabelas)
+        except Exception as e:
+            logger.error(f"Erro ao obter versões de tabelas: {str(e)}")
+            return
+
+        headers = {
+            "ETag": _gerar_etag(request, tabelas, versoes),
+            "Cache-Control": "private, no-cache",
+        }
+        # Last-Modified tem resolução de segundos: só é enviado quando o
+        # segundo da última alteração já terminou, senão outra escrita no
+        # mesmo segundo ficaria com a mesma data
+        if time.time() >= int(alterado_em) + 1:
+            headers["Last-Modified"] = formatdate(int(alterado_em), usegmt=True)
+
+        if _nao_modificado(request, headers["ETag"], alterado_em):
+            raise HTTPException(status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return verificar
+
+
+# ==================== EVENTOS DA SESSÃO ====================
+
+
+def marcar_tabelas_alteradas(session, *tabelas: str):
+    """
+    Registra tabelas alteradas por UPDATE/DELETE em lote
+
+    Args:
+        session: Sessão (AsyncSession ou Session) em que o comando foi executado
+        tabelas: Nomes das tabelas
+    """
+    session = getattr(session, "sync_session", session)
+    alteradas = TABELAS_VERSIONADAS.intersection(tabelas)
+    if alteradas:
+        session.info.setdefault(_CHAVE_SESSAO, set()).update(alteradas)
+
+
+def tabelas_alteradas_na_sessao(session) -> set:
+    """
+    Tabelas versionadas com escritas ainda não commitadas na sessão
+
+    Quem cacheia resultados pelas versões não deve ler nem gravar o cache
+    enquanto a própria sessão tem alterações pendentes nessas tabelas.
+    """
+    session = getattr(session, "sync_session", session)
+    return set(session.info.get(_CHAVE_SESSAO, ()))
+
+
+@event.listens_for(Session, "after_flush")
+def _registrar_tabelas_do_flush(session: Session, flush_context):
+    tabelas = set()
+    for objeto in chain(session.new, session.deleted, session.dirty):
+        tabela = getattr(objeto, "__tablename__", None)
+        if tabela not in TABELAS_VERSIONADAS or tabela in tabelas:
+            continue
+        if objeto in session.dirty and not session.is_modified(objeto, include_collections=False):
+            continue
+        tabelas.add(tabela)
+    if tabelas:
+        marcar_tabelas_alteradas(session, *tabelas)
+
+
+async def publicar_versoes(session):
+    """
+    Incrementa as versões das tabelas alteradas pelos commits da sessão
+
+    Chamada por get_db antes da resposta e pelas tasks antes de terminar,
+    para que o próximo GET condicional já veja a versão nova.
+
+    Args:
+        session: Sessão (AsyncSession ou Session) já commitada
+    """
+    session = getattr(session, "sync_session", session)
+    tabelas = session.info.pop(_CHAVE_A_PUBLICAR, None)
+    if tabelas:
+        await versoes_tabelas.incrementar(tabelas)
+
+
+@event.listens_for(Session, "after_commit")
+def _registrar_versoes_a_publicar(session: Session):
+    tabelas = session.info.pop(_CHAVE_SESSAO, None)
+    if not tabelas:
+        return
+    if not versoes_tabelas.compartilhadas:
+        versoes_tabelas.incrementar_local(tabelas)
+        return
+    session.info.setdefault(_CHAVE_A_PUBLICAR, set()).update(tabelas)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _descartar_tabelas(session: Session, previous_transaction):
+    session.info.pop(_CHAVE_SESSAO, None)
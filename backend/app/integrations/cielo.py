@@ -18,6 +18,7 @@ from enum import Enum
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.integrations.http_client import get_http_client
 
 logger = get_logger(__name__)
 
@@ -98,6 +99,11 @@ class CieloClient:
             "RequestId": ""  # Será preenchido por requisição
         }
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP com pool de conexões keep-alive compartilhado"""
+        return get_http_client("cielo", timeout=30.0)
+
     async def _make_request(
         self,
         method: str,
@@ -118,42 +124,42 @@ class CieloClient:
             "endpoint": endpoint
         })
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                if method == "POST":
-                    response = await client.post(url, json=data, headers=headers)
-                elif method == "GET":
-                    response = await client.get(url, headers=headers)
-                elif method == "PUT":
-                    response = await client.put(url, json=data, headers=headers)
-                else:
-                    raise ValueError(f"Método HTTP não suportado: {method}")
-
-                response.raise_for_status()
-                result = response.json()
-
-                logger.info(f"Cielo API success: {response.status_code}", extra={
-                    "request_id": request_id,
-                    "status_code": response.status_code
-                })
-
-                return result
-
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Cielo API error: {e.response.status_code}", extra={
-                    "request_id": request_id,
-                    "status_code": e.response.status_code,
-                    "response": e.response.text
-                })
-                error_data = e.response.json() if e.response.text else {}
-                raise Exception(f"Erro Cielo API: {error_data.get('message', str(e))}")
-
-            except Exception as e:
-                logger.error(f"Cielo request error: {str(e)}", extra={
-                    "request_id": request_id,
-                    "error": str(e)
-                })
-                raise
+        client = self.client
+        try:
+            if method == "POST":
+                response = await client.post(url, json=data, headers=headers)
+            elif method == "GET":
+                response = await client.get(url, headers=headers)
+            elif method == "PUT":
+                response = await client.put(url, json=data, headers=headers)
+            else:
+                raise ValueError(f"Método HTTP não suportado: {method}")
+
+            response.raise_for_status()
+            result = response.json()
+
+            logger.info(f"Cielo API success: {response.status_code}", extra={
+                "request_id": request_id,
+                "status_code": response.status_code
+            })
+
+            return result
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Cielo API error: {e.response.status_code}", extra={
+                "request_id": request_id,
+                "status_code": e.response.status_code,
+                "response": e.response.text
+            })
+            error_data = e.response.json() if e.response.text else {}
+            raise Exception(f"Erro Cielo API: {error_data.get('message', str(e))}")
+
+        except Exception as e:
+            logger.error(f"Cielo request error: {str(e)}", extra={
+                "request_id": request_id,
+                "error": str(e)
+            })
+            raise
 
     # ========================================================================
     # PAGAMENTO COM CARTÃO DE CRÉDITO
@@ -6,6 +6,8 @@ import httpx
 from typing import Dict, Any, List, Optional
 from decimal import Decimal
 
+from app.integrations.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +33,11 @@ class CorreiosClient:
         self.senha = senha or ""
         self.base_url = "https://ws.correios.com.br"
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP com pool de conexões keep-alive compartilhado"""
+        return get_http_client("correios", timeout=30.0)
+
     async def calcular_frete(
         self,
         cep_origem: str,
@@ -91,40 +98,42 @@ class CorreiosClient:
                     "sCdAvisoRecebimento": "N"
                 }
 
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(url, params=params)
-                    response.raise_for_status()
-
-                    # Parse XML response
-                    import xml.etree.ElementTree as ET
-                    root = ET.fromstring(response.content)
-
-                    # Extrair dados do serviço
-                    servico_data = root.find('.//cServico')
-                    if servico_data is not None:
-                        codigo = servico_data.find('Codigo').text
-                        valor = servico_data.find('Valor').text.replace(',', '.')
-                        prazo = servico_data.find('PrazoEntrega').text
-                        erro = servico_data.find('Erro').text
-                        msg_erro = servico_data.find('MsgErro').text if servico_data.find('MsgErro') is not None else ""
-
-                        nome_servico = "PAC" if codigo == "04510" else "SEDEX" if codigo == "04014" else f"Serviço {codigo}"
-
-                        resultado = {
-                            "servico": nome_servico,
-                            "codigo": codigo,
-                            "valor": Decimal(valor) if erro == "0" else None,
-                            "prazo_dias": int(prazo) if erro == "0" else None,
-                            "erro": erro != "0",
-                            "mensagem_erro": msg_erro if erro != "0" else None
-                        }
-
-                        resultados.append(resultado)
-
-                        if erro == "0":
-                            logger.info(f"Frete {nome_servico}: R$ {valor} - {prazo} dias")
-                        else:
-                            logger.warning(f"Erro ao calcular {nome_servico}: {msg_erro}")
+                client = self.client
+                response = await client.get(url, params=params)
+                response.raise_for_status()
+
+                # Parse XML response
+                import xml.etree.ElementTree as ET
+                root = ET.fromstring(response.content)
+
+                # Extrair dados do serviço
+                servico_data = root.find('.//cServico')
+                if servico_data is not None:
+                    codigo = servico_data.find('Codigo').text
+                    valor = servico_data.find('Valor').text.replace(',', '.')
+                    prazo = servico_data.find('PrazoEntrega').text
+                    erro = servico_data.find('Erro').text
+                    msg_erro = servico_data.find('MsgErro').text if servico_data.find('MsgErro') is not None else ""
+
+                    nome_servico = (
+                        "PAC" if codigo == "04510" else "SEDEX" if codigo == "04014" else f"Serviço {codigo}"
+                    )
+
+                    resultado = {
+                        "servico": nome_servico,
+                        "codigo": codigo,
+                        "valor": Decimal(valor) if erro == "0" else None,
+                        "prazo_dias": int(prazo) if erro == "0" else None,
+                        "erro": erro != "0",
+                        "mensagem_erro": msg_erro if erro != "0" else None
+                    }
+
+                    resultados.append(resultado)
+
+                    if erro == "0":
+                        logger.info(f"Frete {nome_servico}: R$ {valor} - {prazo} dias")
+                    else:
+                        logger.warning(f"Erro ao calcular {nome_servico}: {msg_erro}")
 
             except Exception as e:
                 logger.error(f"Erro ao calcular frete para serviço {codigo_servico}: {str(e)}")
@@ -160,33 +169,33 @@ class CorreiosClient:
         url = f"https://viacep.com.br/ws/{cep}/json/"
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
+            client = get_http_client("viacep", timeout=10.0)
+            response = await client.get(url)
+            response.raise_for_status()
 
-                data = response.json()
-
-                if "erro" in data:
-                    logger.warning(f"CEP {cep} não encontrado")
-                    return {
-                        "cep": cep,
-                        "erro": True,
-                        "mensagem": "CEP não encontrado"
-                    }
-
-                logger.info(f"CEP {cep} encontrado: {data.get('localidade')}/{data.get('uf')}")
+            data = response.json()
 
+            if "erro" in data:
+                logger.warning(f"CEP {cep} não encontrado")
                 return {
-                    "cep": data.get("cep"),
-                    "logradouro": data.get("logradouro"),
-                    "complemento": data.get("complemento"),
-                    "bairro": data.get("bairro"),
-                    "cidade": data.get("localidade"),
-                    "uf": data.get("uf"),
-                    "ibge": data.get("ibge"),
-                    "erro": False
+                    "cep": cep,
+                    "erro": True,
+                    "mensagem": "CEP não encontrado"
                 }
 
+            logger.info(f"CEP {cep} encontrado: {data.get('localidade')}/{data.get('uf')}")
+
+            return {
+                "cep": data.get("cep"),
+                "logradouro": data.get("logradouro"),
+                "complemento": data.get("complemento"),
+                "bairro": data.get("bairro"),
+                "cidade": data.get("localidade"),
+                "uf": data.get("uf"),
+                "ibge": data.get("ibge"),
+                "erro": False
+            }
+
         except Exception as e:
             logger.error(f"Erro ao consultar CEP {cep}: {str(e)}")
             return {
@@ -6,6 +6,8 @@ import httpx
 from typing import Dict, Any, List, Optional
 from enum import Enum
 
+from app.integrations.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,6 +41,11 @@ class EmailClient:
         self.sender_email = sender_email
         self.sender_name = sender_name or sender_email
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP com pool de conexões keep-alive compartilhado"""
+        return get_http_client("email", timeout=30.0)
+
     async def enviar_email(
         self,
         destinatario: str,
@@ -136,34 +143,34 @@ class EmailClient:
             "Content-Type": "application/json"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
+        client = self.client
+        try:
+            response = await client.post(url, headers=headers, json=payload)
+            response.raise_for_status()
 
-                logger.info(f"Email enviado com sucesso via SendGrid - ID: {response.headers.get('X-Message-Id')}")
+            logger.info(f"Email enviado com sucesso via SendGrid - ID: {response.headers.get('X-Message-Id')}")
 
-                return {
-                    "sucesso": True,
-                    "provider": "sendgrid",
-                    "message_id": response.headers.get("X-Message-Id"),
-                    "destinatario": destinatario
-                }
+            return {
+                "sucesso": True,
+                "provider": "sendgrid",
+                "message_id": response.headers.get("X-Message-Id"),
+                "destinatario": destinatario
+            }
 
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Erro ao enviar email via SendGrid: {e.response.status_code} - {e.response.text}")
-                return {
-                    "sucesso": False,
-                    "provider": "sendgrid",
-                    "erro": f"HTTP {e.response.status_code}: {e.response.text}"
-                }
-            except Exception as e:
-                logger.error(f"Erro ao enviar email via SendGrid: {str(e)}")
-                return {
-                    "sucesso": False,
-                    "provider": "sendgrid",
-                    "erro": str(e)
-                }
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Erro ao enviar email via SendGrid: {e.response.status_code} - {e.response.text}")
+            return {
+                "sucesso": False,
+                "provider": "sendgrid",
+                "erro": f"HTTP {e.response.status_code}: {e.response.text}"
+            }
+        except Exception as e:
+            logger.error(f"Erro ao enviar email via SendGrid: {str(e)}")
+            return {
+                "sucesso": False,
+                "provider": "sendgrid",
+                "erro": str(e)
+            }
 
     async def _enviar_aws_ses(
         self,
@@ -284,25 +291,25 @@ class EmailClient:
             "Content-Type": "application/json"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
+        client = self.client
+        try:
+            response = await client.post(url, headers=headers, json=payload)
+            response.raise_for_status()
 
-                logger.info(f"Email template enviado com sucesso - ID: {response.headers.get('X-Message-Id')}")
+            logger.info(f"Email template enviado com sucesso - ID: {response.headers.get('X-Message-Id')}")
 
-                return {
-                    "sucesso": True,
-                    "provider": "sendgrid",
-                    "message_id": response.headers.get("X-Message-Id"),
-                    "destinatario": destinatario,
-                    "template_id": template_id
-                }
+            return {
+                "sucesso": True,
+                "provider": "sendgrid",
+                "message_id": response.headers.get("X-Message-Id"),
+                "destinatario": destinatario,
+                "template_id": template_id
+            }
 
-            except Exception as e:
-                logger.error(f"Erro ao enviar template: {str(e)}")
-                return {
-                    "sucesso": False,
-                    "provider": "sendgrid",
-                    "erro": str(e)
-                }
+        except Exception as e:
+            logger.error(f"Erro ao enviar template: {str(e)}")
+            return {
+                "sucesso": False,
+                "provider": "sendgrid",
+                "erro": str(e)
+            }
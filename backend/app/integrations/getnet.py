@@ -9,6 +9,8 @@ from datetime import datetime
 import hashlib
 import json
 
+from app.integrations.http_client import get_http_client, token_cache
+
 
 class GetNetEnvironment(str, Enum):
     """Ambientes GetNet"""
@@ -60,26 +62,35 @@ class GetNetClient:
 
         self._access_token: Optional[str] = None
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP com pool de conexões keep-alive compartilhado"""
+        return get_http_client("getnet", timeout=30.0)
+
+    @property
+    def _chave_token(self) -> str:
+        return f"getnet:{self.environment.value}:{self.client_id}"
+
     async def _get_access_token(self) -> str:
         """
         Obtém access token OAuth2
+
+        Compartilhado entre instâncias e renovado antes de expirar.
         """
-        if self._access_token:
-            return self._access_token
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.auth_url,
-                auth=(self.client_id, self.client_secret),
-                data={
-                    "scope": "oob",
-                    "grant_type": "client_credentials"
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            self._access_token = data["access_token"]
-            return self._access_token
+        self._access_token = await token_cache.obter(self._chave_token, self._solicitar_token)
+        return self._access_token
+
+    async def _solicitar_token(self) -> Dict[str, Any]:
+        response = await self.client.post(
+            self.auth_url,
+            auth=(self.client_id, self.client_secret),
+            data={
+                "scope": "oob",
+                "grant_type": "client_credentials"
+            }
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def _make_request(
         self,
@@ -90,28 +101,31 @@ class GetNetClient:
     ) -> Dict[str, Any]:
         """
         Faz requisição autenticada para API GetNet
-        """
-        token = await self._get_access_token()
-
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "seller_id": self.seller_id
-        }
 
+        Token recusado (401) é descartado e a requisição repetida uma vez.
+        """
         url = f"{self.base_url}{endpoint}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
+        for tentativa in range(2):
+            token = await self._get_access_token()
+            response = await self.client.request(
                 method=method,
                 url=url,
-                headers=headers,
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "Content-Type": "application/json",
+                    "seller_id": self.seller_id
+                },
                 json=data,
-                params=params,
-                timeout=30.0
+                params=params
             )
-            response.raise_for_status()
-            return response.json()
+            if response.status_code == 401 and tentativa == 0:
+                token_cache.invalidar(self._chave_token)
+                continue
+            break
+
+        response.raise_for_status()
+        return response.json()
 
     def _detect_card_brand(self, card_number: str) -> str:
         """
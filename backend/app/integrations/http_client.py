@@ -0,0 +1,162 @@
+"""
+Registro de clientes HTTP compartilhados pelas integrações
+
+Cada integração obtém um httpx.AsyncClient nomeado que vive durante todo o
+ciclo de vida da aplicação, reaproveitando conexões TCP/TLS (keep-alive) em
+vez de abrir um cliente novo a cada chamada. HTTP/2 é habilitado quando o
+pacote h2 está instalado (pip install httpx[http2]).
+
+Os access tokens OAuth2 (client_credentials) ficam em token_cache,
+compartilhados entre as instâncias dos clientes e renovados antes de expirar.
+"""
+import asyncio
+import importlib.util
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+H2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(
+    nome: str,
+    base_url: str = "",
+    timeout: float = 30.0,
+    connect_timeout: float = 5.0,
+    http2: bool = True,
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+) -> httpx.AsyncClient:
+    """
+    Retorna o cliente HTTP compartilhado de uma integração, criando-o se necessário
+
+    Args:
+        nome: Nome da integração (chave do registro)
+        base_url: URL base das requisições
+        timeout: Timeout padrão em segundos (leitura, escrita e pool)
+        connect_timeout: Timeout para abrir a conexão (TCP/TLS)
+        http2: Usar HTTP/2 quando disponível
+        max_connections: Máximo de conexões simultâneas no pool
+        max_keepalive_connections: Máximo de conexões ociosas mantidas abertas
+
+    Returns:
+        httpx.AsyncClient compartilhado
+    """
+    client = _clients.get(nome)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(timeout, connect=min(connect_timeout, timeout)),
+            http2=http2 and H2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+        _clients[nome] = client
+        logger.debug(f"Cliente HTTP '{nome}' criado (http2={http2 and H2_AVAILABLE})")
+    return client
+
+
+def set_http_client(nome: str, client: Optional[httpx.AsyncClient]) -> None:
+    """
+    Substitui (ou remove, com None) o cliente registrado de uma integração
+
+    Útil em testes para apontar a integração para um servidor mock.
+    """
+    if client is None:
+        _clients.pop(nome, None)
+    else:
+        _clients[nome] = client
+
+
+async def close_http_clients() -> None:
+    """Fecha todos os clientes HTTP registrados (shutdown da aplicação)"""
+    for nome, client in list(_clients.items()):
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.error(f"Erro ao fechar cliente HTTP '{nome}': {str(e)}")
+    _clients.clear()
+
+
+class TokenCache:
+    """
+    Cache de access tokens OAuth2 por credencial
+
+    O token é renovado `margem_renovacao` segundos antes de expirar. Chamadas
+    concorrentes com o token vencido aguardam uma única renovação (um lock
+    por chave), em vez de cada uma pedir um token ao provedor.
+    """
+
+    def __init__(self, margem_renovacao: float = 60.0, validade_padrao: float = 300.0):
+        """
+        Args:
+            margem_renovacao: Segundos antes da expiração em que o token é renovado
+            validade_padrao: Validade assumida quando o provedor não envia expires_in
+        """
+        self.margem_renovacao = margem_renovacao
+        self.validade_padrao = validade_padrao
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _valido(self, chave: str) -> Optional[str]:
+        em_cache = self._tokens.get(chave)
+        if em_cache and time.monotonic() < em_cache[1]:
+            return em_cache[0]
+        return None
+
+    async def obter(
+        self,
+        chave: str,
+        renovar: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> str:
+        """
+        Retorna o token em cache ou obtém um novo
+
+        Args:
+            chave: Identifica a credencial (ex.: "sicoob:<client_id>")
+            renovar: Coroutine que pede o token ao provedor e retorna a
+                resposta OAuth2 (access_token, expires_in)
+
+        Returns:
+            Access token válido
+        """
+        token = self._valido(chave)
+        if token:
+            return token
+
+        lock = self._locks.setdefault(chave, asyncio.Lock())
+        async with lock:
+            # Outra chamada pode ter renovado enquanto esta aguardava
+            token = self._valido(chave)
+            if token:
+                return token
+
+            data = await renovar()
+            token = data["access_token"]
+            validade = float(data.get("expires_in") or self.validade_padrao)
+            self._tokens[chave] = (
+                token,
+                time.monotonic() + max(validade - self.margem_renovacao, validade / 2),
+            )
+            logger.debug(f"Token OAuth '{chave}' renovado (expira em {validade:.0f}s)")
+            return token
+
+    def invalidar(self, chave: str) -> None:
+        """Descarta o token de uma credencial (ex.: após resposta 401)"""
+        self._tokens.pop(chave, None)
+
+    def limpar(self) -> None:
+        """Descarta todos os tokens"""
+        self._tokens.clear()
+        self._locks.clear()
+
+
+token_cache = TokenCache()
@@ -6,6 +6,8 @@ import httpx
 from typing import Dict, Any, List, Optional
 from decimal import Decimal
 
+from app.integrations.http_client import get_http_client, token_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,11 +37,24 @@ class MelhorEnvioClient:
         self.base_url = "https://sandbox.melhorenvio.com.br" if sandbox else "https://api.melhorenvio.com"
         self.access_token = None
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP com pool de conexões keep-alive compartilhado"""
+        return get_http_client("melhorenvio", timeout=30.0)
+
     async def _get_access_token(self) -> str:
-        """Obtém access token via OAuth2"""
-        if self.access_token:
-            return self.access_token
+        """
+        Obtém access token via OAuth2
 
+        Compartilhado entre instâncias e renovado antes de expirar.
+        """
+        ambiente = "sandbox" if self.sandbox else "producao"
+        self.access_token = await token_cache.obter(
+            f"melhorenvio:{ambiente}:{self.client_id}", self._solicitar_token
+        )
+        return self.access_token
+
+    async def _solicitar_token(self) -> Dict[str, Any]:
         logger.info("Obtendo access token do Melhor Envio")
 
         url = f"{self.base_url}/oauth/token"
@@ -51,20 +66,16 @@ class MelhorEnvioClient:
             "scope": "*"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-
-                data = response.json()
-                self.access_token = data.get("access_token")
+        try:
+            response = await self.client.post(url, json=payload)
+            response.raise_for_status()
 
-                logger.info("Access token obtido com sucesso")
-                return self.access_token
+            logger.info("Access token obtido com sucesso")
+            return response.json()
 
-            except Exception as e:
-                logger.error(f"Erro ao obter access token: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Erro ao obter access token: {str(e)}")
+            raise
 
     async def calcular_frete(
         self,
@@ -125,52 +136,52 @@ class MelhorEnvioClient:
             "Accept": "application/json"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
-
-                cotacoes = response.json()
-                resultados = []
-
-                for cotacao in cotacoes:
-                    if cotacao.get("error"):
-                        logger.warning(f"Erro na cotação {cotacao.get('name')}: {cotacao.get('error')}")
-                        continue
-
-                    resultado = {
-                        "transportadora": cotacao.get("company", {}).get("name"),
-                        "servico": cotacao.get("name"),
-                        "servico_id": cotacao.get("id"),
-                        "valor": Decimal(str(cotacao.get("price", 0))),
-                        "prazo_dias": cotacao.get("delivery_time"),
-                        "prazo_range": {
-                            "min": cotacao.get("delivery_range", {}).get("min"),
-                            "max": cotacao.get("delivery_range", {}).get("max")
-                        },
-                        "valor_seguro": Decimal(str(cotacao.get("insurance_value", 0))),
-                        "desconto": Decimal(str(cotacao.get("discount", 0))),
-                        "logo": cotacao.get("company", {}).get("picture")
-                    }
-
-                    resultados.append(resultado)
-
-                    logger.info(
-                        f"Frete {resultado['transportadora']} - {resultado['servico']}: "
-                        f"R$ {resultado['valor']} ({resultado['prazo_dias']} dias)"
-                    )
-
-                # Ordenar por valor
-                resultados.sort(key=lambda x: x["valor"])
-
-                return resultados
-
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Erro HTTP ao calcular frete: {e.response.status_code} - {e.response.text}")
-                raise
-            except Exception as e:
-                logger.error(f"Erro ao calcular frete: {str(e)}")
-                raise
+        client = self.client
+        try:
+            response = await client.post(url, headers=headers, json=payload)
+            response.raise_for_status()
+
+            cotacoes = response.json()
+            resultados = []
+
+            for cotacao in cotacoes:
+                if cotacao.get("error"):
+                    logger.warning(f"Erro na cotação {cotacao.get('name')}: {cotacao.get('error')}")
+                    continue
+
+                resultado = {
+                    "transportadora": cotacao.get("company", {}).get("name"),
+                    "servico": cotacao.get("name"),
+                    "servico_id": cotacao.get("id"),
+                    "valor": Decimal(str(cotacao.get("price", 0))),
+                    "prazo_dias": cotacao.get("delivery_time"),
+                    "prazo_range": {
+                        "min": cotacao.get("delivery_range", {}).get("min"),
+                        "max": cotacao.get("delivery_range", {}).get("max")
+                    },
+                    "valor_seguro": Decimal(str(cotacao.get("insurance_value", 0))),
+                    "desconto": Decimal(str(cotacao.get("discount", 0))),
+                    "logo": cotacao.get("company", {}).get("picture")
+                }
+
+                resultados.append(resultado)
+
+                logger.info(
+                    f"Frete {resultado['transportadora']} - {resultado['servico']}: "
+                    f"R$ {resultado['valor']} ({resultado['prazo_dias']} dias)"
+                )
+
+            # Ordenar por valor
+            resultados.sort(key=lambda x: x["valor"])
+
+            return resultados
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Erro HTTP ao calcular frete: {e.response.status_code} - {e.response.text}")
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao calcular frete: {str(e)}")
+            raise
 
     async def criar_carrinho(
         self,
@@ -210,19 +221,19 @@ class MelhorEnvioClient:
             "Accept": "application/json"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
+        client = self.client
+        try:
+            response = await client.post(url, headers=headers, json=payload)
+            response.raise_for_status()
 
-                data = response.json()
-                logger.info(f"Envio adicionado ao carrinho: {data.get('id')}")
+            data = response.json()
+            logger.info(f"Envio adicionado ao carrinho: {data.get('id')}")
 
-                return data
+            return data
 
-            except Exception as e:
-                logger.error(f"Erro ao criar carrinho: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Erro ao criar carrinho: {str(e)}")
+            raise
 
     async def checkout(self, order_ids: List[str]) -> Dict[str, Any]:
         """
@@ -250,19 +261,19 @@ class MelhorEnvioClient:
             "Accept": "application/json"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
+        client = self.client
+        try:
+            response = await client.post(url, headers=headers, json=payload)
+            response.raise_for_status()
 
-                data = response.json()
-                logger.info(f"Checkout realizado com sucesso: {data.get('purchase', {}).get('id')}")
+            data = response.json()
+            logger.info(f"Checkout realizado com sucesso: {data.get('purchase', {}).get('id')}")
 
-                return data
+            return data
 
-            except Exception as e:
-                logger.error(f"Erro ao realizar checkout: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Erro ao realizar checkout: {str(e)}")
+            raise
 
     async def gerar_etiqueta(self, order_id: str, mode: str = "private") -> bytes:
         """
@@ -292,25 +303,26 @@ class MelhorEnvioClient:
             "Accept": "application/json"
         }
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                response = await client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
+        client = self.client
+        try:
+            # Geração e download da etiqueta podem demorar mais que o padrão
+            response = await client.post(url, headers=headers, json=payload, timeout=60.0)
+            response.raise_for_status()
 
-                data = response.json()
-                etiqueta_url = data.get("url")
+            data = response.json()
+            etiqueta_url = data.get("url")
 
-                # Baixar PDF da etiqueta
-                response_pdf = await client.get(etiqueta_url)
-                response_pdf.raise_for_status()
+            # Baixar PDF da etiqueta
+            response_pdf = await client.get(etiqueta_url, timeout=60.0)
+            response_pdf.raise_for_status()
 
-                logger.info(f"Etiqueta gerada com sucesso")
+            logger.info(f"Etiqueta gerada com sucesso")
 
-                return response_pdf.content
+            return response_pdf.content
 
-            except Exception as e:
-                logger.error(f"Erro ao gerar etiqueta: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Erro ao gerar etiqueta: {str(e)}")
+            raise
 
     async def rastrear_envio(self, order_id: str) -> Dict[str, Any]:
         """
@@ -335,16 +347,16 @@ class MelhorEnvioClient:
             "Accept": "application/json"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(url, headers=headers, params=params)
-                response.raise_for_status()
+        client = self.client
+        try:
+            response = await client.get(url, headers=headers, params=params)
+            response.raise_for_status()
 
-                data = response.json()
-                logger.info(f"Rastreamento obtido: {len(data)} eventos")
+            data = response.json()
+            logger.info(f"Rastreamento obtido: {len(data)} eventos")
 
-                return data
+            return data
 
-            except Exception as e:
-                logger.error(f"Erro ao rastrear envio: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Erro ao rastrear envio: {str(e)}")
+            raise
@@ -6,6 +6,9 @@ import httpx
 from typing import Dict, Any, List, Optional
 from decimal import Decimal
 
+from app.core.config import settings
+from app.integrations.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,7 +24,15 @@ class MercadoLivreClient:
     - Atualização de estoque
     """
 
-    def __init__(self, client_id: str, client_secret: str, access_token: str = None, refresh_token: str = None):
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        access_token: str = None,
+        refresh_token: str = None,
+        base_url: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
         """
         Inicializa client do Mercado Livre
 
@@ -30,12 +41,22 @@ class MercadoLivreClient:
             client_secret: Client Secret da aplicação
             access_token: Access token OAuth (opcional)
             refresh_token: Refresh token OAuth (opcional)
+            base_url: URL base da API (padrão: MERCADO_LIVRE_API_URL)
+            http_client: Cliente HTTP a usar (padrão: cliente compartilhado "mercadolivre")
         """
         self.client_id = client_id
         self.client_secret = client_secret
         self.access_token = access_token
         self.refresh_token = refresh_token
-        self.base_url = "https://api.mercadolibre.com"
+        self.base_url = (base_url or settings.MERCADO_LIVRE_API_URL).rstrip("/")
+        self._http_client = http_client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP com pool de conexões keep-alive compartilhado"""
+        if self._http_client is not None:
+            return self._http_client
+        return get_http_client("mercadolivre", timeout=30.0)
 
     async def obter_access_token(self, code: str, redirect_uri: str) -> Dict[str, Any]:
         """
@@ -60,28 +81,28 @@ class MercadoLivreClient:
             "redirect_uri": redirect_uri
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
+        client = self.client
+        try:
+            response = await client.post(url, json=payload)
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                self.access_token = data.get("access_token")
-                self.refresh_token = data.get("refresh_token")
+            self.access_token = data.get("access_token")
+            self.refresh_token = data.get("refresh_token")
 
-                logger.info("Access token obtido com sucesso")
+            logger.info("Access token obtido com sucesso")
 
-                return {
-                    "access_token": self.access_token,
-                    "refresh_token": self.refresh_token,
-                    "expires_in": data.get("expires_in"),
-                    "user_id": data.get("user_id")
-                }
+            return {
+                "access_token": self.access_token,
+                "refresh_token": self.refresh_token,
+                "expires_in": data.get("expires_in"),
+                "user_id": data.get("user_id")
+            }
 
-            except Exception as e:
-                logger.error(f"Erro ao obter access token: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Erro ao obter access token: {str(e)}")
+            raise
 
     async def atualizar_access_token(self) -> Dict[str, Any]:
         """
@@ -104,27 +125,27 @@ class MercadoLivreClient:
             "refresh_token": self.refresh_token
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
+        client = self.client
+        try:
+            response = await client.post(url, json=payload)
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                self.access_token = data.get("access_token")
-                self.refresh_token = data.get("refresh_token")
+            self.access_token = data.get("access_token")
+            self.refresh_token = data.get("refresh_token")
 
-                logger.info("Access token atualizado com sucesso")
+            logger.info("Access token atualizado com sucesso")
 
-                return {
-                    "access_token": self.access_token,
-                    "refresh_token": self.refresh_token,
-                    "expires_in": data.get("expires_in")
-                }
+            return {
+                "access_token": self.access_token,
+                "refresh_token": self.refresh_token,
+                "expires_in": data.get("expires_in")
+            }
 
-            except Exception as e:
-                logger.error(f"Erro ao atualizar access token: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Erro ao atualizar access token: {str(e)}")
+            raise
 
     async def criar_anuncio(
         self,
@@ -181,42 +202,49 @@ class MercadoLivreClient:
             "Content-Type": "application/json"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
+        client = self.client
+        try:
+            response = await client.post(url, headers=headers, json=payload)
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                logger.info(f"Anúncio criado - ID: {data.get('id')}, Permalink: {data.get('permalink')}")
+            logger.info(f"Anúncio criado - ID: {data.get('id')}, Permalink: {data.get('permalink')}")
 
-                return {
-                    "id": data.get("id"),
-                    "permalink": data.get("permalink"),
-                    "status": data.get("status"),
-                    "titulo": data.get("title"),
-                    "preco": data.get("price")
-                }
+            return {
+                "id": data.get("id"),
+                "permalink": data.get("permalink"),
+                "status": data.get("status"),
+                "titulo": data.get("title"),
+                "preco": data.get("price")
+            }
 
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Erro ao criar anúncio: {e.response.status_code} - {e.response.text}")
-                raise
-            except Exception as e:
-                logger.error(f"Erro ao criar anúncio: {str(e)}")
-                raise
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Erro ao criar anúncio: {e.response.status_code} - {e.response.text}")
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao criar anúncio: {str(e)}")
+            raise
 
-    async def atualizar_estoque(self, item_id: str, quantidade: int) -> Dict[str, Any]:
+    async def atualizar_estoque(
+        self, item_id: str, quantidade: int, access_token: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Atualiza a quantidade disponível de um anúncio
 
         Args:
             item_id: ID do anúncio
             quantidade: Nova quantidade
+            access_token: Token OAuth a usar nesta chamada (padrão: self.access_token)
 
         Returns:
             Dados atualizados
+
+        Raises:
+            httpx.HTTPStatusError: Em respostas de erro (429 indica rate limit)
         """
-        if not self.access_token:
+        access_token = access_token or self.access_token
+        if not access_token:
             raise ValueError("Access token não configurado")
 
         logger.info(f"Atualizando estoque do item {item_id} para {quantidade}")
@@ -228,28 +256,28 @@ class MercadoLivreClient:
         }
 
         headers = {
-            "Authorization": f"Bearer {self.access_token}",
+            "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.put(url, headers=headers, json=payload)
-                response.raise_for_status()
+        client = self.client
+        try:
+            response = await client.put(url, headers=headers, json=payload)
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                logger.info(f"Estoque atualizado - ID: {item_id}, Nova quantidade: {quantidade}")
+            logger.info(f"Estoque atualizado - ID: {item_id}, Nova quantidade: {quantidade}")
 
-                return {
-                    "id": data.get("id"),
-                    "quantidade": data.get("available_quantity"),
-                    "status": data.get("status")
-                }
+            return {
+                "id": data.get("id"),
+                "quantidade": data.get("available_quantity"),
+                "status": data.get("status")
+            }
 
-            except Exception as e:
-                logger.error(f"Erro ao atualizar estoque: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Erro ao atualizar estoque: {str(e)}")
+            raise
 
     async def pausar_anuncio(self, item_id: str) -> Dict[str, Any]:
         """
@@ -277,23 +305,23 @@ class MercadoLivreClient:
             "Content-Type": "application/json"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.put(url, headers=headers, json=payload)
-                response.raise_for_status()
+        client = self.client
+        try:
+            response = await client.put(url, headers=headers, json=payload)
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                logger.info(f"Anúncio pausado - ID: {item_id}")
+            logger.info(f"Anúncio pausado - ID: {item_id}")
 
-                return {
-                    "id": data.get("id"),
-                    "status": data.get("status")
-                }
+            return {
+                "id": data.get("id"),
+                "status": data.get("status")
+            }
 
-            except Exception as e:
-                logger.error(f"Erro ao pausar anúncio: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Erro ao pausar anúncio: {str(e)}")
+            raise
 
     async def listar_vendas(
         self,
@@ -334,35 +362,35 @@ class MercadoLivreClient:
             "Authorization": f"Bearer {self.access_token}"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(url, headers=headers, params=params)
-                response.raise_for_status()
+        client = self.client
+        try:
+            response = await client.get(url, headers=headers, params=params)
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                vendas = []
-                for ordem in data.get("results", []):
-                    vendas.append({
-                        "id": ordem.get("id"),
-                        "status": ordem.get("status"),
-                        "data": ordem.get("date_created"),
-                        "total": ordem.get("total_amount"),
-                        "comprador_id": ordem.get("buyer", {}).get("id"),
-                        "itens": len(ordem.get("order_items", []))
-                    })
+            vendas = []
+            for ordem in data.get("results", []):
+                vendas.append({
+                    "id": ordem.get("id"),
+                    "status": ordem.get("status"),
+                    "data": ordem.get("date_created"),
+                    "total": ordem.get("total_amount"),
+                    "comprador_id": ordem.get("buyer", {}).get("id"),
+                    "itens": len(ordem.get("order_items", []))
+                })
 
-                logger.info(f"Encontradas {len(vendas)} vendas")
+            logger.info(f"Encontradas {len(vendas)} vendas")
 
-                return {
-                    "total": data.get("paging", {}).get("total"),
-                    "vendas": vendas,
-                    "paginacao": data.get("paging")
-                }
+            return {
+                "total": data.get("paging", {}).get("total"),
+                "vendas": vendas,
+                "paginacao": data.get("paging")
+            }
 
-            except Exception as e:
-                logger.error(f"Erro ao listar vendas: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Erro ao listar vendas: {str(e)}")
+            raise
 
     async def obter_detalhes_venda(self, order_id: str) -> Dict[str, Any]:
         """
@@ -385,30 +413,30 @@ class MercadoLivreClient:
             "Authorization": f"Bearer {self.access_token}"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
+        client = self.client
+        try:
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                logger.info(f"Detalhes obtidos - Ordem: {order_id}, Status: {data.get('status')}")
+            logger.info(f"Detalhes obtidos - Ordem: {order_id}, Status: {data.get('status')}")
 
-                return {
-                    "id": data.get("id"),
-                    "status": data.get("status"),
-                    "data_criacao": data.get("date_created"),
-                    "data_fechamento": data.get("date_closed"),
-                    "total": data.get("total_amount"),
-                    "comprador": data.get("buyer"),
-                    "itens": data.get("order_items"),
-                    "pagamentos": data.get("payments"),
-                    "envio": data.get("shipping")
-                }
+            return {
+                "id": data.get("id"),
+                "status": data.get("status"),
+                "data_criacao": data.get("date_created"),
+                "data_fechamento": data.get("date_closed"),
+                "total": data.get("total_amount"),
+                "comprador": data.get("buyer"),
+                "itens": data.get("order_items"),
+                "pagamentos": data.get("payments"),
+                "envio": data.get("shipping")
+            }
 
-            except Exception as e:
-                logger.error(f"Erro ao obter detalhes da venda: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Erro ao obter detalhes da venda: {str(e)}")
+            raise
 
     async def enviar_mensagem(
         self,
@@ -445,21 +473,21 @@ class MercadoLivreClient:
             "Content-Type": "application/json"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
+        client = self.client
+        try:
+            response = await client.post(url, headers=headers, json=payload)
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                logger.info(f"Mensagem enviada com sucesso")
+            logger.info(f"Mensagem enviada com sucesso")
 
-                return {
-                    "sucesso": True,
-                    "message_id": data.get("id"),
-                    "status": data.get("status")
-                }
+            return {
+                "sucesso": True,
+                "message_id": data.get("id"),
+                "status": data.get("status")
+            }
 
-            except Exception as e:
-                logger.error(f"Erro ao enviar mensagem: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Erro ao enviar mensagem: {str(e)}")
+            raise
@@ -9,6 +9,7 @@ from decimal import Decimal
 from datetime import datetime
 
 from app.modules.pagamentos.models import StatusPagamento
+from app.integrations.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,11 @@ class MercadoPagoClient:
             "Content-Type": "application/json"
         }
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP com pool de conexões keep-alive compartilhado"""
+        return get_http_client("mercadopago", timeout=30.0)
+
     async def criar_pagamento_pix(
         self,
         valor: Decimal,
@@ -58,38 +64,39 @@ class MercadoPagoClient:
         if external_reference:
             payload["external_reference"] = external_reference
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/v1/payments",
-                    headers=self.headers,
-                    json=payload
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                logger.info(f"Pagamento PIX criado com sucesso - ID: {data.get('id')}")
-
-                return {
-                    "id": data.get("id"),
-                    "status": data.get("status"),
-                    "status_detail": data.get("status_detail"),
-                    "qr_code": data.get("point_of_interaction", {}).get("transaction_data", {}).get("qr_code"),
-                    "qr_code_base64": data.get("point_of_interaction", {}).get("transaction_data", {}).get("qr_code_base64"),
-                    "ticket_url": data.get("point_of_interaction", {}).get("transaction_data", {}).get("ticket_url"),
-                    "transaction_id": data.get("id"),
-                    "external_reference": data.get("external_reference"),
-                    "valor": Decimal(str(data.get("transaction_amount"))),
-                    "data_criacao": data.get("date_created"),
-                    "data_expiracao": data.get("date_of_expiration")
-                }
-
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Erro HTTP ao criar pagamento: {e.response.status_code} - {e.response.text}")
-                raise Exception(f"Erro ao criar pagamento PIX: {e.response.text}")
-            except Exception as e:
-                logger.error(f"Erro ao criar pagamento PIX: {str(e)}")
-                raise
+        client = self.client
+        try:
+            response = await client.post(
+                f"{self.base_url}/v1/payments",
+                headers=self.headers,
+                json=payload
+            )
+            response.raise_for_status()
+
+            data = response.json()
+            logger.info(f"Pagamento PIX criado com sucesso - ID: {data.get('id')}")
+            transacao = data.get("point_of_interaction", {}).get("transaction_data", {})
+
+            return {
+                "id": data.get("id"),
+                "status": data.get("status"),
+                "status_detail": data.get("status_detail"),
+                "qr_code": transacao.get("qr_code"),
+                "qr_code_base64": transacao.get("qr_code_base64"),
+                "ticket_url": transacao.get("ticket_url"),
+                "transaction_id": data.get("id"),
+                "external_reference": data.get("external_reference"),
+                "valor": Decimal(str(data.get("transaction_amount"))),
+                "data_criacao": data.get("date_created"),
+                "data_expiracao": data.get("date_of_expiration")
+            }
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Erro HTTP ao criar pagamento: {e.response.status_code} - {e.response.text}")
+            raise Exception(f"Erro ao criar pagamento PIX: {e.response.text}")
+        except Exception as e:
+            logger.error(f"Erro ao criar pagamento PIX: {str(e)}")
+            raise
 
     async def consultar_pagamento(self, payment_id: int) -> Dict[str, Any]:
         """
@@ -103,36 +110,36 @@ class MercadoPagoClient:
         """
         logger.info(f"Consultando pagamento {payment_id}")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/v1/payments/{payment_id}",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-
-                data = response.json()
-
-                return {
-                    "id": data.get("id"),
-                    "status": data.get("status"),
-                    "status_detail": data.get("status_detail"),
-                    "transaction_id": data.get("id"),
-                    "external_reference": data.get("external_reference"),
-                    "valor": Decimal(str(data.get("transaction_amount"))),
-                    "valor_pago": Decimal(str(data.get("transaction_amount_refunded", 0))),
-                    "data_criacao": data.get("date_created"),
-                    "data_aprovacao": data.get("date_approved"),
-                    "metodo_pagamento": data.get("payment_method_id"),
-                    "tipo_pagamento": data.get("payment_type_id")
-                }
-
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Erro ao consultar pagamento: {e.response.status_code}")
-                raise
-            except Exception as e:
-                logger.error(f"Erro ao consultar pagamento: {str(e)}")
-                raise
+        client = self.client
+        try:
+            response = await client.get(
+                f"{self.base_url}/v1/payments/{payment_id}",
+                headers=self.headers
+            )
+            response.raise_for_status()
+
+            data = response.json()
+
+            return {
+                "id": data.get("id"),
+                "status": data.get("status"),
+                "status_detail": data.get("status_detail"),
+                "transaction_id": data.get("id"),
+                "external_reference": data.get("external_reference"),
+                "valor": Decimal(str(data.get("transaction_amount"))),
+                "valor_pago": Decimal(str(data.get("transaction_amount_refunded", 0))),
+                "data_criacao": data.get("date_created"),
+                "data_aprovacao": data.get("date_approved"),
+                "metodo_pagamento": data.get("payment_method_id"),
+                "tipo_pagamento": data.get("payment_type_id")
+            }
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Erro ao consultar pagamento: {e.response.status_code}")
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao consultar pagamento: {str(e)}")
+            raise
 
     async def cancelar_pagamento(self, payment_id: int) -> Dict[str, Any]:
         """
@@ -146,30 +153,30 @@ class MercadoPagoClient:
         """
         logger.info(f"Cancelando pagamento {payment_id}")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.put(
-                    f"{self.base_url}/v1/payments/{payment_id}",
-                    headers=self.headers,
-                    json={"status": "cancelled"}
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                logger.info(f"Pagamento {payment_id} cancelado com sucesso")
-
-                return {
-                    "id": data.get("id"),
-                    "status": data.get("status"),
-                    "cancelado": True
-                }
-
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Erro ao cancelar pagamento: {e.response.status_code}")
-                raise
-            except Exception as e:
-                logger.error(f"Erro ao cancelar pagamento: {str(e)}")
-                raise
+        client = self.client
+        try:
+            response = await client.put(
+                f"{self.base_url}/v1/payments/{payment_id}",
+                headers=self.headers,
+                json={"status": "cancelled"}
+            )
+            response.raise_for_status()
+
+            data = response.json()
+            logger.info(f"Pagamento {payment_id} cancelado com sucesso")
+
+            return {
+                "id": data.get("id"),
+                "status": data.get("status"),
+                "cancelado": True
+            }
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Erro ao cancelar pagamento: {e.response.status_code}")
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao cancelar pagamento: {str(e)}")
+            raise
 
     async def processar_webhook(self, webhook_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -232,31 +239,31 @@ class MercadoPagoClient:
         if notification_url:
             payload["notification_url"] = notification_url
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/checkout/preferences",
-                    headers=self.headers,
-                    json=payload
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                logger.info(f"Preferência criada - ID: {data.get('id')}")
-
-                return {
-                    "id": data.get("id"),
-                    "init_point": data.get("init_point"),  # URL para checkout web
-                    "sandbox_init_point": data.get("sandbox_init_point"),  # URL sandbox
-                    "external_reference": data.get("external_reference")
-                }
-
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Erro ao criar preferência: {e.response.status_code}")
-                raise
-            except Exception as e:
-                logger.error(f"Erro ao criar preferência: {str(e)}")
-                raise
+        client = self.client
+        try:
+            response = await client.post(
+                f"{self.base_url}/checkout/preferences",
+                headers=self.headers,
+                json=payload
+            )
+            response.raise_for_status()
+
+            data = response.json()
+            logger.info(f"Preferência criada - ID: {data.get('id')}")
+
+            return {
+                "id": data.get("id"),
+                "init_point": data.get("init_point"),  # URL para checkout web
+                "sandbox_init_point": data.get("sandbox_init_point"),  # URL sandbox
+                "external_reference": data.get("external_reference")
+            }
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Erro ao criar preferência: {e.response.status_code}")
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao criar preferência: {str(e)}")
+            raise
 
     async def criar_pagamento_cartao(
         self,
@@ -310,37 +317,37 @@ class MercadoPagoClient:
         if external_reference:
             payload["external_reference"] = external_reference
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/v1/payments",
-                    headers=self.headers,
-                    json=payload
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                logger.info(f"Pagamento com cartão criado - ID: {data.get('id')}, Status: {data.get('status')}")
-
-                return {
-                    "id": data.get("id"),
-                    "status": data.get("status"),
-                    "status_detail": data.get("status_detail"),
-                    "valor": data.get("transaction_amount"),
-                    "data_criacao": data.get("date_created"),
-                    "data_aprovacao": data.get("date_approved"),
-                    "metodo_pagamento": data.get("payment_method_id"),
-                    "parcelas": data.get("installments"),
-                    "authorization_code": data.get("authorization_code"),
-                    "external_reference": data.get("external_reference")
-                }
-
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Erro ao criar pagamento com cartão: {e.response.status_code} - {e.response.text}")
-                raise
-            except Exception as e:
-                logger.error(f"Erro ao criar pagamento com cartão: {str(e)}")
-                raise
+        client = self.client
+        try:
+            response = await client.post(
+                f"{self.base_url}/v1/payments",
+                headers=self.headers,
+                json=payload
+            )
+            response.raise_for_status()
+
+            data = response.json()
+            logger.info(f"Pagamento com cartão criado - ID: {data.get('id')}, Status: {data.get('status')}")
+
+            return {
+                "id": data.get("id"),
+                "status": data.get("status"),
+                "status_detail": data.get("status_detail"),
+                "valor": data.get("transaction_amount"),
+                "data_criacao": data.get("date_created"),
+                "data_aprovacao": data.get("date_approved"),
+                "metodo_pagamento": data.get("payment_method_id"),
+                "parcelas": data.get("installments"),
+                "authorization_code": data.get("authorization_code"),
+                "external_reference": data.get("external_reference")
+            }
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Erro ao criar pagamento com cartão: {e.response.status_code} - {e.response.text}")
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao criar pagamento com cartão: {str(e)}")
+            raise
 
 
 # Helper para converter status MP para status interno
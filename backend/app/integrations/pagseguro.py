@@ -15,6 +15,8 @@ from typing import Dict, Any, Optional, List
 from decimal import Decimal
 from datetime import datetime, timedelta
 
+from app.integrations.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,6 +49,11 @@ class PagSeguroClient:
             "Accept": "application/json"
         }
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP com pool de conexões keep-alive compartilhado"""
+        return get_http_client("pagseguro", timeout=30.0)
+
     async def criar_pagamento_pix(
         self,
         valor: Decimal,
@@ -92,34 +99,33 @@ class PagSeguroClient:
             "customer": customer
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/charges",
-                json=payload,
-                headers=self.headers,
-                timeout=30.0
-            )
-
-            if response.status_code in [200, 201]:
-                data = response.json()
-                logger.info(f"PIX criado com sucesso - ID: {data.get('id')}")
-                return {
-                    "sucesso": True,
-                    "id": data.get("id"),
-                    "reference_id": data.get("reference_id"),
-                    "status": data.get("status"),
-                    "qr_code": data.get("qr_codes", [{}])[0].get("text"),
-                    "qr_code_base64": data.get("qr_codes", [{}])[0].get("arrangement", {}).get("qr_code"),
-                    "expiration_date": data.get("qr_codes", [{}])[0].get("expiration_date"),
-                    "links": data.get("links", [])
-                }
-            else:
-                logger.error(f"Erro ao criar PIX: {response.status_code} - {response.text}")
-                return {
-                    "sucesso": False,
-                    "erro": response.text,
-                    "status_code": response.status_code
-                }
+        client = self.client
+        response = await client.post(
+            f"{self.base_url}/charges",
+            json=payload,
+            headers=self.headers
+        )
+
+        if response.status_code in [200, 201]:
+            data = response.json()
+            logger.info(f"PIX criado com sucesso - ID: {data.get('id')}")
+            return {
+                "sucesso": True,
+                "id": data.get("id"),
+                "reference_id": data.get("reference_id"),
+                "status": data.get("status"),
+                "qr_code": data.get("qr_codes", [{}])[0].get("text"),
+                "qr_code_base64": data.get("qr_codes", [{}])[0].get("arrangement", {}).get("qr_code"),
+                "expiration_date": data.get("qr_codes", [{}])[0].get("expiration_date"),
+                "links": data.get("links", [])
+            }
+        else:
+            logger.error(f"Erro ao criar PIX: {response.status_code} - {response.text}")
+            return {
+                "sucesso": False,
+                "erro": response.text,
+                "status_code": response.status_code
+            }
 
     async def criar_pagamento_cartao(
         self,
@@ -162,34 +168,33 @@ class PagSeguroClient:
             "customer": customer
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/charges",
-                json=payload,
-                headers=self.headers,
-                timeout=30.0
-            )
-
-            if response.status_code in [200, 201]:
-                data = response.json()
-                logger.info(f"Pagamento cartão criado - ID: {data.get('id')}")
-                return {
-                    "sucesso": True,
-                    "id": data.get("id"),
-                    "reference_id": data.get("reference_id"),
-                    "status": data.get("status"),
-                    "amount": data.get("amount"),
-                    "paid_at": data.get("paid_at"),
-                    "payment_response": data.get("payment_response"),
-                    "links": data.get("links", [])
-                }
-            else:
-                logger.error(f"Erro pagamento cartão: {response.status_code} - {response.text}")
-                return {
-                    "sucesso": False,
-                    "erro": response.text,
-                    "status_code": response.status_code
-                }
+        client = self.client
+        response = await client.post(
+            f"{self.base_url}/charges",
+            json=payload,
+            headers=self.headers
+        )
+
+        if response.status_code in [200, 201]:
+            data = response.json()
+            logger.info(f"Pagamento cartão criado - ID: {data.get('id')}")
+            return {
+                "sucesso": True,
+                "id": data.get("id"),
+                "reference_id": data.get("reference_id"),
+                "status": data.get("status"),
+                "amount": data.get("amount"),
+                "paid_at": data.get("paid_at"),
+                "payment_response": data.get("payment_response"),
+                "links": data.get("links", [])
+            }
+        else:
+            logger.error(f"Erro pagamento cartão: {response.status_code} - {response.text}")
+            return {
+                "sucesso": False,
+                "erro": response.text,
+                "status_code": response.status_code
+            }
 
     async def criar_boleto(
         self,
@@ -241,34 +246,33 @@ class PagSeguroClient:
             "customer": customer
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/charges",
-                json=payload,
-                headers=self.headers,
-                timeout=30.0
-            )
-
-            if response.status_code in [200, 201]:
-                data = response.json()
-                logger.info(f"Boleto criado - ID: {data.get('id')}")
-                return {
-                    "sucesso": True,
-                    "id": data.get("id"),
-                    "reference_id": data.get("reference_id"),
-                    "status": data.get("status"),
-                    "barcode": data.get("payment_method", {}).get("boleto", {}).get("barcode"),
-                    "formatted_barcode": data.get("payment_method", {}).get("boleto", {}).get("formatted_barcode"),
-                    "due_date": data.get("payment_method", {}).get("boleto", {}).get("due_date"),
-                    "links": data.get("links", [])
-                }
-            else:
-                logger.error(f"Erro ao criar boleto: {response.status_code} - {response.text}")
-                return {
-                    "sucesso": False,
-                    "erro": response.text,
-                    "status_code": response.status_code
-                }
+        client = self.client
+        response = await client.post(
+            f"{self.base_url}/charges",
+            json=payload,
+            headers=self.headers
+        )
+
+        if response.status_code in [200, 201]:
+            data = response.json()
+            logger.info(f"Boleto criado - ID: {data.get('id')}")
+            return {
+                "sucesso": True,
+                "id": data.get("id"),
+                "reference_id": data.get("reference_id"),
+                "status": data.get("status"),
+                "barcode": data.get("payment_method", {}).get("boleto", {}).get("barcode"),
+                "formatted_barcode": data.get("payment_method", {}).get("boleto", {}).get("formatted_barcode"),
+                "due_date": data.get("payment_method", {}).get("boleto", {}).get("due_date"),
+                "links": data.get("links", [])
+            }
+        else:
+            logger.error(f"Erro ao criar boleto: {response.status_code} - {response.text}")
+            return {
+                "sucesso": False,
+                "erro": response.text,
+                "status_code": response.status_code
+            }
 
     async def consultar_cobranca(self, charge_id: str) -> Dict[str, Any]:
         """
@@ -282,33 +286,32 @@ class PagSeguroClient:
         """
         logger.info(f"Consultando cobrança: {charge_id}")
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/charges/{charge_id}",
-                headers=self.headers,
-                timeout=30.0
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "sucesso": True,
-                    "id": data.get("id"),
-                    "reference_id": data.get("reference_id"),
-                    "status": data.get("status"),
-                    "amount": data.get("amount"),
-                    "paid_at": data.get("paid_at"),
-                    "created_at": data.get("created_at"),
-                    "payment_method": data.get("payment_method"),
-                    "customer": data.get("customer")
-                }
-            else:
-                logger.error(f"Erro ao consultar: {response.status_code} - {response.text}")
-                return {
-                    "sucesso": False,
-                    "erro": response.text,
-                    "status_code": response.status_code
-                }
+        client = self.client
+        response = await client.get(
+            f"{self.base_url}/charges/{charge_id}",
+            headers=self.headers
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+            return {
+                "sucesso": True,
+                "id": data.get("id"),
+                "reference_id": data.get("reference_id"),
+                "status": data.get("status"),
+                "amount": data.get("amount"),
+                "paid_at": data.get("paid_at"),
+                "created_at": data.get("created_at"),
+                "payment_method": data.get("payment_method"),
+                "customer": data.get("customer")
+            }
+        else:
+            logger.error(f"Erro ao consultar: {response.status_code} - {response.text}")
+            return {
+                "sucesso": False,
+                "erro": response.text,
+                "status_code": response.status_code
+            }
 
     async def cancelar_cobranca(self, charge_id: str) -> Dict[str, Any]:
         """
@@ -322,27 +325,26 @@ class PagSeguroClient:
         """
         logger.info(f"Cancelando cobrança: {charge_id}")
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/charges/{charge_id}/cancel",
-                headers=self.headers,
-                timeout=30.0
-            )
-
-            if response.status_code in [200, 201, 204]:
-                logger.info(f"Cobrança {charge_id} cancelada")
-                return {
-                    "sucesso": True,
-                    "charge_id": charge_id,
-                    "status": "CANCELED"
-                }
-            else:
-                logger.error(f"Erro ao cancelar: {response.status_code} - {response.text}")
-                return {
-                    "sucesso": False,
-                    "erro": response.text,
-                    "status_code": response.status_code
-                }
+        client = self.client
+        response = await client.post(
+            f"{self.base_url}/charges/{charge_id}/cancel",
+            headers=self.headers
+        )
+
+        if response.status_code in [200, 201, 204]:
+            logger.info(f"Cobrança {charge_id} cancelada")
+            return {
+                "sucesso": True,
+                "charge_id": charge_id,
+                "status": "CANCELED"
+            }
+        else:
+            logger.error(f"Erro ao cancelar: {response.status_code} - {response.text}")
+            return {
+                "sucesso": False,
+                "erro": response.text,
+                "status_code": response.status_code
+            }
 
     async def capturar_pagamento(
         self,
@@ -365,29 +367,28 @@ class PagSeguroClient:
         if amount:
             payload["amount"] = {"value": amount}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/charges/{charge_id}/capture",
-                json=payload if payload else None,
-                headers=self.headers,
-                timeout=30.0
-            )
-
-            if response.status_code in [200, 201]:
-                data = response.json()
-                return {
-                    "sucesso": True,
-                    "id": data.get("id"),
-                    "status": data.get("status"),
-                    "amount": data.get("amount")
-                }
-            else:
-                logger.error(f"Erro ao capturar: {response.status_code} - {response.text}")
-                return {
-                    "sucesso": False,
-                    "erro": response.text,
-                    "status_code": response.status_code
-                }
+        client = self.client
+        response = await client.post(
+            f"{self.base_url}/charges/{charge_id}/capture",
+            json=payload if payload else None,
+            headers=self.headers
+        )
+
+        if response.status_code in [200, 201]:
+            data = response.json()
+            return {
+                "sucesso": True,
+                "id": data.get("id"),
+                "status": data.get("status"),
+                "amount": data.get("amount")
+            }
+        else:
+            logger.error(f"Erro ao capturar: {response.status_code} - {response.text}")
+            return {
+                "sucesso": False,
+                "erro": response.text,
+                "status_code": response.status_code
+            }
 
     def processar_webhook(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 import base64
 import hashlib
 
+from app.integrations.http_client import get_http_client, token_cache
+
 
 class SicoobEnvironment(str, Enum):
     """Ambientes Sicoob"""
@@ -46,28 +48,37 @@ class SicoobClient:
 
         self._access_token: Optional[str] = None
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP com pool de conexões keep-alive compartilhado"""
+        return get_http_client("sicoob", timeout=30.0)
+
+    @property
+    def _chave_token(self) -> str:
+        return f"sicoob:{self.environment.value}:{self.client_id}"
+
     async def _get_access_token(self) -> str:
         """
         Obtém access token OAuth2
+
+        Compartilhado entre instâncias e renovado antes de expirar.
         """
-        if self._access_token:
-            return self._access_token
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.auth_url,
-                data={
-                    "grant_type": "client_credentials",
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "scope": "cob.write cob.read cobv.write cobv.read pix.write pix.read"
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
-            )
-            response.raise_for_status()
-            data = response.json()
-            self._access_token = data["access_token"]
-            return self._access_token
+        self._access_token = await token_cache.obter(self._chave_token, self._solicitar_token)
+        return self._access_token
+
+    async def _solicitar_token(self) -> Dict[str, Any]:
+        response = await self.client.post(
+            self.auth_url,
+            data={
+                "grant_type": "client_credentials",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "scope": "cob.write cob.read cobv.write cobv.read pix.write pix.read"
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def _make_request(
         self,
@@ -78,32 +89,35 @@ class SicoobClient:
     ) -> Dict[str, Any]:
         """
         Faz requisição autenticada para API Sicoob
-        """
-        token = await self._get_access_token()
-
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
 
+        Token recusado (401) é descartado e a requisição repetida uma vez.
+        """
         url = f"{self.base_url}{endpoint}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
+        for tentativa in range(2):
+            token = await self._get_access_token()
+            response = await self.client.request(
                 method=method,
                 url=url,
-                headers=headers,
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "Content-Type": "application/json"
+                },
                 json=data,
-                params=params,
-                timeout=30.0
+                params=params
             )
-            response.raise_for_status()
+            if response.status_code == 401 and tentativa == 0:
+                token_cache.invalidar(self._chave_token)
+                continue
+            break
+
+        response.raise_for_status()
 
-            # Algumas respostas não têm body
-            if response.status_code == 204:
-                return {}
+        # Algumas respostas não têm body
+        if response.status_code == 204:
+            return {}
 
-            return response.json()
+        return response.json()
 
     # ============================================================================
     # PIX - COBRANÇA IMEDIATA (COB)
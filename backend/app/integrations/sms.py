@@ -6,6 +6,8 @@ import httpx
 from typing import Dict, Any, Optional
 import base64
 
+from app.integrations.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,6 +35,11 @@ class SMSClient:
         self.phone_number = phone_number
         self.base_url = f"https://api.twilio.com/2010-04-01/Accounts/{account_sid}"
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP com pool de conexões keep-alive compartilhado"""
+        return get_http_client("sms", timeout=30.0)
+
     def _get_auth_header(self) -> str:
         """Gera header de autenticação Basic"""
         credentials = f"{self.account_sid}:{self.auth_token}"
@@ -74,39 +81,39 @@ class SMSClient:
             "Content-Type": "application/x-www-form-urlencoded"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(url, headers=headers, data=payload)
-                response.raise_for_status()
-
-                data = response.json()
-
-                logger.info(f"SMS enviado com sucesso - SID: {data.get('sid')}, Status: {data.get('status')}")
-
-                return {
-                    "sucesso": True,
-                    "message_sid": data.get("sid"),
-                    "status": data.get("status"),
-                    "destinatario": destinatario,
-                    "segmentos": data.get("num_segments"),
-                    "preco": data.get("price"),
-                    "moeda": data.get("price_unit")
-                }
-
-            except httpx.HTTPStatusError as e:
-                error_data = e.response.json()
-                logger.error(f"Erro ao enviar SMS: {error_data.get('message')}")
-                return {
-                    "sucesso": False,
-                    "erro": error_data.get("message"),
-                    "codigo_erro": error_data.get("code")
-                }
-            except Exception as e:
-                logger.error(f"Erro ao enviar SMS: {str(e)}")
-                return {
-                    "sucesso": False,
-                    "erro": str(e)
-                }
+        client = self.client
+        try:
+            response = await client.post(url, headers=headers, data=payload)
+            response.raise_for_status()
+
+            data = response.json()
+
+            logger.info(f"SMS enviado com sucesso - SID: {data.get('sid')}, Status: {data.get('status')}")
+
+            return {
+                "sucesso": True,
+                "message_sid": data.get("sid"),
+                "status": data.get("status"),
+                "destinatario": destinatario,
+                "segmentos": data.get("num_segments"),
+                "preco": data.get("price"),
+                "moeda": data.get("price_unit")
+            }
+
+        except httpx.HTTPStatusError as e:
+            error_data = e.response.json()
+            logger.error(f"Erro ao enviar SMS: {error_data.get('message')}")
+            return {
+                "sucesso": False,
+                "erro": error_data.get("message"),
+                "codigo_erro": error_data.get("code")
+            }
+        except Exception as e:
+            logger.error(f"Erro ao enviar SMS: {str(e)}")
+            return {
+                "sucesso": False,
+                "erro": str(e)
+            }
 
     async def consultar_mensagem(self, message_sid: str) -> Dict[str, Any]:
         """
@@ -126,36 +133,36 @@ class SMSClient:
             "Authorization": self._get_auth_header()
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-
-                data = response.json()
-
-                logger.info(f"Mensagem consultada - Status: {data.get('status')}")
-
-                return {
-                    "message_sid": data.get("sid"),
-                    "status": data.get("status"),
-                    "de": data.get("from"),
-                    "para": data.get("to"),
-                    "corpo": data.get("body"),
-                    "data_criacao": data.get("date_created"),
-                    "data_envio": data.get("date_sent"),
-                    "data_atualizacao": data.get("date_updated"),
-                    "segmentos": data.get("num_segments"),
-                    "preco": data.get("price"),
-                    "erro_codigo": data.get("error_code"),
-                    "erro_mensagem": data.get("error_message")
-                }
-
-            except Exception as e:
-                logger.error(f"Erro ao consultar mensagem: {str(e)}")
-                return {
-                    "sucesso": False,
-                    "erro": str(e)
-                }
+        client = self.client
+        try:
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
+
+            data = response.json()
+
+            logger.info(f"Mensagem consultada - Status: {data.get('status')}")
+
+            return {
+                "message_sid": data.get("sid"),
+                "status": data.get("status"),
+                "de": data.get("from"),
+                "para": data.get("to"),
+                "corpo": data.get("body"),
+                "data_criacao": data.get("date_created"),
+                "data_envio": data.get("date_sent"),
+                "data_atualizacao": data.get("date_updated"),
+                "segmentos": data.get("num_segments"),
+                "preco": data.get("price"),
+                "erro_codigo": data.get("error_code"),
+                "erro_mensagem": data.get("error_message")
+            }
+
+        except Exception as e:
+            logger.error(f"Erro ao consultar mensagem: {str(e)}")
+            return {
+                "sucesso": False,
+                "erro": str(e)
+            }
 
     async def enviar_whatsapp(
         self,
@@ -196,37 +203,37 @@ class SMSClient:
             "Content-Type": "application/x-www-form-urlencoded"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(url, headers=headers, data=payload)
-                response.raise_for_status()
-
-                data = response.json()
-
-                logger.info(f"WhatsApp enviado com sucesso - SID: {data.get('sid')}")
-
-                return {
-                    "sucesso": True,
-                    "message_sid": data.get("sid"),
-                    "status": data.get("status"),
-                    "destinatario": destinatario,
-                    "canal": "whatsapp"
-                }
-
-            except httpx.HTTPStatusError as e:
-                error_data = e.response.json()
-                logger.error(f"Erro ao enviar WhatsApp: {error_data.get('message')}")
-                return {
-                    "sucesso": False,
-                    "erro": error_data.get("message"),
-                    "codigo_erro": error_data.get("code")
-                }
-            except Exception as e:
-                logger.error(f"Erro ao enviar WhatsApp: {str(e)}")
-                return {
-                    "sucesso": False,
-                    "erro": str(e)
-                }
+        client = self.client
+        try:
+            response = await client.post(url, headers=headers, data=payload)
+            response.raise_for_status()
+
+            data = response.json()
+
+            logger.info(f"WhatsApp enviado com sucesso - SID: {data.get('sid')}")
+
+            return {
+                "sucesso": True,
+                "message_sid": data.get("sid"),
+                "status": data.get("status"),
+                "destinatario": destinatario,
+                "canal": "whatsapp"
+            }
+
+        except httpx.HTTPStatusError as e:
+            error_data = e.response.json()
+            logger.error(f"Erro ao enviar WhatsApp: {error_data.get('message')}")
+            return {
+                "sucesso": False,
+                "erro": error_data.get("message"),
+                "codigo_erro": error_data.get("code")
+            }
+        except Exception as e:
+            logger.error(f"Erro ao enviar WhatsApp: {str(e)}")
+            return {
+                "sucesso": False,
+                "erro": str(e)
+            }
 
     async def verificar_numero(self, numero: str) -> Dict[str, Any]:
         """
@@ -246,39 +253,39 @@ class SMSClient:
             "Authorization": self._get_auth_header()
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
+        client = self.client
+        try:
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                logger.info(f"Número verificado - Válido: {data.get('phone_number')}")
+            logger.info(f"Número verificado - Válido: {data.get('phone_number')}")
 
-                return {
-                    "valido": True,
-                    "numero_formatado": data.get("phone_number"),
-                    "numero_nacional": data.get("national_format"),
-                    "pais": data.get("country_code"),
-                    "operadora": data.get("carrier", {}).get("name"),
-                    "tipo": data.get("carrier", {}).get("type")
-                }
+            return {
+                "valido": True,
+                "numero_formatado": data.get("phone_number"),
+                "numero_nacional": data.get("national_format"),
+                "pais": data.get("country_code"),
+                "operadora": data.get("carrier", {}).get("name"),
+                "tipo": data.get("carrier", {}).get("type")
+            }
 
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 404:
-                    logger.warning(f"Número inválido: {numero}")
-                    return {
-                        "valido": False,
-                        "erro": "Número não encontrado"
-                    }
-                logger.error(f"Erro ao verificar número: {e.response.text}")
-                return {
-                    "valido": False,
-                    "erro": e.response.text
-                }
-            except Exception as e:
-                logger.error(f"Erro ao verificar número: {str(e)}")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                logger.warning(f"Número inválido: {numero}")
                 return {
                     "valido": False,
-                    "erro": str(e)
+                    "erro": "Número não encontrado"
                 }
+            logger.error(f"Erro ao verificar número: {e.response.text}")
+            return {
+                "valido": False,
+                "erro": e.response.text
+            }
+        except Exception as e:
+            logger.error(f"Erro ao verificar número: {str(e)}")
+            return {
+                "valido": False,
+                "erro": str(e)
+            }
@@ -17,10 +17,17 @@ from app.modules.auth.models import (  # noqa: F401
 )
 
 # Sprint 1 - Base
-from app.modules.produtos.models import Produto  # noqa: F401
+from app.modules.produtos.models import (  # noqa: F401
+    Produto,
+    ProdutoRemovido,
+    LoteAtualizacaoProdutos,
+    HistoricoPrecoProduto,
+)
 from app.modules.categorias.models import Categoria  # noqa: F401
 from app.modules.estoque.models import (  # noqa: F401
     MovimentacaoEstoque,
+    SnapshotSaldoEstoque,
+    ArquivoMovimentacaoEstoque,
     LoteEstoque,
     LocalizacaoEstoque,
     ProdutoLocalizacao,
@@ -28,10 +35,11 @@ from app.modules.estoque.models import (  # noqa: F401
     ItemInventario,
 )
 from app.modules.vendas.models import Venda, ItemVenda  # noqa: F401
-from app.modules.pdv.models import Caixa, MovimentacaoCaixa  # noqa: F401
+from app.modules.pdv.models import Caixa, MovimentacaoCaixa, OperacaoOfflinePDV  # noqa: F401
 from app.modules.financeiro.models import (  # noqa: F401
     ContaPagar,
     ContaReceber,
+    FluxoCaixaDiario,
 )
 from app.modules.nfe.models import NotaFiscal  # noqa: F401
 from app.modules.clientes.models import Cliente  # noqa: F401
@@ -76,8 +84,13 @@ from app.modules.pagamentos.models import (  # noqa: F401
     TransacaoPix,
     Boleto,
     ConciliacaoBancaria,
+    ConciliacaoContaReceber,
+    WebhookRecebido,
 )
 
+# Numeração sequencial (nosso número, NFC-e, pedidos)
+from app.core.sequencias import Sequencia  # noqa: F401
+
 # Import/Export (Fase 3)
 try:
     from app.modules.importexport.models import (  # noqa: F401
@@ -130,8 +143,13 @@ __all__ = [
     "RefreshToken",
     # Sprint 1
     "Produto",
+    "ProdutoRemovido",
+    "LoteAtualizacaoProdutos",
+    "HistoricoPrecoProduto",
     "Categoria",
     "MovimentacaoEstoque",
+    "SnapshotSaldoEstoque",
+    "ArquivoMovimentacaoEstoque",
     "LoteEstoque",
     "LocalizacaoEstoque",
     "ProdutoLocalizacao",
@@ -141,8 +159,10 @@ __all__ = [
     "ItemVenda",
     "Caixa",
     "MovimentacaoCaixa",
+    "OperacaoOfflinePDV",
     "ContaPagar",
     "ContaReceber",
+    "FluxoCaixaDiario",
     "NotaFiscal",
     "Cliente",
     "CondicaoPagamento",
@@ -170,4 +190,7 @@ __all__ = [
     "TransacaoPix",
     "Boleto",
     "ConciliacaoBancaria",
+    "WebhookRecebido",
+    # Numeração
+    "Sequencia",
 ]
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.versionamento import requisicao_condicional
 from app.modules.categorias.service import CategoriaService
 from app.modules.categorias.schemas import (
     CategoriaCreate,
@@ -44,6 +45,7 @@ async def create_categoria(
 
 @router.get(
     "/{categoria_id}",
+    dependencies=[Depends(requisicao_condicional("categorias"))],
     response_model=CategoriaResponse,
     summary="Buscar categoria por ID",
     description="Retorna os dados de uma categoria específica",
@@ -56,6 +58,7 @@ async def get_categoria(categoria_id: int, db: AsyncSession = Depends(get_db)):
 
 @router.get(
     "/",
+    dependencies=[Depends(requisicao_condicional("categorias"))],
     response_model=CategoriaList,
     summary="Listar categorias",
     description="Lista todas as categorias com paginação",
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.core.database import get_db
+from app.core.versionamento import requisicao_condicional
 from app.modules.condicoes_pagamento.service import CondicaoPagamentoService
 from app.modules.condicoes_pagamento.schemas import (
     CondicaoPagamentoCreate,
@@ -126,6 +127,7 @@ async def create_condicao(
 
 @router.get(
     "/{condicao_id}",
+    dependencies=[Depends(requisicao_condicional("condicoes_pagamento", "parcelas_padrao"))],
     response_model=CondicaoPagamentoResponse,
     summary="Buscar condição de pagamento por ID",
     description="Retorna os dados de uma condição de pagamento específica com suas parcelas",
@@ -138,6 +140,7 @@ async def get_condicao(condicao_id: int, db: AsyncSession = Depends(get_db)):
 
 @router.get(
     "/",
+    dependencies=[Depends(requisicao_condicional("condicoes_pagamento", "parcelas_padrao"))],
     response_model=CondicaoPagamentoList,
     summary="Listar condições de pagamento",
     description="Lista todas as condições de pagamento com paginação e filtros",
@@ -162,6 +165,7 @@ async def list_condicoes(
 
 @router.get(
     "/ativas/list",
+    dependencies=[Depends(requisicao_condicional("condicoes_pagamento", "parcelas_padrao"))],
     response_model=List[CondicaoPagamentoResponse],
     summary="Listar apenas condições ativas",
     description="Retorna lista de todas as condições de pagamento ativas (sem paginação)",
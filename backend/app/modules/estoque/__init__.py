@@ -4,6 +4,8 @@ Módulo de Estoque
 from app.modules.estoque.models import (
     MovimentacaoEstoque,
     TipoMovimentacao,
+    SnapshotSaldoEstoque,
+    ArquivoMovimentacaoEstoque,
     LoteEstoque,
     LocalizacaoEstoque,
     ProdutoLocalizacao,
@@ -27,11 +29,14 @@ from app.modules.estoque.lote_service import LoteEstoqueService
 from app.modules.estoque.curva_abc_service import CurvaABCService
 from app.modules.estoque.wms_service import WMSService
 from app.modules.estoque.inventario_service import InventarioService
+from app.modules.estoque.arquivamento_service import ArquivamentoEstoqueService
 from app.modules.estoque.router import router
 
 __all__ = [
     "MovimentacaoEstoque",
     "TipoMovimentacao",
+    "SnapshotSaldoEstoque",
+    "ArquivoMovimentacaoEstoque",
     "LoteEstoque",
     "LocalizacaoEstoque",
     "ProdutoLocalizacao",
@@ -52,5 +57,6 @@ __all__ = [
     "CurvaABCService",
     "WMSService",
     "InventarioService",
+    "ArquivamentoEstoqueService",
     "router",
 ]
@@ -0,0 +1,241 @@
+"""
+Repository para Arquivamento de Movimentações de Estoque
+"""
+from typing import Optional, List, Dict, Any, AsyncIterator
+from datetime import datetime, date
+from sqlalchemy import select, delete, func, case, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.estoque.models import (
+    MovimentacaoEstoque,
+    SnapshotSaldoEstoque,
+    ArquivoMovimentacaoEstoque,
+    TipoMovimentacao,
+)
+from app.modules.estoque.repository import quantidade_com_sinal
+
+
+def nome_particao(periodo: date) -> str:
+    """Nome da partição mensal de movimentacoes_estoque (ex: movimentacoes_estoque_p202501)"""
+    return f"movimentacoes_estoque_p{periodo.year:04d}{periodo.month:02d}"
+
+
+class ArquivamentoEstoqueRepository:
+    """Repository para snapshots de saldo e arquivamento do ledger de estoque"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @property
+    def dialeto(self) -> str:
+        """Nome do dialeto do banco conectado (postgresql, sqlite...)"""
+        return self.session.get_bind().dialect.name
+
+    async def get_data_movimentacao_mais_antiga(self) -> Optional[datetime]:
+        """
+        Retorna a data da movimentação mais antiga ainda no ledger
+
+        Returns:
+            Data da movimentação mais antiga ou None se o ledger estiver vazio
+        """
+        result = await self.session.execute(
+            select(func.min(MovimentacaoEstoque.created_at))
+        )
+        return result.scalar_one_or_none()
+
+    async def get_arquivo_periodo(
+        self, periodo: date
+    ) -> Optional[ArquivoMovimentacaoEstoque]:
+        """
+        Busca o registro de arquivamento de um período
+
+        Args:
+            periodo: Primeiro dia do mês arquivado
+
+        Returns:
+            ArquivoMovimentacaoEstoque ou None se o período não foi arquivado
+        """
+        result = await self.session.execute(
+            select(ArquivoMovimentacaoEstoque).where(
+                ArquivoMovimentacaoEstoque.periodo == periodo
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_arquivos(self) -> List[ArquivoMovimentacaoEstoque]:
+        """Lista todos os períodos arquivados, do mais recente ao mais antigo"""
+        result = await self.session.execute(
+            select(ArquivoMovimentacaoEstoque).order_by(
+                ArquivoMovimentacaoEstoque.periodo.desc()
+            )
+        )
+        return list(result.scalars().all())
+
+    async def stream_movimentacoes_periodo(
+        self, inicio: datetime, fim: datetime, lote: int = 5000
+    ) -> AsyncIterator[MovimentacaoEstoque]:
+        """
+        Percorre as movimentações de um período sem carregá-las todas em memória
+
+        Args:
+            inicio: Início do período (inclusivo)
+            fim: Fim do período (exclusivo)
+            lote: Quantidade de linhas buscadas por vez no cursor
+
+        Yields:
+            MovimentacaoEstoque em ordem de created_at, id
+        """
+        query = (
+            select(MovimentacaoEstoque)
+            .where(
+                MovimentacaoEstoque.created_at >= inicio,
+                MovimentacaoEstoque.created_at < fim,
+            )
+            .order_by(MovimentacaoEstoque.created_at, MovimentacaoEstoque.id)
+            .execution_options(yield_per=lote)
+        )
+        result = await self.session.stream_scalars(query)
+        async for movimentacao in result:
+            yield movimentacao
+
+    async def agregar_periodo_por_produto(
+        self, inicio: datetime, fim: datetime
+    ) -> List[Dict[str, Any]]:
+        """
+        Consolida as movimentações do período por produto em uma única query
+
+        Args:
+            inicio: Início do período (inclusivo)
+            fim: Fim do período (exclusivo)
+
+        Returns:
+            Lista de dicts com produto_id, quantidades por natureza,
+            saldo do período e total de movimentações
+        """
+        tipo = MovimentacaoEstoque.tipo
+        quantidade = MovimentacaoEstoque.quantidade
+        entradas = [TipoMovimentacao.ENTRADA, TipoMovimentacao.DEVOLUCAO]
+        saidas = [TipoMovimentacao.SAIDA, TipoMovimentacao.TRANSFERENCIA]
+
+        query = (
+            select(
+                MovimentacaoEstoque.produto_id,
+                func.coalesce(
+                    func.sum(case((tipo.in_(entradas), quantidade), else_=0)), 0
+                ).label("quantidade_entradas"),
+                func.coalesce(
+                    func.sum(case((tipo.in_(saidas), quantidade), else_=0)), 0
+                ).label("quantidade_saidas"),
+                func.coalesce(
+                    func.sum(
+                        case((tipo == TipoMovimentacao.AJUSTE, quantidade), else_=0)
+                    ),
+                    0,
+                ).label("quantidade_ajustes"),
+                func.coalesce(func.sum(quantidade_com_sinal()), 0).label("saldo_periodo"),
+                func.count(MovimentacaoEstoque.id).label("total_movimentacoes"),
+            )
+            .where(
+                MovimentacaoEstoque.created_at >= inicio,
+                MovimentacaoEstoque.created_at < fim,
+            )
+            .group_by(MovimentacaoEstoque.produto_id)
+        )
+        result = await self.session.execute(query)
+        return [dict(row._mapping) for row in result.all()]
+
+    async def get_saldos_acumulados(self, ate_periodo: date) -> Dict[int, float]:
+        """
+        Retorna o saldo acumulado mais recente de cada produto antes de um período
+
+        Args:
+            ate_periodo: Período (exclusivo) até o qual considerar snapshots
+
+        Returns:
+            Dict produto_id -> saldo_acumulado
+        """
+        ultimo = (
+            select(
+                SnapshotSaldoEstoque.produto_id,
+                func.max(SnapshotSaldoEstoque.periodo).label("periodo"),
+            )
+            .where(SnapshotSaldoEstoque.periodo < ate_periodo)
+            .group_by(SnapshotSaldoEstoque.produto_id)
+            .subquery()
+        )
+        query = select(
+            SnapshotSaldoEstoque.produto_id, SnapshotSaldoEstoque.saldo_acumulado
+        ).join(
+            ultimo,
+            (SnapshotSaldoEstoque.produto_id == ultimo.c.produto_id)
+            & (SnapshotSaldoEstoque.periodo == ultimo.c.periodo),
+        )
+        result = await self.session.execute(query)
+        return {row.produto_id: float(row.saldo_acumulado) for row in result.all()}
+
+    async def criar_snapshots(self, snapshots: List[Dict[str, Any]]) -> None:
+        """
+        Insere os snapshots de saldo de um período em lote
+
+        Args:
+            snapshots: Lista de dicts com as colunas de SnapshotSaldoEstoque
+        """
+        if snapshots:
+            await self.session.execute(
+                SnapshotSaldoEstoque.__table__.insert(), snapshots
+            )
+
+    async def registrar_arquivo(
+        self, arquivo: ArquivoMovimentacaoEstoque
+    ) -> ArquivoMovimentacaoEstoque:
+        """Registra um período arquivado"""
+        self.session.add(arquivo)
+        await self.session.flush()
+        await self.session.refresh(arquivo)
+        return arquivo
+
+    async def remover_periodo(self, periodo: date, inicio: datetime, fim: datetime) -> None:
+        """
+        Remove do ledger as movimentações de um período já arquivado
+
+        Em PostgreSQL, quando existe a partição mensal correspondente, ela é
+        desanexada e descartada (operação O(1), sem gerar bloat). Nos demais
+        casos as linhas são removidas com um DELETE por faixa de datas.
+
+        Args:
+            periodo: Primeiro dia do mês arquivado
+            inicio: Início do período (inclusivo)
+            fim: Fim do período (exclusivo)
+        """
+        if self.dialeto == "postgresql":
+            particao = nome_particao(periodo)
+            existe = await self.session.execute(
+                text("SELECT to_regclass(:nome) IS NOT NULL"), {"nome": particao}
+            )
+            if existe.scalar_one():
+                await self.session.execute(
+                    text(f"ALTER TABLE movimentacoes_estoque DETACH PARTITION {particao}")
+                )
+                await self.session.execute(text(f"DROP TABLE {particao}"))
+                return
+
+        await self.session.execute(
+            delete(MovimentacaoEstoque).where(
+                MovimentacaoEstoque.created_at >= inicio,
+                MovimentacaoEstoque.created_at < fim,
+            )
+        )
+
+    async def garantir_particao(self, periodo: date) -> None:
+        """
+        Cria a partição mensal do período caso ainda não exista (somente PostgreSQL)
+
+        Args:
+            periodo: Primeiro dia do mês da partição
+        """
+        if self.dialeto != "postgresql":
+            return
+        await self.session.execute(
+            text("SELECT criar_particao_movimentacoes_estoque(:periodo)"),
+            {"periodo": periodo},
+        )
@@ -0,0 +1,326 @@
+"""
+Service para Arquivamento do Ledger de Movimentações de Estoque
+
+Move períodos mensais fechados de movimentacoes_estoque para arquivos
+comprimidos (CSV gzip ou Parquet) e consolida o saldo de cada produto em
+snapshots, de forma que o saldo continue exato sem as linhas arquivadas.
+"""
+import csv
+import gzip
+import hashlib
+import logging
+import os
+from datetime import datetime, date
+from pathlib import Path
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import (
+    BusinessRuleException,
+    DuplicateException,
+    ValidationException,
+)
+from app.modules.estoque.arquivamento_repository import ArquivamentoEstoqueRepository
+from app.modules.estoque.models import ArquivoMovimentacaoEstoque
+from app.modules.estoque.repository import inicio_mes, inicio_proximo_mes
+from app.modules.estoque.schemas import (
+    ArquivoMovimentacaoResponse,
+    FormatoArquivoEnum,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+COLUNAS_ARQUIVO = [
+    "id",
+    "produto_id",
+    "tipo",
+    "quantidade",
+    "custo_unitario",
+    "valor_total",
+    "documento_referencia",
+    "observacao",
+    "usuario_id",
+    "created_at",
+]
+
+
+class ArquivamentoEstoqueService:
+    """Service para arquivamento de períodos fechados do ledger de estoque"""
+
+    def __init__(self, session: AsyncSession, diretorio: Optional[str] = None):
+        self.repository = ArquivamentoEstoqueRepository(session)
+        self.session = session
+        self.diretorio = Path(diretorio or settings.ESTOQUE_ARQUIVO_DIR)
+
+    async def arquivar_periodo(
+        self,
+        ano: int,
+        mes: int,
+        formato: FormatoArquivoEnum = FormatoArquivoEnum.CSV,
+    ) -> ArquivoMovimentacaoResponse:
+        """
+        Arquiva um mês fechado de movimentações de estoque
+
+        Regras:
+        - Só meses anteriores ao mês corrente podem ser arquivados
+        - Os meses devem ser arquivados em ordem (não pode haver movimentações
+          anteriores ao período ainda no ledger)
+        - O arquivo é gravado e verificado antes de as linhas serem removidas
+        - Para cada produto movimentado é gravado um snapshot com o saldo
+          acumulado até o fim do período
+
+        Args:
+            ano: Ano do período
+            mes: Mês do período (1-12)
+            formato: Formato do arquivo (csv gzip ou parquet)
+
+        Returns:
+            ArquivoMovimentacaoResponse com os dados do arquivo gerado
+
+        Raises:
+            ValidationException: Se o período é inválido ou o formato indisponível
+            BusinessRuleException: Se o período não está fechado ou fora de ordem
+            DuplicateException: Se o período já foi arquivado
+        """
+        if not 1 <= mes <= 12:
+            raise ValidationException(f"Mês inválido: {mes}")
+
+        if formato == FormatoArquivoEnum.PARQUET and not PYARROW_AVAILABLE:
+            raise ValidationException(
+                "pyarrow não está instalado. Execute: pip install pyarrow"
+            )
+
+        periodo = date(ano, mes, 1)
+        proximo = inicio_proximo_mes(periodo)
+        if proximo > inicio_mes(datetime.utcnow().date()):
+            raise BusinessRuleException(
+                f"Período {periodo:%m/%Y} ainda não está fechado"
+            )
+
+        if await self.repository.get_arquivo_periodo(periodo):
+            raise DuplicateException(f"Período {periodo:%m/%Y} já foi arquivado")
+
+        mais_antiga = await self.repository.get_data_movimentacao_mais_antiga()
+        if mais_antiga and mais_antiga.date() < periodo:
+            raise BusinessRuleException(
+                f"Existem movimentações anteriores a {periodo:%m/%Y} no ledger. "
+                f"Arquive primeiro o período {inicio_mes(mais_antiga.date()):%m/%Y}"
+            )
+
+        inicio_dt = datetime.combine(periodo, datetime.min.time())
+        fim_dt = datetime.combine(proximo, datetime.min.time())
+
+        caminho, total, tamanho, checksum = await self._gravar_arquivo(
+            periodo, inicio_dt, fim_dt, formato
+        )
+
+        # Consolida saldos do período a partir dos snapshots anteriores
+        saldos_anteriores = await self.repository.get_saldos_acumulados(periodo)
+        agregados = await self.repository.agregar_periodo_por_produto(inicio_dt, fim_dt)
+        agora = datetime.utcnow()
+        snapshots = [
+            {
+                "produto_id": item["produto_id"],
+                "periodo": periodo,
+                "quantidade_entradas": float(item["quantidade_entradas"]),
+                "quantidade_saidas": float(item["quantidade_saidas"]),
+                "quantidade_ajustes": float(item["quantidade_ajustes"]),
+                "total_movimentacoes": item["total_movimentacoes"],
+                "saldo_acumulado": saldos_anteriores.get(item["produto_id"], 0.0)
+                + float(item["saldo_periodo"]),
+                "created_at": agora,
+            }
+            for item in agregados
+        ]
+
+        total_agregado = sum(item["total_movimentacoes"] for item in agregados)
+        if total_agregado != total:
+            raise BusinessRuleException(
+                f"Arquivo do período {periodo:%m/%Y} contém {total} registros, "
+                f"mas o ledger possui {total_agregado}. Arquivamento abortado."
+            )
+
+        await self.repository.criar_snapshots(snapshots)
+        await self.repository.remover_periodo(periodo, inicio_dt, fim_dt)
+
+        arquivo = await self.repository.registrar_arquivo(
+            ArquivoMovimentacaoEstoque(
+                periodo=periodo,
+                formato=formato.value,
+                caminho_arquivo=str(caminho),
+                total_registros=total,
+                tamanho_bytes=tamanho,
+                checksum_sha256=checksum,
+            )
+        )
+
+        logger.info(
+            f"Período {periodo:%m/%Y} de movimentações de estoque arquivado: "
+            f"{total} registros, {len(snapshots)} snapshots, arquivo {caminho}"
+        )
+
+        return ArquivoMovimentacaoResponse.model_validate(arquivo)
+
+    async def arquivar_ate(
+        self,
+        ano: int,
+        mes: int,
+        formato: FormatoArquivoEnum = FormatoArquivoEnum.CSV,
+    ) -> List[ArquivoMovimentacaoResponse]:
+        """
+        Arquiva em ordem todos os meses com movimentações até o período informado
+
+        Args:
+            ano: Ano do último período a arquivar
+            mes: Mês do último período a arquivar
+            formato: Formato dos arquivos
+
+        Returns:
+            Lista com os períodos arquivados
+        """
+        limite = date(ano, mes, 1)
+        arquivados = []
+
+        while True:
+            mais_antiga = await self.repository.get_data_movimentacao_mais_antiga()
+            if not mais_antiga:
+                break
+
+            periodo = inicio_mes(mais_antiga.date())
+            if periodo > limite:
+                break
+
+            arquivados.append(
+                await self.arquivar_periodo(periodo.year, periodo.month, formato)
+            )
+
+        return arquivados
+
+    async def garantir_particoes_futuras(self, meses: int = 3) -> None:
+        """
+        Garante que as partições dos próximos meses existam (somente PostgreSQL)
+
+        Args:
+            meses: Quantidade de meses à frente, contando o mês corrente
+        """
+        periodo = inicio_mes(datetime.utcnow().date())
+        for _ in range(meses):
+            await self.repository.garantir_particao(periodo)
+            periodo = inicio_proximo_mes(periodo)
+
+    async def listar_arquivos(self) -> List[ArquivoMovimentacaoResponse]:
+        """Lista os períodos arquivados"""
+        arquivos = await self.repository.get_arquivos()
+        return [ArquivoMovimentacaoResponse.model_validate(a) for a in arquivos]
+
+    async def _gravar_arquivo(
+        self,
+        periodo: date,
+        inicio: datetime,
+        fim: datetime,
+        formato: FormatoArquivoEnum,
+    ) -> tuple[Path, int, int, str]:
+        """
+        Grava as movimentações do período em arquivo comprimido
+
+        O arquivo é escrito em um caminho temporário e só é renomeado para o
+        nome final após a conclusão, evitando arquivos parciais.
+
+        Returns:
+            Tupla (caminho, total de registros, tamanho em bytes, sha256)
+        """
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        extensao = "csv.gz" if formato == FormatoArquivoEnum.CSV else "parquet"
+        caminho = self.diretorio / f"movimentacoes_estoque_{periodo:%Y%m}.{extensao}"
+        temporario = caminho.with_name(caminho.name + ".tmp")
+
+        movimentacoes = self.repository.stream_movimentacoes_periodo(inicio, fim)
+        if formato == FormatoArquivoEnum.CSV:
+            total = await self._gravar_csv(temporario, movimentacoes)
+        else:
+            total = await self._gravar_parquet(temporario, movimentacoes)
+
+        os.replace(temporario, caminho)
+
+        sha256 = hashlib.sha256()
+        with open(caminho, "rb") as f:
+            for bloco in iter(lambda: f.read(1024 * 1024), b""):
+                sha256.update(bloco)
+
+        return caminho, total, caminho.stat().st_size, sha256.hexdigest()
+
+    @staticmethod
+    def _linha(movimentacao) -> list:
+        """Converte uma movimentação em linha de arquivo"""
+        return [
+            movimentacao.id,
+            movimentacao.produto_id,
+            getattr(movimentacao.tipo, "value", movimentacao.tipo),
+            str(movimentacao.quantidade),
+            str(movimentacao.custo_unitario),
+            str(movimentacao.valor_total),
+            movimentacao.documento_referencia,
+            movimentacao.observacao,
+            movimentacao.usuario_id,
+            movimentacao.created_at.isoformat(),
+        ]
+
+    async def _gravar_csv(self, caminho: Path, movimentacoes) -> int:
+        """Grava movimentações em CSV comprimido com gzip"""
+        total = 0
+        with gzip.open(caminho, "wt", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUNAS_ARQUIVO)
+            async for movimentacao in movimentacoes:
+                writer.writerow(self._linha(movimentacao))
+                total += 1
+        return total
+
+    async def _gravar_parquet(
+        self, caminho: Path, movimentacoes, tamanho_lote: int = 5000
+    ) -> int:
+        """Grava movimentações em Parquet (zstd) em lotes de linhas"""
+        schema = pa.schema(
+            [
+                ("id", pa.int64()),
+                ("produto_id", pa.int64()),
+                ("tipo", pa.string()),
+                ("quantidade", pa.string()),
+                ("custo_unitario", pa.string()),
+                ("valor_total", pa.string()),
+                ("documento_referencia", pa.string()),
+                ("observacao", pa.string()),
+                ("usuario_id", pa.int64()),
+                ("created_at", pa.string()),
+            ]
+        )
+        total = 0
+        lote: list = []
+        with pq.ParquetWriter(caminho, schema, compression="zstd") as writer:
+            async for movimentacao in movimentacoes:
+                lote.append(self._linha(movimentacao))
+                if len(lote) >= tamanho_lote:
+                    writer.write_table(self._tabela(schema, lote))
+                    total += len(lote)
+                    lote = []
+            if lote:
+                writer.write_table(self._tabela(schema, lote))
+                total += len(lote)
+        return total
+
+    @staticmethod
+    def _tabela(schema, linhas: list):
+        """Monta uma tabela pyarrow a partir de linhas"""
+        colunas = list(zip(*linhas))
+        return pa.Table.from_arrays(
+            [pa.array(coluna, type=campo.type) for coluna, campo in zip(colunas, schema)],
+            schema=schema,
+        )
@@ -1,9 +1,9 @@
 """
 Repository para Inventário de Estoque
 """
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterable
 from datetime import datetime
-from sqlalchemy import select, and_, func, or_
+from sqlalchemy import select, update, and_, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.estoque.models import (
@@ -12,6 +12,9 @@ from app.modules.estoque.models import (
     StatusInventario,
     TipoInventario,
 )
+from app.modules.produtos.models import Produto
+from app.modules.produtos.indice_codigo_barras import marcar_produtos_alterados
+from app.modules.produtos.sincronizacao import carimbar_no_commit
 
 
 class InventarioRepository:
@@ -241,3 +244,102 @@ class InventarioRepository:
             "contados": contados,
             "pendentes": total - contados,
         }
+
+    # ==================== CONTAGEM EM LOTE ====================
+
+    async def get_status_fichas(
+        self, ficha_ids: Iterable[int]
+    ) -> Dict[int, StatusInventario]:
+        """Retorna o status de várias fichas em uma única consulta"""
+        ids = list(set(ficha_ids))
+        if not ids:
+            return {}
+        result = await self.session.execute(
+            select(FichaInventario.id, FichaInventario.status).where(
+                FichaInventario.id.in_(ids)
+            )
+        )
+        return {ficha_id: status for ficha_id, status in result.all()}
+
+    async def get_itens_para_contagem(
+        self, ficha_ids: Iterable[int], produto_ids: Iterable[int]
+    ) -> list:
+        """
+        Busca os itens candidatos de um lote de contagens
+
+        Seleciona apenas colunas (sem carregar entidades nem relacionamentos)
+        para que lotes consecutivos enxerguem sempre os valores já gravados.
+        """
+        fichas = list(set(ficha_ids))
+        produtos = list(set(produto_ids))
+        if not fichas or not produtos:
+            return []
+        result = await self.session.execute(
+            select(
+                ItemInventario.id,
+                ItemInventario.ficha_id,
+                ItemInventario.produto_id,
+                ItemInventario.localizacao_id,
+                ItemInventario.quantidade_sistema,
+                ItemInventario.quantidade_contada,
+            ).where(
+                and_(
+                    ItemInventario.ficha_id.in_(fichas),
+                    ItemInventario.produto_id.in_(produtos),
+                )
+            )
+        )
+        return list(result.all())
+
+    async def atualizar_contagens(self, valores: List[dict]) -> int:
+        """
+        Grava contagens de vários itens com um único UPDATE em lote (por PK)
+
+        Args:
+            valores: Dicts com id, quantidade_contada, divergencia,
+                conferido_por_id, justificativa e data_contagem
+
+        Returns:
+            Quantidade de itens atualizados
+        """
+        if not valores:
+            return 0
+        await self.session.execute(update(ItemInventario), valores)
+        return len(valores)
+
+    async def aplicar_divergencias_estoque(self, ficha_id: int) -> int:
+        """
+        Aplica as divergências da ficha no estoque dos produtos
+
+        Executa um único UPDATE somando a divergência de todos os itens do
+        produto na ficha (vários itens quando contado por localização).
+
+        Returns:
+            Quantidade de produtos ajustados
+        """
+        filtro_itens = and_(
+            ItemInventario.ficha_id == ficha_id,
+            ItemInventario.quantidade_contada.isnot(None),
+            ItemInventario.divergencia != 0,
+        )
+        result = await self.session.execute(
+            select(ItemInventario.produto_id).where(filtro_itens).distinct()
+        )
+        produto_ids = list(result.scalars().all())
+        if not produto_ids:
+            return 0
+
+        divergencia_produto = (
+            select(func.sum(ItemInventario.divergencia))
+            .where(filtro_itens, ItemInventario.produto_id == Produto.id)
+            .scalar_subquery()
+        )
+        await self.session.execute(
+            update(Produto)
+            .where(Produto.id.in_(produto_ids))
+            .values(estoque_atual=Produto.estoque_atual + divergencia_produto)
+            .execution_options(synchronize_session=False)
+        )
+        marcar_produtos_alterados(self.session, produto_ids)
+        carimbar_no_commit(self.session, Produto.id.in_(produto_ids))
+        return len(produto_ids)
@@ -1,14 +1,17 @@
 """
 Service para Inventário de Estoque
 """
+import json
 import math
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from decimal import Decimal
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.estoque.inventario_repository import InventarioRepository
 from app.modules.estoque.wms_repository import WMSRepository
-from app.modules.estoque.repository import EstoqueRepository
+from app.modules.estoque.repository import MovimentacaoEstoqueRepository
 from app.modules.produtos.repository import ProdutoRepository
 from app.modules.categorias.repository import CategoriaRepository
 from app.modules.estoque.models import StatusInventario
@@ -22,10 +25,18 @@ from app.modules.estoque.schemas import (
     FinalizarContagemRequest,
     AcuracidadeResponse,
     DivergenciaItem,
+    ContagemLoteItem,
+    ContagemLoteResultado,
+    ContagemLoteResponse,
+    StatusContagemLoteEnum,
 )
 from app.core.exceptions import NotFoundException, ValidationException
 
 
+# Linhas processadas por vez na contagem em lote (limita o tamanho dos IN)
+TAMANHO_LOTE_CONTAGEM = 1000
+
+
 class InventarioService:
     """Service para regras de negócio de Inventário"""
 
@@ -33,7 +44,7 @@ class InventarioService:
         self.session = session
         self.repository = InventarioRepository(session)
         self.wms_repository = WMSRepository(session)
-        self.estoque_repository = EstoqueRepository(session)
+        self.estoque_repository = MovimentacaoEstoqueRepository(session)
         self.produto_repository = ProdutoRepository(session)
         self.categoria_repository = CategoriaRepository(session)
 
@@ -229,6 +240,234 @@ class InventarioService:
 
         return ItemInventarioResponse.model_validate(item)
 
+    async def registrar_contagens_lote(
+        self, itens: List[ContagemLoteItem], acumular: bool = False
+    ) -> ContagemLoteResponse:
+        """
+        Registra contagens em lote (coletores de código de barras)
+
+        Regras:
+        - Fichas devem estar EM_ANDAMENTO
+        - Códigos de barras são resolvidos em uma única consulta por lote
+        - Várias linhas do mesmo item são consolidadas (última vence, ou soma
+          quando acumular=True) e gravadas com um UPDATE em lote
+        - Linhas inválidas não interrompem o lote: cada linha tem seu resultado
+        """
+        resultados: List[ContagemLoteResultado] = []
+        itens_atualizados = 0
+        linhas = list(enumerate(itens, start=1))
+
+        for inicio in range(0, len(linhas), TAMANHO_LOTE_CONTAGEM):
+            parciais, atualizados = await self._processar_lote_contagem(
+                linhas[inicio:inicio + TAMANHO_LOTE_CONTAGEM], acumular
+            )
+            resultados.extend(parciais)
+            itens_atualizados += atualizados
+
+        return self._resumo_contagem_lote(resultados, itens_atualizados)
+
+    async def registrar_contagens_ndjson(
+        self, conteudo: AsyncIterator[bytes], acumular: bool = False
+    ) -> ContagemLoteResponse:
+        """
+        Registra contagens recebidas como NDJSON (uma linha JSON por leitura)
+
+        O corpo é lido em streaming e processado a cada TAMANHO_LOTE_CONTAGEM
+        linhas, sem carregar o arquivo inteiro em memória. Linhas com JSON ou
+        campos inválidos geram resultado de erro com o número da linha.
+        """
+        resultados: List[ContagemLoteResultado] = []
+        itens_atualizados = 0
+        pendentes: List[Tuple[int, ContagemLoteItem]] = []
+
+        async for numero, texto in self._ler_linhas_ndjson(conteudo):
+            try:
+                pendentes.append((numero, ContagemLoteItem.model_validate(json.loads(texto))))
+            except (ValueError, ValidationError) as e:
+                resultados.append(self._erro_contagem(numero, self._mensagem_erro(e)))
+                continue
+
+            if len(pendentes) >= TAMANHO_LOTE_CONTAGEM:
+                parciais, atualizados = await self._processar_lote_contagem(
+                    pendentes, acumular
+                )
+                resultados.extend(parciais)
+                itens_atualizados += atualizados
+                pendentes = []
+
+        if pendentes:
+            parciais, atualizados = await self._processar_lote_contagem(pendentes, acumular)
+            resultados.extend(parciais)
+            itens_atualizados += atualizados
+
+        resultados.sort(key=lambda r: r.linha)
+        return self._resumo_contagem_lote(resultados, itens_atualizados)
+
+    async def _processar_lote_contagem(
+        self, linhas: List[Tuple[int, ContagemLoteItem]], acumular: bool
+    ) -> Tuple[List[ContagemLoteResultado], int]:
+        """Resolve e grava um lote de linhas de contagem"""
+        status_fichas = await self.repository.get_status_fichas(
+            linha.ficha_id for _, linha in linhas
+        )
+        codigos = await self.produto_repository.get_ids_por_codigos_barras(
+            linha.codigo_barras for _, linha in linhas if linha.produto_id is None
+        )
+
+        erros: Dict[int, str] = {}
+        resolvidas: List[Tuple[int, ContagemLoteItem, int]] = []
+        for numero, linha in linhas:
+            status = status_fichas.get(linha.ficha_id)
+            produto_id = linha.produto_id or codigos.get(linha.codigo_barras)
+            if status is None:
+                erros[numero] = f"Ficha de inventário {linha.ficha_id} não encontrada"
+            elif status != StatusInventario.EM_ANDAMENTO:
+                erros[numero] = (
+                    f"Ficha de inventário {linha.ficha_id} não está em andamento. "
+                    f"Status atual: {status.value}"
+                )
+            elif produto_id is None:
+                erros[numero] = f"Código de barras {linha.codigo_barras} não cadastrado"
+            else:
+                resolvidas.append((numero, linha, produto_id))
+
+        candidatos: Dict[Tuple[int, int], list] = {}
+        for item in await self.repository.get_itens_para_contagem(
+            (linha.ficha_id for _, linha, _ in resolvidas),
+            (produto_id for _, _, produto_id in resolvidas),
+        ):
+            candidatos.setdefault((item.ficha_id, item.produto_id), []).append(item)
+
+        agora = datetime.utcnow()
+        contagens: Dict[int, dict] = {}
+        item_por_linha: Dict[int, int] = {}
+        for numero, linha, produto_id in resolvidas:
+            item = self._selecionar_item_contagem(
+                candidatos.get((linha.ficha_id, produto_id), []), linha.localizacao_id
+            )
+            if isinstance(item, str):
+                erros[numero] = item.format(produto_id=produto_id, ficha_id=linha.ficha_id)
+                continue
+
+            contagem = contagens.get(item.id)
+            if contagem is None:
+                contagem = contagens[item.id] = {
+                    "id": item.id,
+                    "quantidade_contada": float(item.quantidade_contada or 0),
+                    "quantidade_sistema": float(item.quantidade_sistema),
+                }
+            if acumular:
+                contagem["quantidade_contada"] += linha.quantidade_contada
+            else:
+                contagem["quantidade_contada"] = linha.quantidade_contada
+            contagem["conferido_por_id"] = linha.conferido_por_id
+            contagem["justificativa"] = linha.justificativa
+            item_por_linha[numero] = item.id
+
+        valores = []
+        for contagem in contagens.values():
+            quantidade_sistema = contagem.pop("quantidade_sistema")
+            contagem["divergencia"] = round(
+                contagem["quantidade_contada"] - quantidade_sistema, 2
+            )
+            contagem["data_contagem"] = agora
+            valores.append(contagem)
+        await self.repository.atualizar_contagens(valores)
+
+        resultados = []
+        for numero, linha in linhas:
+            if numero in erros:
+                resultados.append(self._erro_contagem(numero, erros[numero]))
+                continue
+            contagem = contagens[item_por_linha[numero]]
+            resultados.append(
+                ContagemLoteResultado(
+                    linha=numero,
+                    status=StatusContagemLoteEnum.REGISTRADA,
+                    item_id=contagem["id"],
+                    produto_id=linha.produto_id or codigos.get(linha.codigo_barras),
+                    quantidade_contada=contagem["quantidade_contada"],
+                    divergencia=contagem["divergencia"],
+                )
+            )
+        return resultados, len(valores)
+
+    @staticmethod
+    def _selecionar_item_contagem(candidatos: list, localizacao_id: Optional[int]):
+        """
+        Escolhe o item da ficha que corresponde à linha
+
+        Returns:
+            Linha do item ou mensagem de erro (str) quando não há item único
+        """
+        if localizacao_id is not None:
+            candidatos = [c for c in candidatos if c.localizacao_id == localizacao_id]
+            if not candidatos:
+                return (
+                    "Produto {produto_id} não pertence à ficha {ficha_id} "
+                    f"na localização {localizacao_id}"
+                )
+        elif len(candidatos) > 1:
+            sem_localizacao = [c for c in candidatos if c.localizacao_id is None]
+            if len(sem_localizacao) != 1:
+                return (
+                    "Produto {produto_id} está em mais de uma localização da ficha "
+                    "{ficha_id}; informe localizacao_id"
+                )
+            candidatos = sem_localizacao
+
+        if not candidatos:
+            return "Produto {produto_id} não pertence à ficha {ficha_id}"
+        return candidatos[0]
+
+    @staticmethod
+    async def _ler_linhas_ndjson(
+        conteudo: AsyncIterator[bytes],
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """Quebra o corpo recebido em linhas (número, texto), ignorando linhas vazias"""
+        buffer = b""
+        numero = 0
+        async for bloco in conteudo:
+            buffer += bloco
+            *completas, buffer = buffer.split(b"\n")
+            for linha in completas:
+                numero += 1
+                texto = linha.decode("utf-8", errors="replace").strip()
+                if texto:
+                    yield numero, texto
+        texto = buffer.decode("utf-8", errors="replace").strip()
+        if texto:
+            yield numero + 1, texto
+
+    @staticmethod
+    def _mensagem_erro(erro: Exception) -> str:
+        """Mensagem legível para erro de parse/validação de uma linha"""
+        if isinstance(erro, ValidationError):
+            return "; ".join(
+                f"{'.'.join(str(p) for p in e['loc']) or 'linha'}: {e['msg']}"
+                for e in erro.errors()
+            )
+        return f"JSON inválido: {erro}"
+
+    @staticmethod
+    def _erro_contagem(numero: int, mensagem: str) -> ContagemLoteResultado:
+        return ContagemLoteResultado(
+            linha=numero, status=StatusContagemLoteEnum.ERRO, erro=mensagem
+        )
+
+    @staticmethod
+    def _resumo_contagem_lote(
+        resultados: List[ContagemLoteResultado], itens_atualizados: int
+    ) -> ContagemLoteResponse:
+        erros = sum(1 for r in resultados if r.status == StatusContagemLoteEnum.ERRO)
+        return ContagemLoteResponse(
+            total_linhas=len(resultados),
+            registradas=len(resultados) - erros,
+            erros=erros,
+            itens_atualizados=itens_atualizados,
+            resultados=resultados,
+        )
+
     async def finalizar_inventario(
         self, ficha_id: int, data: FinalizarContagemRequest
     ) -> FichaInventarioResponse:
@@ -271,19 +510,9 @@ class InventarioService:
 
         return FichaInventarioResponse.model_validate(ficha)
 
-    async def _ajustar_estoque_por_inventario(self, ficha_id: int):
+    async def _ajustar_estoque_por_inventario(self, ficha_id: int) -> int:
         """Ajusta estoque dos produtos baseado na contagem do inventário"""
-        itens_com_divergencia = await self.repository.get_itens_com_divergencia(
-            ficha_id
-        )
-
-        for item in itens_com_divergencia:
-            # Atualiza estoque do produto para a quantidade contada
-            produto = await self.produto_repository.get_by_id(item.produto_id)
-            if produto:
-                await self.produto_repository.update(
-                    item.produto_id, {"estoque_atual": item.quantidade_contada}
-                )
+        return await self.repository.aplicar_divergencias_estoque(ficha_id)
 
     async def cancelar_inventario(self, ficha_id: int) -> FichaInventarioResponse:
         """Cancela inventário (apenas se não estiver concluído)"""
@@ -1,17 +1,284 @@
 """
 Service para sincronização automática de estoque com marketplaces
 """
+import asyncio
 import logging
+from dataclasses import dataclass
 from typing import Dict, Any, List, Optional
+import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 
 from app.integrations.mercadolivre import MercadoLivreClient
+from app.modules.produtos.repository import ProdutoRepository
 from app.core.config import settings
+from app.utils.retry import RetryConfig
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _AtualizacaoPendente:
+    """Atualização de estoque aguardando a janela de debounce de um SKU"""
+
+    produto_id: int
+    ml_item_id: str
+    quantidade: int
+    access_token: str
+    primeira_em: float
+    enviar_em: float
+
+
+class MercadoLivreSyncWorker:
+    """
+    Worker de sincronização de estoque com o Mercado Livre
+
+    - Concorrência limitada por semáforo sobre um cliente HTTP com pool
+    - Backoff ciente de rate limit: um 429 pausa todos os envios até o
+      Retry-After (ou backoff exponencial), erros 5xx/rede são retentados
+    - Debounce por SKU: várias atualizações do mesmo anúncio dentro da janela
+      viram um único envio com a quantidade mais recente (limitado por
+      espera_maxima para SKUs que não param de vender)
+    """
+
+    def __init__(
+        self,
+        ml_client: MercadoLivreClient,
+        concorrencia: int = 8,
+        debounce: float = 3.0,
+        espera_maxima: float = 15.0,
+        retry_config: Optional[RetryConfig] = None,
+    ):
+        """
+        Args:
+            ml_client: Client do Mercado Livre
+            concorrencia: Máximo de requisições simultâneas ao ML
+            debounce: Segundos sem novas vendas antes de enviar um SKU
+            espera_maxima: Segundos máximos entre a primeira venda e o envio
+            retry_config: Configuração de tentativas e backoff
+        """
+        self.ml_client = ml_client
+        self.debounce = debounce
+        self.espera_maxima = espera_maxima
+        self.retry_config = retry_config or RetryConfig(
+            max_attempts=5, initial_delay=1.0, max_delay=30.0
+        )
+        self._semaforo = asyncio.Semaphore(concorrencia)
+        self._pendentes: Dict[str, _AtualizacaoPendente] = {}
+        self._pausado_ate = 0.0
+        self._tarefa: Optional[asyncio.Task] = None
+        self._evento = asyncio.Event()
+
+    async def enviar(
+        self, ml_item_id: str, quantidade: int, access_token: str
+    ) -> Dict[str, Any]:
+        """
+        Envia a quantidade de um anúncio ao ML com retry e backoff
+
+        Args:
+            ml_item_id: ID do anúncio
+            quantidade: Quantidade disponível
+            access_token: Token OAuth
+
+        Returns:
+            Resposta do ML
+
+        Raises:
+            httpx.HTTPStatusError: Erro não retentável ou tentativas esgotadas
+        """
+        loop = asyncio.get_running_loop()
+
+        for tentativa in range(self.retry_config.max_attempts):
+            espera = self._pausado_ate - loop.time()
+            if espera > 0:
+                await asyncio.sleep(espera)
+
+            async with self._semaforo:
+                try:
+                    return await self.ml_client.atualizar_estoque(
+                        item_id=ml_item_id,
+                        quantidade=quantidade,
+                        access_token=access_token,
+                    )
+                except httpx.HTTPStatusError as e:
+                    status_code = e.response.status_code
+                    if status_code != 429 and status_code < 500:
+                        raise
+                    erro = e
+                    delay = self.retry_config.calculate_delay(tentativa)
+                    if status_code == 429:
+                        delay = self._retry_after(e.response, delay)
+                        # Rate limit é global: pausa todos os envios
+                        self._pausado_ate = max(self._pausado_ate, loop.time() + delay)
+                except httpx.TransportError as e:
+                    erro = e
+                    delay = self.retry_config.calculate_delay(tentativa)
+
+            if tentativa == self.retry_config.max_attempts - 1:
+                raise erro
+
+            logger.warning(
+                f"Falha ao sincronizar {ml_item_id} (tentativa {tentativa + 1}/"
+                f"{self.retry_config.max_attempts}): {erro}. Nova tentativa em {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _retry_after(response: httpx.Response, padrao: float) -> float:
+        """Lê o header Retry-After (em segundos) de uma resposta 429"""
+        try:
+            return max(float(response.headers["Retry-After"]), 0.0)
+        except (KeyError, ValueError):
+            return padrao
+
+    def agendar(
+        self,
+        produto_id: int,
+        ml_item_id: str,
+        quantidade: int,
+        access_token: str,
+    ) -> None:
+        """
+        Agenda o envio da quantidade de um SKU com debounce
+
+        Chamadas repetidas para o mesmo anúncio dentro da janela apenas
+        substituem a quantidade pendente.
+
+        Args:
+            produto_id: ID do produto
+            ml_item_id: ID do anúncio
+            quantidade: Quantidade disponível mais recente
+            access_token: Token OAuth
+        """
+        agora = asyncio.get_running_loop().time()
+        pendente = self._pendentes.get(ml_item_id)
+
+        if pendente:
+            pendente.quantidade = quantidade
+            pendente.access_token = access_token
+            pendente.enviar_em = min(
+                agora + self.debounce, pendente.primeira_em + self.espera_maxima
+            )
+        else:
+            self._pendentes[ml_item_id] = _AtualizacaoPendente(
+                produto_id=produto_id,
+                ml_item_id=ml_item_id,
+                quantidade=quantidade,
+                access_token=access_token,
+                primeira_em=agora,
+                enviar_em=agora + self.debounce,
+            )
+
+        if self._tarefa is None or self._tarefa.done():
+            self._tarefa = asyncio.create_task(self._loop())
+        self._evento.set()
+
+    async def descarregar(self, somente_vencidos: bool = False) -> List[Dict[str, Any]]:
+        """
+        Envia as atualizações pendentes
+
+        Args:
+            somente_vencidos: Se True, envia apenas SKUs cuja janela já expirou
+
+        Returns:
+            Resultado de cada envio
+        """
+        agora = asyncio.get_running_loop().time()
+        lote = [
+            p for p in self._pendentes.values()
+            if not somente_vencidos or p.enviar_em <= agora
+        ]
+        for pendente in lote:
+            del self._pendentes[pendente.ml_item_id]
+
+        return await asyncio.gather(*(self._enviar_pendente(p) for p in lote))
+
+    async def _enviar_pendente(self, pendente: _AtualizacaoPendente) -> Dict[str, Any]:
+        """Envia uma atualização pendente sem propagar exceções"""
+        try:
+            resposta = await self.enviar(
+                pendente.ml_item_id, pendente.quantidade, pendente.access_token
+            )
+            return {
+                "sucesso": True,
+                "produto_id": pendente.produto_id,
+                "ml_item_id": pendente.ml_item_id,
+                "quantidade": pendente.quantidade,
+                "ml_response": resposta,
+            }
+        except Exception as e:
+            logger.error(f"Erro ao sincronizar {pendente.ml_item_id}: {str(e)}")
+            return {
+                "sucesso": False,
+                "produto_id": pendente.produto_id,
+                "ml_item_id": pendente.ml_item_id,
+                "erro": str(e),
+            }
+
+    async def _loop(self) -> None:
+        """Envia SKUs à medida que suas janelas de debounce expiram"""
+        loop = asyncio.get_running_loop()
+        while self._pendentes:
+            proximo = min(p.enviar_em for p in self._pendentes.values())
+            espera = proximo - loop.time()
+            if espera > 0:
+                self._evento.clear()
+                try:
+                    await asyncio.wait_for(self._evento.wait(), timeout=espera)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.descarregar(somente_vencidos=True)
+
+    async def parar(self) -> None:
+        """Envia todas as atualizações pendentes e encerra o loop de debounce"""
+        if self._tarefa and not self._tarefa.done():
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+        self._tarefa = None
+        await self.descarregar()
+
+
+_ml_sync_worker: Optional[MercadoLivreSyncWorker] = None
+
+
+def get_ml_sync_worker() -> Optional[MercadoLivreSyncWorker]:
+    """
+    Retorna o worker de sincronização do Mercado Livre deste processo
+
+    Returns:
+        MercadoLivreSyncWorker ou None se o Mercado Livre não estiver configurado
+    """
+    global _ml_sync_worker
+
+    if _ml_sync_worker is None:
+        ml_client_id = getattr(settings, 'MERCADO_LIVRE_CLIENT_ID', None)
+        ml_secret = getattr(settings, 'MERCADO_LIVRE_CLIENT_SECRET', None)
+        if not (ml_client_id and ml_secret):
+            return None
+
+        _ml_sync_worker = MercadoLivreSyncWorker(
+            MercadoLivreClient(client_id=ml_client_id, client_secret=ml_secret),
+            concorrencia=settings.ML_SYNC_CONCORRENCIA,
+            debounce=settings.ML_SYNC_DEBOUNCE_SEGUNDOS,
+            espera_maxima=settings.ML_SYNC_ESPERA_MAXIMA_SEGUNDOS,
+        )
+
+    return _ml_sync_worker
+
+
+async def parar_ml_sync_worker() -> None:
+    """Descarrega e encerra o worker de sincronização (shutdown da aplicação)"""
+    global _ml_sync_worker
+
+    if _ml_sync_worker is not None:
+        await _ml_sync_worker.parar()
+        _ml_sync_worker = None
+
+
 class MarketplaceSyncService:
     """
     Service para sincronizar estoque com marketplaces
@@ -23,24 +290,25 @@ class MarketplaceSyncService:
     - Histórico de sincronizações
     """
 
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        worker: Optional[MercadoLivreSyncWorker] = None
+    ):
         """
         Inicializa service
 
         Args:
             db: Sessão do banco de dados
+            worker: Worker de sincronização (padrão: worker do processo)
         """
         self.db = db
 
-        # Mercado Livre client
-        ml_client_id = getattr(settings, 'MERCADO_LIVRE_CLIENT_ID', None)
-        ml_secret = getattr(settings, 'MERCADO_LIVRE_CLIENT_SECRET', None)
+        # Worker compartilhado (cliente HTTP com pool, backoff e debounce)
+        self.worker = worker or get_ml_sync_worker()
 
-        if ml_client_id and ml_secret:
-            self.ml_client = MercadoLivreClient(
-                client_id=ml_client_id,
-                client_secret=ml_secret
-            )
+        if self.worker:
+            self.ml_client = self.worker.ml_client
         else:
             self.ml_client = None
             logger.warning("Mercado Livre não configurado - sync desabilitado")
@@ -73,13 +341,11 @@ class MarketplaceSyncService:
         logger.info(f"Sincronizando produto {produto_id} com ML {ml_item_id} - Qtd: {quantidade}")
 
         try:
-            # Atualizar access token no client
-            self.ml_client.access_token = access_token
-
-            # Atualizar estoque no ML
-            resultado = await self.ml_client.atualizar_estoque(
-                item_id=ml_item_id,
-                quantidade=quantidade
+            # Atualizar estoque no ML (com retry/backoff de rate limit)
+            resultado = await self.worker.enviar(
+                ml_item_id=ml_item_id,
+                quantidade=quantidade,
+                access_token=access_token
             )
 
             # Registrar sincronização
@@ -127,6 +393,10 @@ class MarketplaceSyncService:
         """
         Sincroniza múltiplos produtos em lote
 
+        Os envios são feitos concorrentemente, limitados por
+        ML_SYNC_CONCORRENCIA, sobre o mesmo pool de conexões. A ordem dos
+        resultados corresponde à ordem dos produtos informados.
+
         Args:
             produtos: Lista de dicts com produto_id, ml_item_id, quantidade
             access_token: Token OAuth
@@ -136,30 +406,24 @@ class MarketplaceSyncService:
         """
         logger.info(f"Sincronização em lote: {len(produtos)} produtos")
 
-        resultados = []
-        sucessos = 0
-        falhas = 0
-
-        for produto in produtos:
-            resultado = await self.sincronizar_produto_ml(
+        resultados = await asyncio.gather(*(
+            self.sincronizar_produto_ml(
                 produto_id=produto["produto_id"],
                 quantidade=produto["quantidade"],
                 ml_item_id=produto["ml_item_id"],
                 access_token=access_token
             )
+            for produto in produtos
+        ))
 
-            resultados.append(resultado)
-
-            if resultado["sucesso"]:
-                sucessos += 1
-            else:
-                falhas += 1
+        sucessos = sum(1 for resultado in resultados if resultado["sucesso"])
+        falhas = len(resultados) - sucessos
 
         return {
             "total": len(produtos),
             "sucessos": sucessos,
             "falhas": falhas,
-            "resultados": resultados
+            "resultados": list(resultados)
         }
 
     async def processar_venda_ml(
@@ -355,7 +619,9 @@ async def sync_produto_apos_venda(
     """
     Hook para sincronizar estoque após venda local
 
-    Chamado automaticamente após registrar venda no sistema.
+    Chamado automaticamente após registrar venda no sistema. O envio é
+    agendado no worker com debounce por SKU: várias vendas do mesmo item
+    em poucos segundos resultam em um único envio com o saldo mais recente.
 
     Args:
         db: Sessão do banco
@@ -363,6 +629,8 @@ async def sync_produto_apos_venda(
         quantidade_vendida: Quantidade vendida
     """
     service = MarketplaceSyncService(db)
+    if not service.worker:
+        return
 
     # Buscar mapeamento ML
     ml_item_id = await service.obter_mapeamento_ml(produto_id)
@@ -371,13 +639,14 @@ async def sync_produto_apos_venda(
         # TODO: Buscar access_token do usuário
         access_token = "TODO_GET_FROM_USER"
 
-        # TODO: Buscar quantidade atual em estoque
-        quantidade_atual = 0  # SELECT quantidade FROM estoque WHERE produto_id = produto_id
+        produto = await ProdutoRepository(db).get_by_id(produto_id)
+        if not produto:
+            return
 
-        await service.sincronizar_produto_ml(
+        service.worker.agendar(
             produto_id=produto_id,
-            quantidade=quantidade_atual,
             ml_item_id=ml_item_id,
+            quantidade=max(int(produto.estoque_atual), 0),
             access_token=access_token
         )
 
@@ -19,7 +19,15 @@ class TipoMovimentacao(str, PyEnum):
 
 
 class MovimentacaoEstoque(Base):
-    """Modelo de Movimentação de Estoque"""
+    """
+    Modelo de Movimentação de Estoque
+
+    Em PostgreSQL a tabela é particionada por faixa mensal de created_at
+    (ver migration de particionamento); a chave primária física passa a ser
+    (id, created_at), mas id continua único via sequence. Consultas devem
+    sempre que possível filtrar created_at com limites constantes para que
+    o planner descarte partições (partition pruning).
+    """
 
     __tablename__ = "movimentacoes_estoque"
 
@@ -60,6 +68,77 @@ class MovimentacaoEstoque(Base):
         return f"<MovimentacaoEstoque(id={self.id}, produto_id={self.produto_id}, tipo='{self.tipo}', quantidade={self.quantidade})>"
 
 
+class SnapshotSaldoEstoque(Base):
+    """
+    Snapshot de saldo de estoque por produto ao final de um período arquivado
+
+    Ao arquivar um mês de movimentações, os totais do período e os valores
+    acumulados são consolidados aqui, permitindo remover as linhas do ledger
+    sem perder a exatidão do saldo.
+    """
+
+    __tablename__ = "snapshots_saldo_estoque"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    produto_id: Mapped[int] = mapped_column(
+        ForeignKey("produtos.id"), nullable=False, index=True
+    )
+    periodo: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    quantidade_entradas: Mapped[float] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0.0
+    )
+    quantidade_saidas: Mapped[float] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0.0
+    )
+    quantidade_ajustes: Mapped[float] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0.0
+    )
+    total_movimentacoes: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+    saldo_acumulado: Mapped[float] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0.0
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    __table_args__ = (
+        Index("idx_snapshot_produto_periodo", "produto_id", "periodo", unique=True),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<SnapshotSaldoEstoque(produto_id={self.produto_id}, periodo={self.periodo}, "
+            f"saldo_acumulado={self.saldo_acumulado})>"
+        )
+
+
+class ArquivoMovimentacaoEstoque(Base):
+    """Registro de um período de movimentações movido para armazenamento frio"""
+
+    __tablename__ = "arquivos_movimentacao_estoque"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    periodo: Mapped[date] = mapped_column(
+        Date, nullable=False, unique=True, index=True
+    )
+    formato: Mapped[str] = mapped_column(String(10), nullable=False)
+    caminho_arquivo: Mapped[str] = mapped_column(String(500), nullable=False)
+    total_registros: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    tamanho_bytes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    checksum_sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ArquivoMovimentacaoEstoque(periodo={self.periodo}, formato='{self.formato}', "
+            f"total_registros={self.total_registros})>"
+        )
+
+
 class LoteEstoque(Base):
     """Modelo de Lote de Estoque para controle FIFO"""
 
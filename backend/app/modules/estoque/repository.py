@@ -2,14 +2,54 @@
 Repository para Movimentações de Estoque
 """
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, date
 from sqlalchemy import select, func, and_, case
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.estoque.models import MovimentacaoEstoque, TipoMovimentacao
+from app.modules.estoque.models import (
+    MovimentacaoEstoque,
+    SnapshotSaldoEstoque,
+    TipoMovimentacao,
+)
 from app.modules.estoque.schemas import MovimentacaoCreate
 
 
+def inicio_mes(data: date) -> date:
+    """Retorna o primeiro dia do mês da data informada"""
+    return date(data.year, data.month, 1)
+
+
+def inicio_proximo_mes(data: date) -> date:
+    """Retorna o primeiro dia do mês seguinte à data informada"""
+    if data.month == 12:
+        return date(data.year + 1, 1, 1)
+    return date(data.year, data.month + 1, 1)
+
+
+def quantidade_com_sinal():
+    """
+    Expressão SQL da quantidade com sinal conforme o tipo da movimentação
+
+    Entradas e devoluções somam, saídas e transferências subtraem e ajustes
+    já são gravados com o próprio sinal.
+    """
+    return case(
+        (
+            MovimentacaoEstoque.tipo.in_(
+                [TipoMovimentacao.ENTRADA, TipoMovimentacao.DEVOLUCAO]
+            ),
+            MovimentacaoEstoque.quantidade,
+        ),
+        (
+            MovimentacaoEstoque.tipo.in_(
+                [TipoMovimentacao.SAIDA, TipoMovimentacao.TRANSFERENCIA]
+            ),
+            -MovimentacaoEstoque.quantidade,
+        ),
+        else_=MovimentacaoEstoque.quantidade,
+    )
+
+
 class MovimentacaoEstoqueRepository:
     """Repository para operações de banco de dados de Movimentações de Estoque"""
 
@@ -185,60 +225,52 @@ class MovimentacaoEstoqueRepository:
         """
         Calcula o saldo atual de um produto baseado nas movimentações
 
+        Parte do último snapshot de período arquivado (se houver) e soma apenas
+        as movimentações posteriores a ele, em uma única agregação condicional.
+        O limite constante em created_at permite ao PostgreSQL descartar as
+        partições anteriores ao snapshot.
+
         Args:
             produto_id: ID do produto
 
         Returns:
             Saldo atual calculado (entradas - saídas + ajustes)
         """
-        # Calcula entradas
-        query_entradas = select(
-            func.coalesce(func.sum(MovimentacaoEstoque.quantidade), 0)
-        ).where(
-            and_(
-                MovimentacaoEstoque.produto_id == produto_id,
-                MovimentacaoEstoque.tipo.in_(
-                    [TipoMovimentacao.ENTRADA, TipoMovimentacao.DEVOLUCAO]
-                ),
-            )
-        )
+        snapshot = await self.get_ultimo_snapshot(produto_id)
 
-        result_entradas = await self.session.execute(query_entradas)
-        entradas = result_entradas.scalar_one()
-
-        # Calcula saídas
-        query_saidas = select(
-            func.coalesce(func.sum(MovimentacaoEstoque.quantidade), 0)
-        ).where(
-            and_(
-                MovimentacaoEstoque.produto_id == produto_id,
-                MovimentacaoEstoque.tipo.in_(
-                    [TipoMovimentacao.SAIDA, TipoMovimentacao.TRANSFERENCIA]
-                ),
-            )
+        saldo_base = 0.0
+        query = select(func.coalesce(func.sum(quantidade_com_sinal()), 0)).where(
+            MovimentacaoEstoque.produto_id == produto_id
         )
 
-        result_saidas = await self.session.execute(query_saidas)
-        saidas = result_saidas.scalar_one()
-
-        # Calcula ajustes (podem ser positivos ou negativos)
-        # Para ajustes, vamos considerar a quantidade com sinal
-        query_ajustes = select(
-            func.coalesce(func.sum(MovimentacaoEstoque.quantidade), 0)
-        ).where(
-            and_(
-                MovimentacaoEstoque.produto_id == produto_id,
-                MovimentacaoEstoque.tipo == TipoMovimentacao.AJUSTE,
+        if snapshot:
+            saldo_base = float(snapshot.saldo_acumulado)
+            query = query.where(
+                MovimentacaoEstoque.created_at >= inicio_proximo_mes(snapshot.periodo)
             )
-        )
 
-        result_ajustes = await self.session.execute(query_ajustes)
-        ajustes = result_ajustes.scalar_one()
+        result = await self.session.execute(query)
+        return saldo_base + float(result.scalar_one())
+
+    async def get_ultimo_snapshot(
+        self, produto_id: int
+    ) -> Optional[SnapshotSaldoEstoque]:
+        """
+        Busca o snapshot de saldo mais recente de um produto
+
+        Args:
+            produto_id: ID do produto
 
-        # Saldo = Entradas - Saídas + Ajustes
-        # Nota: Ajustes positivos aumentam, negativos diminuem
-        saldo = float(entradas) - float(saidas) + float(ajustes)
-        return saldo
+        Returns:
+            SnapshotSaldoEstoque ou None se nenhum período foi arquivado
+        """
+        result = await self.session.execute(
+            select(SnapshotSaldoEstoque)
+            .where(SnapshotSaldoEstoque.produto_id == produto_id)
+            .order_by(SnapshotSaldoEstoque.periodo.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
 
     async def get_movimentacoes_periodo(
         self,
@@ -1,12 +1,13 @@
 """
 Router para endpoints de Estoque
 """
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from typing import Optional
 
 from app.core.database import get_db
+from app.core.versionamento import requisicao_condicional
 from app.modules.estoque.service import EstoqueService
 from app.modules.estoque.lote_service import LoteEstoqueService
 from app.modules.estoque.curva_abc_service import CurvaABCService
@@ -44,6 +45,8 @@ from app.modules.estoque.schemas import (
     FinalizarContagemRequest,
     AcuracidadeResponse,
     DivergenciaItem,
+    ContagemLoteRequest,
+    ContagemLoteResponse,
 )
 
 router = APIRouter()
@@ -626,6 +629,7 @@ async def criar_localizacao(
 
 @router.get(
     "/wms/localizacoes/{localizacao_id}",
+    dependencies=[Depends(requisicao_condicional("localizacoes_estoque", "produtos_localizacoes"))],
     response_model=LocalizacaoEstoqueResponse,
     summary="Buscar localização por ID",
     description="Retorna informações de uma localização específica",
@@ -638,6 +642,7 @@ async def get_localizacao(localizacao_id: int, db: AsyncSession = Depends(get_db
 
 @router.get(
     "/wms/localizacoes",
+    dependencies=[Depends(requisicao_condicional("localizacoes_estoque", "produtos_localizacoes"))],
     response_model=LocalizacaoEstoqueList,
     summary="Listar localizações",
     description="Lista todas as localizações de estoque com paginação",
@@ -712,6 +717,7 @@ async def vincular_produto_localizacao(
 
 @router.get(
     "/wms/produtos/{produto_id}/localizacoes",
+    dependencies=[Depends(requisicao_condicional("localizacoes_estoque", "produtos_localizacoes"))],
     response_model=list[ProdutoLocalizacaoResponse],
     summary="Listar localizações de um produto",
     description="Lista todas as localizações onde um produto está armazenado",
@@ -906,6 +912,68 @@ async def registrar_contagem(
     return await service.registrar_contagem(data)
 
 
+@router.post(
+    "/inventario/contagens/lote",
+    response_model=ContagemLoteResponse,
+    summary="Registrar contagens em lote",
+    description="Registra várias contagens de uma vez (coletores), com resultado por linha",
+)
+async def registrar_contagens_lote(
+    data: ContagemLoteRequest, db: AsyncSession = Depends(get_db)
+):
+    """
+    Registra contagens em lote.
+
+    **Exemplo:**
+    ```json
+    {
+        "acumular": false,
+        "itens": [
+            {"ficha_id": 1, "codigo_barras": "7891234567890", "quantidade_contada": 12},
+            {"ficha_id": 1, "produto_id": 42, "quantidade_contada": 3, "localizacao_id": 5}
+        ]
+    }
+    ```
+
+    **Regras:**
+    - Cada linha informa produto_id ou codigo_barras
+    - localizacao_id é obrigatório quando o produto está em mais de uma localização da ficha
+    - acumular=true soma as quantidades (uma linha por leitura do coletor)
+    - Linhas com erro não impedem o registro das demais
+    """
+    service = InventarioService(db)
+    return await service.registrar_contagens_lote(data.itens, data.acumular)
+
+
+@router.post(
+    "/inventario/contagens/ndjson",
+    response_model=ContagemLoteResponse,
+    summary="Registrar contagens via NDJSON",
+    description="Recebe contagens em streaming (application/x-ndjson), uma linha JSON por leitura",
+)
+async def registrar_contagens_ndjson(
+    request: Request,
+    acumular: bool = Query(False, description="Soma as quantidades à contagem já registrada"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Registra contagens enviadas como NDJSON.
+
+    **Exemplo de corpo:**
+    ```
+    {"ficha_id": 1, "codigo_barras": "7891234567890", "quantidade_contada": 1}
+    {"ficha_id": 1, "codigo_barras": "7891234567890", "quantidade_contada": 1}
+    {"ficha_id": 1, "produto_id": 42, "quantidade_contada": 3}
+    ```
+
+    O corpo é processado em blocos à medida que chega, permitindo enviar
+    dezenas de milhares de leituras em uma única requisição. O número da
+    linha de cada resultado corresponde à linha do corpo enviado.
+    """
+    service = InventarioService(db)
+    return await service.registrar_contagens_ndjson(request.stream(), acumular)
+
+
 @router.post(
     "/inventario/fichas/{ficha_id}/finalizar",
     response_model=FichaInventarioResponse,
@@ -4,7 +4,7 @@ Schemas Pydantic para Estoque
 from datetime import datetime, date
 from typing import Optional
 from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
 from app.modules.produtos.schemas import ProdutoResponse
 
 
@@ -584,3 +584,86 @@ class DivergenciaItem(BaseModel):
     localizacao_codigo: Optional[str]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ContagemLoteItem(BaseModel):
+    """Linha de contagem enviada por coletor (produto por ID ou código de barras)"""
+
+    ficha_id: int = Field(..., gt=0, description="ID da ficha de inventário")
+    produto_id: Optional[int] = Field(None, gt=0, description="ID do produto")
+    codigo_barras: Optional[str] = Field(None, max_length=50, description="Código de barras lido")
+    quantidade_contada: float = Field(..., ge=0, description="Quantidade contada")
+    localizacao_id: Optional[int] = Field(None, description="ID da localização contada")
+    justificativa: Optional[str] = Field(None, max_length=500, description="Justificativa se houver divergência")
+    conferido_por_id: Optional[int] = Field(None, description="ID do usuário que conferiu")
+
+    @model_validator(mode="after")
+    def validar_produto(self):
+        """Exige produto_id ou codigo_barras"""
+        if self.produto_id is None and not self.codigo_barras:
+            raise ValueError("Informe produto_id ou codigo_barras")
+        return self
+
+
+class ContagemLoteRequest(BaseModel):
+    """Lote de contagens de inventário"""
+
+    itens: list[ContagemLoteItem] = Field(..., min_length=1, max_length=5000, description="Linhas de contagem")
+    acumular: bool = Field(
+        False,
+        description="Soma as quantidades à contagem já registrada (leituras unitárias) em vez de substituí-la",
+    )
+
+
+class StatusContagemLoteEnum(str, Enum):
+    """Resultado do processamento de uma linha de contagem"""
+
+    REGISTRADA = "REGISTRADA"
+    ERRO = "ERRO"
+
+
+class ContagemLoteResultado(BaseModel):
+    """Resultado de uma linha do lote de contagens"""
+
+    linha: int = Field(..., description="Número da linha no lote (a partir de 1)")
+    status: StatusContagemLoteEnum
+    item_id: Optional[int] = None
+    produto_id: Optional[int] = None
+    quantidade_contada: Optional[float] = Field(None, description="Contagem do item após o lote")
+    divergencia: Optional[float] = Field(None, description="Divergência do item após o lote")
+    erro: Optional[str] = None
+
+
+class ContagemLoteResponse(BaseModel):
+    """Resumo do processamento de um lote de contagens"""
+
+    total_linhas: int
+    registradas: int
+    erros: int
+    itens_atualizados: int = Field(..., description="Itens de inventário distintos atualizados")
+    resultados: list[ContagemLoteResultado]
+
+
+# ==================== SCHEMAS ARQUIVAMENTO ====================
+
+
+class FormatoArquivoEnum(str, Enum):
+    """Formatos suportados para arquivamento do ledger de estoque"""
+
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+class ArquivoMovimentacaoResponse(BaseModel):
+    """Schema de resposta de período de movimentações arquivado"""
+
+    id: int
+    periodo: date
+    formato: str
+    caminho_arquivo: str
+    total_registros: int
+    tamanho_bytes: int
+    checksum_sha256: str
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
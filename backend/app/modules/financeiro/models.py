@@ -128,3 +128,38 @@ class ContaReceber(Base):
 
     def __repr__(self) -> str:
         return f"<ContaReceber(id={self.id}, descricao='{self.descricao}', valor={self.valor_original}, status='{self.status}')>"
+
+
+class FluxoCaixaDiario(Base):
+    """
+    Projeção diária do fluxo de caixa
+
+    Uma linha por dia com os valores previstos (saldo em aberto das contas
+    PENDENTES/ATRASADAS pelo vencimento) e realizados (pagamentos e
+    recebimentos pela data da baixa). Mantida de forma incremental pelos
+    eventos de ContaPagar/ContaReceber (financeiro/projecao.py); o saldo
+    acumulado é calculado na leitura.
+    """
+
+    __tablename__ = "fluxo_caixa_diario"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    data: Mapped[date] = mapped_column(Date, nullable=False, unique=True)
+    previsto_entradas: Mapped[float] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0.0, server_default="0"
+    )
+    previsto_saidas: Mapped[float] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0.0, server_default="0"
+    )
+    realizado_entradas: Mapped[float] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0.0, server_default="0"
+    )
+    realizado_saidas: Mapped[float] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0.0, server_default="0"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<FluxoCaixaDiario(data={self.data}, previsto=+{self.previsto_entradas}/-{self.previsto_saidas})>"
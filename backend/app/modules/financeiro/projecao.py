@@ -0,0 +1,247 @@
+"""
+Projeção diária do fluxo de caixa (tabela fluxo_caixa_diario)
+
+Cada conta contribui para a projeção com:
+- previsto: saldo em aberto (original - liquidado) no dia do vencimento,
+  enquanto a conta está PENDENTE ou ATRASADA
+- realizado: valor liquidado (pago/recebido) no dia de cada baixa. Numa
+  alteração só o incremento entra no dia da nova baixa; baixas parciais
+  anteriores continuam nos seus dias
+
+Escritas pelo ORM são aplicadas pelos eventos de mapper no mesmo flush (e
+portanto na mesma transação): a diferença entre a contribuição anterior e a
+nova vira um UPSERT relativo por dia. UPDATE/DELETE em lote não disparam
+esses eventos; quem os executa calcula diferenca_projecao() para cada conta
+e chama aplicar_deltas_projecao().
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Mapping, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.modules.financeiro.models import (
+    ContaPagar,
+    ContaReceber,
+    FluxoCaixaDiario,
+    StatusFinanceiro,
+)
+
+COLUNAS_PROJECAO = ("previsto_entradas", "previsto_saidas", "realizado_entradas", "realizado_saidas")
+
+# tabela -> (valor liquidado, data da baixa, coluna prevista, coluna realizada)
+_CONFIGURACAO = {
+    "contas_receber": ("valor_recebido", "data_recebimento", "previsto_entradas", "realizado_entradas"),
+    "contas_pagar": ("valor_pago", "data_pagamento", "previsto_saidas", "realizado_saidas"),
+}
+_STATUS_EM_ABERTO = (StatusFinanceiro.PENDENTE, StatusFinanceiro.ATRASADA)
+
+DeltasProjecao = Dict[Tuple[date, str], Decimal]
+
+
+def atributos_projecao(tabela: str) -> Tuple[str, ...]:
+    """Atributos da conta que influenciam a projeção"""
+    liquidado, data_baixa, _, _ = _CONFIGURACAO[tabela]
+    return ("status", "valor_original", "data_vencimento", liquidado, data_baixa)
+
+
+def _decimal(valor) -> Decimal:
+    return Decimal(str(valor or 0))
+
+
+def _previsto(tabela: str, estado: Mapping) -> DeltasProjecao:
+    liquidado, _, coluna_prevista, _ = _CONFIGURACAO[tabela]
+    em_aberto = _decimal(estado["valor_original"]) - _decimal(estado[liquidado])
+    if estado["status"] in _STATUS_EM_ABERTO and em_aberto > 0:
+        return {(estado["data_vencimento"], coluna_prevista): em_aberto}
+    return {}
+
+
+def _realizado(tabela: str, estado: Mapping) -> DeltasProjecao:
+    liquidado, data_baixa, _, coluna_realizada = _CONFIGURACAO[tabela]
+    # O que já foi liquidado continua realizado mesmo se a conta for cancelada
+    if _decimal(estado[liquidado]) > 0 and estado[data_baixa] is not None:
+        return {(estado[data_baixa], coluna_realizada): _decimal(estado[liquidado])}
+    return {}
+
+
+def _realizado_alterado(tabela: str, antes: Mapping, depois: Mapping) -> DeltasProjecao:
+    """
+    Ajuste do realizado numa alteração da conta
+
+    Uma nova baixa (ou estorno) lança só a diferença do valor liquidado no
+    dia da baixa; o realizado dos dias anteriores não muda. Sem mudança de
+    valor, uma data de baixa corrigida move o realizado para o novo dia.
+    """
+    liquidado, data_baixa, _, coluna_realizada = _CONFIGURACAO[tabela]
+    incremento = _decimal(depois[liquidado]) - _decimal(antes[liquidado])
+    if not incremento:
+        if antes[data_baixa] == depois[data_baixa]:
+            return {}
+        deltas: DeltasProjecao = defaultdict(Decimal)
+        for chave, valor in _realizado(tabela, depois).items():
+            deltas[chave] += valor
+        for chave, valor in _realizado(tabela, antes).items():
+            deltas[chave] -= valor
+        return deltas
+
+    dia = depois[data_baixa] or antes[data_baixa]
+    if dia is None:
+        return {}
+    return {(dia, coluna_realizada): incremento}
+
+
+def contribuicao(tabela: str, estado: Mapping) -> DeltasProjecao:
+    """
+    Valores que uma conta soma na projeção
+
+    O realizado fica todo no dia da última baixa (o estado não guarda o
+    histórico de baixas parciais).
+
+    Args:
+        tabela: "contas_pagar" ou "contas_receber"
+        estado: Valores dos atributos_projecao() da conta
+    """
+    valores: DeltasProjecao = defaultdict(Decimal)
+    for parte in (_previsto(tabela, estado), _realizado(tabela, estado)):
+        for chave, valor in parte.items():
+            valores[chave] += valor
+    return valores
+
+
+def diferenca_projecao(
+    tabela: str, antes: Optional[Mapping], depois: Optional[Mapping]
+) -> DeltasProjecao:
+    """
+    Ajustes na projeção para uma conta que passou de `antes` para `depois`
+
+    Conta nova ou removida soma (ou retira) a contribuição inteira. Numa
+    alteração o previsto é substituído e o realizado recebe só o
+    incremento no dia da baixa (_realizado_alterado).
+
+    Args:
+        tabela: "contas_pagar" ou "contas_receber"
+        antes: Estado anterior (None para conta nova)
+        depois: Estado novo (None para conta removida)
+    """
+    deltas: DeltasProjecao = defaultdict(Decimal)
+    if antes is None or depois is None:
+        if depois is not None:
+            for chave, valor in contribuicao(tabela, depois).items():
+                deltas[chave] += valor
+        if antes is not None:
+            for chave, valor in contribuicao(tabela, antes).items():
+                deltas[chave] -= valor
+    else:
+        for chave, valor in _previsto(tabela, depois).items():
+            deltas[chave] += valor
+        for chave, valor in _previsto(tabela, antes).items():
+            deltas[chave] -= valor
+        for chave, valor in _realizado_alterado(tabela, antes, depois).items():
+            deltas[chave] += valor
+    return {chave: valor for chave, valor in deltas.items() if valor}
+
+
+def aplicar_deltas_projecao(connection, deltas: DeltasProjecao) -> None:
+    """
+    Soma os ajustes na projeção (UPSERT relativo, um registro por dia)
+
+    Args:
+        connection: Connection síncrona (eventos de mapper ou run_sync)
+        deltas: Ajustes por (dia, coluna)
+    """
+    if not deltas:
+        return
+
+    por_dia: Dict[date, Dict[str, Decimal]] = defaultdict(
+        lambda: dict.fromkeys(COLUNAS_PROJECAO, Decimal(0))
+    )
+    for (dia, coluna), valor in deltas.items():
+        por_dia[dia][coluna] += valor
+
+    agora = datetime.utcnow()
+    # Ordem fixa de dias evita deadlock entre transações concorrentes
+    linhas = [
+        {"data": dia, **valores, "updated_at": agora}
+        for dia, valores in sorted(por_dia.items())
+    ]
+    tabela = FluxoCaixaDiario.__table__
+
+    dialeto = connection.dialect.name
+    if dialeto in ("postgresql", "sqlite"):
+        insert = pg_insert if dialeto == "postgresql" else sqlite_insert
+        stmt = insert(tabela)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[tabela.c.data],
+            set_={
+                **{coluna: tabela.c[coluna] + stmt.excluded[coluna] for coluna in COLUNAS_PROJECAO},
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        connection.execute(stmt, linhas)
+        return
+
+    for linha in linhas:
+        result = connection.execute(
+            tabela.update()
+            .where(tabela.c.data == linha["data"])
+            .values(
+                **{coluna: tabela.c[coluna] + linha[coluna] for coluna in COLUNAS_PROJECAO},
+                updated_at=agora,
+            )
+        )
+        if result.rowcount == 0:
+            connection.execute(tabela.insert().values(**linha))
+
+
+# ==================== EVENTOS DO ORM ====================
+
+
+def _estado_atual(conta) -> dict:
+    return {
+        atributo: getattr(conta, atributo)
+        for atributo in atributos_projecao(conta.__tablename__)
+    }
+
+
+def _estado_anterior(conta) -> dict:
+    """Valores carregados do banco antes das alterações deste flush"""
+    atributos = inspect(conta).attrs
+    estado = {}
+    for atributo in atributos_projecao(conta.__tablename__):
+        historico = atributos[atributo].history
+        if historico.deleted:
+            estado[atributo] = historico.deleted[0]
+        elif historico.unchanged:
+            estado[atributo] = historico.unchanged[0]
+        else:
+            estado[atributo] = getattr(conta, atributo)
+    return estado
+
+
+@event.listens_for(ContaPagar, "after_insert")
+@event.listens_for(ContaReceber, "after_insert")
+def _projetar_conta_nova(mapper, connection, conta):
+    aplicar_deltas_projecao(
+        connection, diferenca_projecao(conta.__tablename__, None, _estado_atual(conta))
+    )
+
+
+@event.listens_for(ContaPagar, "after_update")
+@event.listens_for(ContaReceber, "after_update")
+def _projetar_conta_alterada(mapper, connection, conta):
+    aplicar_deltas_projecao(
+        connection,
+        diferenca_projecao(conta.__tablename__, _estado_anterior(conta), _estado_atual(conta)),
+    )
+
+
+@event.listens_for(ContaPagar, "after_delete")
+@event.listens_for(ContaReceber, "after_delete")
+def _projetar_conta_removida(mapper, connection, conta):
+    aplicar_deltas_projecao(
+        connection, diferenca_projecao(conta.__tablename__, _estado_anterior(conta), None)
+    )
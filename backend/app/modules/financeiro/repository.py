@@ -1,12 +1,22 @@
 """
 Repository para Financeiro
 """
-from typing import Optional, List, Tuple
-from datetime import date, datetime
-from sqlalchemy import select, func, and_, or_
+from typing import Dict, Iterable, Optional, List, Tuple
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import select, func, and_, or_, case, bindparam, Numeric, Text
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.financeiro.models import ContaPagar, ContaReceber, StatusFinanceiro
+from app.core.versionamento import marcar_tabelas_alteradas
+
+from app.modules.financeiro.projecao import DeltasProjecao, aplicar_deltas_projecao
+from app.modules.financeiro.models import (
+    ContaPagar,
+    ContaReceber,
+    FluxoCaixaDiario,
+    StatusFinanceiro,
+)
 from app.modules.financeiro.schemas import (
     ContaPagarCreate,
     ContaPagarUpdate,
@@ -16,6 +26,14 @@ from app.modules.financeiro.schemas import (
     BaixaRecebimentoCreate,
 )
 
+# Faixas do aging: (rótulo, máximo de dias de atraso; None = sem limite)
+FAIXAS_AGING: Tuple[Tuple[str, Optional[int]], ...] = (
+    ("0-30", 30),
+    ("31-60", 60),
+    ("61-90", 90),
+    ("90+", None),
+)
+
 
 class ContaPagarRepository:
     """Repository para operações de banco de dados de Contas a Pagar"""
@@ -110,7 +128,7 @@ class ContaPagarRepository:
             return None
 
         # Atualiza valor pago
-        conta.valor_pago += baixa_data.valor_pago
+        conta.valor_pago = Decimal(str(conta.valor_pago)) + Decimal(str(baixa_data.valor_pago))
         conta.data_pagamento = baixa_data.data_pagamento
 
         # Atualiza observações se fornecidas
@@ -178,7 +196,11 @@ class ContaPagarRepository:
         return list(result.scalars().all())
 
     async def get_por_periodo(
-        self, data_inicio: date, data_fim: date
+        self,
+        data_inicio: date,
+        data_fim: date,
+        skip: int = 0,
+        limit: Optional[int] = None,
     ) -> List[ContaPagar]:
         """Lista contas a pagar por período de vencimento"""
         query = (
@@ -189,11 +211,23 @@ class ContaPagarRepository:
                     ContaPagar.data_vencimento <= data_fim
                 )
             )
-            .order_by(ContaPagar.data_vencimento)
+            .order_by(ContaPagar.data_vencimento, ContaPagar.id)
+            .offset(skip)
+            .limit(limit)
         )
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def count_por_periodo(self, data_inicio: date, data_fim: date) -> int:
+        """Conta contas por período de vencimento"""
+        result = await self.session.execute(
+            select(func.count(ContaPagar.id)).where(
+                ContaPagar.data_vencimento >= data_inicio,
+                ContaPagar.data_vencimento <= data_fim,
+            )
+        )
+        return result.scalar_one()
+
     async def calcular_totais_periodo(
         self, data_inicio: date, data_fim: date
     ) -> Tuple[float, float]:
@@ -222,6 +256,152 @@ class ContaPagarRepository:
 
         return total_a_pagar, total_pago
 
+    async def get_para_baixa(self, conta_ids: Iterable[int]) -> Dict[int, RowMapping]:
+        """
+        Estado das contas para baixa em lote (uma consulta, linhas bloqueadas)
+
+        Returns:
+            Dict id -> colunas usadas na validação e na projeção
+        """
+        result = await self.session.execute(
+            select(
+                ContaPagar.id,
+                ContaPagar.status,
+                ContaPagar.valor_original,
+                ContaPagar.valor_pago,
+                ContaPagar.data_vencimento,
+                ContaPagar.data_pagamento,
+            )
+            .where(ContaPagar.id.in_(list(conta_ids)))
+            .order_by(ContaPagar.id)
+            .with_for_update()
+        )
+        return {linha["id"]: linha for linha in result.mappings()}
+
+    async def baixar_em_lote(self, baixas: List[dict]) -> None:
+        """
+        Aplica as baixas com um UPDATE executemany
+
+        Args:
+            baixas: Dicts com b_id, b_valor (somado ao valor pago), b_data,
+                b_status e b_obs (anexada às observações, opcional)
+        """
+        tabela = ContaPagar.__table__
+        observacao = bindparam("b_obs", type_=Text)
+        await self.session.execute(
+            tabela.update()
+            .where(tabela.c.id == bindparam("b_id"))
+            .values(
+                valor_pago=tabela.c.valor_pago + bindparam("b_valor", type_=Numeric(10, 2)),
+                data_pagamento=bindparam("b_data"),
+                status=bindparam("b_status", type_=tabela.c.status.type),
+                observacoes=case(
+                    (observacao.is_(None), tabela.c.observacoes),
+                    (tabela.c.observacoes.is_(None), observacao),
+                    else_=tabela.c.observacoes + "\n" + observacao,
+                ),
+                updated_at=datetime.utcnow(),
+            ),
+            baixas,
+        )
+        marcar_tabelas_alteradas(self.session, "contas_pagar")
+
+    async def calcular_resumo_fluxo(self) -> Dict[str, float]:
+        """
+        Totais do fluxo de caixa em uma única consulta (agregação condicional)
+
+        Returns:
+            Dict com pendente (saldo das PENDENTES), pago (contas pagas),
+            vencidas (quantidade) e valor_vencido
+        """
+        saldo = ContaPagar.valor_original - ContaPagar.valor_pago
+        vencida = and_(
+            ContaPagar.status.in_([StatusFinanceiro.PENDENTE, StatusFinanceiro.ATRASADA]),
+            ContaPagar.data_vencimento < date.today(),
+        )
+        query = select(
+            func.coalesce(func.sum(case((ContaPagar.status == StatusFinanceiro.PENDENTE, saldo), else_=0)), 0),
+            func.coalesce(
+                func.sum(case((ContaPagar.status == StatusFinanceiro.PAGA, ContaPagar.valor_pago), else_=0)), 0
+            ),
+            func.count(case((vencida, ContaPagar.id))),
+            func.coalesce(func.sum(case((vencida, saldo), else_=0)), 0),
+        ).where(ContaPagar.status != StatusFinanceiro.CANCELADA)
+        pendente, pago, vencidas, valor_vencido = (await self.session.execute(query)).one()
+        return {
+            "pendente": float(pendente),
+            "pago": float(pago),
+            "vencidas": int(vencidas),
+            "valor_vencido": float(valor_vencido),
+        }
+
+    async def count_vencidas(self) -> int:
+        """Conta contas a pagar vencidas (mesmo critério de get_vencidas)"""
+        result = await self.session.execute(
+            select(func.count(ContaPagar.id)).where(
+                ContaPagar.status.in_([StatusFinanceiro.PENDENTE, StatusFinanceiro.ATRASADA]),
+                ContaPagar.data_vencimento < date.today(),
+            )
+        )
+        return result.scalar_one()
+
+    async def marcar_atrasadas(self, hoje: date) -> int:
+        """
+        Marca como ATRASADA, em um único UPDATE, as contas PENDENTES vencidas
+
+        A projeção diária não muda: PENDENTE e ATRASADA são ambas em aberto.
+
+        Returns:
+            Quantidade de contas marcadas
+        """
+        tabela = ContaPagar.__table__
+        result = await self.session.execute(
+            tabela.update()
+            .where(
+                tabela.c.status == StatusFinanceiro.PENDENTE,
+                tabela.c.data_vencimento < hoje,
+            )
+            .values(status=StatusFinanceiro.ATRASADA, updated_at=datetime.utcnow())
+        )
+        if result.rowcount:
+            marcar_tabelas_alteradas(self.session, "contas_pagar")
+        return result.rowcount
+
+    async def calcular_aging(self, hoje: date) -> Dict[str, Tuple[int, float]]:
+        """
+        Quantidade e saldo em aberto das contas vencidas por faixa de atraso
+
+        Uma única consulta agrupada; a faixa é calculada por comparação de
+        datas, o que evita aritmética de datas específica de cada banco.
+
+        Returns:
+            Dict faixa -> (quantidade, saldo); faixas vazias não aparecem
+        """
+        faixa = case(
+            *[
+                (ContaPagar.data_vencimento >= hoje - timedelta(days=dias), rotulo)
+                for rotulo, dias in FAIXAS_AGING
+                if dias is not None
+            ],
+            else_=FAIXAS_AGING[-1][0],
+        )
+        vencidas = (
+            select(
+                faixa.label("faixa"),
+                (ContaPagar.valor_original - ContaPagar.valor_pago).label("saldo"),
+            )
+            .where(
+                ContaPagar.status.in_([StatusFinanceiro.PENDENTE, StatusFinanceiro.ATRASADA]),
+                ContaPagar.data_vencimento < hoje,
+            )
+            .subquery()
+        )
+        result = await self.session.execute(
+            select(vencidas.c.faixa, func.count(), func.coalesce(func.sum(vencidas.c.saldo), 0))
+            .group_by(vencidas.c.faixa)
+        )
+        return {faixa: (int(quantidade), float(saldo)) for faixa, quantidade, saldo in result.all()}
+
 
 class ContaReceberRepository:
     """Repository para operações de banco de dados de Contas a Receber"""
@@ -316,7 +496,7 @@ class ContaReceberRepository:
             return None
 
         # Atualiza valor recebido
-        conta.valor_recebido += baixa_data.valor_recebido
+        conta.valor_recebido = Decimal(str(conta.valor_recebido)) + Decimal(str(baixa_data.valor_recebido))
         conta.data_recebimento = baixa_data.data_recebimento
 
         # Atualiza observações se fornecidas
@@ -384,7 +564,11 @@ class ContaReceberRepository:
         return list(result.scalars().all())
 
     async def get_por_periodo(
-        self, data_inicio: date, data_fim: date
+        self,
+        data_inicio: date,
+        data_fim: date,
+        skip: int = 0,
+        limit: Optional[int] = None,
     ) -> List[ContaReceber]:
         """Lista contas a receber por período de vencimento"""
         query = (
@@ -395,11 +579,23 @@ class ContaReceberRepository:
                     ContaReceber.data_vencimento <= data_fim
                 )
             )
-            .order_by(ContaReceber.data_vencimento)
+            .order_by(ContaReceber.data_vencimento, ContaReceber.id)
+            .offset(skip)
+            .limit(limit)
         )
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def count_por_periodo(self, data_inicio: date, data_fim: date) -> int:
+        """Conta contas por período de vencimento"""
+        result = await self.session.execute(
+            select(func.count(ContaReceber.id)).where(
+                ContaReceber.data_vencimento >= data_inicio,
+                ContaReceber.data_vencimento <= data_fim,
+            )
+        )
+        return result.scalar_one()
+
     async def calcular_totais_periodo(
         self, data_inicio: date, data_fim: date
     ) -> Tuple[float, float]:
@@ -427,3 +623,202 @@ class ContaReceberRepository:
         total_recebido = result_recebido.scalar_one() or 0.0
 
         return total_a_receber, total_recebido
+
+    async def get_para_baixa(self, conta_ids: Iterable[int]) -> Dict[int, RowMapping]:
+        """
+        Estado das contas para baixa em lote (uma consulta, linhas bloqueadas)
+
+        Returns:
+            Dict id -> colunas usadas na validação e na projeção
+        """
+        result = await self.session.execute(
+            select(
+                ContaReceber.id,
+                ContaReceber.status,
+                ContaReceber.valor_original,
+                ContaReceber.valor_recebido,
+                ContaReceber.data_vencimento,
+                ContaReceber.data_recebimento,
+            )
+            .where(ContaReceber.id.in_(list(conta_ids)))
+            .order_by(ContaReceber.id)
+            .with_for_update()
+        )
+        return {linha["id"]: linha for linha in result.mappings()}
+
+    async def baixar_em_lote(self, baixas: List[dict]) -> None:
+        """
+        Aplica as baixas com um UPDATE executemany
+
+        Args:
+            baixas: Dicts com b_id, b_valor (somado ao valor recebido), b_data,
+                b_status e b_obs (anexada às observações, opcional)
+        """
+        tabela = ContaReceber.__table__
+        observacao = bindparam("b_obs", type_=Text)
+        await self.session.execute(
+            tabela.update()
+            .where(tabela.c.id == bindparam("b_id"))
+            .values(
+                valor_recebido=tabela.c.valor_recebido + bindparam("b_valor", type_=Numeric(10, 2)),
+                data_recebimento=bindparam("b_data"),
+                status=bindparam("b_status", type_=tabela.c.status.type),
+                observacoes=case(
+                    (observacao.is_(None), tabela.c.observacoes),
+                    (tabela.c.observacoes.is_(None), observacao),
+                    else_=tabela.c.observacoes + "\n" + observacao,
+                ),
+                updated_at=datetime.utcnow(),
+            ),
+            baixas,
+        )
+        marcar_tabelas_alteradas(self.session, "contas_receber")
+
+    async def calcular_resumo_fluxo(self) -> Dict[str, float]:
+        """
+        Totais do fluxo de caixa em uma única consulta (agregação condicional)
+
+        Returns:
+            Dict com pendente (saldo das PENDENTES), recebido (contas recebidas),
+            vencidas (quantidade) e valor_vencido
+        """
+        saldo = ContaReceber.valor_original - ContaReceber.valor_recebido
+        vencida = and_(
+            ContaReceber.status.in_([StatusFinanceiro.PENDENTE, StatusFinanceiro.ATRASADA]),
+            ContaReceber.data_vencimento < date.today(),
+        )
+        query = select(
+            func.coalesce(func.sum(case((ContaReceber.status == StatusFinanceiro.PENDENTE, saldo), else_=0)), 0),
+            func.coalesce(
+                func.sum(case(
+                    (ContaReceber.status == StatusFinanceiro.RECEBIDA, ContaReceber.valor_recebido), else_=0
+                )),
+                0,
+            ),
+            func.count(case((vencida, ContaReceber.id))),
+            func.coalesce(func.sum(case((vencida, saldo), else_=0)), 0),
+        ).where(ContaReceber.status != StatusFinanceiro.CANCELADA)
+        pendente, recebido, vencidas, valor_vencido = (await self.session.execute(query)).one()
+        return {
+            "pendente": float(pendente),
+            "recebido": float(recebido),
+            "vencidas": int(vencidas),
+            "valor_vencido": float(valor_vencido),
+        }
+
+    async def count_vencidas(self) -> int:
+        """Conta contas a receber vencidas (mesmo critério de get_vencidas)"""
+        result = await self.session.execute(
+            select(func.count(ContaReceber.id)).where(
+                ContaReceber.status.in_([StatusFinanceiro.PENDENTE, StatusFinanceiro.ATRASADA]),
+                ContaReceber.data_vencimento < date.today(),
+            )
+        )
+        return result.scalar_one()
+
+    async def marcar_atrasadas(self, hoje: date, documentos: Optional[Iterable[str]] = None) -> int:
+        """
+        Marca como ATRASADA, em um único UPDATE, as contas PENDENTES vencidas
+
+        A projeção diária não muda: PENDENTE e ATRASADA são ambas em aberto.
+
+        Args:
+            hoje: Data de referência
+            documentos: Restringe às contas com estes documentos (ex: nosso
+                número dos boletos vencidos)
+
+        Returns:
+            Quantidade de contas marcadas
+        """
+        tabela = ContaReceber.__table__
+        condicoes = [
+            tabela.c.status == StatusFinanceiro.PENDENTE,
+            tabela.c.data_vencimento < hoje,
+        ]
+        if documentos is not None:
+            condicoes.append(tabela.c.documento.in_(list(documentos)))
+        result = await self.session.execute(
+            tabela.update()
+            .where(*condicoes)
+            .values(status=StatusFinanceiro.ATRASADA, updated_at=datetime.utcnow())
+        )
+        if result.rowcount:
+            marcar_tabelas_alteradas(self.session, "contas_receber")
+        return result.rowcount
+
+    async def calcular_aging(self, hoje: date) -> Dict[str, Tuple[int, float]]:
+        """
+        Quantidade e saldo em aberto das contas vencidas por faixa de atraso
+
+        Uma única consulta agrupada; a faixa é calculada por comparação de
+        datas, o que evita aritmética de datas específica de cada banco.
+
+        Returns:
+            Dict faixa -> (quantidade, saldo); faixas vazias não aparecem
+        """
+        faixa = case(
+            *[
+                (ContaReceber.data_vencimento >= hoje - timedelta(days=dias), rotulo)
+                for rotulo, dias in FAIXAS_AGING
+                if dias is not None
+            ],
+            else_=FAIXAS_AGING[-1][0],
+        )
+        vencidas = (
+            select(
+                faixa.label("faixa"),
+                (ContaReceber.valor_original - ContaReceber.valor_recebido).label("saldo"),
+            )
+            .where(
+                ContaReceber.status.in_([StatusFinanceiro.PENDENTE, StatusFinanceiro.ATRASADA]),
+                ContaReceber.data_vencimento < hoje,
+            )
+            .subquery()
+        )
+        result = await self.session.execute(
+            select(vencidas.c.faixa, func.count(), func.coalesce(func.sum(vencidas.c.saldo), 0))
+            .group_by(vencidas.c.faixa)
+        )
+        return {faixa: (int(quantidade), float(saldo)) for faixa, quantidade, saldo in result.all()}
+
+
+class ProjecaoFluxoRepository:
+    """Repository da projeção diária do fluxo de caixa"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_serie(self, data_inicio: date, data_fim: date) -> List[FluxoCaixaDiario]:
+        """Dias do período que têm valores previstos ou realizados"""
+        result = await self.session.execute(
+            select(FluxoCaixaDiario)
+            .where(
+                FluxoCaixaDiario.data >= data_inicio,
+                FluxoCaixaDiario.data <= data_fim,
+            )
+            .order_by(FluxoCaixaDiario.data)
+        )
+        return list(result.scalars().all())
+
+    async def get_saldo_anterior(self, data: date) -> float:
+        """Saldo projetado acumulado (previsto + realizado) até o dia anterior a `data`"""
+        result = await self.session.execute(
+            select(
+                func.coalesce(
+                    func.sum(
+                        FluxoCaixaDiario.previsto_entradas
+                        - FluxoCaixaDiario.previsto_saidas
+                        + FluxoCaixaDiario.realizado_entradas
+                        - FluxoCaixaDiario.realizado_saidas
+                    ),
+                    0,
+                )
+            ).where(FluxoCaixaDiario.data < data)
+        )
+        return float(result.scalar_one())
+
+    async def aplicar_deltas(self, deltas: DeltasProjecao) -> None:
+        """Aplica ajustes calculados para escritas em lote (fora dos eventos do ORM)"""
+        if deltas:
+            connection = await self.session.connection()
+            await connection.run_sync(aplicar_deltas_projecao, deltas)
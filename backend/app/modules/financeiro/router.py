@@ -18,8 +18,11 @@ from app.modules.financeiro.schemas import (
     ContaReceberList,
     BaixaPagamentoCreate,
     BaixaRecebimentoCreate,
+    BaixaLoteCreate,
+    BaixaLoteResponse,
     FluxoCaixaResponse,
     FluxoCaixaPeriodoResponse,
+    AgingResponse,
 )
 
 router = APIRouter()
@@ -166,6 +169,39 @@ async def baixar_pagamento(
     return await service.baixar_pagamento(conta_id, baixa_data)
 
 
+@router.post(
+    "/contas-pagar/baixa-lote",
+    response_model=BaixaLoteResponse,
+    summary="Baixa em lote de contas a pagar",
+    description="Registra pagamentos de várias contas a pagar em uma operação",
+)
+async def baixar_pagamentos_lote(
+    lote: BaixaLoteCreate,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Registra pagamento de várias contas a pagar de uma vez.
+
+    **Regras:**
+    - Até 1000 contas por lote, cada conta uma única vez
+    - Mesmas regras da baixa individual, avaliadas por item
+    - Itens inválidos voltam com `sucesso=false` e o motivo; os demais são baixados
+    - Forma de pagamento e observações são anexadas às observações da conta
+
+    **Exemplo de requisição:**
+    ```json
+    {
+        "itens": [
+            {"conta_id": 10, "valor": 250.00, "data": "2025-12-15", "forma_pagamento": "PIX"},
+            {"conta_id": 11, "valor": 99.90, "data": "2025-12-15", "forma_pagamento": "PIX"}
+        ]
+    }
+    ```
+    """
+    service = FinanceiroService(db)
+    return await service.baixar_pagamentos_lote(lote)
+
+
 @router.delete(
     "/contas-pagar/{conta_id}",
     response_model=ContaPagarResponse,
@@ -217,7 +253,7 @@ async def get_contas_pagar_vencidas(
     **Critérios:**
     - Data de vencimento menor que hoje
     - Status PENDENTE ou ATRASADA
-    - Status é automaticamente atualizado para ATRASADA
+    - Contas ainda PENDENTES são exibidas como ATRASADA (a gravação é feita pela rotina noturna)
     """
     service = FinanceiroService(db)
     return await service.get_contas_pagar_vencidas(page, page_size)
@@ -366,6 +402,39 @@ async def baixar_recebimento(
     return await service.baixar_recebimento(conta_id, baixa_data)
 
 
+@router.post(
+    "/contas-receber/baixa-lote",
+    response_model=BaixaLoteResponse,
+    summary="Baixa em lote de contas a receber",
+    description="Registra recebimentos de várias contas a receber (retorno CNAB, liquidação de cartões)",
+)
+async def baixar_recebimentos_lote(
+    lote: BaixaLoteCreate,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Registra recebimento de várias contas a receber de uma vez.
+
+    **Regras:**
+    - Até 1000 contas por lote, cada conta uma única vez
+    - Mesmas regras da baixa individual, avaliadas por item
+    - Itens inválidos voltam com `sucesso=false` e o motivo; os demais são baixados
+    - Forma de pagamento e observações são anexadas às observações da conta
+
+    **Exemplo de requisição:**
+    ```json
+    {
+        "itens": [
+            {"conta_id": 10, "valor": 250.00, "data": "2025-12-15", "forma_pagamento": "BOLETO"},
+            {"conta_id": 11, "valor": 99.90, "data": "2025-12-15", "forma_pagamento": "BOLETO"}
+        ]
+    }
+    ```
+    """
+    service = FinanceiroService(db)
+    return await service.baixar_recebimentos_lote(lote)
+
+
 @router.delete(
     "/contas-receber/{conta_id}",
     response_model=ContaReceberResponse,
@@ -417,7 +486,7 @@ async def get_contas_receber_vencidas(
     **Critérios:**
     - Data de vencimento menor que hoje
     - Status PENDENTE ou ATRASADA
-    - Status é automaticamente atualizado para ATRASADA
+    - Contas ainda PENDENTES são exibidas como ATRASADA (a gravação é feita pela rotina noturna)
     """
     service = FinanceiroService(db)
     return await service.get_contas_receber_vencidas(page, page_size)
@@ -459,11 +528,14 @@ async def get_fluxo_caixa(db: AsyncSession = Depends(get_db)):
     "/fluxo-caixa/periodo",
     response_model=FluxoCaixaPeriodoResponse,
     summary="Fluxo de caixa por período",
-    description="Retorna fluxo de caixa detalhado de um período específico",
+    description="Retorna a série diária do fluxo de caixa de um período, com detalhe paginado opcional",
 )
 async def get_fluxo_periodo(
     data_inicio: date = Query(..., description="Data de início do período"),
     data_fim: date = Query(..., description="Data de fim do período"),
+    detalhar: bool = Query(False, description="Incluir página de contas do período"),
+    page: int = Query(1, ge=1, description="Página das contas (com detalhar)"),
+    page_size: int = Query(50, ge=1, le=100, description="Contas por página (com detalhar)"),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -472,15 +544,18 @@ async def get_fluxo_periodo(
     **Parâmetros:**
     - **data_inicio**: Data de início do período (formato: YYYY-MM-DD)
     - **data_fim**: Data de fim do período (formato: YYYY-MM-DD)
+    - **detalhar**: Se true, inclui uma página das contas a pagar e a receber
+    - **page** / **page_size**: Paginação das contas
 
     **Retorna:**
-    - Todas as contas a pagar do período
-    - Todas as contas a receber do período
+    - Série diária: previsto e realizado (entradas e saídas) e saldo acumulado
     - Totais calculados (a pagar, a receber, pago, recebido)
     - Saldo do período
+    - Contas do período (somente com detalhar=true, paginadas)
 
     **Exemplo:**
     - `/fluxo-caixa/periodo?data_inicio=2025-11-01&data_fim=2025-11-30`
+    - `/fluxo-caixa/periodo?data_inicio=2025-11-01&data_fim=2025-11-30&detalhar=true&page=2`
 
     **Útil para:**
     - Relatórios mensais
@@ -488,4 +563,38 @@ async def get_fluxo_periodo(
     - Planejamento financeiro
     """
     service = FinanceiroService(db)
-    return await service.get_fluxo_periodo(data_inicio, data_fim)
+    return await service.get_fluxo_periodo(data_inicio, data_fim, detalhar, page, page_size)
+
+
+# ============================================
+# ENDPOINTS DE AGING
+# ============================================
+
+@router.get(
+    "/aging",
+    response_model=AgingResponse,
+    summary="Aging de contas vencidas",
+    description="Retorna as contas vencidas em aberto agrupadas por faixa de dias de atraso",
+)
+async def get_aging(
+    tipo: str = Query(..., pattern="^(pagar|receber)$", description="pagar ou receber"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Retorna o aging das contas a pagar ou a receber.
+
+    **Faixas de atraso:** 0-30, 31-60, 61-90 e 90+ dias
+
+    **Inclui por faixa:**
+    - Quantidade de contas vencidas (PENDENTE ou ATRASADA)
+    - Saldo em aberto (original - pago/recebido)
+
+    **Exemplo:**
+    - `/aging?tipo=receber`
+
+    **Útil para:**
+    - Análise de inadimplência
+    - Priorização de cobranças e pagamentos
+    """
+    service = FinanceiroService(db)
+    return await service.get_aging(tipo)
@@ -186,6 +186,54 @@ class ContaReceberList(BaseModel):
     pages: int
 
 
+# ============================================
+# SCHEMAS DE BAIXA EM LOTE
+# ============================================
+
+class ItemBaixaLote(BaseModel):
+    """Item de baixa em lote (pagamento ou recebimento de um título)"""
+
+    conta_id: int = Field(..., gt=0, description="ID da conta")
+    valor: float = Field(..., gt=0, description="Valor pago/recebido")
+    data: date = Field(..., description="Data do pagamento/recebimento")
+    forma_pagamento: Optional[str] = Field(None, max_length=50, description="Forma (PIX, BOLETO, CARTAO...)")
+    observacoes: Optional[str] = Field(None, max_length=500, description="Observações sobre a baixa")
+
+
+class BaixaLoteCreate(BaseModel):
+    """Schema para baixa em lote de contas a pagar ou a receber"""
+
+    itens: list[ItemBaixaLote] = Field(..., min_length=1, max_length=1000, description="Baixas do lote")
+
+    @field_validator("itens")
+    @classmethod
+    def validar_contas_unicas(cls, v: list[ItemBaixaLote]) -> list[ItemBaixaLote]:
+        """Cada conta aparece uma única vez no lote"""
+        ids = [item.conta_id for item in v]
+        if len(ids) != len(set(ids)):
+            raise ValueError("Conta repetida no lote")
+        return v
+
+
+class ResultadoBaixaLote(BaseModel):
+    """Resultado da baixa de um item do lote"""
+
+    conta_id: int
+    sucesso: bool
+    status: Optional[StatusFinanceiroEnum] = None
+    valor_liquidado: Optional[float] = Field(None, description="Total pago/recebido após a baixa")
+    erro: Optional[str] = None
+
+
+class BaixaLoteResponse(BaseModel):
+    """Schema de resposta da baixa em lote"""
+
+    total: int
+    baixadas: int
+    rejeitadas: int
+    resultados: list[ResultadoBaixaLote]
+
+
 # ============================================
 # SCHEMAS DE FLUXO DE CAIXA
 # ============================================
@@ -204,6 +252,18 @@ class FluxoCaixaResponse(BaseModel):
     valor_vencido_receber: float = Field(..., description="Valor total vencido a receber")
 
 
+class FluxoCaixaDiaResponse(BaseModel):
+    """Schema de um dia da projeção do fluxo de caixa"""
+
+    data: date
+    previsto_entradas: float = Field(..., description="Saldo em aberto a receber com vencimento no dia")
+    previsto_saidas: float = Field(..., description="Saldo em aberto a pagar com vencimento no dia")
+    realizado_entradas: float = Field(..., description="Valor recebido no dia")
+    realizado_saidas: float = Field(..., description="Valor pago no dia")
+    saldo_dia: float = Field(..., description="Entradas - saídas (previstas e realizadas) do dia")
+    saldo_acumulado: float = Field(..., description="Saldo projetado acumulado até o fim do dia")
+
+
 class FluxoCaixaPeriodoResponse(BaseModel):
     """Schema de resposta para fluxo de caixa por período"""
 
@@ -214,5 +274,37 @@ class FluxoCaixaPeriodoResponse(BaseModel):
     total_pago: float
     total_recebido: float
     saldo_periodo: float
-    contas_pagar: list[ContaPagarResponse]
-    contas_receber: list[ContaReceberResponse]
+    saldo_inicial: float = Field(..., description="Saldo projetado acumulado antes do período")
+    dias: list[FluxoCaixaDiaResponse] = Field(..., description="Série diária do período")
+    contas_pagar: list[ContaPagarResponse] = Field(
+        default_factory=list, description="Página de contas a pagar (somente com detalhar=true)"
+    )
+    contas_receber: list[ContaReceberResponse] = Field(
+        default_factory=list, description="Página de contas a receber (somente com detalhar=true)"
+    )
+    total_contas_pagar: Optional[int] = Field(None, description="Contas a pagar no período (com detalhar=true)")
+    total_contas_receber: Optional[int] = Field(None, description="Contas a receber no período (com detalhar=true)")
+    page: Optional[int] = None
+    page_size: Optional[int] = None
+
+
+# ============================================
+# SCHEMAS DE AGING
+# ============================================
+
+class FaixaAgingResponse(BaseModel):
+    """Schema de uma faixa de dias de atraso do aging"""
+
+    faixa: str = Field(..., description="Faixa de dias de atraso (0-30, 31-60, 61-90, 90+)")
+    quantidade: int = Field(..., description="Quantidade de contas vencidas na faixa")
+    valor: float = Field(..., description="Saldo em aberto das contas da faixa")
+
+
+class AgingResponse(BaseModel):
+    """Schema de resposta do aging de contas a pagar ou a receber"""
+
+    tipo: str = Field(..., description="pagar ou receber")
+    data_referencia: date
+    faixas: list[FaixaAgingResponse]
+    total_quantidade: int
+    total_valor: float
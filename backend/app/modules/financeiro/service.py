@@ -1,13 +1,21 @@
 """
 Service Layer para Financeiro
 """
-from typing import Optional, List
-from datetime import date, datetime
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, List
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
 import math
 
-from app.modules.financeiro.repository import ContaPagarRepository, ContaReceberRepository
+from app.modules.financeiro.repository import (
+    FAIXAS_AGING,
+    ContaPagarRepository,
+    ContaReceberRepository,
+    ProjecaoFluxoRepository,
+)
 from app.modules.financeiro.models import StatusFinanceiro
+from app.modules.financeiro.projecao import diferenca_projecao
 from app.modules.financeiro.schemas import (
     ContaPagarCreate,
     ContaPagarUpdate,
@@ -17,16 +25,44 @@ from app.modules.financeiro.schemas import (
     ContaReceberUpdate,
     ContaReceberResponse,
     ContaReceberList,
+    StatusFinanceiroEnum,
     BaixaPagamentoCreate,
     BaixaRecebimentoCreate,
+    BaixaLoteCreate,
+    BaixaLoteResponse,
+    ItemBaixaLote,
+    ResultadoBaixaLote,
     FluxoCaixaResponse,
+    FluxoCaixaDiaResponse,
     FluxoCaixaPeriodoResponse,
+    FaixaAgingResponse,
+    AgingResponse,
 )
+from app.core.cache import cache_service
 from app.core.exceptions import (
     NotFoundException,
     ValidationException,
     BusinessRuleException,
 )
+from app.core.versionamento import tabelas_alteradas_na_sessao, versoes_tabelas
+
+# Resumo do fluxo de caixa cacheado junto com as versões das tabelas de
+# contas e o dia do cálculo: qualquer escrita commitada (criação, baixa,
+# cancelamento, mudança para ATRASADA) ou a virada do dia invalida o valor
+_CHAVE_FLUXO_CAIXA = "financeiro:fluxo_caixa"
+_TABELAS_FLUXO_CAIXA = ("contas_pagar", "contas_receber")
+_TTL_FLUXO_CAIXA = 300
+
+# tabela -> (valor liquidado, data da baixa, status quitado, rótulo, verbo)
+_BAIXA_LOTE = {
+    "contas_pagar": ("valor_pago", "data_pagamento", StatusFinanceiro.PAGA, "pago", "pagar"),
+    "contas_receber": (
+        "valor_recebido", "data_recebimento", StatusFinanceiro.RECEBIDA, "recebido", "receber",
+    ),
+}
+
+# Limite da série diária por consulta (~10 anos)
+MAX_DIAS_FLUXO_PERIODO = 3660
 
 
 class FinanceiroService:
@@ -35,6 +71,7 @@ class FinanceiroService:
     def __init__(self, session: AsyncSession):
         self.conta_pagar_repo = ContaPagarRepository(session)
         self.conta_receber_repo = ContaReceberRepository(session)
+        self.projecao_repo = ProjecaoFluxoRepository(session)
         self.session = session
 
     # ============================================
@@ -63,10 +100,7 @@ class FinanceiroService:
         if not conta:
             raise NotFoundException(f"Conta a pagar {conta_id} não encontrada")
 
-        # Atualiza status se necessário
-        await self._atualizar_status_vencimento_pagar(conta)
-
-        return ContaPagarResponse.model_validate(conta)
+        return self._resposta_conta(ContaPagarResponse, conta)
 
     async def list_contas_pagar(
         self,
@@ -99,15 +133,11 @@ class FinanceiroService:
         )
         total = await self.conta_pagar_repo.count(fornecedor_id, status_enum, categoria)
 
-        # Atualiza status de vencimento
-        for conta in contas:
-            await self._atualizar_status_vencimento_pagar(conta)
-
         # Calcula total de páginas
         pages = math.ceil(total / page_size) if total > 0 else 1
 
         return ContaPagarList(
-            items=[ContaPagarResponse.model_validate(c) for c in contas],
+            items=[self._resposta_conta(ContaPagarResponse, c) for c in contas],
             total=total,
             page=page,
             page_size=page_size,
@@ -158,7 +188,7 @@ class FinanceiroService:
             raise BusinessRuleException("Não é possível pagar conta cancelada")
 
         # Valida que valor pago total não excede o original
-        total_pago = conta.valor_pago + baixa_data.valor_pago
+        total_pago = Decimal(str(conta.valor_pago)) + Decimal(str(baixa_data.valor_pago))
         if total_pago > conta.valor_original:
             raise ValidationException(
                 f"Valor total pago (R$ {total_pago:.2f}) não pode exceder valor original (R$ {conta.valor_original:.2f})"
@@ -202,14 +232,10 @@ class FinanceiroService:
         contas = await self.conta_pagar_repo.get_pendentes(skip, page_size)
         total = await self.conta_pagar_repo.count(status=StatusFinanceiro.PENDENTE)
 
-        # Atualiza status de vencimento
-        for conta in contas:
-            await self._atualizar_status_vencimento_pagar(conta)
-
         pages = math.ceil(total / page_size) if total > 0 else 1
 
         return ContaPagarList(
-            items=[ContaPagarResponse.model_validate(c) for c in contas],
+            items=[self._resposta_conta(ContaPagarResponse, c) for c in contas],
             total=total,
             page=page,
             page_size=page_size,
@@ -229,19 +255,12 @@ class FinanceiroService:
         skip = (page - 1) * page_size
 
         contas = await self.conta_pagar_repo.get_vencidas(skip, page_size)
-
-        # Atualiza status para ATRASADA
-        for conta in contas:
-            await self._atualizar_status_vencimento_pagar(conta)
-
-        # Conta novamente após atualizar status
-        total_contas = await self.conta_pagar_repo.get_vencidas(0, 10000)
-        total = len(total_contas)
+        total = await self.conta_pagar_repo.count_vencidas()
 
         pages = math.ceil(total / page_size) if total > 0 else 1
 
         return ContaPagarList(
-            items=[ContaPagarResponse.model_validate(c) for c in contas],
+            items=[self._resposta_conta(ContaPagarResponse, c) for c in contas],
             total=total,
             page=page,
             page_size=page_size,
@@ -275,10 +294,7 @@ class FinanceiroService:
         if not conta:
             raise NotFoundException(f"Conta a receber {conta_id} não encontrada")
 
-        # Atualiza status se necessário
-        await self._atualizar_status_vencimento_receber(conta)
-
-        return ContaReceberResponse.model_validate(conta)
+        return self._resposta_conta(ContaReceberResponse, conta)
 
     async def list_contas_receber(
         self,
@@ -311,15 +327,11 @@ class FinanceiroService:
         )
         total = await self.conta_receber_repo.count(cliente_id, status_enum, categoria)
 
-        # Atualiza status de vencimento
-        for conta in contas:
-            await self._atualizar_status_vencimento_receber(conta)
-
         # Calcula total de páginas
         pages = math.ceil(total / page_size) if total > 0 else 1
 
         return ContaReceberList(
-            items=[ContaReceberResponse.model_validate(c) for c in contas],
+            items=[self._resposta_conta(ContaReceberResponse, c) for c in contas],
             total=total,
             page=page,
             page_size=page_size,
@@ -370,7 +382,7 @@ class FinanceiroService:
             raise BusinessRuleException("Não é possível receber conta cancelada")
 
         # Valida que valor recebido total não excede o original
-        total_recebido = conta.valor_recebido + baixa_data.valor_recebido
+        total_recebido = Decimal(str(conta.valor_recebido)) + Decimal(str(baixa_data.valor_recebido))
         if total_recebido > conta.valor_original:
             raise ValidationException(
                 f"Valor total recebido (R$ {total_recebido:.2f}) não pode exceder valor original (R$ {conta.valor_original:.2f})"
@@ -414,14 +426,10 @@ class FinanceiroService:
         contas = await self.conta_receber_repo.get_pendentes(skip, page_size)
         total = await self.conta_receber_repo.count(status=StatusFinanceiro.PENDENTE)
 
-        # Atualiza status de vencimento
-        for conta in contas:
-            await self._atualizar_status_vencimento_receber(conta)
-
         pages = math.ceil(total / page_size) if total > 0 else 1
 
         return ContaReceberList(
-            items=[ContaReceberResponse.model_validate(c) for c in contas],
+            items=[self._resposta_conta(ContaReceberResponse, c) for c in contas],
             total=total,
             page=page,
             page_size=page_size,
@@ -441,25 +449,46 @@ class FinanceiroService:
         skip = (page - 1) * page_size
 
         contas = await self.conta_receber_repo.get_vencidas(skip, page_size)
-
-        # Atualiza status para ATRASADA
-        for conta in contas:
-            await self._atualizar_status_vencimento_receber(conta)
-
-        # Conta novamente após atualizar status
-        total_contas = await self.conta_receber_repo.get_vencidas(0, 10000)
-        total = len(total_contas)
+        total = await self.conta_receber_repo.count_vencidas()
 
         pages = math.ceil(total / page_size) if total > 0 else 1
 
         return ContaReceberList(
-            items=[ContaReceberResponse.model_validate(c) for c in contas],
+            items=[self._resposta_conta(ContaReceberResponse, c) for c in contas],
             total=total,
             page=page,
             page_size=page_size,
             pages=pages,
         )
 
+    # ============================================
+    # BAIXA EM LOTE
+    # ============================================
+
+    async def baixar_pagamentos_lote(self, lote: BaixaLoteCreate) -> BaixaLoteResponse:
+        """
+        Registra pagamentos de várias contas a pagar
+
+        Regras (por item, como em baixar_pagamento):
+        - Não pode pagar conta cancelada ou já paga
+        - Valor pago total não pode exceder valor original
+        - Itens inválidos são rejeitados sem impedir os demais
+        """
+        return await self._baixar_lote(self.conta_pagar_repo, "contas_pagar", lote)
+
+    async def baixar_recebimentos_lote(self, lote: BaixaLoteCreate) -> BaixaLoteResponse:
+        """
+        Registra recebimentos de várias contas a receber
+
+        Usado após retorno CNAB ou arquivo de liquidação de cartões.
+
+        Regras (por item, como em baixar_recebimento):
+        - Não pode receber conta cancelada ou já recebida
+        - Valor recebido total não pode exceder valor original
+        - Itens inválidos são rejeitados sem impedir os demais
+        """
+        return await self._baixar_lote(self.conta_receber_repo, "contas_receber", lote)
+
     # ============================================
     # FLUXO DE CAIXA
     # ============================================
@@ -468,6 +497,10 @@ class FinanceiroService:
         """
         Retorna resumo do fluxo de caixa atual
 
+        Os totais são agregados no banco (uma consulta por tabela) e o
+        resultado fica em cache até a próxima escrita em contas a pagar ou a
+        receber.
+
         Retorna:
         - Total a pagar (contas pendentes)
         - Total a receber (contas pendentes)
@@ -476,108 +509,308 @@ class FinanceiroService:
         - Total recebido
         - Contas vencidas
         """
-        # Busca todas as contas pendentes
-        contas_pagar_pendentes = await self.conta_pagar_repo.get_all(
-            skip=0, limit=10000, status=StatusFinanceiro.PENDENTE
-        )
-        contas_receber_pendentes = await self.conta_receber_repo.get_all(
-            skip=0, limit=10000, status=StatusFinanceiro.PENDENTE
-        )
-
-        # Busca contas atrasadas
-        contas_pagar_atrasadas = await self.conta_pagar_repo.get_vencidas(skip=0, limit=10000)
-        contas_receber_atrasadas = await self.conta_receber_repo.get_vencidas(skip=0, limit=10000)
-
-        # Calcula totais
-        total_a_pagar = sum(
-            c.valor_original - c.valor_pago
-            for c in contas_pagar_pendentes
-        )
-        total_a_receber = sum(
-            c.valor_original - c.valor_recebido
-            for c in contas_receber_pendentes
-        )
-
-        # Busca contas pagas e recebidas
-        contas_pagas = await self.conta_pagar_repo.get_all(
-            skip=0, limit=10000, status=StatusFinanceiro.PAGA
-        )
-        contas_recebidas = await self.conta_receber_repo.get_all(
-            skip=0, limit=10000, status=StatusFinanceiro.RECEBIDA
-        )
-
-        total_pago = sum(c.valor_pago for c in contas_pagas)
-        total_recebido = sum(c.valor_recebido for c in contas_recebidas)
-
-        # Calcula valores vencidos
-        valor_vencido_pagar = sum(
-            c.valor_original - c.valor_pago
-            for c in contas_pagar_atrasadas
-        )
-        valor_vencido_receber = sum(
-            c.valor_original - c.valor_recebido
-            for c in contas_receber_atrasadas
-        )
-
-        return FluxoCaixaResponse(
-            total_a_pagar=total_a_pagar,
-            total_a_receber=total_a_receber,
-            saldo_projetado=total_a_receber - total_a_pagar,
-            total_pago=total_pago,
-            total_recebido=total_recebido,
-            contas_vencidas_pagar=len(contas_pagar_atrasadas),
-            contas_vencidas_receber=len(contas_receber_atrasadas),
-            valor_vencido_pagar=valor_vencido_pagar,
-            valor_vencido_receber=valor_vencido_receber,
+        # Com escritas pendentes na própria sessão o cache não vale
+        usar_cache = not tabelas_alteradas_na_sessao(self.session).intersection(_TABELAS_FLUXO_CAIXA)
+        if usar_cache:
+            versoes, _ = await versoes_tabelas.obter(_TABELAS_FLUXO_CAIXA)
+            marcador = (versoes, date.today().isoformat())
+            em_cache = await cache_service.get(_CHAVE_FLUXO_CAIXA)
+            if em_cache and em_cache["marcador"] == marcador:
+                return FluxoCaixaResponse(**em_cache["resumo"])
+
+        pagar = await self.conta_pagar_repo.calcular_resumo_fluxo()
+        receber = await self.conta_receber_repo.calcular_resumo_fluxo()
+
+        resumo = FluxoCaixaResponse(
+            total_a_pagar=pagar["pendente"],
+            total_a_receber=receber["pendente"],
+            saldo_projetado=receber["pendente"] - pagar["pendente"],
+            total_pago=pagar["pago"],
+            total_recebido=receber["recebido"],
+            contas_vencidas_pagar=pagar["vencidas"],
+            contas_vencidas_receber=receber["vencidas"],
+            valor_vencido_pagar=pagar["valor_vencido"],
+            valor_vencido_receber=receber["valor_vencido"],
         )
+        if usar_cache:
+            await cache_service.set(
+                _CHAVE_FLUXO_CAIXA,
+                {"marcador": marcador, "resumo": resumo.model_dump()},
+                ttl=_TTL_FLUXO_CAIXA,
+            )
+        return resumo
 
     async def get_fluxo_periodo(
-        self, data_inicio: date, data_fim: date
+        self,
+        data_inicio: date,
+        data_fim: date,
+        detalhar: bool = False,
+        page: int = 1,
+        page_size: int = 50,
     ) -> FluxoCaixaPeriodoResponse:
         """
         Retorna fluxo de caixa por período
 
+        A série diária vem da projeção mantida incrementalmente
+        (fluxo_caixa_diario), então o custo depende do número de dias e não
+        do número de contas. As contas só são listadas com `detalhar`, uma
+        página por vez.
+
         Args:
             data_inicio: Data de início do período
             data_fim: Data de fim do período
+            detalhar: Inclui a página `page` das contas do período
+            page: Página das contas (com detalhar)
+            page_size: Contas por página (máx. 100)
 
         Retorna:
-            Fluxo de caixa detalhado do período
+            Série diária, totais e saldo do período
         """
         # Valida período
         if data_fim < data_inicio:
             raise ValidationException("Data fim não pode ser anterior à data início")
+        if (data_fim - data_inicio).days >= MAX_DIAS_FLUXO_PERIODO:
+            raise ValidationException(
+                f"Período não pode ter mais de {MAX_DIAS_FLUXO_PERIODO} dias"
+            )
 
-        # Busca contas do período
-        contas_pagar = await self.conta_pagar_repo.get_por_periodo(data_inicio, data_fim)
-        contas_receber = await self.conta_receber_repo.get_por_periodo(data_inicio, data_fim)
+        saldo_inicial = await self.projecao_repo.get_saldo_anterior(data_inicio)
+        por_dia = {d.data: d for d in await self.projecao_repo.get_serie(data_inicio, data_fim)}
 
-        # Calcula totais
-        total_a_pagar, total_pago = await self.conta_pagar_repo.calcular_totais_periodo(
-            data_inicio, data_fim
+        dias = []
+        saldo = saldo_inicial
+        totais = dict.fromkeys(
+            ("previsto_entradas", "previsto_saidas", "realizado_entradas", "realizado_saidas"), 0.0
         )
-        total_a_receber, total_recebido = await self.conta_receber_repo.calcular_totais_periodo(
-            data_inicio, data_fim
+        for deslocamento in range((data_fim - data_inicio).days + 1):
+            dia = data_inicio + timedelta(days=deslocamento)
+            registro = por_dia.get(dia)
+            valores = {
+                coluna: float(getattr(registro, coluna)) if registro else 0.0
+                for coluna in totais
+            }
+            for coluna, valor in valores.items():
+                totais[coluna] += valor
+            saldo_dia = (
+                valores["previsto_entradas"] - valores["previsto_saidas"]
+                + valores["realizado_entradas"] - valores["realizado_saidas"]
+            )
+            saldo += saldo_dia
+            dias.append(FluxoCaixaDiaResponse(
+                data=dia,
+                **{coluna: round(valor, 2) for coluna, valor in valores.items()},
+                saldo_dia=round(saldo_dia, 2),
+                saldo_acumulado=round(saldo, 2),
+            ))
+
+        resposta = FluxoCaixaPeriodoResponse(
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            total_a_pagar=round(totais["previsto_saidas"], 2),
+            total_a_receber=round(totais["previsto_entradas"], 2),
+            total_pago=round(totais["realizado_saidas"], 2),
+            total_recebido=round(totais["realizado_entradas"], 2),
+            saldo_periodo=round(totais["realizado_entradas"] - totais["realizado_saidas"], 2),
+            saldo_inicial=round(saldo_inicial, 2),
+            dias=dias,
         )
 
-        saldo_periodo = total_recebido - total_pago
+        if detalhar:
+            page = max(page, 1)
+            if page_size < 1 or page_size > 100:
+                page_size = 50
+            skip = (page - 1) * page_size
+            contas_pagar = await self.conta_pagar_repo.get_por_periodo(
+                data_inicio, data_fim, skip=skip, limit=page_size
+            )
+            contas_receber = await self.conta_receber_repo.get_por_periodo(
+                data_inicio, data_fim, skip=skip, limit=page_size
+            )
+            resposta.contas_pagar = [self._resposta_conta(ContaPagarResponse, c) for c in contas_pagar]
+            resposta.contas_receber = [self._resposta_conta(ContaReceberResponse, c) for c in contas_receber]
+            resposta.total_contas_pagar = await self.conta_pagar_repo.count_por_periodo(data_inicio, data_fim)
+            resposta.total_contas_receber = await self.conta_receber_repo.count_por_periodo(data_inicio, data_fim)
+            resposta.page = page
+            resposta.page_size = page_size
 
-        return FluxoCaixaPeriodoResponse(
-            data_inicio=data_inicio,
-            data_fim=data_fim,
-            total_a_pagar=total_a_pagar,
-            total_a_receber=total_a_receber,
-            total_pago=total_pago,
-            total_recebido=total_recebido,
-            saldo_periodo=saldo_periodo,
-            contas_pagar=[ContaPagarResponse.model_validate(c) for c in contas_pagar],
-            contas_receber=[ContaReceberResponse.model_validate(c) for c in contas_receber],
+        return resposta
+
+    # ============================================
+    # VENCIMENTOS E AGING
+    # ============================================
+
+    async def atualizar_status_vencidas(self, hoje: Optional[date] = None) -> Dict[str, int]:
+        """
+        Marca como ATRASADA todas as contas PENDENTES vencidas
+
+        Executada pela rotina noturna (app/tasks/financeiro.py): um UPDATE
+        por tabela, no lugar da atualização conta a conta durante as leituras.
+
+        Args:
+            hoje: Data de referência (padrão: hoje)
+
+        Returns:
+            Quantidade de contas marcadas por tabela
+        """
+        hoje = hoje or date.today()
+        return {
+            "contas_pagar": await self.conta_pagar_repo.marcar_atrasadas(hoje),
+            "contas_receber": await self.conta_receber_repo.marcar_atrasadas(hoje),
+        }
+
+    async def marcar_recebimentos_atrasados(
+        self, documentos: Iterable[str], hoje: Optional[date] = None
+    ) -> int:
+        """
+        Marca como ATRASADA as contas a receber PENDENTES vencidas dos documentos
+
+        Usado pela varredura de boletos vencidos (pagamentos/services/vencimentos.py),
+        na mesma transação, sem esperar a rotina noturna.
+
+        Args:
+            documentos: Documentos das contas (nosso número dos boletos)
+            hoje: Data de referência (padrão: hoje)
+
+        Returns:
+            Quantidade de contas marcadas
+        """
+        documentos = list(documentos)
+        if not documentos:
+            return 0
+        return await self.conta_receber_repo.marcar_atrasadas(hoje or date.today(), documentos)
+
+    async def get_aging(self, tipo: str, hoje: Optional[date] = None) -> AgingResponse:
+        """
+        Aging das contas vencidas em aberto por faixa de dias de atraso
+
+        Args:
+            tipo: "pagar" ou "receber"
+            hoje: Data de referência (padrão: hoje)
+
+        Retorna:
+            Quantidade e saldo em aberto nas faixas 0-30, 31-60, 61-90 e 90+
+        """
+        repositorios = {"pagar": self.conta_pagar_repo, "receber": self.conta_receber_repo}
+        if tipo not in repositorios:
+            raise ValidationException(f"Tipo '{tipo}' inválido (use 'pagar' ou 'receber')")
+
+        hoje = hoje or date.today()
+        por_faixa = await repositorios[tipo].calcular_aging(hoje)
+
+        faixas = [
+            FaixaAgingResponse(
+                faixa=faixa,
+                quantidade=por_faixa.get(faixa, (0, 0.0))[0],
+                valor=round(por_faixa.get(faixa, (0, 0.0))[1], 2),
+            )
+            for faixa, _ in FAIXAS_AGING
+        ]
+        return AgingResponse(
+            tipo=tipo,
+            data_referencia=hoje,
+            faixas=faixas,
+            total_quantidade=sum(f.quantidade for f in faixas),
+            total_valor=round(sum(f.valor for f in faixas), 2),
         )
 
     # ============================================
     # MÉTODOS AUXILIARES PRIVADOS
     # ============================================
 
+    async def _baixar_lote(self, repository, tabela: str, lote: BaixaLoteCreate) -> BaixaLoteResponse:
+        """
+        Valida o lote inteiro com uma consulta e aplica as baixas válidas
+
+        As contas são lidas (e bloqueadas) de uma vez; os UPDATEs saem em um
+        único executemany, seguidos dos ajustes da projeção diária.
+        """
+        liquidado, data_baixa, status_final, rotulo, acao = _BAIXA_LOTE[tabela]
+        contas = await repository.get_para_baixa(item.conta_id for item in lote.itens)
+
+        baixas, resultados = [], []
+        deltas = defaultdict(Decimal)
+        for item in lote.itens:
+            conta = contas.get(item.conta_id)
+            if conta is None:
+                erro = f"Conta a {acao} {item.conta_id} não encontrada"
+            elif conta["status"] == StatusFinanceiro.CANCELADA:
+                erro = f"Não é possível {acao} conta cancelada"
+            elif conta["status"] == status_final:
+                erro = f"Conta já está com status '{status_final.value}'"
+            else:
+                erro = None
+                original = Decimal(str(conta["valor_original"]))
+                total = Decimal(str(conta[liquidado])) + Decimal(str(item.valor))
+                if total > original:
+                    erro = (
+                        f"Valor total {rotulo} (R$ {total:.2f}) não pode exceder "
+                        f"valor original (R$ {original:.2f})"
+                    )
+
+            if erro:
+                resultados.append(ResultadoBaixaLote(conta_id=item.conta_id, sucesso=False, erro=erro))
+                continue
+
+            if total >= original:
+                status = status_final
+            elif conta["status"] == StatusFinanceiro.ATRASADA:
+                status = StatusFinanceiro.ATRASADA
+            else:
+                status = StatusFinanceiro.PENDENTE
+
+            antes = dict(conta)
+            depois = {**antes, liquidado: total, data_baixa: item.data, "status": status}
+            for chave, valor in diferenca_projecao(tabela, antes, depois).items():
+                deltas[chave] += valor
+
+            baixas.append({
+                "b_id": item.conta_id,
+                "b_valor": Decimal(str(item.valor)),
+                "b_data": item.data,
+                "b_status": status,
+                "b_obs": self._observacao_baixa(item),
+            })
+            resultados.append(ResultadoBaixaLote(
+                conta_id=item.conta_id, sucesso=True, status=status, valor_liquidado=float(total),
+            ))
+
+        if baixas:
+            await repository.baixar_em_lote(baixas)
+            await self.projecao_repo.aplicar_deltas(deltas)
+
+        return BaixaLoteResponse(
+            total=len(resultados),
+            baixadas=len(baixas),
+            rejeitadas=len(resultados) - len(baixas),
+            resultados=resultados,
+        )
+
+    @staticmethod
+    def _observacao_baixa(item: ItemBaixaLote) -> Optional[str]:
+        """Forma de pagamento e observações do item, anexadas às observações da conta"""
+        partes = []
+        if item.forma_pagamento:
+            partes.append(f"[{item.forma_pagamento.upper()}]")
+        if item.observacoes:
+            partes.append(item.observacoes)
+        return " ".join(partes) or None
+
+    @staticmethod
+    def _resposta_conta(schema, conta):
+        """
+        Resposta da conta sem escrever no banco
+
+        Conta PENDENTE vencida que a rotina noturna ainda não marcou é
+        exibida como ATRASADA.
+        """
+        resposta = schema.model_validate(conta)
+        if (
+            resposta.status == StatusFinanceiroEnum.PENDENTE
+            and resposta.data_vencimento < date.today()
+        ):
+            resposta.status = StatusFinanceiroEnum.ATRASADA
+        return resposta
+
     async def _atualizar_status_vencimento_pagar(self, conta) -> None:
         """Atualiza status da conta a pagar se estiver vencida"""
         hoje = date.today()
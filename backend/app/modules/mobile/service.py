@@ -14,6 +14,8 @@ from app.modules.mobile.schemas import (
     EstoqueConsultaResponse,
 )
 from app.modules.produtos.models import Produto
+from app.modules.produtos.repository import ProdutoRepository
+from app.modules.produtos.indice_codigo_barras import indice_codigo_barras
 from app.modules.clientes.models import Cliente
 from app.modules.vendas.models import Venda, ItemVenda
 from app.modules.vendas.service import VendasService
@@ -44,23 +46,11 @@ class MobileService:
         Returns:
             Lista de produtos encontrados (versão resumida)
         """
-        # Busca por código de barras exato ou descrição parcial
-        query = (
-            select(Produto)
-            .where(
-                Produto.ativo == True,
-                or_(
-                    Produto.codigo_barras.ilike(f"%{termo}%"),
-                    Produto.descricao.ilike(f"%{termo}%")
-                )
-            )
-            .order_by(Produto.descricao)
-            .limit(limit)
+        # Busca por relevância (full-text/trigrama ou índice n-grama)
+        produtos = await ProdutoRepository(self.session).search_by_descricao(
+            termo, 0, limit, apenas_ativos=True
         )
 
-        result = await self.session.execute(query)
-        produtos = result.scalars().all()
-
         return [ProdutoMobileResponse.model_validate(p) for p in produtos]
 
     async def buscar_produto_por_codigo_barras(
@@ -75,16 +65,15 @@ class MobileService:
         Returns:
             Produto encontrado ou None
         """
-        query = select(Produto).where(
-            Produto.codigo_barras == codigo,
-            Produto.ativo == True
-        )
-
-        result = await self.session.execute(query)
-        produto = result.scalar_one_or_none()
-
+        produto = await indice_codigo_barras.buscar(self.session, codigo)
         if produto:
-            return ProdutoMobileResponse.model_validate(produto)
+            return ProdutoMobileResponse(
+                id=produto.id,
+                descricao=produto.descricao,
+                codigo_barras=produto.codigo_barras,
+                preco_venda=produto.preco_venda,
+                estoque_atual=produto.estoque_atual,
+            )
         return None
 
     async def consultar_estoque(self, produto_id: int) -> EstoqueConsultaResponse:
@@ -5,10 +5,13 @@ from typing import Optional, List
 from datetime import datetime
 from decimal import Decimal
 import math
+from sqlalchemy import Integer, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.sequencias import proximo_numero
+
 from app.modules.nfe.repository import NotaFiscalRepository
-from app.modules.nfe.models import TipoNota, StatusNota
+from app.modules.nfe.models import NotaFiscal, TipoNota, StatusNota
 from app.modules.nfe.schemas import (
     NotaFiscalCreate,
     NotaFiscalResponse,
@@ -169,6 +172,27 @@ class NotaFiscalService:
 
             await self.estoque_service.entrada_estoque(entrada_data)
 
+    async def _proximo_numero_nfce(self, serie: str) -> int:
+        """
+        Próximo número de NFC-e da série
+
+        Reservado um a um (bloco 1): numeração fiscal não deve ter lacunas
+        além das notas que falharem depois da reserva.
+        """
+
+        async def ultimo_emitido(executor) -> int:
+            # Números com mais de 9 dígitos são os simulados antigos (timestamp)
+            result = await executor.execute(
+                select(func.max(cast(NotaFiscal.numero, Integer))).where(
+                    NotaFiscal.tipo == TipoNota.NFCE,
+                    NotaFiscal.serie == serie,
+                    func.length(NotaFiscal.numero) <= 9,
+                )
+            )
+            return result.scalar() or 0
+
+        return await proximo_numero(self.session, f"nfce.serie.{serie}", inicial=ultimo_emitido, bloco=1)
+
     async def emitir_nfce(self, emissao_data: EmitirNFCeCreate) -> NotaFiscalResponse:
         """
         Emite NFC-e para uma venda (simulado)
@@ -189,13 +213,15 @@ class NotaFiscalService:
         # TODO: Buscar dados da venda quando módulo vendas estiver completo
         # Por enquanto, cria uma nota simulada
 
+        numero = await self._proximo_numero_nfce(emissao_data.serie)
+
         # Gera chave de acesso simulada (44 dígitos)
-        chave_simulada = self._gerar_chave_simulada()
+        chave_simulada = self._gerar_chave_simulada(emissao_data.serie, numero)
 
         # Cria nota fiscal
         nota_data = NotaFiscalCreate(
             tipo=TipoNotaEnum.NFCE,
-            numero=str(datetime.now().timestamp())[:10],  # Número simulado
+            numero=str(numero),
             serie=emissao_data.serie,
             chave_acesso=chave_simulada,
             data_emissao=datetime.now(),
@@ -220,17 +246,20 @@ class NotaFiscalService:
 
         return NotaFiscalResponse.model_validate(nota)
 
-    def _gerar_chave_simulada(self) -> str:
+    def _gerar_chave_simulada(self, serie: str, numero: int) -> str:
         """
         Gera uma chave de acesso simulada de 44 dígitos
 
+        Série e número ficam nas posições da chave oficial (23-25 e 26-34),
+        então notas emitidas no mesmo segundo não repetem a chave.
+
         Returns:
             Chave de acesso simulada
         """
         # Em produção, usaria algoritmo oficial de geração de chave
         timestamp = str(int(datetime.now().timestamp()))
-        chave = timestamp.ljust(44, "0")
-        return chave[:44]
+        chave = timestamp.ljust(22, "0")[:22] + serie.zfill(3)[-3:] + str(numero).zfill(9)
+        return chave.ljust(44, "0")
 
     async def consultar_nota(self, nota_id: int) -> ConsultarNotaResponse:
         """
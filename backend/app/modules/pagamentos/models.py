@@ -4,7 +4,9 @@ Models para Pagamentos (PIX, Boleto, Conciliação)
 from datetime import datetime, date
 from typing import Optional
 from decimal import Decimal
-from sqlalchemy import String, Boolean, DateTime, ForeignKey, Numeric, Date, Text, Enum as SQLEnum
+from sqlalchemy import (
+    String, Boolean, DateTime, ForeignKey, Numeric, Date, Text, Enum as SQLEnum, UniqueConstraint
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
@@ -33,6 +35,14 @@ class StatusPagamento(str, enum.Enum):
     EXPIRADO = "expirado"
 
 
+class StatusWebhookRecebido(str, enum.Enum):
+    """Status de um webhook de gateway na caixa de entrada"""
+    PENDENTE = "pendente"
+    PROCESSADO = "processado"
+    ERRO = "erro"  # Será tentado de novo
+    FALHOU = "falhou"  # Tentativas esgotadas (reprocessar manualmente)
+
+
 class TipoChavePix(str, enum.Enum):
     """Tipos de chave PIX"""
     CPF = "cpf"
@@ -108,7 +118,7 @@ class TransacaoPix(Base):
     status: Mapped[StatusPagamento] = mapped_column(SQLEnum(StatusPagamento), default=StatusPagamento.PENDENTE)
     data_criacao: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     data_pagamento: Mapped[datetime] = mapped_column(DateTime, nullable=True)
-    data_expiracao: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    data_expiracao: Mapped[datetime] = mapped_column(DateTime, nullable=True, index=True)
 
     # QR Code (para cobrança)
     qr_code_texto: Mapped[str] = mapped_column(Text, nullable=True)  # Texto do QR Code (copia e cola)
@@ -272,6 +282,8 @@ class ExtratoBancario(Base):
     # Import
     arquivo_origem: Mapped[str] = mapped_column(String(500), nullable=True)
     linha_arquivo: Mapped[int] = mapped_column(nullable=True)
+    # SHA-256 do conteúdo do lançamento: reimportar o mesmo período não duplica
+    hash_conteudo: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, unique=True, index=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
@@ -299,8 +311,8 @@ class ConciliacaoBancaria(Base):
     tipo: Mapped[str] = mapped_column(String(50), nullable=False)  # pix, boleto, transferencia, etc
 
     # IDs relacionados
-    transacao_pix_id: Mapped[int] = mapped_column(ForeignKey('transacoes_pix.id'), nullable=True)
-    boleto_id: Mapped[int] = mapped_column(ForeignKey('boletos.id'), nullable=True)
+    transacao_pix_id: Mapped[int] = mapped_column(ForeignKey('transacoes_pix.id'), nullable=True, index=True)
+    boleto_id: Mapped[int] = mapped_column(ForeignKey('boletos.id'), nullable=True, index=True)
 
     # Dados da conciliação
     valor_sistema: Mapped[Decimal] = mapped_column(Numeric(15, 2), nullable=False)
@@ -310,6 +322,8 @@ class ConciliacaoBancaria(Base):
     # Automática ou manual
     automatica: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     usuario_id: Mapped[int] = mapped_column(nullable=True)  # Usuário que fez conciliação manual
+    # 0 a 1 (matching por valor/data)
+    confianca: Mapped[Optional[Decimal]] = mapped_column(Numeric(5, 4), nullable=True)
 
     # Observações
     observacoes: Mapped[str] = mapped_column(Text, nullable=True)
@@ -321,6 +335,75 @@ class ConciliacaoBancaria(Base):
         "ExtratoBancario",
         back_populates="conciliacao"
     )
+    contas_receber: Mapped[list["ConciliacaoContaReceber"]] = relationship(
+        "ConciliacaoContaReceber",
+        back_populates="conciliacao"
+    )
 
     def __repr__(self):
         return f"<ConciliacaoBancaria(tipo={self.tipo}, diferenca={self.diferenca})>"
+
+
+class ConciliacaoContaReceber(Base):
+    """
+    Conta a receber coberta por uma conciliação
+
+    Permite que um único lançamento (ex: depósito da adquirente de cartão)
+    concilie várias contas a receber
+    """
+    __tablename__ = 'conciliacoes_contas_receber'
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    conciliacao_id: Mapped[int] = mapped_column(
+        ForeignKey('conciliacoes_bancarias.id', ondelete='CASCADE'), nullable=False, index=True
+    )
+    conta_receber_id: Mapped[int] = mapped_column(ForeignKey('contas_receber.id'), nullable=False, index=True)
+    valor: Mapped[Decimal] = mapped_column(Numeric(15, 2), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    # Relacionamentos
+    conciliacao: Mapped["ConciliacaoBancaria"] = relationship(
+        "ConciliacaoBancaria",
+        back_populates="contas_receber"
+    )
+
+    def __repr__(self):
+        return f"<ConciliacaoContaReceber(conta_receber_id={self.conta_receber_id}, valor={self.valor})>"
+
+
+# ==============================================================================
+# Models Webhooks de Gateways
+# ==============================================================================
+
+class WebhookRecebido(Base):
+    """
+    Caixa de entrada de webhooks dos gateways de pagamento
+
+    O endpoint só valida a assinatura e grava aqui; os workers processam
+    em lote. (gateway, evento_id) é único: reenvios do gateway não duplicam.
+    """
+    __tablename__ = 'webhooks_recebidos'
+    __table_args__ = (
+        UniqueConstraint('gateway', 'evento_id', name='uq_webhooks_recebidos_gateway_evento'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    gateway: Mapped[str] = mapped_column(String(20), nullable=False)
+    evento_id: Mapped[str] = mapped_column(String(150), nullable=False)
+    pagamento_id: Mapped[Optional[str]] = mapped_column(String(150), nullable=True, index=True)
+
+    payload: Mapped[str] = mapped_column(Text, nullable=False)  # JSON
+    headers: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON
+
+    status: Mapped[StatusWebhookRecebido] = mapped_column(
+        SQLEnum(StatusWebhookRecebido), default=StatusWebhookRecebido.PENDENTE, nullable=False, index=True
+    )
+    tentativas: Mapped[int] = mapped_column(default=0, nullable=False)
+    erro: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    recebido_em: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    processado_em: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<WebhookRecebido(gateway={self.gateway}, evento_id={self.evento_id}, status={self.status})>"
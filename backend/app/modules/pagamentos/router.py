@@ -5,7 +5,9 @@ from __future__ import annotations
 
 from typing import List
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status
+from decimal import Decimal
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
@@ -16,7 +18,7 @@ from app.modules.pagamentos.schemas import (
     # PIX
     ChavePixCreate, ChavePixInResponse,
     TransacaoPixCreate, TransacaoPixInResponse,
-    WebhookPixPayload,
+    WebhookPixPayload, QRCodePixResponse,
     # Boleto
     ConfiguracaoBoletoCreate, ConfiguracaoBoletoInResponse,
     BoletoCreate, BoletoInResponse,
@@ -25,12 +27,13 @@ from app.modules.pagamentos.schemas import (
     ConciliacaoBancariaInResponse,
     ImportCSVRequest,
     # CNAB
-    CNABRemessaRequest, CNABRemessaResponse,
+    CNABRemessaRequest, CNABRemessaResponse, CNABRemessaArquivoRequest,
     CNABRetornoRequest, CNABRetornoResponse,
 )
 from app.modules.pagamentos.services.pix_service import PixService
 from app.modules.pagamentos.services.boleto_service import BoletoService
 from app.modules.pagamentos.services.conciliacao_service import ConciliacaoService
+from app.modules.pagamentos.services.conciliacao_aproximada import ParametrosConciliacao
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -70,6 +73,26 @@ async def listar_chaves_pix(
     return await service.listar_chaves_pix(ativa=ativa)
 
 
+@router.get("/pix/chaves/{chave_id}/qrcode", response_model=QRCodePixResponse)
+async def qr_code_chave_pix(
+    chave_id: int,
+    valor: Decimal = Query(None, gt=0),
+    descricao: str = Query(None, max_length=72),
+    formato: str = Query("png", pattern="^(png|svg)$"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    QR Code estático de uma chave PIX (valor opcional)
+
+    Requer permissão: financeiro:read
+
+    A imagem é cacheada pelo payload: pedidos repetidos não renderizam de novo.
+    """
+    service = PixService(db)
+    return await service.gerar_qr_code_estatico(chave_id, valor, descricao, formato)
+
+
 @router.post("/pix/cobrar", response_model=TransacaoPixInResponse, status_code=status.HTTP_201_CREATED)
 async def criar_cobranca_pix(
     cobranca_data: TransacaoPixCreate,
@@ -230,6 +253,40 @@ async def importar_extrato_csv(
     return await service.importar_extrato_csv(import_data)
 
 
+@router.post("/conciliacao/importar-extrato")
+async def importar_extrato(
+    arquivo: UploadFile = File(..., description="Extrato CSV ou OFX"),
+    banco_codigo: str = Form(...),
+    agencia: str = Form(...),
+    conta: str = Form(...),
+    formato: str = Form("csv", pattern="^(csv|ofx)$"),
+    separador: str = Form(","),
+    encoding: str = Form("utf-8"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Importa extrato bancário (CSV ou OFX) enviado como arquivo
+
+    Requer permissão: financeiro:create
+
+    O arquivo é processado em streaming e gravado em lotes; lançamentos já
+    importados (extratos com períodos sobrepostos) são ignorados e contados
+    em "duplicados".
+    """
+    service = ConciliacaoService(db)
+    return await service.importar_extrato(
+        arquivo.file,
+        formato=formato,
+        banco_codigo=banco_codigo,
+        agencia=agencia,
+        conta=conta,
+        separador=separador,
+        encoding=encoding,
+        arquivo_origem=arquivo.filename,
+    )
+
+
 @router.get("/conciliacao/pendentes", response_model=List[ExtratoBancarioInResponse])
 async def listar_pendentes(
     banco_codigo: str,
@@ -269,7 +326,7 @@ async def auto_conciliar(
     Algoritmo:
     1. PIX: Match por E2E ID
     2. Boleto: Match por Nosso Número
-    3. Tolerância: ±R$0,01 e ±1 dia
+    3. Tolerância: ±R$0,01 no valor
     """
     service = ConciliacaoService(db)
     return await service.conciliar_automaticamente(
@@ -279,6 +336,49 @@ async def auto_conciliar(
     )
 
 
+@router.post("/conciliacao/auto-conciliar-valor")
+async def auto_conciliar_por_valor(
+    banco_codigo: str,
+    data_inicio: date,
+    data_fim: date,
+    tolerancia_valor: Decimal = Query(Decimal("0.01"), ge=0, le=10),
+    tolerancia_dias: int = Query(3, ge=0, le=30),
+    max_titulos: int = Query(4, ge=1, le=6),
+    confianca_minima: float = Query(0.8, ge=0, le=1),
+    aplicar: bool = False,
+    baixar_titulos: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Conciliação por valor e data contra contas a receber em aberto
+
+    Requer permissão: financeiro:update
+
+    Para créditos sem chave de documento (cartão, TED, depósito):
+    1. 1:1: valor ± tolerancia_valor e vencimento ± tolerancia_dias
+    2. N:1: um depósito cobrindo de 2 a max_titulos contas a receber
+    3. Cada sugestão traz confiança de 0 a 1
+
+    Com aplicar=false apenas retorna as sugestões; com aplicar=true grava as
+    que têm confiança >= confianca_minima (e baixa as contas com baixar_titulos=true).
+    """
+    service = ConciliacaoService(db)
+    return await service.conciliar_por_valor_data(
+        banco_codigo=banco_codigo,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        parametros=ParametrosConciliacao(
+            tolerancia_valor=tolerancia_valor,
+            tolerancia_dias=tolerancia_dias,
+            max_titulos=max_titulos
+        ),
+        confianca_minima=confianca_minima,
+        aplicar=aplicar,
+        baixar_titulos=baixar_titulos
+    )
+
+
 # ==============================================================================
 # CNAB 240/400
 # ==============================================================================
@@ -344,6 +444,50 @@ async def gerar_arquivo_cnab_remessa(
     )
 
 
+@router.post("/cnab/remessa/arquivo")
+async def baixar_arquivo_cnab_remessa(
+    request_data: CNABRemessaArquivoRequest,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Gera arquivo CNAB de remessa como download em streaming
+
+    Para remessas grandes (faturamento mensal): os boletos são lidos do banco
+    em partições e o arquivo é enviado conforme é gerado. Sem boleto_ids,
+    envia todos os boletos da configuração ainda não registrados.
+    """
+    from app.modules.pagamentos.services.cnab_service import CNABService
+    from datetime import datetime
+
+    service = CNABService(db)
+    try:
+        config = await service.carregar_configuracao(request_data.configuracao_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    async def conteudo():
+        # A sessão da dependency já foi encerrada quando o corpo é enviado:
+        # a leitura reabre a conexão e ela é devolvida ao fim do arquivo
+        try:
+            async for bloco in service.gerar_remessa_streaming(
+                config,
+                request_data.formato,
+                request_data.numero_remessa,
+                request_data.boleto_ids
+            ):
+                yield bloco
+        finally:
+            await db.close()
+
+    nome_arquivo = f"remessa_cnab{request_data.formato}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+    return StreamingResponse(
+        conteudo(),
+        media_type="text/plain; charset=latin-1",
+        headers={"Content-Disposition": f"attachment; filename={nome_arquivo}"}
+    )
+
+
 @router.post("/cnab/retorno", response_model=CNABRetornoResponse)
 async def processar_arquivo_cnab_retorno(
     request_data: CNABRetornoRequest,
@@ -353,7 +497,8 @@ async def processar_arquivo_cnab_retorno(
     """
     Processa arquivo CNAB de retorno (resposta do banco)
 
-    Atualiza status dos boletos com base nas ocorrências do arquivo.
+    Atualiza status dos boletos com base nas ocorrências do arquivo e baixa
+    as contas a receber (documento = nosso número) dos boletos liquidados.
     """
     from app.modules.pagamentos.services.cnab_service import CNABService
 
@@ -377,5 +522,6 @@ async def processar_arquivo_cnab_retorno(
         total_registros=resultado["total_registros"],
         boletos_atualizados=resultado["boletos_atualizados"],
         boletos_pagos=resultado["boletos_pagos"],
+        contas_receber_baixadas=resultado["contas_receber_baixadas"],
         erros=resultado.get("erros", [])
     )
@@ -52,6 +52,13 @@ class TransacaoPixCreate(BaseModel):
     pagador_documento: Optional[str] = None
     data_expiracao: Optional[datetime] = None
     webhook_url: Optional[str] = None
+    formato_qr_code: str = Field(default="png", pattern="^(png|svg)$")
+
+
+class QRCodePixResponse(BaseModel):
+    """QR Code estático de uma chave PIX"""
+    qr_code_texto: str  # BR Code (copia e cola)
+    qr_code_imagem: str  # Data URI (PNG ou SVG)
 
 
 class TransacaoPixInResponse(BaseModel):
@@ -268,6 +275,14 @@ class CNABRemessaRequest(BaseModel):
     numero_remessa: int = Field(default=1, ge=1)
 
 
+class CNABRemessaArquivoRequest(BaseModel):
+    """Request para geração do arquivo CNAB de remessa em streaming"""
+    configuracao_id: int
+    boleto_ids: Optional[list[int]] = Field(None, min_length=1)  # Sem ids: boletos não registrados
+    formato: str = Field(..., pattern="^(240|400)$")
+    numero_remessa: int = Field(default=1, ge=1)
+
+
 class CNABRetornoRequest(BaseModel):
     """Request para processamento de arquivo CNAB de retorno"""
     configuracao_id: int
@@ -291,4 +306,5 @@ class CNABRetornoResponse(BaseModel):
     total_registros: int
     boletos_atualizados: int
     boletos_pagos: int
+    contas_receber_baixadas: int = 0
     erros: list[dict] = []
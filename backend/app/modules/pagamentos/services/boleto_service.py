@@ -13,6 +13,7 @@ from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 
 from app.core.logging import get_logger, log_business_event
+from app.core.sequencias import proximo_numero
 from app.core.exceptions import NotFoundException, BusinessException
 from app.modules.pagamentos.models import (
     ConfiguracaoBoleto, Boleto, StatusBoleto
@@ -178,19 +179,21 @@ class BoletoService:
         return boleto
 
     async def _gerar_nosso_numero(self, config: ConfiguracaoBoleto) -> str:
-        """Gera nosso número sequencial"""
-        # Busca último nosso número
-        result = await self.db.execute(
-            select(Boleto).where(
-                Boleto.configuracao_id == config.id
-            ).order_by(Boleto.id.desc()).limit(1)
-        )
-        ultimo = result.scalar_one_or_none()
+        """Gera nosso número sequencial (sequência própria de cada configuração)"""
+
+        async def ultimo_emitido(executor) -> int:
+            # Ponto de partida da sequência: último boleto emitido antes dela
+            result = await executor.execute(
+                select(Boleto.nosso_numero).where(
+                    Boleto.configuracao_id == config.id
+                ).order_by(Boleto.id.desc()).limit(1)
+            )
+            ultimo = result.scalar_one_or_none()
+            return int(ultimo) if ultimo else 0
 
-        if ultimo:
-            proximo = int(ultimo.nosso_numero) + 1
-        else:
-            proximo = 1
+        proximo = await proximo_numero(
+            self.db, f"boleto.nosso_numero.{config.id}", inicial=ultimo_emitido
+        )
 
         # Formata com zeros à esquerda (11 dígitos)
         return str(proximo).zfill(11)
@@ -321,7 +324,7 @@ class BoletoService:
             select(Boleto)
             .options(selectinload(Boleto.configuracao))
             .where(
-                Boleto.status.in_([StatusBoleto.REGISTRADO, StatusBoleto.ABERTO]),
+                Boleto.status.in_([StatusBoleto.REGISTRADO, StatusBoleto.ABERTO, StatusBoleto.VENCIDO]),
                 Boleto.data_vencimento < data_limite
             )
             .order_by(Boleto.data_vencimento.asc())
@@ -330,6 +333,31 @@ class BoletoService:
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def marcar_vencidos(self, hoje: Optional[date] = None) -> List[str]:
+        """
+        Marca como VENCIDO, em um único UPDATE, os boletos em aberto vencidos
+
+        Não faz commit (varredura de app/modules/pagamentos/services/vencimentos.py).
+        Boleto vencido continua podendo ser pago (retorno CNAB) ou cancelado.
+
+        Args:
+            hoje: Data de referência (padrão: hoje)
+
+        Returns:
+            Nosso números dos boletos marcados
+        """
+        tabela = Boleto.__table__
+        result = await self.db.execute(
+            tabela.update()
+            .where(
+                tabela.c.status.in_([StatusBoleto.REGISTRADO, StatusBoleto.ABERTO]),
+                tabela.c.data_vencimento < (hoje or date.today())
+            )
+            .values(status=StatusBoleto.VENCIDO, updated_at=datetime.utcnow())
+            .returning(tabela.c.nosso_numero)
+        )
+        return list(result.scalars().all())
+
     async def cancelar_boleto(self, boleto_id: int) -> Boleto:
         """
         Cancela um boleto registrado
@@ -360,8 +388,8 @@ class BoletoService:
             logger.info(f"Boleto {boleto.nosso_numero} já estava cancelado")
             return boleto
 
-        # Apenas boletos em aberto ou registrados podem ser cancelados
-        if boleto.status not in [StatusBoleto.ABERTO, StatusBoleto.REGISTRADO]:
+        # Apenas boletos em aberto, registrados ou vencidos podem ser cancelados
+        if boleto.status not in [StatusBoleto.ABERTO, StatusBoleto.REGISTRADO, StatusBoleto.VENCIDO]:
             raise ValueError(
                 f"Apenas boletos em aberto ou registrados podem ser cancelados. Status atual: {boleto.status.value}"
             )
@@ -0,0 +1,147 @@
+"""
+BR Code PIX (padrão EMV QRCPS-MPM) e renderização do QR Code
+
+- gerar_br_code: payload "copia e cola" em TLV (id + tamanho + valor) com
+  CRC16-CCITT no campo 63, como no Manual de Padrões para Iniciação do PIX
+- renderizar_qr_code: PNG ou SVG em data URI, fora do event loop
+  (pool de threads próprio, limitado para não disputar CPU com as requisições)
+- chave_cache_qr_code: hash do payload; QR Codes de chave estática se repetem
+  e são servidos do cache em vez de renderizados de novo
+"""
+import asyncio
+import base64
+import hashlib
+import io
+import re
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Optional
+
+import qrcode
+import qrcode.image.svg
+
+FORMATOS_QR_CODE = ("png", "svg")
+
+# Renderizações simultâneas (cada uma ocupa uma CPU)
+MAX_THREADS_QR_CODE = 2
+
+_GUI_PIX = "br.gov.bcb.pix"
+_MAX_NOME = 25
+_MAX_CIDADE = 15
+# Campo 62-05 (txid): até 25 letras e números
+MAX_TXID = 25
+_TXID_ESTATICO = "***"
+
+_executor_qr_code: Optional[ThreadPoolExecutor] = None
+
+
+def _campo(identificador: str, valor: str) -> str:
+    if len(valor) > 99:
+        raise ValueError(f"Campo {identificador} do BR Code excede 99 caracteres")
+    return f"{identificador}{len(valor):02d}{valor}"
+
+
+def _texto_emv(texto: str, tamanho: int) -> str:
+    """Remove acentos e caracteres fora do conjunto aceito pelo EMV"""
+    sem_acento = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return re.sub(r"[^A-Za-z0-9 $%*+\-./:]", "", sem_acento).strip()[:tamanho]
+
+
+def crc16_ccitt(payload: str) -> str:
+    """CRC16-CCITT (polinômio 0x1021, valor inicial 0xFFFF) em 4 dígitos hexadecimais"""
+    crc = 0xFFFF
+    for byte in payload.encode():
+        crc ^= byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+            crc &= 0xFFFF
+    return f"{crc:04X}"
+
+
+def gerar_br_code(
+    chave: str,
+    nome_recebedor: str,
+    cidade: str,
+    valor: Optional[Decimal] = None,
+    txid: Optional[str] = None,
+    descricao: Optional[str] = None,
+) -> str:
+    """
+    Gera o BR Code (PIX Copia e Cola)
+
+    Args:
+        chave: Chave PIX do recebedor
+        nome_recebedor: Nome do recebedor (até 25 caracteres)
+        cidade: Cidade do recebedor (até 15 caracteres)
+        valor: Valor fixo (None = pagador informa o valor)
+        txid: Identificador da cobrança; só letras e números, até 25
+            caracteres (None = QR Code estático reutilizável, "***")
+        descricao: Informação adicional exibida ao pagador
+
+    Returns:
+        Payload com CRC16 no final
+    """
+    conta = _campo("00", _GUI_PIX) + _campo("01", chave)
+    if descricao:
+        espaco = 99 - len(conta) - 4
+        descricao = _texto_emv(descricao, espaco)
+        if descricao:
+            conta += _campo("02", descricao)
+
+    referencia = re.sub(r"[^A-Za-z0-9]", "", txid or "")[:MAX_TXID] or _TXID_ESTATICO
+
+    payload = (
+        _campo("00", "01")
+        + (_campo("01", "12") if txid else "")  # Cobrança: QR Code de uso único
+        + _campo("26", conta)
+        + _campo("52", "0000")
+        + _campo("53", "986")  # BRL
+        + (_campo("54", f"{Decimal(valor):.2f}") if valor else "")
+        + _campo("58", "BR")
+        + _campo("59", _texto_emv(nome_recebedor, _MAX_NOME) or "N")
+        + _campo("60", _texto_emv(cidade, _MAX_CIDADE) or "N")
+        + _campo("62", _campo("05", referencia))
+        + "6304"
+    )
+    return payload + crc16_ccitt(payload)
+
+
+def chave_cache_qr_code(payload: str, formato: str) -> str:
+    """Chave do cache da imagem: hash do payload + formato"""
+    return f"pix:qr_code:{formato}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+def _renderizar(payload: str, formato: str) -> str:
+    qr = qrcode.QRCode(
+        error_correction=qrcode.constants.ERROR_CORRECT_M,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(payload)
+    qr.make(fit=True)
+
+    buffer = io.BytesIO()
+    if formato == "svg":
+        qr.make_image(image_factory=qrcode.image.svg.SvgPathImage).save(buffer)
+        tipo = "image/svg+xml"
+    else:
+        qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+        tipo = "image/png"
+    return f"data:{tipo};base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+
+async def renderizar_qr_code(payload: str, formato: str = "png") -> str:
+    """
+    Renderiza o QR Code em data URI sem bloquear o event loop
+
+    Raises:
+        ValueError: Formato não suportado
+    """
+    global _executor_qr_code
+    if formato not in FORMATOS_QR_CODE:
+        raise ValueError(f"Formato de QR Code não suportado: {formato}")
+    if _executor_qr_code is None:
+        _executor_qr_code = ThreadPoolExecutor(MAX_THREADS_QR_CODE, thread_name_prefix="qr_code")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor_qr_code, _renderizar, payload, formato)
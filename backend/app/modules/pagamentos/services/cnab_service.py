@@ -4,13 +4,18 @@ CNAB = Centro Nacional de Automação Bancária
 """
 from __future__ import annotations
 
+import io
 import logging
+from dataclasses import dataclass
 from datetime import date, datetime
 from decimal import Decimal
-from typing import List, Dict, Any, Optional
-from sqlalchemy import select
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from sqlalchemy import Row, bindparam, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.modules.financeiro.models import ContaReceber, StatusFinanceiro
+from app.modules.financeiro.schemas import BaixaLoteCreate, ItemBaixaLote
+from app.modules.financeiro.service import FinanceiroService
 from app.modules.pagamentos.models import (
     ConfiguracaoBoleto,
     Boleto,
@@ -20,6 +25,50 @@ from app.modules.pagamentos.models import (
 
 logger = logging.getLogger(__name__)
 
+# Nosso números por IN (...) e títulos por baixa em lote no processamento do retorno
+LOTE_RETORNO = 1000
+OCORRENCIA_LIQUIDACAO = "06"
+
+# Registros por bloco da remessa em streaming (e linhas por partição do cursor)
+LOTE_REMESSA = 1000
+ENCODING_CNAB = "latin-1"
+
+# Campos do boleto usados nos registros de remessa
+_COLUNAS_REMESSA = (
+    Boleto.id,
+    Boleto.nosso_numero,
+    Boleto.numero_documento,
+    Boleto.valor,
+    Boleto.data_emissao,
+    Boleto.data_vencimento,
+    Boleto.sacado_nome,
+    Boleto.sacado_documento,
+    Boleto.sacado_endereco,
+    Boleto.sacado_cep,
+    Boleto.sacado_cidade,
+    Boleto.sacado_uf,
+)
+
+
+@dataclass
+class OcorrenciaRetorno:
+    """Registro de detalhe do arquivo de retorno"""
+    linha: int
+    nosso_numero: str
+    codigo_ocorrencia: str
+    valor_pago: Decimal
+    data_pagamento: Optional[date]
+
+
+async def _iterar(itens: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in itens:
+        yield item
+
+
+def _codificar_registros(linhas: List[str]) -> bytes:
+    """Registros terminados em CRLF, no encoding do arquivo CNAB"""
+    return "".join(linha + "\r\n" for linha in linhas).encode(ENCODING_CNAB, errors="replace")
+
 
 class CNABService:
     """Serviço para operações com arquivos CNAB"""
@@ -51,43 +100,8 @@ class CNABService:
             f"Boletos: {len(boletos)}, Nº Remessa: {numero_remessa}"
         )
 
-        # Buscar configuração
-        stmt = select(ConfiguracaoBoleto).where(ConfiguracaoBoleto.id == configuracao_id)
-        result = await self.db.execute(stmt)
-        config = result.scalar_one_or_none()
-
-        if not config:
-            raise ValueError(f"Configuração {configuracao_id} não encontrada")
-
-        linhas = []
-
-        # Header do Arquivo (Registro 0)
-        linhas.append(self._gerar_header_arquivo_240(config, numero_remessa))
-
-        # Header do Lote (Registro 1)
-        linhas.append(self._gerar_header_lote_240(config, 1))
-
-        # Detalhe - Segmento P e Q para cada boleto
-        sequencial = 1
-        for boleto in boletos:
-            # Segmento P - Dados do boleto
-            linhas.append(self._gerar_segmento_p_240(config, boleto, 1, sequencial))
-            sequencial += 1
-
-            # Segmento Q - Dados do sacado
-            linhas.append(self._gerar_segmento_q_240(config, boleto, 1, sequencial))
-            sequencial += 1
-
-            # Segmento R - Opcional (multa, juros, descontos)
-            linhas.append(self._gerar_segmento_r_240(config, boleto, 1, sequencial))
-            sequencial += 1
-
-        # Trailer do Lote (Registro 5)
-        linhas.append(self._gerar_trailer_lote_240(len(boletos), 1))
-
-        # Trailer do Arquivo (Registro 9)
-        linhas.append(self._gerar_trailer_arquivo_240(1))
-
+        config = await self.carregar_configuracao(configuracao_id)
+        linhas = [linha async for linha in self._linhas_remessa_240(config, _iterar(boletos), numero_remessa)]
         conteudo = "\r\n".join(linhas)
 
         logger.info(f"CNAB 240 remessa gerado com sucesso - {len(linhas)} registros")
@@ -96,62 +110,35 @@ class CNABService:
     async def processar_cnab240_retorno(
         self,
         configuracao_id: int,
-        conteudo_arquivo: str
+        conteudo_arquivo: Union[str, Iterable[str]],
+        baixar_contas_receber: bool = True
     ) -> Dict[str, Any]:
         """
         Processa arquivo CNAB 240 de retorno (resposta do banco)
 
         Args:
             configuracao_id: ID da configuração bancária
-            conteudo_arquivo: Conteúdo do arquivo CNAB 240
+            conteudo_arquivo: Conteúdo do arquivo CNAB 240 (texto ou linhas)
+            baixar_contas_receber: Baixa as contas a receber dos boletos liquidados
 
         Returns:
             Dicionário com estatísticas do processamento
         """
         logger.info(f"Processando CNAB 240 retorno - Config: {configuracao_id}")
 
-        linhas = conteudo_arquivo.strip().split("\n")
-        total_registros = 0
-        boletos_atualizados = 0
-        boletos_pagos = 0
-        erros = []
-
-        for idx, linha in enumerate(linhas):
-            linha = linha.strip()
-            if not linha or len(linha) != 240:
-                continue
-
-            tipo_registro = linha[7:8]
-
-            # Processar apenas Segmento T (retorno de cobrança)
-            if tipo_registro == "3" and linha[13:14] == "T":
-                try:
-                    resultado = await self._processar_segmento_t_240(linha)
-                    total_registros += 1
-
-                    if resultado["atualizado"]:
-                        boletos_atualizados += 1
-
-                    if resultado["pago"]:
-                        boletos_pagos += 1
-
-                except Exception as e:
-                    logger.error(f"Erro ao processar linha {idx + 1}: {str(e)}")
-                    erros.append({"linha": idx + 1, "erro": str(e)})
-
-        await self.db.commit()
+        ocorrencias, erros = self._ler_retorno(
+            conteudo_arquivo,
+            tamanho=240,
+            detalhe=lambda linha: linha[7:8] == "3" and linha[13:14] == "T",
+            ler=self._ler_segmento_t_240,
+        )
+        resultado = await self._aplicar_retorno("240", ocorrencias, erros, baixar_contas_receber)
 
         logger.info(
-            f"CNAB 240 retorno processado - Atualizados: {boletos_atualizados}, "
-            f"Pagos: {boletos_pagos}, Erros: {len(erros)}"
+            f"CNAB 240 retorno processado - Atualizados: {resultado['boletos_atualizados']}, "
+            f"Pagos: {resultado['boletos_pagos']}, Erros: {len(erros)}"
         )
-
-        return {
-            "total_registros": total_registros,
-            "boletos_atualizados": boletos_atualizados,
-            "boletos_pagos": boletos_pagos,
-            "erros": erros
-        }
+        return resultado
 
     # ========== CNAB 400 (Layout antigo) ==========
 
@@ -177,25 +164,8 @@ class CNABService:
             f"Boletos: {len(boletos)}"
         )
 
-        stmt = select(ConfiguracaoBoleto).where(ConfiguracaoBoleto.id == configuracao_id)
-        result = await self.db.execute(stmt)
-        config = result.scalar_one_or_none()
-
-        if not config:
-            raise ValueError(f"Configuração {configuracao_id} não encontrada")
-
-        linhas = []
-
-        # Header do Arquivo (Registro 0)
-        linhas.append(self._gerar_header_arquivo_400(config, numero_remessa))
-
-        # Detalhe para cada boleto (Registro 1)
-        for idx, boleto in enumerate(boletos, start=1):
-            linhas.append(self._gerar_detalhe_400(config, boleto, idx))
-
-        # Trailer do Arquivo (Registro 9)
-        linhas.append(self._gerar_trailer_arquivo_400(len(boletos)))
-
+        config = await self.carregar_configuracao(configuracao_id)
+        linhas = [linha async for linha in self._linhas_remessa_400(config, _iterar(boletos), numero_remessa)]
         conteudo = "\r\n".join(linhas)
 
         logger.info(f"CNAB 400 remessa gerado com sucesso - {len(linhas)} registros")
@@ -204,63 +174,312 @@ class CNABService:
     async def processar_cnab400_retorno(
         self,
         configuracao_id: int,
-        conteudo_arquivo: str
+        conteudo_arquivo: Union[str, Iterable[str]],
+        baixar_contas_receber: bool = True
     ) -> Dict[str, Any]:
         """
         Processa arquivo CNAB 400 de retorno
 
         Args:
             configuracao_id: ID da configuração bancária
-            conteudo_arquivo: Conteúdo do arquivo CNAB 400
+            conteudo_arquivo: Conteúdo do arquivo CNAB 400 (texto ou linhas)
+            baixar_contas_receber: Baixa as contas a receber dos boletos liquidados
 
         Returns:
             Dicionário com estatísticas
         """
         logger.info(f"Processando CNAB 400 retorno - Config: {configuracao_id}")
 
-        linhas = conteudo_arquivo.strip().split("\n")
-        total_registros = 0
-        boletos_atualizados = 0
-        boletos_pagos = 0
+        ocorrencias, erros = self._ler_retorno(
+            conteudo_arquivo,
+            tamanho=400,
+            detalhe=lambda linha: linha[0:1] == "1",
+            ler=self._ler_detalhe_400,
+        )
+        resultado = await self._aplicar_retorno("400", ocorrencias, erros, baixar_contas_receber)
+
+        logger.info(
+            f"CNAB 400 retorno processado - Atualizados: {resultado['boletos_atualizados']}, "
+            f"Pagos: {resultado['boletos_pagos']}"
+        )
+        return resultado
+
+    # ========== Remessa em streaming (240 e 400) ==========
+
+    async def carregar_configuracao(self, configuracao_id: int) -> ConfiguracaoBoleto:
+        """
+        Busca a configuração bancária
+
+        Raises:
+            ValueError: Configuração não encontrada
+        """
+        stmt = select(ConfiguracaoBoleto).where(ConfiguracaoBoleto.id == configuracao_id)
+        result = await self.db.execute(stmt)
+        config = result.scalar_one_or_none()
+
+        if not config:
+            raise ValueError(f"Configuração {configuracao_id} não encontrada")
+        return config
+
+    async def gerar_remessa_streaming(
+        self,
+        config: ConfiguracaoBoleto,
+        formato: str,
+        numero_remessa: int = 1,
+        boleto_ids: Optional[List[int]] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Gera o arquivo de remessa em blocos, sem montar o arquivo em memória
+
+        Os boletos vêm de um cursor no servidor (yield_per) e cada bloco de
+        LOTE_REMESSA registros é entregue assim que fica pronto; contadores e
+        totais dos trailers são acumulados durante a geração. Serve tanto para
+        StreamingResponse quanto para gravar em arquivo:
+
+            async for bloco in service.gerar_remessa_streaming(config, "240"):
+                arquivo.write(bloco)
+
+        Args:
+            config: Configuração bancária (carregar_configuracao)
+            formato: 240 ou 400
+            numero_remessa: Número sequencial do arquivo
+            boleto_ids: Boletos a enviar; sem eles, todos os boletos da
+                configuração ainda não registrados no banco
+        """
+        gerar = self._linhas_remessa_240 if formato == "240" else self._linhas_remessa_400
+        bloco = []
+        total = 0
+        async for linha in gerar(config, self._stream_boletos_remessa(config.id, boleto_ids), numero_remessa):
+            bloco.append(linha)
+            if len(bloco) >= LOTE_REMESSA:
+                total += len(bloco)
+                yield _codificar_registros(bloco)
+                bloco = []
+        if bloco:
+            total += len(bloco)
+            yield _codificar_registros(bloco)
+
+        logger.info(f"CNAB {formato} remessa gerado em streaming - {total} registros")
+
+    async def _stream_boletos_remessa(
+        self, configuracao_id: int, boleto_ids: Optional[List[int]]
+    ) -> AsyncIterator[Row]:
+        """Boletos da remessa lidos em partições de LOTE_REMESSA linhas"""
+        if boleto_ids is None:
+            consultas = [
+                select(*_COLUNAS_REMESSA)
+                .where(Boleto.configuracao_id == configuracao_id, Boleto.registrado.is_(False))
+                .order_by(Boleto.id)
+            ]
+        else:
+            ids = sorted(set(boleto_ids))
+            consultas = [
+                select(*_COLUNAS_REMESSA)
+                .where(Boleto.id.in_(ids[inicio:inicio + LOTE_REMESSA]))
+                .order_by(Boleto.id)
+                for inicio in range(0, len(ids), LOTE_REMESSA)
+            ]
+
+        for consulta in consultas:
+            result = await self.db.stream(consulta.execution_options(yield_per=LOTE_REMESSA))
+            async for particao in result.partitions():
+                for boleto in particao:
+                    yield boleto
+
+    async def _linhas_remessa_240(
+        self, config: ConfiguracaoBoleto, boletos: AsyncIterator[Any], numero_remessa: int
+    ) -> AsyncIterator[str]:
+        """Registros do arquivo CNAB 240 (um lote; P, Q e R por boleto)"""
+        yield self._gerar_header_arquivo_240(config, numero_remessa)
+        yield self._gerar_header_lote_240(config, 1)
+
+        qtd_boletos = 0
+        valor_total = Decimal(0)
+        sequencial = 1
+        async for boleto in boletos:
+            yield self._gerar_segmento_p_240(config, boleto, 1, sequencial)
+            yield self._gerar_segmento_q_240(config, boleto, 1, sequencial + 1)
+            yield self._gerar_segmento_r_240(config, boleto, 1, sequencial + 2)
+            sequencial += 3
+            qtd_boletos += 1
+            valor_total += boleto.valor
+
+        yield self._gerar_trailer_lote_240(config, qtd_boletos, 1, valor_total)
+        yield self._gerar_trailer_arquivo_240(config, 1, qtd_boletos * 3 + 4)
+
+    async def _linhas_remessa_400(
+        self, config: ConfiguracaoBoleto, boletos: AsyncIterator[Any], numero_remessa: int
+    ) -> AsyncIterator[str]:
+        """Registros do arquivo CNAB 400 (header, um detalhe por boleto, trailer)"""
+        yield self._gerar_header_arquivo_400(config, numero_remessa)
+
+        qtd_boletos = 0
+        async for boleto in boletos:
+            qtd_boletos += 1
+            yield self._gerar_detalhe_400(config, boleto, qtd_boletos)
+
+        yield self._gerar_trailer_arquivo_400(qtd_boletos)
+
+    # ========== Processamento do retorno (240 e 400) ==========
+
+    def _ler_retorno(
+        self,
+        conteudo_arquivo: Union[str, Iterable[str]],
+        tamanho: int,
+        detalhe: Callable[[str], bool],
+        ler: Callable[[int, str], OcorrenciaRetorno],
+    ) -> Tuple[List[OcorrenciaRetorno], List[Dict[str, Any]]]:
+        """
+        Percorre o arquivo linha a linha e extrai os registros de detalhe
+
+        Linhas com tamanho diferente do layout são ignoradas; registros com
+        campos inválidos entram em erros sem interromper a leitura.
+        """
+        linhas = io.StringIO(conteudo_arquivo) if isinstance(conteudo_arquivo, str) else conteudo_arquivo
+        ocorrencias = []
         erros = []
 
-        for idx, linha in enumerate(linhas):
-            linha = linha.strip()
-            if not linha or len(linha) != 400:
+        for numero, linha in enumerate(linhas, start=1):
+            linha = linha.rstrip("\r\n")
+            if len(linha) != tamanho or not detalhe(linha):
                 continue
+            try:
+                ocorrencias.append(ler(numero, linha))
+            except (ValueError, ArithmeticError) as e:
+                logger.error(f"Erro ao processar linha {numero}: {str(e)}")
+                erros.append({"linha": numero, "erro": str(e)})
 
-            tipo_registro = linha[0:1]
-
-            # Processar apenas Registro 1 (Detalhe)
-            if tipo_registro == "1":
-                try:
-                    resultado = await self._processar_detalhe_400(linha)
-                    total_registros += 1
+        return ocorrencias, erros
 
-                    if resultado["atualizado"]:
-                        boletos_atualizados += 1
+    async def _aplicar_retorno(
+        self,
+        layout: str,
+        ocorrencias: List[OcorrenciaRetorno],
+        erros: List[Dict[str, Any]],
+        baixar_contas_receber: bool
+    ) -> Dict[str, Any]:
+        """
+        Aplica as ocorrências do retorno em lote
 
-                    if resultado["pago"]:
-                        boletos_pagos += 1
+        - Boletos: uma consulta IN (...) por LOTE_RETORNO nosso números
+        - Liquidações: um UPDATE executemany
+        - Contas a receber com documento = nosso número: baixa em lote
+          (FinanceiroService.baixar_recebimentos_lote)
+        """
+        boletos = await self._carregar_boletos(sorted({o.nosso_numero for o in ocorrencias}))
 
-                except Exception as e:
-                    logger.error(f"Erro ao processar linha {idx + 1}: {str(e)}")
-                    erros.append({"linha": idx + 1, "erro": str(e)})
+        boletos_atualizados = 0
+        boletos_pagos = 0
+        liquidacoes: Dict[str, OcorrenciaRetorno] = {}
+        for ocorrencia in ocorrencias:
+            if ocorrencia.nosso_numero not in boletos:
+                logger.warning(f"Boleto não encontrado - Nosso número: {ocorrencia.nosso_numero}")
+                continue
+            boletos_atualizados += 1
+            if ocorrencia.codigo_ocorrencia == OCORRENCIA_LIQUIDACAO:
+                boletos_pagos += 1
+                liquidacoes[ocorrencia.nosso_numero] = ocorrencia
+
+        if liquidacoes:
+            tabela = Boleto.__table__
+            await self.db.execute(
+                tabela.update()
+                .where(tabela.c.id == bindparam("b_id"))
+                .values(
+                    status=StatusBoleto.PAGO,
+                    valor_pago=bindparam("b_valor_pago"),
+                    data_pagamento=func.coalesce(bindparam("b_data_pagamento"), tabela.c.data_pagamento),
+                    updated_at=datetime.utcnow(),
+                ),
+                [
+                    {
+                        "b_id": boletos[nosso_numero],
+                        "b_valor_pago": ocorrencia.valor_pago,
+                        "b_data_pagamento": ocorrencia.data_pagamento,
+                    }
+                    for nosso_numero, ocorrencia in liquidacoes.items()
+                ],
+            )
+
+        contas_baixadas = 0
+        if liquidacoes and baixar_contas_receber:
+            contas_baixadas = await self._baixar_contas_receber(layout, liquidacoes)
 
         await self.db.commit()
 
-        logger.info(
-            f"CNAB 400 retorno processado - Atualizados: {boletos_atualizados}, "
-            f"Pagos: {boletos_pagos}"
-        )
-
         return {
-            "total_registros": total_registros,
+            "total_registros": len(ocorrencias),
             "boletos_atualizados": boletos_atualizados,
             "boletos_pagos": boletos_pagos,
+            "contas_receber_baixadas": contas_baixadas,
             "erros": erros
         }
 
+    async def _carregar_boletos(self, nosso_numeros: List[str]) -> Dict[str, int]:
+        """nosso número -> id dos boletos existentes"""
+        boletos = {}
+        for inicio in range(0, len(nosso_numeros), LOTE_RETORNO):
+            result = await self.db.execute(
+                select(Boleto.nosso_numero, Boleto.id).where(
+                    Boleto.nosso_numero.in_(nosso_numeros[inicio:inicio + LOTE_RETORNO])
+                )
+            )
+            boletos.update((nosso_numero, boleto_id) for nosso_numero, boleto_id in result)
+        return boletos
+
+    async def _baixar_contas_receber(
+        self, layout: str, liquidacoes: Dict[str, OcorrenciaRetorno]
+    ) -> int:
+        """
+        Baixa as contas a receber cujo documento é o nosso número liquidado
+
+        O valor baixado é limitado ao saldo da conta (juros e multa pagos no
+        boleto não entram no título). Documentos com mais de uma conta em
+        aberto são ambíguos e ficam para baixa manual.
+        """
+        nosso_numeros = sorted(liquidacoes)
+        por_documento: Dict[str, List[Tuple[int, Decimal]]] = {}
+        for inicio in range(0, len(nosso_numeros), LOTE_RETORNO):
+            result = await self.db.execute(
+                select(
+                    ContaReceber.documento,
+                    ContaReceber.id,
+                    ContaReceber.valor_original - ContaReceber.valor_recebido,
+                ).where(
+                    ContaReceber.documento.in_(nosso_numeros[inicio:inicio + LOTE_RETORNO]),
+                    ContaReceber.status.notin_([StatusFinanceiro.RECEBIDA, StatusFinanceiro.CANCELADA]),
+                )
+            )
+            for documento, conta_id, saldo in result:
+                por_documento.setdefault(documento, []).append((conta_id, Decimal(str(saldo))))
+
+        itens = []
+        for documento, contas in por_documento.items():
+            if len(contas) > 1:
+                logger.warning(f"Nosso número {documento} com {len(contas)} contas a receber em aberto")
+                continue
+            conta_id, saldo = contas[0]
+            ocorrencia = liquidacoes[documento]
+            valor = min(ocorrencia.valor_pago, saldo)
+            if valor <= 0:
+                continue
+            itens.append(ItemBaixaLote(
+                conta_id=conta_id,
+                valor=float(valor),
+                data=ocorrencia.data_pagamento or date.today(),
+                forma_pagamento="BOLETO",
+                observacoes=f"Retorno CNAB {layout} (nosso número {documento})",
+            ))
+
+        baixadas = 0
+        financeiro = FinanceiroService(self.db)
+        for inicio in range(0, len(itens), LOTE_RETORNO):
+            resposta = await financeiro.baixar_recebimentos_lote(
+                BaixaLoteCreate(itens=itens[inicio:inicio + LOTE_RETORNO])
+            )
+            baixadas += resposta.baixadas
+        return baixadas
+
     # ========== Métodos auxiliares CNAB 240 ==========
 
     def _gerar_header_arquivo_240(
@@ -273,7 +492,7 @@ class CNABService:
         linha += "0"  # Tipo de registro
         linha += " " * 9  # Uso exclusivo FEBRABAN
         linha += "2"  # Tipo de inscrição (2 = CNPJ)
-        linha += config.cedente_cnpj.zfill(14)  # CNPJ
+        linha += config.cedente_documento.zfill(14)  # CNPJ
         linha += " " * 20  # Convênio
         linha += config.agencia.zfill(5)  # Agência
         linha += (config.agencia_dv or " ").ljust(1)  # DV agência
@@ -306,7 +525,7 @@ class CNABService:
         linha += "060"  # Versão do layout do lote
         linha += " "  # Uso exclusivo FEBRABAN
         linha += "2"  # Tipo de inscrição
-        linha += config.cedente_cnpj.zfill(15)
+        linha += config.cedente_documento.zfill(15)
         linha += " " * 20  # Convênio
         linha += config.agencia.zfill(5)
         linha += (config.agencia_dv or " ").ljust(1)
@@ -336,7 +555,7 @@ class CNABService:
         linha += (config.conta_dv or " ").ljust(1)
         linha += " "  # DV agência/conta
         linha += boleto.nosso_numero[:20].ljust(20)
-        linha += config.carteira.zfill(1)
+        linha += config.carteira.zfill(1)[:1]  # Código da carteira (1 posição)
         linha += "1"  # Forma de cadastramento (1 = Com cadastramento)
         linha += "1"  # Tipo de documento (1 = Tradicional)
         linha += "2"  # Identificação da emissão (2 = Cliente emite)
@@ -351,7 +570,7 @@ class CNABService:
         linha += boleto.data_emissao.strftime("%d%m%Y")
         linha += "1"  # Código de juros (1 = Valor por dia)
         linha += "00000000"  # Data de juros
-        linha += str(int((boleto.valor * config.juros_mes / 100 / 30) * 100)).zfill(15)
+        linha += str(int((boleto.valor * config.percentual_juros / 100 / 30) * 100)).zfill(15)
         linha += "0"  # Código de desconto (0 = Sem desconto)
         linha += "00000000"  # Data de desconto
         linha += "000000000000000"  # Valor de desconto
@@ -359,7 +578,7 @@ class CNABService:
         linha += "000000000000000"  # Valor abatimento
         linha += " " * 25  # Uso da empresa
         linha += "0"  # Código de protesto (0 = Não protestar)
-        linha += str(config.dias_protesto or 0).zfill(2)
+        linha += "00"  # Prazo de protesto
         linha += "0"  # Código de baixa (0 = Não baixar)
         linha += "000"  # Prazo de baixa
         linha += "09"  # Código da moeda (09 = Real)
@@ -379,11 +598,11 @@ class CNABService:
         linha += "Q"  # Código do segmento
         linha += " "  # Uso exclusivo FEBRABAN
         linha += "01"  # Código de movimento
-        linha += "1" if len(boleto.sacado_cpf_cnpj) == 11 else "2"  # Tipo inscrição (1=CPF, 2=CNPJ)
-        linha += boleto.sacado_cpf_cnpj.zfill(15)
+        linha += "1" if len(boleto.sacado_documento) == 11 else "2"  # Tipo inscrição (1=CPF, 2=CNPJ)
+        linha += boleto.sacado_documento.zfill(15)
         linha += boleto.sacado_nome[:40].ljust(40)
         linha += (boleto.sacado_endereco or "")[:40].ljust(40)
-        linha += (boleto.sacado_bairro or "")[:15].ljust(15)
+        linha += " " * 15  # Bairro
         linha += (boleto.sacado_cep or "").replace("-", "").zfill(8)
         linha += (boleto.sacado_cidade or "")[:15].ljust(15)
         linha += (boleto.sacado_uf or "").ljust(2)
@@ -414,63 +633,57 @@ class CNABService:
         linha += "000000000000000"  # Valor/percentual desconto 3
         linha += "2"  # Código de multa (2 = Percentual)
         linha += (boleto.data_vencimento + timedelta(days=1)).strftime("%d%m%Y")
-        linha += str(int(config.multa_atraso * 100)).zfill(15)  # Percentual em centavos
+        linha += str(int(config.percentual_multa * 100)).zfill(15)  # Percentual em centavos
         linha += " " * 10  # Informação ao sacado
         linha += " " * 40  # Mensagem 3
         linha += " " * 40  # Mensagem 4
         linha += " " * 61  # Uso exclusivo FEBRABAN
         return linha.ljust(240)
 
-    def _gerar_trailer_lote_240(self, qtd_boletos: int, lote: int) -> str:
+    def _gerar_trailer_lote_240(
+        self, config: ConfiguracaoBoleto, qtd_boletos: int, lote: int, valor_total: Decimal
+    ) -> str:
         """Gera trailer do lote CNAB 240 (Registro 5)"""
         qtd_registros = (qtd_boletos * 3) + 2  # P + Q + R por boleto + header + trailer
         linha = ""
-        linha += "000"  # Código do banco (será preenchido)
+        linha += config.banco_codigo.zfill(3)
         linha += str(lote).zfill(4)
         linha += "5"  # Tipo de registro
         linha += " " * 9  # Uso exclusivo FEBRABAN
         linha += str(qtd_registros).zfill(6)
-        linha += " " * 217  # Uso exclusivo FEBRABAN
+        linha += str(qtd_boletos).zfill(6)  # Quantidade de títulos em cobrança
+        linha += str(int(valor_total * 100)).zfill(17)  # Valor total dos títulos em centavos
+        linha += " " * 194  # Uso exclusivo FEBRABAN
         return linha.ljust(240)
 
-    def _gerar_trailer_arquivo_240(self, qtd_lotes: int) -> str:
+    def _gerar_trailer_arquivo_240(
+        self, config: ConfiguracaoBoleto, qtd_lotes: int, qtd_registros: int
+    ) -> str:
         """Gera trailer do arquivo CNAB 240 (Registro 9)"""
         linha = ""
-        linha += "000"  # Código do banco
+        linha += config.banco_codigo.zfill(3)
         linha += "9999"  # Lote de serviço
         linha += "9"  # Tipo de registro
         linha += " " * 9  # Uso exclusivo FEBRABAN
         linha += str(qtd_lotes).zfill(6)
-        linha += " " * 6  # Qtd registros (será calculado)
+        linha += str(qtd_registros).zfill(6)
         linha += " " * 205  # Uso exclusivo FEBRABAN
         return linha.ljust(240)
 
-    async def _processar_segmento_t_240(self, linha: str) -> Dict[str, Any]:
-        """Processa Segmento T do retorno CNAB 240"""
-        nosso_numero = linha[37:57].strip()
+    def _ler_segmento_t_240(self, numero: int, linha: str) -> OcorrenciaRetorno:
+        """Lê Segmento T do retorno CNAB 240"""
         codigo_ocorrencia = linha[15:17]
-        valor_pago = Decimal(linha[77:92]) / 100
-        data_pagamento_str = linha[137:145]
-
-        # Buscar boleto
-        stmt = select(Boleto).where(Boleto.nosso_numero == nosso_numero)
-        result = await self.db.execute(stmt)
-        boleto = result.scalar_one_or_none()
-
-        if not boleto:
-            logger.warning(f"Boleto não encontrado - Nosso número: {nosso_numero}")
-            return {"atualizado": False, "pago": False}
-
-        # Processar ocorrência
-        pago = False
-        if codigo_ocorrencia == "06":  # Liquidação
-            boleto.status = StatusBoleto.PAGO
-            boleto.valor_pago = valor_pago
-            boleto.data_pagamento = datetime.strptime(data_pagamento_str, "%d%m%Y").date()
-            pago = True
-            logger.info(f"Boleto {nosso_numero} marcado como PAGO - Valor: {valor_pago}")
-
-        return {"atualizado": True, "pago": pago}
+        data_pagamento = None
+        if codigo_ocorrencia == OCORRENCIA_LIQUIDACAO and linha[137:145].strip():
+            data_pagamento = datetime.strptime(linha[137:145], "%d%m%Y").date()
+
+        return OcorrenciaRetorno(
+            linha=numero,
+            nosso_numero=linha[37:57].strip(),
+            codigo_ocorrencia=codigo_ocorrencia,
+            valor_pago=Decimal(linha[77:92]) / 100,
+            data_pagamento=data_pagamento,
+        )
 
     # ========== Métodos auxiliares CNAB 400 ==========
 
@@ -493,7 +706,7 @@ class CNABService:
         linha += config.banco_codigo.zfill(3)
         linha += config.banco_nome[:15].ljust(15)
         linha += datetime.now().strftime("%d%m%y")
-        linha += " " * 294  # Brancos
+        linha += " " * 293  # Brancos
         linha += str(numero_remessa).zfill(6)
         return linha.ljust(400)
 
@@ -504,7 +717,7 @@ class CNABService:
         linha = ""
         linha += "1"  # Tipo de registro
         linha += "2"  # Tipo de inscrição (2 = CNPJ)
-        linha += config.cedente_cnpj.zfill(14)
+        linha += config.cedente_documento.zfill(14)
         linha += config.agencia.zfill(4)
         linha += (config.agencia_dv or "0").ljust(2)
         linha += config.conta.zfill(8)
@@ -523,13 +736,13 @@ class CNABService:
         linha += boleto.data_emissao.strftime("%d%m%y")
         linha += "00"  # Instrução 1
         linha += "00"  # Instrução 2
-        linha += str(int((boleto.valor * config.juros_mes / 100 / 30) * 100)).zfill(13)
+        linha += str(int((boleto.valor * config.percentual_juros / 100 / 30) * 100)).zfill(13)
         linha += " " * 6  # Data de desconto
         linha += "0000000000000"  # Valor de desconto
         linha += "0000000000000"  # Valor IOF
         linha += "0000000000000"  # Abatimento
-        linha += "1" if len(boleto.sacado_cpf_cnpj) == 11 else "2"
-        linha += boleto.sacado_cpf_cnpj.zfill(14)
+        linha += "1" if len(boleto.sacado_documento) == 11 else "2"
+        linha += boleto.sacado_documento.zfill(14)
         linha += boleto.sacado_nome[:40].ljust(40)
         linha += (boleto.sacado_endereco or "")[:40].ljust(40)
         linha += " " * 12  # Mensagem
@@ -546,33 +759,20 @@ class CNABService:
         linha += str(qtd_boletos + 2).zfill(6)  # Total de registros (+ header + trailer)
         return linha.ljust(400)
 
-    async def _processar_detalhe_400(self, linha: str) -> Dict[str, Any]:
-        """Processa registro de detalhe do retorno CNAB 400"""
-        nosso_numero = linha[62:73].strip()
+    def _ler_detalhe_400(self, numero: int, linha: str) -> OcorrenciaRetorno:
+        """Lê registro de detalhe do retorno CNAB 400"""
         codigo_ocorrencia = linha[108:110]
-        valor_pago = Decimal(linha[253:266]) / 100 if linha[253:266].strip() else Decimal("0")
-        data_pagamento_str = linha[110:116]
-
-        # Buscar boleto
-        stmt = select(Boleto).where(Boleto.nosso_numero.contains(nosso_numero))
-        result = await self.db.execute(stmt)
-        boleto = result.scalar_one_or_none()
-
-        if not boleto:
-            logger.warning(f"Boleto não encontrado - Nosso número: {nosso_numero}")
-            return {"atualizado": False, "pago": False}
-
-        # Processar ocorrência
-        pago = False
-        if codigo_ocorrencia == "06":  # Liquidação
-            boleto.status = StatusBoleto.PAGO
-            boleto.valor_pago = valor_pago
-            if data_pagamento_str.strip():
-                boleto.data_pagamento = datetime.strptime(data_pagamento_str, "%d%m%y").date()
-            pago = True
-            logger.info(f"Boleto {nosso_numero} marcado como PAGO - Valor: {valor_pago}")
-
-        return {"atualizado": True, "pago": pago}
+        data_pagamento = None
+        if codigo_ocorrencia == OCORRENCIA_LIQUIDACAO and linha[110:116].strip():
+            data_pagamento = datetime.strptime(linha[110:116], "%d%m%y").date()
+
+        return OcorrenciaRetorno(
+            linha=numero,
+            nosso_numero=linha[62:73].strip(),
+            codigo_ocorrencia=codigo_ocorrencia,
+            valor_pago=Decimal(linha[253:266]) / 100 if linha[253:266].strip() else Decimal("0"),
+            data_pagamento=data_pagamento,
+        )
 
 
 # Importação adicional necessária
@@ -0,0 +1,287 @@
+"""
+Motor de conciliação aproximada por valor e data
+
+Para lançamentos sem chave de documento (liquidação de cartão, TED, depósito),
+casa créditos do extrato com contas a receber em aberto:
+
+1. 1:1 - lançamentos e títulos ordenados por valor; uma varredura com dois
+   ponteiros gera os pares dentro da janela de valor (±tolerancia_valor) e de
+   data (±tolerancia_dias). Os pares são aceitos em ordem de confiança, cada
+   lançamento e cada título no máximo uma vez.
+2. N:1 - para os lançamentos que sobraram, procura de 2 a max_titulos títulos
+   da janela de datas cuja soma bate com o valor (subset-sum limitado aos
+   max_candidatos_grupo títulos mais próximos da data, com poda pela soma;
+   menor quantidade de títulos primeiro).
+
+Cada sugestão traz uma confiança entre 0 e 1, reduzida pela diferença de
+valor, pela distância entre as datas, pela quantidade de títulos agrupados e
+pela existência de alternativas igualmente válidas.
+
+O módulo não acessa o banco: recebe e devolve estruturas simples.
+"""
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+# Soluções N:1 enumeradas por lançamento (acima disso só importa que é ambíguo)
+MAX_SOLUCOES_GRUPO = 10
+
+
+@dataclass(frozen=True)
+class LancamentoCredito:
+    """Crédito do extrato a conciliar"""
+    id: int
+    data: date
+    valor: Decimal
+
+
+@dataclass(frozen=True)
+class TituloAberto:
+    """Conta a receber em aberto"""
+    id: int
+    data_vencimento: date
+    saldo: Decimal
+
+
+@dataclass
+class ParametrosConciliacao:
+    """Janelas de tolerância e limites do agrupamento"""
+    tolerancia_valor: Decimal = Decimal("0.01")
+    tolerancia_dias: int = 3
+    max_titulos: int = 4
+    max_candidatos_grupo: int = 20
+
+
+@dataclass
+class SugestaoConciliacao:
+    """Lançamento casado com um ou mais títulos"""
+    extrato_id: int
+    titulo_ids: List[int]
+    valor_extrato: Decimal
+    valor_titulos: Decimal
+    dias: int
+    confianca: float
+
+    @property
+    def diferenca(self) -> Decimal:
+        return self.valor_extrato - self.valor_titulos
+
+
+def calcular_confianca(
+    diferenca: Decimal,
+    dias: int,
+    parametros: ParametrosConciliacao,
+    quantidade_titulos: int = 1,
+    alternativas: int = 0,
+) -> float:
+    """
+    Confiança de uma sugestão (0 a 1)
+
+    Args:
+        diferenca: Valor do extrato - soma dos títulos
+        dias: Maior distância em dias entre o lançamento e os vencimentos
+        quantidade_titulos: Títulos agrupados na sugestão
+        alternativas: Outras combinações igualmente válidas
+    """
+    penalidade_valor = (
+        float(abs(diferenca) / parametros.tolerancia_valor) if parametros.tolerancia_valor else 0.0
+    )
+    penalidade_data = dias / (parametros.tolerancia_dias + 1)
+    confianca = (
+        1.0
+        - 0.10 * penalidade_valor
+        - 0.30 * penalidade_data
+        - 0.10 * (quantidade_titulos - 1)
+        - 0.15 * min(alternativas, 3)
+    )
+    return round(min(1.0, max(0.0, confianca)), 4)
+
+
+def _dias(lancamento: LancamentoCredito, titulo: TituloAberto) -> int:
+    return abs((lancamento.data - titulo.data_vencimento).days)
+
+
+def _pares_candidatos(
+    lancamentos: Sequence[LancamentoCredito],
+    titulos: Sequence[TituloAberto],
+    parametros: ParametrosConciliacao,
+) -> List[Tuple[LancamentoCredito, TituloAberto, int]]:
+    """Pares dentro das janelas de valor e data (varredura sobre listas ordenadas por valor)"""
+    tolerancia = parametros.tolerancia_valor
+    ordenados = sorted(titulos, key=lambda t: (t.saldo, t.id))
+    pares = []
+    inicio = 0
+
+    for lancamento in sorted(lancamentos, key=lambda l: (l.valor, l.id)):
+        while inicio < len(ordenados) and ordenados[inicio].saldo < lancamento.valor - tolerancia:
+            inicio += 1
+        indice = inicio
+        while indice < len(ordenados) and ordenados[indice].saldo <= lancamento.valor + tolerancia:
+            titulo = ordenados[indice]
+            dias = _dias(lancamento, titulo)
+            if dias <= parametros.tolerancia_dias:
+                pares.append((lancamento, titulo, dias))
+            indice += 1
+
+    return pares
+
+
+def _conciliar_um_para_um(
+    lancamentos: Sequence[LancamentoCredito],
+    titulos: Sequence[TituloAberto],
+    parametros: ParametrosConciliacao,
+) -> List[SugestaoConciliacao]:
+    pares = _pares_candidatos(lancamentos, titulos, parametros)
+
+    por_lancamento: Dict[int, int] = {}
+    por_titulo: Dict[int, int] = {}
+    for lancamento, titulo, _ in pares:
+        por_lancamento[lancamento.id] = por_lancamento.get(lancamento.id, 0) + 1
+        por_titulo[titulo.id] = por_titulo.get(titulo.id, 0) + 1
+
+    avaliados = []
+    for lancamento, titulo, dias in pares:
+        alternativas = max(por_lancamento[lancamento.id], por_titulo[titulo.id]) - 1
+        confianca = calcular_confianca(
+            lancamento.valor - titulo.saldo, dias, parametros, alternativas=alternativas
+        )
+        avaliados.append((confianca, lancamento, titulo, dias))
+    avaliados.sort(key=lambda a: (-a[0], a[3], abs(a[1].valor - a[2].saldo), a[1].id, a[2].id))
+
+    sugestoes = []
+    lancamentos_usados: Set[int] = set()
+    titulos_usados: Set[int] = set()
+    for confianca, lancamento, titulo, dias in avaliados:
+        if lancamento.id in lancamentos_usados or titulo.id in titulos_usados:
+            continue
+        lancamentos_usados.add(lancamento.id)
+        titulos_usados.add(titulo.id)
+        sugestoes.append(SugestaoConciliacao(
+            extrato_id=lancamento.id,
+            titulo_ids=[titulo.id],
+            valor_extrato=lancamento.valor,
+            valor_titulos=titulo.saldo,
+            dias=dias,
+            confianca=confianca,
+        ))
+    return sugestoes
+
+
+def _subconjuntos(
+    candidatos: Sequence[TituloAberto], alvo: Decimal, tolerancia: Decimal, tamanho: int
+) -> List[Tuple[TituloAberto, ...]]:
+    """
+    Subconjuntos de `tamanho` títulos com soma em alvo ± tolerancia
+
+    Os candidatos devem estar em ordem decrescente de saldo: a maior soma
+    possível a partir de um índice é a dos próximos títulos, o que permite
+    podar os ramos que não alcançam o alvo.
+    """
+    prefixo = [Decimal(0)]
+    for candidato in candidatos:
+        prefixo.append(prefixo[-1] + candidato.saldo)
+    total = len(candidatos)
+    solucoes: List[Tuple[TituloAberto, ...]] = []
+    escolhidos: List[TituloAberto] = []
+
+    def buscar(inicio: int, restantes: int, soma: Decimal) -> None:
+        if restantes == 0:
+            if abs(soma - alvo) <= tolerancia:
+                solucoes.append(tuple(escolhidos))
+            return
+        for indice in range(inicio, total - restantes + 1):
+            if len(solucoes) >= MAX_SOLUCOES_GRUPO:
+                return
+            # Maior soma ainda possível: este título e os próximos (maiores restantes)
+            if soma + prefixo[indice + restantes] - prefixo[indice] < alvo - tolerancia:
+                return
+            nova_soma = soma + candidatos[indice].saldo
+            if nova_soma > alvo + tolerancia:
+                continue
+            escolhidos.append(candidatos[indice])
+            buscar(indice + 1, restantes - 1, nova_soma)
+            escolhidos.pop()
+
+    buscar(0, tamanho, Decimal(0))
+    return solucoes
+
+
+def _conciliar_agrupado(
+    lancamentos: Sequence[LancamentoCredito],
+    titulos: Sequence[TituloAberto],
+    titulos_usados: Set[int],
+    parametros: ParametrosConciliacao,
+) -> List[SugestaoConciliacao]:
+    por_data = sorted(titulos, key=lambda t: (t.data_vencimento, t.id))
+    datas = [t.data_vencimento for t in por_data]
+    janela = timedelta(days=parametros.tolerancia_dias)
+    tolerancia = parametros.tolerancia_valor
+    sugestoes = []
+
+    # Maiores depósitos primeiro: são os que mais dependem de agrupamento
+    for lancamento in sorted(lancamentos, key=lambda l: (-l.valor, l.id)):
+        candidatos = [
+            titulo
+            for titulo in por_data[
+                bisect_left(datas, lancamento.data - janela):bisect_right(datas, lancamento.data + janela)
+            ]
+            if titulo.id not in titulos_usados and titulo.saldo <= lancamento.valor + tolerancia
+        ]
+        if len(candidatos) < 2:
+            continue
+        candidatos.sort(key=lambda t: (_dias(lancamento, t), t.id))
+        candidatos = sorted(
+            candidatos[:parametros.max_candidatos_grupo], key=lambda t: (-t.saldo, t.id)
+        )
+
+        for tamanho in range(2, min(parametros.max_titulos, len(candidatos)) + 1):
+            solucoes = _subconjuntos(candidatos, lancamento.valor, tolerancia, tamanho)
+            if not solucoes:
+                continue
+            escolhida = min(
+                solucoes,
+                key=lambda s: (sum(_dias(lancamento, t) for t in s), sorted(t.id for t in s)),
+            )
+            valor_titulos = sum((t.saldo for t in escolhida), Decimal(0))
+            dias = max(_dias(lancamento, t) for t in escolhida)
+            titulos_usados.update(t.id for t in escolhida)
+            sugestoes.append(SugestaoConciliacao(
+                extrato_id=lancamento.id,
+                titulo_ids=sorted(t.id for t in escolhida),
+                valor_extrato=lancamento.valor,
+                valor_titulos=valor_titulos,
+                dias=dias,
+                confianca=calcular_confianca(
+                    lancamento.valor - valor_titulos, dias, parametros,
+                    quantidade_titulos=tamanho, alternativas=len(solucoes) - 1,
+                ),
+            ))
+            break
+
+    return sugestoes
+
+
+def conciliar_por_valor_data(
+    lancamentos: Sequence[LancamentoCredito],
+    titulos: Sequence[TituloAberto],
+    parametros: Optional[ParametrosConciliacao] = None,
+) -> List[SugestaoConciliacao]:
+    """
+    Sugere conciliações 1:1 e N:1 entre créditos do extrato e títulos em aberto
+
+    Returns:
+        Sugestões ordenadas pelo id do lançamento
+    """
+    parametros = parametros or ParametrosConciliacao()
+
+    sugestoes = _conciliar_um_para_um(lancamentos, titulos, parametros)
+    if parametros.max_titulos > 1:
+        conciliados = {s.extrato_id for s in sugestoes}
+        titulos_usados = {titulo_id for s in sugestoes for titulo_id in s.titulo_ids}
+        sugestoes += _conciliar_agrupado(
+            [l for l in lancamentos if l.id not in conciliados], titulos, titulos_usados, parametros
+        )
+
+    return sorted(sugestoes, key=lambda s: s.extrato_id)
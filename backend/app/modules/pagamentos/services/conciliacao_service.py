@@ -3,28 +3,72 @@ Service Layer para Conciliação Bancária
 """
 from __future__ import annotations
 
-from datetime import date, datetime
-from typing import List, Dict, Any, Optional
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, BinaryIO, Callable, Iterator, List, Dict, Optional, Set, Tuple
 from decimal import Decimal
-import csv
+from itertools import islice
 import io
 import base64
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, case
+from sqlalchemy import select, and_, func, case, exists, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 
 from app.core.logging import get_logger, log_business_event
-from app.core.exceptions import NotFoundException, BusinessException
+from app.core.exceptions import NotFoundException, BusinessException, ValidationException
+from app.modules.financeiro.models import ContaReceber, StatusFinanceiro
+from app.modules.financeiro.schemas import BaixaLoteCreate, ItemBaixaLote
+from app.modules.financeiro.service import FinanceiroService
 from app.modules.pagamentos.models import (
-    ExtratoBancario, ConciliacaoBancaria, TransacaoPix, Boleto
+    ExtratoBancario, ConciliacaoBancaria, ConciliacaoContaReceber, TransacaoPix, Boleto
 )
 from app.modules.pagamentos.schemas import (
     ExtratoBancarioCreate, ConciliacaoBancariaCreate,
     ImportCSVRequest
 )
+from app.modules.pagamentos.services.conciliacao_aproximada import (
+    LancamentoCredito,
+    ParametrosConciliacao,
+    SugestaoConciliacao,
+    TituloAberto,
+    conciliar_por_valor_data,
+)
+from app.modules.pagamentos.services.extrato_parser import (
+    ErroLeitura,
+    ItemExtrato,
+    hash_lancamento,
+    ler_csv,
+    ler_ofx,
+    linhas_do_arquivo,
+)
 
 logger = get_logger(__name__)
 
+# Tamanho dos lotes de IN (...) e de gravação da conciliação automática
+LOTE_CONCILIACAO = 1000
+TOLERANCIA_VALOR = Decimal('0.01')
+
+# Lançamentos por INSERT na importação de extrato e erros detalhados no retorno
+LOTE_IMPORTACAO = 1000
+MAX_ERROS_IMPORTACAO = 100
+
+
+async def _ler_em_thread(itens: Iterator[ItemExtrato], tamanho: int) -> AsyncIterator[ItemExtrato]:
+    """
+    Consome os itens do extrato em blocos numa thread do pool
+
+    A leitura do arquivo (upload em disco) e o parsing são bloqueantes; feitos
+    aqui, não travam o event loop. Um bloco por vez mantém a memória limitada.
+    """
+    while True:
+        bloco = await run_in_threadpool(list, islice(itens, tamanho))
+        if not bloco:
+            return
+        for item in bloco:
+            yield item
+
 
 class ConciliacaoService:
     """Service para Conciliação Bancária"""
@@ -37,66 +81,169 @@ class ConciliacaoService:
         import_data: ImportCSVRequest
     ) -> Dict[str, Any]:
         """
-        Importa extrato bancário de arquivo CSV
+        Importa extrato bancário de arquivo CSV (base64)
 
         Formato esperado: data,descricao,documento,valor,tipo
         """
-        # Decodifica base64
         try:
-            csv_content = base64.b64decode(import_data.arquivo_base64).decode(
-                import_data.encoding
-            )
+            conteudo = base64.b64decode(import_data.arquivo_base64)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Erro ao decodificar arquivo: {str(e)}"
             )
 
-        # Parse CSV
-        reader = csv.DictReader(
-            io.StringIO(csv_content),
-            delimiter=import_data.separador
+        return await self.importar_extrato(
+            io.BytesIO(conteudo),
+            formato="csv",
+            banco_codigo=import_data.banco_codigo,
+            agencia=import_data.agencia,
+            conta=import_data.conta,
+            separador=import_data.separador,
+            encoding=import_data.encoding,
         )
 
-        lancamentos_criados = 0
-        erros = []
+    async def importar_extrato(
+        self,
+        arquivo: BinaryIO,
+        formato: str,
+        banco_codigo: str,
+        agencia: str,
+        conta: str,
+        separador: str = ",",
+        encoding: str = "utf-8",
+        arquivo_origem: Optional[str] = None,
+        ao_progredir: Optional[Callable[[Dict[str, int]], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Importa extrato bancário (CSV ou OFX) em streaming
 
-        for idx, row in enumerate(reader, start=1):
-            try:
-                # Valida campos obrigatórios
-                if not all(k in row for k in ['data', 'descricao', 'valor', 'tipo']):
-                    erros.append(f"Linha {idx}: Campos obrigatórios faltando")
-                    continue
+        O arquivo é lido linha a linha e gravado em lotes de LOTE_IMPORTACAO,
+        então a memória não cresce com o tamanho do arquivo. A leitura e o
+        parsing rodam no thread pool, fora do event loop. Lançamentos cujo
+        hash de conteúdo já existe (extratos com períodos sobrepostos) são
+        ignorados e contados em "duplicados".
 
-                # Cria lançamento
-                lancamento = ExtratoBancario(
-                    banco_codigo=import_data.banco_codigo,
-                    agencia=import_data.agencia,
-                    conta=import_data.conta,
-                    data=datetime.strptime(row['data'], '%Y-%m-%d').date(),
-                    descricao=row['descricao'],
-                    documento=row.get('documento'),
-                    valor=Decimal(row['valor'].replace(',', '.')),
-                    tipo=row['tipo'].upper(),
-                    saldo=Decimal(row.get('saldo', '0').replace(',', '.')) if row.get('saldo') else None,
-                    arquivo_origem=f"import_csv_{datetime.now().strftime('%Y%m%d%H%M%S')}",
-                    linha_arquivo=idx
-                )
+        Linhas idênticas sem FITID são diferenciadas pela ordem dentro do dia;
+        o contador é zerado a cada troca de data, o que supõe o extrato
+        ordenado por data (como os bancos exportam).
 
-                self.db.add(lancamento)
-                lancamentos_criados += 1
+        Args:
+            arquivo: Arquivo binário (lido em blocos)
+            formato: csv ou ofx
+            ao_progredir: Chamado após cada lote com os contadores parciais
 
-            except Exception as e:
-                erros.append(f"Linha {idx}: {str(e)}")
+        Returns:
+            Contadores da importação e até MAX_ERROS_IMPORTACAO mensagens de erro
+        """
+        linhas = linhas_do_arquivo(arquivo, encoding)
+        if formato == "csv":
+            itens = ler_csv(linhas, separador)
+        elif formato == "ofx":
+            itens = ler_ofx(linhas)
+        else:
+            raise ValidationException(f"Formato de extrato inválido: {formato}")
+
+        arquivo_origem = arquivo_origem or f"import_{formato}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        progresso = {"linhas_lidas": 0, "lancamentos_criados": 0, "duplicados": 0, "total_erros": 0}
+        erros: List[str] = []
+        lote: Dict[str, Dict[str, Any]] = {}
+        ocorrencias: Dict[Tuple, int] = {}
+        data_atual = None
+
+        async def gravar_lote() -> None:
+            criados = await self._inserir_lote_extrato(list(lote.values()))
+            progresso["lancamentos_criados"] += criados
+            progresso["duplicados"] += len(lote) - criados
+            lote.clear()
+            logger.info(f"Importação de extrato {arquivo_origem}: {progresso}")
+            if ao_progredir:
+                await ao_progredir(dict(progresso))
+
+        try:
+            async for item in _ler_em_thread(itens, LOTE_IMPORTACAO):
+                progresso["linhas_lidas"] += 1
+                if isinstance(item, ErroLeitura):
+                    progresso["total_erros"] += 1
+                    if len(erros) < MAX_ERROS_IMPORTACAO:
+                        erros.append(f"Linha {item.linha}: {item.mensagem}")
+                    continue
 
+                if item.data != data_atual:
+                    data_atual, ocorrencias = item.data, {}
+                chave = (item.valor, item.tipo, item.documento, item.descricao)
+                ocorrencias[chave] = ocorrencias.get(chave, 0) + 1
+                hash_conteudo = hash_lancamento(banco_codigo, agencia, conta, item, ocorrencias[chave])
+
+                if hash_conteudo in lote:
+                    # Mesmo FITID repetido no arquivo
+                    progresso["duplicados"] += 1
+                    continue
+                lote[hash_conteudo] = {
+                    "banco_codigo": banco_codigo,
+                    "agencia": agencia,
+                    "conta": conta,
+                    "data": item.data,
+                    "descricao": item.descricao[:500],
+                    "documento": item.documento[:50] if item.documento else None,
+                    "valor": item.valor,
+                    "tipo": item.tipo,
+                    "saldo": item.saldo,
+                    "conciliado": False,
+                    "arquivo_origem": arquivo_origem,
+                    "linha_arquivo": item.linha,
+                    "hash_conteudo": hash_conteudo,
+                    "created_at": datetime.utcnow(),
+                }
+                if len(lote) >= LOTE_IMPORTACAO:
+                    await gravar_lote()
+        except UnicodeDecodeError as e:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Erro ao decodificar arquivo: {str(e)}"
+            )
+
+        if lote:
+            await gravar_lote()
         await self.db.commit()
 
-        logger.info(f"Extrato importado: {lancamentos_criados} lançamentos")
+        logger.info(
+            f"Extrato importado: {progresso['lancamentos_criados']} lançamentos, "
+            f"{progresso['duplicados']} duplicados, {progresso['total_erros']} erros"
+        )
 
-        return {
-            "lancamentos_criados": lancamentos_criados,
-            "erros": erros
-        }
+        return {**progresso, "erros": erros}
+
+    async def _inserir_lote_extrato(self, linhas: List[Dict[str, Any]]) -> int:
+        """
+        Grava um lote de lançamentos ignorando hashes já existentes
+
+        Um SELECT ... IN (...) descobre os hashes já gravados e um único
+        INSERT executemany grava os novos. Em SQLite/PostgreSQL o INSERT usa
+        ON CONFLICT DO NOTHING, protegendo contra importações concorrentes.
+
+        Returns:
+            Quantidade de lançamentos novos
+        """
+        tabela = ExtratoBancario.__table__
+        existentes = set((await self.db.execute(
+            select(tabela.c.hash_conteudo).where(
+                tabela.c.hash_conteudo.in_([linha["hash_conteudo"] for linha in linhas])
+            )
+        )).scalars())
+        novas = [linha for linha in linhas if linha["hash_conteudo"] not in existentes]
+        if not novas:
+            return 0
+
+        dialeto = self.db.get_bind().dialect.name
+        if dialeto in ("postgresql", "sqlite"):
+            insert = pg_insert if dialeto == "postgresql" else sqlite_insert
+            stmt = insert(tabela).on_conflict_do_nothing(index_elements=[tabela.c.hash_conteudo])
+        else:
+            stmt = tabela.insert()
+        await self.db.execute(stmt, novas)
+        return len(novas)
 
     async def listar_pendentes(
         self,
@@ -132,60 +279,79 @@ class ConciliacaoService:
         Algoritmo:
         1. PIX: Match por E2E ID no documento
         2. Boleto: Match por Nosso Número no documento
-        3. Tolerância: ±0.01 no valor, ±1 dia na data
+        3. Tolerância: ±0.01 no valor
+
+        Os candidatos do lote inteiro são carregados com consultas IN (...)
+        e o matching é feito em memória por dicionário (hash join); as
+        conciliações e a marcação dos lançamentos são gravadas em lote.
+        Cada transação/boleto concilia no máximo um lançamento.
         """
-        # Busca lançamentos pendentes
+        # Busca lançamentos pendentes (somente as colunas do matching)
         result = await self.db.execute(
-            select(ExtratoBancario).where(
+            select(
+                ExtratoBancario.id,
+                ExtratoBancario.documento,
+                ExtratoBancario.valor
+            ).where(
                 ExtratoBancario.banco_codigo == banco_codigo,
                 ExtratoBancario.conciliado == False,
                 ExtratoBancario.data >= data_inicio,
                 ExtratoBancario.data <= data_fim
-            )
+            ).order_by(ExtratoBancario.data, ExtratoBancario.id)
         )
-        lancamentos = list(result.scalars().all())
+        lancamentos = result.all()
 
-        conciliados = 0
+        candidatos_pix = await self._carregar_candidatos(
+            TransacaoPix.e2e_id,
+            ConciliacaoBancaria.transacao_pix_id,
+            {doc for _, doc, _ in lancamentos if doc and doc.startswith('E')}
+        )
+        candidatos_boleto = await self._carregar_candidatos(
+            Boleto.nosso_numero,
+            ConciliacaoBancaria.boleto_id,
+            {doc for _, doc, _ in lancamentos if doc and doc.isdigit()}
+        )
+
+        conciliacoes = []
         detalhes = []
+        usados_pix: Set[int] = set()
+        usados_boleto: Set[int] = set()
+
+        for extrato_id, documento, valor in lancamentos:
+            if not documento:
+                continue
 
-        for lancamento in lancamentos:
             # Tenta match PIX por E2E ID
-            if lancamento.documento and lancamento.documento.startswith('E'):
-                match_pix = await self._tentar_match_pix(lancamento)
-                if match_pix:
-                    await self._criar_conciliacao(
-                        lancamento,
-                        "pix",
-                        transacao_pix_id=match_pix.id,
-                        valor_sistema=match_pix.valor
+            if documento.startswith('E'):
+                match = self._casar(candidatos_pix, documento, valor, usados_pix)
+                if match:
+                    conciliacoes.append(
+                        self._nova_conciliacao(extrato_id, valor, "pix", match, transacao_pix_id=match[0])
                     )
-                    conciliados += 1
                     detalhes.append({
-                        "extrato_id": lancamento.id,
-                        "transacao_pix_id": match_pix.id,
-                        "valor": float(lancamento.valor)
+                        "extrato_id": extrato_id,
+                        "transacao_pix_id": match[0],
+                        "valor": float(valor)
                     })
                     continue
 
             # Tenta match Boleto por Nosso Número
-            if lancamento.documento and lancamento.documento.isdigit():
-                match_boleto = await self._tentar_match_boleto(lancamento)
-                if match_boleto:
-                    await self._criar_conciliacao(
-                        lancamento,
-                        "boleto",
-                        boleto_id=match_boleto.id,
-                        valor_sistema=match_boleto.valor
+            if documento.isdigit():
+                match = self._casar(candidatos_boleto, documento, valor, usados_boleto)
+                if match:
+                    conciliacoes.append(
+                        self._nova_conciliacao(extrato_id, valor, "boleto", match, boleto_id=match[0])
                     )
-                    conciliados += 1
                     detalhes.append({
-                        "extrato_id": lancamento.id,
-                        "boleto_id": match_boleto.id,
-                        "valor": float(lancamento.valor)
+                        "extrato_id": extrato_id,
+                        "boleto_id": match[0],
+                        "valor": float(valor)
                     })
 
+        await self._gravar_conciliacoes(conciliacoes)
         await self.db.commit()
 
+        conciliados = len(conciliacoes)
         logger.info(f"Conciliação automática: {conciliados}/{len(lancamentos)} conciliados")
 
         return {
@@ -195,67 +361,323 @@ class ConciliacaoService:
             "detalhes": detalhes
         }
 
-    async def _tentar_match_pix(
+    async def _carregar_candidatos(
         self,
-        lancamento: ExtratoBancario
-    ) -> Optional[TransacaoPix]:
-        """Tenta encontrar transação PIX correspondente"""
-        result = await self.db.execute(
-            select(TransacaoPix).where(
-                TransacaoPix.e2e_id == lancamento.documento,
-                # Tolerância de ±0.01
-                TransacaoPix.valor.between(
-                    lancamento.valor - Decimal('0.01'),
-                    lancamento.valor + Decimal('0.01')
+        coluna_documento,
+        coluna_conciliacao,
+        documentos: Set[str]
+    ) -> Dict[str, Tuple[int, Decimal]]:
+        """
+        Carrega transações PIX ou boletos pelos documentos do extrato
+
+        Consultas IN (...) em lotes de LOTE_CONCILIACAO; ignora os que já
+        possuem conciliação.
+
+        Returns:
+            Dict documento -> (id, valor)
+        """
+        modelo = coluna_documento.class_
+        documentos = sorted(documentos)
+        candidatos = {}
+
+        for inicio in range(0, len(documentos), LOTE_CONCILIACAO):
+            result = await self.db.execute(
+                select(coluna_documento, modelo.id, modelo.valor).where(
+                    coluna_documento.in_(documentos[inicio:inicio + LOTE_CONCILIACAO]),
+                    ~exists().where(coluna_conciliacao == modelo.id)
                 )
             )
-        )
-        return result.scalar_one_or_none()
+            for documento, candidato_id, valor in result:
+                candidatos[documento] = (candidato_id, valor)
+
+        return candidatos
+
+    @staticmethod
+    def _casar(
+        candidatos: Dict[str, Tuple[int, Decimal]],
+        documento: str,
+        valor: Decimal,
+        usados: Set[int]
+    ) -> Optional[Tuple[int, Decimal]]:
+        """Match em memória por documento, com tolerância de ±0.01 no valor"""
+        candidato = candidatos.get(documento)
+        if candidato is None or candidato[0] in usados:
+            return None
+        if abs(candidato[1] - valor) > TOLERANCIA_VALOR:
+            return None
+        usados.add(candidato[0])
+        return candidato
+
+    @staticmethod
+    def _nova_conciliacao(
+        extrato_id: int,
+        valor_extrato: Decimal,
+        tipo: str,
+        match: Tuple[int, Decimal],
+        transacao_pix_id: int = None,
+        boleto_id: int = None
+    ) -> Dict[str, Any]:
+        """Linha de conciliação automática para gravação em lote"""
+        valor_sistema = match[1]
+        return {
+            "extrato_id": extrato_id,
+            "tipo": tipo,
+            "transacao_pix_id": transacao_pix_id,
+            "boleto_id": boleto_id,
+            "valor_sistema": valor_sistema,
+            "valor_extrato": valor_extrato,
+            "diferenca": valor_extrato - valor_sistema,
+            "automatica": True,
+        }
+
+    async def _gravar_conciliacoes(self, conciliacoes: List[Dict[str, Any]]) -> None:
+        """
+        Grava as conciliações e marca os lançamentos como conciliados
+
+        Por lote: um INSERT executemany com RETURNING e um UPDATE executemany
+        dos lançamentos. Como cada transação/boleto concilia um único
+        lançamento, o id retornado é associado pelo transacao_pix_id/boleto_id,
+        sem depender da ordem das linhas do RETURNING.
+        """
+        tabela_conciliacao = ConciliacaoBancaria.__table__
+        tabela_extrato = ExtratoBancario.__table__
+        agora = datetime.utcnow()
+
+        for inicio in range(0, len(conciliacoes), LOTE_CONCILIACAO):
+            lote = conciliacoes[inicio:inicio + LOTE_CONCILIACAO]
+            result = await self.db.execute(
+                tabela_conciliacao.insert().returning(
+                    tabela_conciliacao.c.id,
+                    tabela_conciliacao.c.transacao_pix_id,
+                    tabela_conciliacao.c.boleto_id
+                ),
+                [
+                    {chave: valor for chave, valor in linha.items() if chave != "extrato_id"}
+                    for linha in lote
+                ]
+            )
+            ids = {
+                (pix_id, boleto_id): conciliacao_id
+                for conciliacao_id, pix_id, boleto_id in result.all()
+            }
+
+            await self.db.execute(
+                tabela_extrato.update()
+                .where(tabela_extrato.c.id == bindparam("b_id"))
+                .values(
+                    conciliado=True,
+                    data_conciliacao=agora,
+                    conciliacao_id=bindparam("b_conciliacao_id")
+                ),
+                [
+                    {
+                        "b_id": linha["extrato_id"],
+                        "b_conciliacao_id": ids[(linha["transacao_pix_id"], linha["boleto_id"])]
+                    }
+                    for linha in lote
+                ]
+            )
 
-    async def _tentar_match_boleto(
+    async def conciliar_por_valor_data(
         self,
-        lancamento: ExtratoBancario
-    ) -> Optional[Boleto]:
-        """Tenta encontrar boleto correspondente"""
+        banco_codigo: str,
+        data_inicio: date,
+        data_fim: date,
+        parametros: Optional[ParametrosConciliacao] = None,
+        confianca_minima: float = 0.8,
+        aplicar: bool = False,
+        baixar_titulos: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Conciliação por valor e data contra contas a receber em aberto
+
+        Para créditos sem chave de documento (cartão, TED, depósito). Veja
+        conciliacao_aproximada para o algoritmo (1:1 e N:1) e a confiança.
+
+        Args:
+            banco_codigo: Código do banco
+            data_inicio: Data inicial dos lançamentos
+            data_fim: Data final dos lançamentos
+            parametros: Tolerâncias de valor/dias e limites do agrupamento
+            confianca_minima: Confiança mínima para gravar a sugestão
+            aplicar: Se True, grava as sugestões com confiança suficiente
+            baixar_titulos: Se True (com aplicar), baixa as contas conciliadas
+                como recebidas na data do lançamento; sugestões com baixa
+                rejeitada não são conciliadas e voltam em "rejeitadas"
+
+        Returns:
+            Dict com totais, as sugestões (aplicadas ou não) e as baixas rejeitadas
+        """
+        parametros = parametros or ParametrosConciliacao()
+        janela = timedelta(days=parametros.tolerancia_dias)
+
         result = await self.db.execute(
-            select(Boleto).where(
-                Boleto.nosso_numero == lancamento.documento,
-                # Tolerância de ±0.01
-                Boleto.valor.between(
-                    lancamento.valor - Decimal('0.01'),
-                    lancamento.valor + Decimal('0.01')
-                )
+            select(ExtratoBancario.id, ExtratoBancario.data, ExtratoBancario.valor).where(
+                ExtratoBancario.banco_codigo == banco_codigo,
+                ExtratoBancario.conciliado == False,
+                ExtratoBancario.tipo == 'C',
+                ExtratoBancario.valor > 0,
+                ExtratoBancario.data >= data_inicio,
+                ExtratoBancario.data <= data_fim
             )
         )
-        return result.scalar_one_or_none()
+        lancamentos = [LancamentoCredito(*linha) for linha in result.all()]
+
+        saldo = ContaReceber.valor_original - ContaReceber.valor_recebido
+        result = await self.db.execute(
+            select(ContaReceber.id, ContaReceber.data_vencimento, saldo).where(
+                ContaReceber.status.in_([StatusFinanceiro.PENDENTE, StatusFinanceiro.ATRASADA]),
+                ContaReceber.data_vencimento >= data_inicio - janela,
+                ContaReceber.data_vencimento <= data_fim + janela,
+                saldo > 0,
+                ~exists().where(ConciliacaoContaReceber.conta_receber_id == ContaReceber.id)
+            )
+        )
+        titulos = [
+            TituloAberto(titulo_id, vencimento, Decimal(str(valor)))
+            for titulo_id, vencimento, valor in result.all()
+        ]
+
+        sugestoes = conciliar_por_valor_data(lancamentos, titulos, parametros)
+        aceitas = [s for s in sugestoes if s.confianca >= confianca_minima] if aplicar else []
+
+        rejeitadas: List[Dict[str, Any]] = []
+        if aceitas:
+            saldos = {t.id: t.saldo for t in titulos}
+            if baixar_titulos:
+                datas = {l.id: l.data for l in lancamentos}
+                aceitas, rejeitadas = await self._baixar_titulos_conciliados(aceitas, saldos, datas)
+            if aceitas:
+                await self._gravar_conciliacoes_contas_receber(aceitas, saldos)
+            await self.db.commit()
+
+        aplicadas = {s.extrato_id for s in aceitas}
+        logger.info(
+            f"Conciliação por valor/data: {len(sugestoes)} sugestões, "
+            f"{len(aplicadas)} aplicadas, {len(lancamentos)} lançamentos"
+        )
 
-    async def _criar_conciliacao(
+        return {
+            "total_lancamentos": len(lancamentos),
+            "total_titulos": len(titulos),
+            "sugestoes": [
+                {
+                    "extrato_id": s.extrato_id,
+                    "conta_receber_ids": s.titulo_ids,
+                    "valor_extrato": float(s.valor_extrato),
+                    "valor_titulos": float(s.valor_titulos),
+                    "diferenca": float(s.diferenca),
+                    "dias": s.dias,
+                    "confianca": s.confianca,
+                    "aplicada": s.extrato_id in aplicadas
+                }
+                for s in sugestoes
+            ],
+            "conciliados": len(aplicadas),
+            "pendentes": len(lancamentos) - len(aplicadas),
+            "rejeitadas": rejeitadas
+        }
+
+    async def _baixar_titulos_conciliados(
         self,
-        lancamento: ExtratoBancario,
-        tipo: str,
-        transacao_pix_id: int = None,
-        boleto_id: int = None,
-        valor_sistema: Decimal = None
-    ):
-        """Cria registro de conciliação"""
-        diferenca = lancamento.valor - valor_sistema if valor_sistema else Decimal('0')
+        sugestoes: List[SugestaoConciliacao],
+        saldos: Dict[int, Decimal],
+        datas: Dict[int, date]
+    ) -> Tuple[List[SugestaoConciliacao], List[Dict[str, Any]]]:
+        """
+        Baixa os títulos das sugestões aceitas, na data de cada lançamento
 
-        conciliacao = ConciliacaoBancaria(
-            tipo=tipo,
-            transacao_pix_id=transacao_pix_id,
-            boleto_id=boleto_id,
-            valor_sistema=valor_sistema,
-            valor_extrato=lancamento.valor,
-            diferenca=diferenca,
-            automatica=True
-        )
+        A baixa em lote revalida as contas bloqueadas e pode rejeitar itens
+        (saldo alterado por outra baixa, conta cancelada). Uma sugestão só é
+        conciliada se todos os seus títulos foram baixados: havendo rejeição,
+        as baixas da rodada são desfeitas (SAVEPOINT) e o lote é refeito sem
+        as sugestões afetadas.
 
-        self.db.add(conciliacao)
+        Returns:
+            (sugestões com todos os títulos baixados, rejeições por título)
+        """
+        financeiro = FinanceiroService(self.db)
+        rejeitadas: List[Dict[str, Any]] = []
+
+        while sugestoes:
+            itens = [
+                ItemBaixaLote(
+                    conta_id=titulo_id,
+                    valor=float(saldos[titulo_id]),
+                    data=datas[sugestao.extrato_id],
+                    observacoes=f"Conciliação bancária (extrato {sugestao.extrato_id})"
+                )
+                for sugestao in sugestoes
+                for titulo_id in sugestao.titulo_ids
+            ]
+            erros: Dict[int, str] = {}
+            savepoint = await self.db.begin_nested()
+            for inicio in range(0, len(itens), LOTE_CONCILIACAO):
+                resposta = await financeiro.baixar_recebimentos_lote(
+                    BaixaLoteCreate(itens=itens[inicio:inicio + LOTE_CONCILIACAO])
+                )
+                erros.update({r.conta_id: r.erro for r in resposta.resultados if not r.sucesso})
+
+            if not erros:
+                await savepoint.commit()
+                break
+
+            await savepoint.rollback()
+            for sugestao in sugestoes:
+                rejeitadas.extend(
+                    {"extrato_id": sugestao.extrato_id, "conta_receber_id": titulo_id, "erro": erros[titulo_id]}
+                    for titulo_id in sugestao.titulo_ids
+                    if titulo_id in erros
+                )
+            sugestoes = [s for s in sugestoes if not erros.keys() & set(s.titulo_ids)]
+
+        if rejeitadas:
+            logger.warning(f"Conciliação por valor/data: {len(rejeitadas)} baixas rejeitadas")
+        return sugestoes, rejeitadas
 
-        # Marca lançamento como conciliado
-        lancamento.conciliado = True
-        lancamento.data_conciliacao = datetime.utcnow()
-        lancamento.conciliacao_id = conciliacao.id
+    async def _gravar_conciliacoes_contas_receber(
+        self,
+        sugestoes: List[SugestaoConciliacao],
+        saldos: Dict[int, Decimal]
+    ) -> None:
+        """Grava as conciliações, as contas cobertas e marca os lançamentos"""
+        conciliacoes = [
+            ConciliacaoBancaria(
+                tipo="conta_receber",
+                valor_sistema=s.valor_titulos,
+                valor_extrato=s.valor_extrato,
+                diferenca=s.diferenca,
+                automatica=True,
+                confianca=Decimal(str(s.confianca))
+            )
+            for s in sugestoes
+        ]
+        self.db.add_all(conciliacoes)
+        await self.db.flush()
+
+        await self.db.execute(
+            ConciliacaoContaReceber.__table__.insert(),
+            [
+                {"conciliacao_id": conciliacao.id, "conta_receber_id": titulo_id, "valor": saldos[titulo_id]}
+                for sugestao, conciliacao in zip(sugestoes, conciliacoes)
+                for titulo_id in sugestao.titulo_ids
+            ]
+        )
+
+        tabela_extrato = ExtratoBancario.__table__
+        await self.db.execute(
+            tabela_extrato.update()
+            .where(tabela_extrato.c.id == bindparam("b_id"))
+            .values(
+                conciliado=True,
+                data_conciliacao=datetime.utcnow(),
+                conciliacao_id=bindparam("b_conciliacao_id")
+            ),
+            [
+                {"b_id": sugestao.extrato_id, "b_conciliacao_id": conciliacao.id}
+                for sugestao, conciliacao in zip(sugestoes, conciliacoes)
+            ]
+        )
 
     # =========================================================================
     # Métodos adicionais para testes
@@ -0,0 +1,164 @@
+"""
+Leitura em streaming de extratos bancários (CSV e OFX)
+
+Os leitores consomem o arquivo linha a linha e produzem um lançamento por vez,
+então a memória usada não depende do tamanho do arquivo. Linhas inválidas
+viram ErroLeitura no mesmo fluxo, sem interromper a leitura.
+
+CSV: cabeçalho data,descricao,documento,valor,tipo[,saldo] (data AAAA-MM-DD,
+valor com ponto ou vírgula decimal, tipo C/D).
+
+OFX (1.x SGML ou 2.x XML): cada <STMTTRN> vira um lançamento; TRNAMT
+negativo é débito, FITID é usado como identificador do lançamento.
+
+hash_lancamento identifica o lançamento entre importações, o que permite
+reimportar extratos com períodos sobrepostos sem duplicar lançamentos.
+"""
+import codecs
+import csv
+import hashlib
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
+
+TAMANHO_BLOCO = 64 * 1024
+
+_CAMPOS_OBRIGATORIOS_CSV = ("data", "descricao", "valor", "tipo")
+_TAG_OFX = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+@dataclass
+class LinhaExtrato:
+    """Lançamento lido do arquivo"""
+    linha: int
+    data: date
+    descricao: str
+    documento: Optional[str]
+    valor: Decimal
+    tipo: str
+    saldo: Optional[Decimal] = None
+    identificador: Optional[str] = None  # FITID (OFX)
+
+
+@dataclass
+class ErroLeitura:
+    """Linha que não pôde ser lida"""
+    linha: int
+    mensagem: str
+
+
+ItemExtrato = Union[LinhaExtrato, ErroLeitura]
+
+
+def linhas_do_arquivo(arquivo: BinaryIO, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Lê um arquivo binário em blocos e produz as linhas de texto (com a quebra)
+
+    Raises:
+        UnicodeDecodeError: Conteúdo inválido para o encoding
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    resto = ""
+    while True:
+        bloco = arquivo.read(TAMANHO_BLOCO)
+        texto = resto + decoder.decode(bloco, final=not bloco)
+        linhas = texto.splitlines(keepends=True)
+        resto = linhas.pop() if linhas and bloco and not linhas[-1].endswith(("\n", "\r")) else ""
+        yield from linhas
+        if not bloco:
+            break
+    if resto:
+        yield resto
+
+
+def _decimal(valor: str) -> Decimal:
+    return Decimal(valor.strip().replace(",", "."))
+
+
+def ler_csv(linhas: Iterable[str], separador: str = ",") -> Iterator[ItemExtrato]:
+    """Lançamentos de um extrato CSV"""
+    reader = csv.DictReader(linhas, delimiter=separador)
+
+    for idx, row in enumerate(reader, start=1):
+        if any(row.get(campo) is None for campo in _CAMPOS_OBRIGATORIOS_CSV):
+            yield ErroLeitura(idx, "Campos obrigatórios faltando")
+            continue
+        try:
+            yield LinhaExtrato(
+                linha=idx,
+                data=datetime.strptime(row["data"].strip(), "%Y-%m-%d").date(),
+                descricao=row["descricao"].strip(),
+                documento=(row.get("documento") or "").strip() or None,
+                valor=_decimal(row["valor"]),
+                tipo=row["tipo"].strip().upper(),
+                saldo=_decimal(row["saldo"]) if row.get("saldo") else None,
+            )
+        except (ValueError, InvalidOperation) as e:
+            yield ErroLeitura(idx, str(e) or "Valor inválido")
+
+
+def _data_ofx(valor: str) -> date:
+    """DTPOSTED: AAAAMMDD[HHMMSS[.XXX]][[-3:BRT]]"""
+    return datetime.strptime(valor.strip()[:8], "%Y%m%d").date()
+
+
+def _transacao_ofx(campos: dict, numero: int) -> ItemExtrato:
+    try:
+        valor = _decimal(campos["TRNAMT"])
+        documento = campos.get("CHECKNUM") or campos.get("REFNUM")
+        return LinhaExtrato(
+            linha=numero,
+            data=_data_ofx(campos["DTPOSTED"]),
+            descricao=(campos.get("MEMO") or campos.get("NAME") or campos.get("TRNTYPE") or "").strip(),
+            documento=documento.strip() if documento else None,
+            valor=abs(valor),
+            tipo="D" if valor < 0 else "C",
+            identificador=(campos.get("FITID") or "").strip() or None,
+        )
+    except KeyError as e:
+        return ErroLeitura(numero, f"Campo {e.args[0]} faltando")
+    except (ValueError, InvalidOperation) as e:
+        return ErroLeitura(numero, str(e) or "Valor inválido")
+
+
+def ler_ofx(linhas: Iterable[str]) -> Iterator[ItemExtrato]:
+    """Lançamentos (<STMTTRN>) de um extrato OFX; linha = ordem da transação no arquivo"""
+    campos: Optional[dict] = None
+    numero = 0
+
+    for texto in linhas:
+        for fechamento, tag, valor in _TAG_OFX.findall(texto):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if fechamento:
+                    if campos is not None:
+                        numero += 1
+                        yield _transacao_ofx(campos, numero)
+                    campos = None
+                else:
+                    campos = {}
+            elif campos is not None and not fechamento and valor.strip():
+                campos[tag] = valor.strip()
+
+
+def hash_lancamento(
+    banco_codigo: str, agencia: str, conta: str, lancamento: LinhaExtrato, ocorrencia: int = 1
+) -> str:
+    """
+    SHA-256 do conteúdo do lançamento
+
+    Com FITID o identificador do banco basta. Sem ele, entram os campos do
+    lançamento e a ocorrência (n-ésima linha idêntica do mesmo dia), para que
+    lançamentos iguais legítimos - duas tarifas no mesmo dia - não se fundam.
+    """
+    if lancamento.identificador:
+        partes = (banco_codigo, agencia, conta, "FITID", lancamento.identificador)
+    else:
+        partes = (
+            banco_codigo, agencia, conta, lancamento.data.isoformat(), f"{lancamento.valor:.2f}",
+            lancamento.tipo, lancamento.documento or "", " ".join(lancamento.descricao.upper().split()),
+            str(ocorrencia),
+        )
+    return hashlib.sha256("|".join(partes).encode("utf-8")).hexdigest()
@@ -5,9 +5,6 @@ Gerencia toda a lógica de negócio do PIX
 from __future__ import annotations
 
 import uuid
-import qrcode
-import io
-import base64
 from datetime import datetime, timedelta
 from typing import Optional, List
 from decimal import Decimal
@@ -15,6 +12,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from fastapi import HTTPException, status
 
+from app.core.cache import cache_service
+from app.core.config import settings
 from app.core.logging import get_logger, log_business_event
 from app.core.exceptions import NotFoundException, BusinessException
 from app.modules.pagamentos.models import (
@@ -23,6 +22,9 @@ from app.modules.pagamentos.models import (
 from app.modules.pagamentos.schemas import (
     ChavePixCreate, TransacaoPixCreate, WebhookPixPayload
 )
+from app.modules.pagamentos.services.br_code import (
+    MAX_TXID, chave_cache_qr_code, gerar_br_code, renderizar_qr_code
+)
 from sqlalchemy import func
 
 logger = get_logger(__name__)
@@ -117,8 +119,9 @@ class PixService:
                 detail="Chave PIX não encontrada ou inativa"
             )
 
-        # Gera TXID único
-        txid = str(uuid.uuid4()).replace('-', '')[:35]
+        # Gera TXID único, do tamanho que cabe no BR Code: o PSP devolve no
+        # webhook o txid lido do QR Code
+        txid = uuid.uuid4().hex[:MAX_TXID]
 
         # Cria transação
         transacao = TransacaoPix(
@@ -136,15 +139,16 @@ class PixService:
         # Gera QR Code
         qr_code_texto = self._gerar_pix_copia_cola(
             chave=chave_pix.chave,
-            valor=float(cobranca_data.valor),
+            valor=cobranca_data.valor,
             txid=txid,
             descricao=cobranca_data.descricao
         )
         transacao.qr_code_texto = qr_code_texto
 
-        # Gera imagem do QR Code
-        qr_code_imagem = self._gerar_qr_code_imagem(qr_code_texto)
-        transacao.qr_code_imagem = qr_code_imagem
+        # Gera imagem do QR Code (payload único por cobrança: sem cache)
+        transacao.qr_code_imagem = await self._gerar_qr_code_imagem(
+            qr_code_texto, cobranca_data.formato_qr_code, usar_cache=False
+        )
 
         self.db.add(transacao)
         await self.db.commit()
@@ -267,95 +271,128 @@ class PixService:
         Returns:
             Número de cobranças marcadas como expiradas
         """
-        # Busca cobranças pendentes expiradas
+        txids = await self.expirar_vencidas()
+
+        if txids:
+            await self.db.commit()
+            logger.info(f"{len(txids)} cobranças PIX marcadas como expiradas")
+
+        return len(txids)
+
+    async def expirar_vencidas(self, agora: Optional[datetime] = None) -> List[str]:
+        """
+        Marca como EXPIRADO, em um único UPDATE, as cobranças pendentes vencidas
+
+        Não faz commit (varredura de app/modules/pagamentos/services/vencimentos.py).
+
+        Args:
+            agora: Instante de referência (padrão: agora, UTC)
+
+        Returns:
+            TXIDs das cobranças expiradas
+        """
+        tabela = TransacaoPix.__table__
         result = await self.db.execute(
-            select(TransacaoPix).where(
-                TransacaoPix.status == StatusPagamento.PENDENTE,
-                TransacaoPix.data_expiracao < datetime.utcnow()
+            tabela.update()
+            .where(
+                tabela.c.status == StatusPagamento.PENDENTE,
+                tabela.c.data_expiracao < (agora or datetime.utcnow())
             )
+            .values(status=StatusPagamento.EXPIRADO)
+            .returning(tabela.c.txid)
         )
-        transacoes = list(result.scalars().all())
+        return list(result.scalars().all())
 
-        count = 0
-        for transacao in transacoes:
-            transacao.status = StatusPagamento.EXPIRADO
-            count += 1
+    async def gerar_qr_code_estatico(
+        self,
+        chave_pix_id: int,
+        valor: Optional[Decimal] = None,
+        descricao: Optional[str] = None,
+        formato: str = "png"
+    ) -> dict:
+        """
+        QR Code estático (reutilizável) de uma chave PIX
 
-        if count > 0:
-            await self.db.commit()
-            logger.info(f"{count} cobranças PIX marcadas como expiradas")
+        O payload só muda com chave, valor e descrição; a imagem fica em
+        cache pelo hash do payload e cobranças repetidas não renderizam de novo.
+
+        Raises:
+            NotFoundException: Se chave PIX não encontrada ou inativa
+        """
+        result = await self.db.execute(
+            select(ChavePix).where(
+                ChavePix.id == chave_pix_id,
+                ChavePix.ativa == True
+            )
+        )
+        chave_pix = result.scalar_one_or_none()
+        if not chave_pix:
+            raise NotFoundException("Chave PIX não encontrada ou inativa")
 
-        return count
+        qr_code_texto = self._gerar_pix_copia_cola(
+            chave=chave_pix.chave, valor=valor, descricao=descricao
+        )
+        return {
+            "qr_code_texto": qr_code_texto,
+            "qr_code_imagem": await self._gerar_qr_code_imagem(qr_code_texto, formato),
+        }
 
     def _gerar_pix_copia_cola(
         self,
         chave: str,
-        valor: float,
-        txid: str,
+        valor: Optional[Decimal] = None,
+        txid: Optional[str] = None,
         descricao: Optional[str] = None
     ) -> str:
         """
-        Gera código PIX Copia e Cola (BR Code)
+        Gera código PIX Copia e Cola (BR Code EMV com CRC16)
 
-        Implementação simplificada do padrão EMV/QRCPS
-        Para produção, usar biblioteca como python-pix ou integração com gateway
+        O campo de referência do BR Code aceita até 25 caracteres, então a
+        cobrança leva os 25 primeiros do TXID.
 
         Args:
             chave: Chave PIX
-            valor: Valor da cobrança
-            txid: Transaction ID
+            valor: Valor da cobrança (None = pagador informa)
+            txid: Transaction ID (None = QR Code estático)
             descricao: Descrição (opcional)
 
         Returns:
             String PIX Copia e Cola
         """
-        # NOTA: Esta é uma implementação simplificada para exemplo
-        # Em produção, usar biblioteca como python-pix ou integração com gateway
-        # que gera o BR Code completo seguindo o padrão EMV
-
-        # Formato simplificado (não é um BR Code válido real)
-        # Para produção real, usar biblioteca ou API do banco/gateway
-
-        pix_code = f"PIX{chave}|{valor:.2f}|{txid}"
-        if descricao:
-            pix_code += f"|{descricao}"
-
-        logger.warning(
-            "Usando geração de PIX simplificada. "
-            "Para produção, integrar com API do banco ou gateway (Mercado Pago, PagSeguro)"
+        return gerar_br_code(
+            chave=chave,
+            nome_recebedor=settings.PIX_RECEBEDOR_NOME,
+            cidade=settings.PIX_RECEBEDOR_CIDADE,
+            valor=valor,
+            txid=txid,
+            descricao=descricao,
         )
 
-        return pix_code
-
-    def _gerar_qr_code_imagem(self, texto: str) -> str:
+    async def _gerar_qr_code_imagem(
+        self, texto: str, formato: str = "png", usar_cache: bool = True
+    ) -> str:
         """
-        Gera imagem QR Code em base64
+        Gera imagem QR Code (data URI PNG ou SVG)
+
+        A renderização roda no pool de threads do br_code, fora do event loop.
 
         Args:
             texto: Texto para gerar QR Code
+            formato: "png" ou "svg"
+            usar_cache: Guarda/reaproveita a imagem pelo hash do payload
 
         Returns:
-            Imagem QR Code em base64 (data URI)
+            Imagem QR Code em data URI
         """
-        # Gera QR Code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(texto)
-        qr.make(fit=True)
-
-        # Cria imagem
-        img = qr.make_image(fill_color="black", back_color="white")
-
-        # Converte para base64
-        buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        img_base64 = base64.b64encode(buffer.getvalue()).decode()
-
-        return f"data:image/png;base64,{img_base64}"
+        if not usar_cache:
+            return await renderizar_qr_code(texto, formato)
+
+        chave_cache = chave_cache_qr_code(texto, formato)
+        imagem = await cache_service.get(chave_cache)
+        if imagem is None:
+            imagem = await renderizar_qr_code(texto, formato)
+            await cache_service.set(chave_cache, imagem, ttl=settings.PIX_QR_CODE_CACHE_TTL)
+        return imagem
 
     # =========================================================================
     # Métodos adicionais para testes
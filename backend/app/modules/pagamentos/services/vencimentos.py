@@ -0,0 +1,66 @@
+"""
+Varredura de vencimentos de PIX e boletos
+
+Executada periodicamente (app/tasks/pagamentos.py):
+- Cobranças PIX pendentes com data_expiracao passada -> EXPIRADO
+- Boletos em aberto/registrados com vencimento passado -> VENCIDO
+
+Cada tabela é atualizada com um único UPDATE ... RETURNING. Na mesma
+transação, as contas a receber dos boletos vencidos (ContaReceber.documento
+= nosso número, como no retorno CNAB) passam a ATRASADA, sem esperar a
+rotina noturna do financeiro.
+"""
+from datetime import date, datetime
+from typing import Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger, log_business_event
+from app.modules.financeiro.service import FinanceiroService
+from app.modules.pagamentos.services.boleto_service import BoletoService
+from app.modules.pagamentos.services.pix_service import PixService
+
+logger = get_logger(__name__)
+
+
+async def varrer_vencimentos(
+    session: AsyncSession,
+    agora: Optional[datetime] = None,
+    hoje: Optional[date] = None,
+) -> Dict[str, int]:
+    """
+    Expira cobranças PIX e marca boletos vencidos em uma transação
+
+    Args:
+        session: Sessão (a função faz commit)
+        agora: Instante de referência do PIX (padrão: agora, UTC)
+        hoje: Data de referência dos boletos (padrão: hoje)
+
+    Returns:
+        Quantidade de cobranças expiradas, de boletos marcados e de contas a
+        receber que passaram a ATRASADA
+    """
+    try:
+        txids = await PixService(session).expirar_vencidas(agora)
+        nosso_numeros = await BoletoService(session).marcar_vencidos(hoje)
+        contas = await FinanceiroService(session).marcar_recebimentos_atrasados(nosso_numeros, hoje)
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+
+    resultado = {
+        "pix_expiradas": len(txids),
+        "boletos_vencidos": len(nosso_numeros),
+        "contas_atrasadas": contas,
+    }
+    if not (txids or nosso_numeros):
+        return resultado
+
+    log_business_event(event_name="pagamentos_vencimentos", **resultado)
+    logger.info(
+        f"Varredura de vencimentos: {resultado['pix_expiradas']} PIX expirados, "
+        f"{resultado['boletos_vencidos']} boletos vencidos, "
+        f"{resultado['contas_atrasadas']} contas a receber em atraso"
+    )
+    return resultado
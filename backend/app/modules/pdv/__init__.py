@@ -6,6 +6,9 @@ from app.modules.pdv.models import (
     MovimentacaoCaixa,
     StatusCaixa,
     TipoMovimentacaoCaixa,
+    OperacaoOfflinePDV,
+    TipoOperacaoOffline,
+    StatusOperacaoOffline,
 )
 from app.modules.pdv.schemas import (
     AbrirCaixaCreate,
@@ -18,11 +21,21 @@ from app.modules.pdv.schemas import (
     SangriaCreate,
     SuprimentoCreate,
     SaldoCaixaResponse,
+    ProdutoScanResponse,
     StatusCaixaEnum,
     TipoMovimentacaoCaixaEnum,
+    OperacaoOfflineCreate,
+    SincronizacaoPDVRequest,
+    SincronizacaoPDVResponse,
+    ResultadoOperacaoOffline,
+    ConflitoOfflineResponse,
+    TipoOperacaoOfflineEnum,
+    StatusSincronizacaoEnum,
 )
 from app.modules.pdv.service import PDVService
+from app.modules.pdv.sincronizacao_service import SincronizacaoPDVService
 from app.modules.pdv.repository import CaixaRepository
+from app.modules.pdv.sincronizacao_repository import SincronizacaoPDVRepository
 from app.modules.pdv.router import router
 
 __all__ = [
@@ -31,6 +44,9 @@ __all__ = [
     "MovimentacaoCaixa",
     "StatusCaixa",
     "TipoMovimentacaoCaixa",
+    "OperacaoOfflinePDV",
+    "TipoOperacaoOffline",
+    "StatusOperacaoOffline",
     # Schemas
     "AbrirCaixaCreate",
     "FecharCaixaCreate",
@@ -42,12 +58,22 @@ __all__ = [
     "SangriaCreate",
     "SuprimentoCreate",
     "SaldoCaixaResponse",
+    "ProdutoScanResponse",
     "StatusCaixaEnum",
     "TipoMovimentacaoCaixaEnum",
+    "OperacaoOfflineCreate",
+    "SincronizacaoPDVRequest",
+    "SincronizacaoPDVResponse",
+    "ResultadoOperacaoOffline",
+    "ConflitoOfflineResponse",
+    "TipoOperacaoOfflineEnum",
+    "StatusSincronizacaoEnum",
     # Service
     "PDVService",
+    "SincronizacaoPDVService",
     # Repository
     "CaixaRepository",
+    "SincronizacaoPDVRepository",
     # Router
     "router",
 ]
@@ -3,7 +3,7 @@ Modelos de PDV (Ponto de Venda)
 """
 from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import String, DateTime, Numeric, Integer, ForeignKey, Index, Enum
+from sqlalchemy import String, DateTime, Numeric, Integer, ForeignKey, Index, Enum, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
@@ -22,8 +22,28 @@ class TipoMovimentacaoCaixa(str, PyEnum):
     SUPRIMENTO = "SUPRIMENTO"
 
 
+class TipoOperacaoOffline(str, PyEnum):
+    """Tipo de operação registrada offline no PDV"""
+    VENDA = "VENDA"
+    SANGRIA = "SANGRIA"
+    SUPRIMENTO = "SUPRIMENTO"
+
+
+class StatusOperacaoOffline(str, PyEnum):
+    """Situação de uma operação offline após a sincronização"""
+    APLICADA = "APLICADA"
+    CONFLITO = "CONFLITO"
+
+
 class Caixa(Base):
-    """Modelo de Caixa"""
+    """
+    Modelo de Caixa
+
+    Os totais por tipo de movimentação são mantidos no próprio registro,
+    incrementados atomicamente a cada movimentação (CaixaRepository.
+    registrar_movimentacao), para que o saldo seja lido sem agregar o
+    ledger. No fechamento os totais são conferidos contra o ledger.
+    """
 
     __tablename__ = "caixas"
 
@@ -46,6 +66,18 @@ class Caixa(Base):
     status: Mapped[StatusCaixa] = mapped_column(
         Enum(StatusCaixa), nullable=False, default=StatusCaixa.ABERTO, index=True
     )
+    total_entradas: Mapped[float] = mapped_column(
+        Numeric(12, 2), nullable=False, default=0.0, server_default="0"
+    )
+    total_saidas: Mapped[float] = mapped_column(
+        Numeric(12, 2), nullable=False, default=0.0, server_default="0"
+    )
+    total_sangrias: Mapped[float] = mapped_column(
+        Numeric(12, 2), nullable=False, default=0.0, server_default="0"
+    )
+    total_suprimentos: Mapped[float] = mapped_column(
+        Numeric(12, 2), nullable=False, default=0.0, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
@@ -103,3 +135,65 @@ class MovimentacaoCaixa(Base):
 
     def __repr__(self) -> str:
         return f"<MovimentacaoCaixa(id={self.id}, caixa_id={self.caixa_id}, tipo='{self.tipo}', valor={self.valor})>"
+
+
+class OperacaoOfflinePDV(Base):
+    """
+    Operação do PDV registrada offline e recebida na sincronização em lote
+
+    id_cliente é gerado pelo terminal e funciona como chave de idempotência:
+    uma operação APLICADA reenviada não é aplicada de novo. Operações em
+    CONFLITO (ex: estoque insuficiente) guardam o payload para revisão do
+    operador e podem ser reenviadas com o mesmo id_cliente.
+    """
+
+    __tablename__ = "operacoes_offline_pdv"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id_cliente: Mapped[str] = mapped_column(
+        String(64), nullable=False, unique=True
+    )
+    terminal: Mapped[str | None] = mapped_column(
+        String(50), nullable=True
+    )
+    operador_id: Mapped[int] = mapped_column(
+        Integer, nullable=False
+    )
+    caixa_id: Mapped[int] = mapped_column(
+        ForeignKey("caixas.id"), nullable=False, index=True
+    )
+    tipo: Mapped[TipoOperacaoOffline] = mapped_column(
+        Enum(TipoOperacaoOffline), nullable=False
+    )
+    status: Mapped[StatusOperacaoOffline] = mapped_column(
+        Enum(StatusOperacaoOffline), nullable=False
+    )
+    registrado_em: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False
+    )
+    venda_id: Mapped[int | None] = mapped_column(
+        ForeignKey("vendas.id"), nullable=True
+    )
+    movimentacao_caixa_id: Mapped[int | None] = mapped_column(
+        ForeignKey("movimentacoes_caixa.id"), nullable=True
+    )
+    motivo: Mapped[str | None] = mapped_column(
+        String(500), nullable=True
+    )
+    payload: Mapped[str] = mapped_column(
+        Text, nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    # Índices compostos para otimização de consultas
+    __table_args__ = (
+        Index("idx_operacao_offline_status_operador", "status", "operador_id"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<OperacaoOfflinePDV(id={self.id}, id_cliente='{self.id_cliente}', status='{self.status}')>"
@@ -1,15 +1,24 @@
 """
 Repository para PDV
 """
-from typing import Optional, List
+from decimal import Decimal
+from typing import Dict, Optional, List
 from datetime import datetime
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, raiseload
 
 from app.modules.pdv.models import Caixa, MovimentacaoCaixa, StatusCaixa, TipoMovimentacaoCaixa
 from app.modules.pdv.schemas import AbrirCaixaCreate, MovimentacaoCaixaCreate
 
+# Coluna de total corrente no Caixa e chave no dicionário de totais, por tipo
+_TOTAIS_POR_TIPO = {
+    TipoMovimentacaoCaixa.ENTRADA: (Caixa.total_entradas, "entradas"),
+    TipoMovimentacaoCaixa.SAIDA: (Caixa.total_saidas, "saidas"),
+    TipoMovimentacaoCaixa.SANGRIA: (Caixa.total_sangrias, "sangrias"),
+    TipoMovimentacaoCaixa.SUPRIMENTO: (Caixa.total_suprimentos, "suprimentos"),
+}
+
 
 class CaixaRepository:
     """Repository para operações de banco de dados de Caixa"""
@@ -62,19 +71,27 @@ class CaixaRepository:
         await self.session.refresh(caixa)
         return caixa
 
-    async def get_by_id(self, caixa_id: int) -> Optional[Caixa]:
+    async def get_by_id(
+        self, caixa_id: int, com_movimentacoes: bool = True
+    ) -> Optional[Caixa]:
         """
         Busca caixa por ID
 
         Args:
             caixa_id: ID do caixa
+            com_movimentacoes: Carrega as movimentações junto (False para
+                leituras frequentes, como o saldo)
 
         Returns:
             Caixa ou None
         """
+        carregamento = (
+            selectinload(Caixa.movimentacoes) if com_movimentacoes
+            else raiseload(Caixa.movimentacoes)
+        )
         result = await self.session.execute(
             select(Caixa)
-            .options(selectinload(Caixa.movimentacoes))
+            .options(carregamento)
             .where(Caixa.id == caixa_id)
         )
         return result.scalar_one_or_none()
@@ -209,9 +226,40 @@ class CaixaRepository:
         )
         self.session.add(movimentacao)
         await self.session.flush()
+        await self.incrementar_totais(caixa_id, {tipo: valor})
         await self.session.refresh(movimentacao)
         return movimentacao
 
+    async def incrementar_totais(
+        self, caixa_id: int, valores: Dict[TipoMovimentacaoCaixa, float]
+    ) -> None:
+        """
+        Soma valores aos totais correntes do caixa
+
+        Um único UPDATE relativo (total = total + valor), atômico mesmo com
+        movimentações concorrentes no mesmo caixa. Quem grava
+        MovimentacaoCaixa sem registrar_movimentacao deve chamar este método.
+        O objeto Caixa já carregado na sessão não é atualizado: os totais
+        devem ser lidos com calcular_saldo_caixa.
+
+        Args:
+            caixa_id: ID do caixa
+            valores: Valor a somar por tipo de movimentação
+        """
+        incrementos = {
+            _TOTAIS_POR_TIPO[tipo][0].key: _TOTAIS_POR_TIPO[tipo][0] + Decimal(str(valor))
+            for tipo, valor in valores.items()
+            if valor
+        }
+        if not incrementos:
+            return
+        await self.session.execute(
+            update(Caixa)
+            .where(Caixa.id == caixa_id)
+            .values(**incrementos)
+            .execution_options(synchronize_session=False)
+        )
+
     async def get_movimentacoes_caixa(
         self, caixa_id: int, tipo: Optional[TipoMovimentacaoCaixa] = None
     ) -> List[MovimentacaoCaixa]:
@@ -236,7 +284,7 @@ class CaixaRepository:
 
     async def calcular_saldo_caixa(self, caixa_id: int) -> dict:
         """
-        Calcula o saldo do caixa
+        Retorna os totais correntes do caixa (sem agregar as movimentações)
 
         Args:
             caixa_id: ID do caixa
@@ -244,35 +292,61 @@ class CaixaRepository:
         Returns:
             Dicionário com totais por tipo de movimentação
         """
-        # Busca todas as movimentações do caixa
-        movimentacoes = await self.get_movimentacoes_caixa(caixa_id)
-
-        # Inicializa totais
-        totais = {
-            "entradas": 0.0,
-            "saidas": 0.0,
-            "sangrias": 0.0,
-            "suprimentos": 0.0,
+        result = await self.session.execute(
+            select(*(coluna for coluna, _ in _TOTAIS_POR_TIPO.values()))
+            .where(Caixa.id == caixa_id)
+        )
+        linha = result.one_or_none()
+        if linha is None:
+            return {chave: 0.0 for _, chave in _TOTAIS_POR_TIPO.values()}
+        return {
+            chave: float(valor or 0)
+            for (_, chave), valor in zip(_TOTAIS_POR_TIPO.values(), linha)
         }
 
-        # Calcula totais
-        for mov in movimentacoes:
-            if mov.tipo == TipoMovimentacaoCaixa.ENTRADA:
-                totais["entradas"] += float(mov.valor)
-            elif mov.tipo == TipoMovimentacaoCaixa.SAIDA:
-                totais["saidas"] += float(mov.valor)
-            elif mov.tipo == TipoMovimentacaoCaixa.SANGRIA:
-                totais["sangrias"] += float(mov.valor)
-            elif mov.tipo == TipoMovimentacaoCaixa.SUPRIMENTO:
-                totais["suprimentos"] += float(mov.valor)
+    async def recalcular_saldo_caixa(self, caixa_id: int) -> dict:
+        """
+        Recalcula os totais do caixa a partir do ledger de movimentações
+
+        Usado na conferência do fechamento; o saldo do dia a dia vem dos
+        totais correntes (calcular_saldo_caixa).
 
+        Args:
+            caixa_id: ID do caixa
+
+        Returns:
+            Dicionário com totais por tipo de movimentação
+        """
+        result = await self.session.execute(
+            select(MovimentacaoCaixa.tipo, func.sum(MovimentacaoCaixa.valor))
+            .where(MovimentacaoCaixa.caixa_id == caixa_id)
+            .group_by(MovimentacaoCaixa.tipo)
+        )
+        totais = {chave: 0.0 for _, chave in _TOTAIS_POR_TIPO.values()}
+        for tipo, total in result.all():
+            totais[_TOTAIS_POR_TIPO[tipo][1]] = round(float(total or 0), 2)
         return totais
 
+    async def definir_totais(self, caixa_id: int, totais: dict) -> None:
+        """
+        Sobrescreve os totais correntes do caixa
+
+        Args:
+            caixa_id: ID do caixa
+            totais: Dicionário com totais por tipo (formato de calcular_saldo_caixa)
+        """
+        await self.session.execute(
+            update(Caixa)
+            .where(Caixa.id == caixa_id)
+            .values(**{coluna.key: totais[chave] for coluna, chave in _TOTAIS_POR_TIPO.values()})
+            .execution_options(synchronize_session=False)
+        )
+
     async def get_total_por_tipo(
         self, caixa_id: int, tipo: TipoMovimentacaoCaixa
     ) -> float:
         """
-        Calcula total de movimentações de um tipo específico
+        Retorna o total corrente de um tipo de movimentação
 
         Args:
             caixa_id: ID do caixa
@@ -282,12 +356,7 @@ class CaixaRepository:
             Total de movimentações do tipo
         """
         result = await self.session.execute(
-            select(func.sum(MovimentacaoCaixa.valor)).where(
-                and_(
-                    MovimentacaoCaixa.caixa_id == caixa_id,
-                    MovimentacaoCaixa.tipo == tipo,
-                )
-            )
+            select(_TOTAIS_POR_TIPO[tipo][0]).where(Caixa.id == caixa_id)
         )
         total = result.scalar_one_or_none()
         return float(total) if total else 0.0
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.modules.pdv.service import PDVService
+from app.modules.pdv.sincronizacao_service import SincronizacaoPDVService
 from app.modules.pdv.schemas import (
     AbrirCaixaCreate,
     FecharCaixaCreate,
@@ -16,6 +17,10 @@ from app.modules.pdv.schemas import (
     SangriaCreate,
     SuprimentoCreate,
     SaldoCaixaResponse,
+    ProdutoScanResponse,
+    SincronizacaoPDVRequest,
+    SincronizacaoPDVResponse,
+    ConflitoOfflineResponse,
 )
 from app.modules.vendas.schemas import VendaResponse
 
@@ -411,3 +416,102 @@ async def registrar_venda_pdv_por_id(
     # Buscar o caixa para pegar o operador_id
     caixa = await service.get_caixa_by_id(caixa_id)
     return await service.registrar_venda_pdv(caixa.operador_id, venda_data)
+
+
+@router.get(
+    "/produto/{codigo_barras}",
+    response_model=ProdutoScanResponse,
+    summary="Ler código de barras",
+    description="Resolve a leitura do scanner (índice em memória com fallback no banco)",
+)
+async def ler_codigo_barras(codigo_barras: str, db: AsyncSession = Depends(get_db)):
+    """
+    Retorna os dados do produto lido no PDV.
+
+    A consulta é atendida pelo índice em memória do worker, aquecido no
+    startup e atualizado por eventos de invalidação; só vai ao banco quando o
+    código não está no índice.
+
+    **Exemplo de uso:**
+    - GET /pdv/produto/7891234567890
+    """
+    service = PDVService(db)
+    return await service.ler_codigo_barras(codigo_barras)
+
+
+# ========== SINCRONIZAÇÃO OFFLINE ==========
+
+
+@router.post(
+    "/sincronizacao",
+    response_model=SincronizacaoPDVResponse,
+    summary="Sincronizar operações offline",
+    description="Aplica em lote a fila de vendas, sangrias e suprimentos registrados offline",
+)
+async def sincronizar_operacoes_offline(
+    request: SincronizacaoPDVRequest, db: AsyncSession = Depends(get_db)
+):
+    """
+    Aplica a fila de operações registradas pelo PDV sem conexão.
+
+    **Regras:**
+    - Deve existir um caixa aberto para o operador
+    - Operações são aplicadas na ordem da fila
+    - `id_cliente` é a chave de idempotência: operação já aplicada retorna
+      DUPLICADA (reenviar a fila após timeout é seguro)
+    - Venda sem estoque ou com produto inativo retorna CONFLITO, fica
+      registrada para revisão e não interrompe as demais operações
+    - Conflitos podem ser reenviados com o mesmo `id_cliente`
+
+    **Exemplo de requisição:**
+    ```json
+    {
+        "operador_id": 1,
+        "terminal": "PDV-02",
+        "operacoes": [
+            {
+                "id_cliente": "6f1c2a9e-5b7d-4e38-9a0f-2d4c8b1e7a53",
+                "tipo": "VENDA",
+                "registrado_em": "2026-10-18T14:32:05-03:00",
+                "venda": {
+                    "forma_pagamento": "DINHEIRO",
+                    "itens": [{"produto_id": 1, "quantidade": 2, "preco_unitario": 32.90}]
+                }
+            },
+            {
+                "id_cliente": "0b9e4d17-8c2f-4a61-b3e5-7f0a6c9d2e18",
+                "tipo": "SANGRIA",
+                "registrado_em": "2026-10-18T14:40:00-03:00",
+                "sangria": {"valor": 300.00, "descricao": "Sangria para cofre"}
+            }
+        ]
+    }
+    ```
+    """
+    service = SincronizacaoPDVService(db)
+    return await service.sincronizar(request)
+
+
+@router.get(
+    "/sincronizacao/conflitos",
+    response_model=list[ConflitoOfflineResponse],
+    summary="Listar conflitos da sincronização offline",
+    description="Operações offline que não puderam ser aplicadas e aguardam revisão",
+)
+async def listar_conflitos_offline(
+    operador_id: int = Query(None, description="Filtrar por operador"),
+    skip: int = Query(0, ge=0, description="Registros para pular"),
+    limit: int = Query(100, ge=1, le=1000, description="Limite de registros"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Lista operações offline em conflito (ex: estoque insuficiente).
+
+    O campo `payload` traz a operação original; após corrigir a causa
+    (ex: entrada de estoque), reenvie-a em POST /pdv/sincronizacao.
+
+    **Exemplo de uso:**
+    - GET /pdv/sincronizacao/conflitos?operador_id=1
+    """
+    service = SincronizacaoPDVService(db)
+    return await service.listar_conflitos(operador_id, skip, limit)
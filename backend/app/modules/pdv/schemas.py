@@ -1,10 +1,10 @@
 """
 Schemas Pydantic para PDV
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
 from app.modules.vendas.schemas import ItemVendaCreate
 
 
@@ -22,6 +22,20 @@ class TipoMovimentacaoCaixaEnum(str, Enum):
     SUPRIMENTO = "SUPRIMENTO"
 
 
+class TipoOperacaoOfflineEnum(str, Enum):
+    """Enum de Tipo de Operação Offline"""
+    VENDA = "VENDA"
+    SANGRIA = "SANGRIA"
+    SUPRIMENTO = "SUPRIMENTO"
+
+
+class StatusSincronizacaoEnum(str, Enum):
+    """Resultado de uma operação na sincronização offline"""
+    APLICADA = "APLICADA"
+    DUPLICADA = "DUPLICADA"
+    CONFLITO = "CONFLITO"
+
+
 # ========== CAIXA SCHEMAS ==========
 
 class CaixaBase(BaseModel):
@@ -179,6 +193,86 @@ class SuprimentoCreate(BaseModel):
         return v.strip()
 
 
+# ========== SINCRONIZAÇÃO OFFLINE SCHEMAS ==========
+
+class OperacaoOfflineCreate(BaseModel):
+    """Operação registrada pelo PDV enquanto estava sem conexão"""
+    id_cliente: str = Field(
+        ..., min_length=8, max_length=64,
+        description="ID gerado no terminal (ex: UUID), usado como chave de idempotência",
+    )
+    tipo: TipoOperacaoOfflineEnum = Field(..., description="Tipo da operação")
+    registrado_em: datetime = Field(..., description="Data/hora da operação no terminal")
+    venda: Optional[VendaPDVCreate] = Field(None, description="Dados da venda (tipo VENDA)")
+    sangria: Optional[SangriaCreate] = Field(None, description="Dados da sangria (tipo SANGRIA)")
+    suprimento: Optional[SuprimentoCreate] = Field(None, description="Dados do suprimento (tipo SUPRIMENTO)")
+
+    @field_validator("registrado_em")
+    @classmethod
+    def validar_registrado_em(cls, v: datetime) -> datetime:
+        """Converte para UTC sem fuso (padrão das colunas DateTime)"""
+        if v.tzinfo is not None:
+            v = v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+    @model_validator(mode="after")
+    def validar_dados_do_tipo(self) -> "OperacaoOfflineCreate":
+        """Exige somente os dados correspondentes ao tipo"""
+        informados = {
+            TipoOperacaoOfflineEnum.VENDA: self.venda,
+            TipoOperacaoOfflineEnum.SANGRIA: self.sangria,
+            TipoOperacaoOfflineEnum.SUPRIMENTO: self.suprimento,
+        }
+        if informados[self.tipo] is None:
+            raise ValueError(f"Operação {self.tipo.value} exige o campo '{self.tipo.value.lower()}'")
+        if sum(dados is not None for dados in informados.values()) > 1:
+            raise ValueError("Informe apenas os dados do tipo da operação")
+        return self
+
+
+class SincronizacaoPDVRequest(BaseModel):
+    """Fila de operações offline de um terminal, na ordem em que ocorreram"""
+    operador_id: int = Field(..., gt=0, description="ID do operador")
+    terminal: Optional[str] = Field(None, max_length=50, description="Identificação do terminal")
+    operacoes: list[OperacaoOfflineCreate] = Field(..., min_length=1, max_length=500)
+
+
+class ResultadoOperacaoOffline(BaseModel):
+    """Resultado de uma operação da fila"""
+    id_cliente: str
+    tipo: TipoOperacaoOfflineEnum
+    status: StatusSincronizacaoEnum
+    venda_id: Optional[int] = None
+    movimentacao_caixa_id: Optional[int] = None
+    motivo: Optional[str] = Field(None, description="Motivo do conflito")
+
+
+class SincronizacaoPDVResponse(BaseModel):
+    """Resumo da sincronização de uma fila offline"""
+    caixa_id: int
+    total: int
+    aplicadas: int
+    duplicadas: int
+    conflitos: int
+    resultados: list[ResultadoOperacaoOffline]
+
+
+class ConflitoOfflineResponse(BaseModel):
+    """Operação offline em conflito aguardando revisão do operador"""
+    id: int
+    id_cliente: str
+    terminal: Optional[str]
+    operador_id: int
+    caixa_id: int
+    tipo: TipoOperacaoOfflineEnum
+    registrado_em: datetime
+    motivo: Optional[str]
+    payload: str
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 # ========== SALDO CAIXA SCHEMA ==========
 
 class SaldoCaixaResponse(BaseModel):
@@ -194,3 +288,18 @@ class SaldoCaixaResponse(BaseModel):
     saldo_atual: float
     saldo_esperado: float
     status: StatusCaixaEnum
+
+
+# ========== LEITURA DE PRODUTO ==========
+
+class ProdutoScanResponse(BaseModel):
+    """Dados do produto lido pelo scanner do PDV"""
+    id: int
+    codigo_barras: str
+    descricao: str
+    preco_venda: float
+    unidade: str
+    estoque_atual: float
+    em_estoque: bool
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,6 +1,7 @@
 """
 Service Layer para PDV
 """
+import logging
 from typing import Optional
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -18,7 +19,9 @@ from app.modules.pdv.schemas import (
     SangriaCreate,
     SuprimentoCreate,
     SaldoCaixaResponse,
+    ProdutoScanResponse,
 )
+from app.modules.produtos.indice_codigo_barras import indice_codigo_barras
 from app.modules.vendas.service import VendasService
 from app.modules.vendas.schemas import VendaCreate, VendaResponse
 from app.core.exceptions import (
@@ -27,6 +30,8 @@ from app.core.exceptions import (
     BusinessRuleException,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class PDVService:
     """Service para regras de negócio de PDV"""
@@ -36,6 +41,20 @@ class PDVService:
         self.vendas_service = VendasService(session)
         self.session = session
 
+    async def ler_codigo_barras(self, codigo_barras: str) -> ProdutoScanResponse:
+        """
+        Resolve a leitura do scanner pelo índice em memória do worker
+
+        Raises:
+            NotFoundException: Se não houver produto ativo com o código
+        """
+        produto = await indice_codigo_barras.buscar(self.session, codigo_barras)
+        if produto is None:
+            raise NotFoundException(
+                f"Produto com código de barras {codigo_barras} não encontrado"
+            )
+        return ProdutoScanResponse(**produto._asdict(), em_estoque=produto.em_estoque)
+
     async def abrir_caixa(self, caixa_data: AbrirCaixaCreate) -> CaixaResponse:
         """
         Abre um novo caixa
@@ -75,7 +94,7 @@ class PDVService:
 
         Regras:
         - Deve existir um caixa aberto para o operador
-        - Calcula saldo esperado e compara com valor informado
+        - Confere os totais correntes do caixa contra o ledger de movimentações
         - Altera status para FECHADO
 
         Args:
@@ -95,8 +114,8 @@ class PDVService:
                 f"Não há caixa aberto para o operador {operador_id}"
             )
 
-        # Calcula saldo esperado
-        saldo = await self.calcular_saldo_caixa(caixa.id)
+        # Confere os totais correntes contra o ledger de movimentações
+        await self.conferir_totais_caixa(caixa.id)
 
         # Fecha o caixa
         caixa_fechado = await self.repository.fechar_caixa(
@@ -305,11 +324,11 @@ class PDVService:
             NotFoundException: Se caixa não existe
         """
         # Busca caixa
-        caixa = await self.repository.get_by_id(caixa_id)
+        caixa = await self.repository.get_by_id(caixa_id, com_movimentacoes=False)
         if not caixa:
             raise NotFoundException(f"Caixa {caixa_id} não encontrado")
 
-        # Calcula totais por tipo
+        # Totais correntes mantidos no registro do caixa (sem agregar o ledger)
         totais = await self.repository.calcular_saldo_caixa(caixa_id)
 
         # Calcula saldo esperado
@@ -344,6 +363,36 @@ class PDVService:
             status=caixa.status.value,
         )
 
+    async def conferir_totais_caixa(self, caixa_id: int) -> bool:
+        """
+        Confere os totais correntes do caixa contra o ledger de movimentações
+
+        Se houver divergência (ex: movimentação gravada sem atualizar os
+        totais), o ledger prevalece: os totais são corrigidos e a divergência
+        é registrada em log.
+
+        Args:
+            caixa_id: ID do caixa
+
+        Returns:
+            True se os totais conferem, False se foram corrigidos
+        """
+        correntes = await self.repository.calcular_saldo_caixa(caixa_id)
+        ledger = await self.repository.recalcular_saldo_caixa(caixa_id)
+        divergentes = {
+            tipo: (round(correntes[tipo], 2), valor)
+            for tipo, valor in ledger.items()
+            if round(correntes[tipo], 2) != valor
+        }
+        if not divergentes:
+            return True
+
+        logger.warning(
+            f"Totais do caixa {caixa_id} divergentes do ledger (corrente, ledger): {divergentes}"
+        )
+        await self.repository.definir_totais(caixa_id, ledger)
+        return False
+
     async def get_caixa_by_id(self, caixa_id: int) -> CaixaResponse:
         """
         Busca caixa por ID
@@ -385,7 +434,7 @@ class PDVService:
             ValidationException: Se caixa não está aberto
         """
         # Buscar caixa
-        caixa = await self.repository.get_by_id(caixa_id)
+        caixa = await self.repository.get_by_id(caixa_id, com_movimentacoes=False)
         if not caixa:
             raise NotFoundException(f"Caixa {caixa_id} não encontrado")
 
@@ -394,7 +443,7 @@ class PDVService:
             raise ValidationException(f"Caixa {caixa_id} não está aberto")
 
         # Criar movimentação
-        movimentacao = await self.repository.criar_movimentacao(
+        movimentacao = await self.repository.registrar_movimentacao(
             caixa_id=caixa_id,
             tipo=TipoMovimentacaoCaixa(movimentacao_data.tipo),
             valor=movimentacao_data.valor,
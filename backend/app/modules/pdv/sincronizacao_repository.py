@@ -0,0 +1,123 @@
+"""
+Repository para sincronização de operações offline do PDV
+"""
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.pdv.models import OperacaoOfflinePDV, StatusOperacaoOffline
+from app.modules.produtos.models import Produto
+from app.modules.produtos.sincronizacao import carimbar_no_commit
+from app.modules.estoque.models import MovimentacaoEstoque
+
+
+class SincronizacaoPDVRepository:
+    """Repository para operações offline do PDV"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_operacoes(
+        self, ids_cliente: Iterable[str]
+    ) -> Dict[str, OperacaoOfflinePDV]:
+        """
+        Busca operações já recebidas pelos IDs gerados no terminal
+
+        Returns:
+            Dicionário id_cliente -> operação
+        """
+        ids = set(ids_cliente)
+        if not ids:
+            return {}
+        result = await self.session.execute(
+            select(OperacaoOfflinePDV).where(OperacaoOfflinePDV.id_cliente.in_(ids))
+        )
+        return {op.id_cliente: op for op in result.scalars().all()}
+
+    async def get_produtos_para_baixa(self, produto_ids: Iterable[int]) -> Dict[int, Any]:
+        """
+        Carrega em uma consulta os dados de estoque dos produtos da fila
+
+        As linhas ficam bloqueadas (FOR UPDATE) até o fim da transação para
+        que vendas online concorrentes não consumam o saldo já validado.
+
+        Returns:
+            Dicionário produto_id -> linha (id, descricao, ativo,
+            controla_lote, estoque_atual)
+        """
+        ids = set(produto_ids)
+        if not ids:
+            return {}
+        result = await self.session.execute(
+            select(
+                Produto.id,
+                Produto.descricao,
+                Produto.ativo,
+                Produto.controla_lote,
+                Produto.estoque_atual,
+            )
+            .where(Produto.id.in_(ids))
+            .with_for_update()
+        )
+        return {linha.id: linha for linha in result.all()}
+
+    async def inserir_saidas_estoque(self, movimentacoes: List[Dict[str, Any]]) -> None:
+        """
+        Insere as movimentações de saída em lote (um executemany)
+
+        Args:
+            movimentacoes: Dicts com as colunas de MovimentacaoEstoque
+        """
+        if movimentacoes:
+            await self.session.execute(
+                MovimentacaoEstoque.__table__.insert(), movimentacoes
+            )
+
+    async def baixar_estoque(self, quantidades: Dict[int, float]) -> None:
+        """
+        Subtrai do estoque atual a quantidade de cada produto
+
+        Um único UPDATE executado em lote; a subtração é relativa ao valor
+        no banco, não ao saldo lido na validação.
+
+        Args:
+            quantidades: Dicionário produto_id -> quantidade vendida
+        """
+        if not quantidades:
+            return
+        tabela = Produto.__table__
+        await self.session.execute(
+            tabela.update()
+            .where(tabela.c.id == bindparam("b_id"))
+            .values(estoque_atual=tabela.c.estoque_atual - bindparam("b_quantidade")),
+            [
+                {"b_id": produto_id, "b_quantidade": Decimal(str(quantidade))}
+                for produto_id, quantidade in quantidades.items()
+            ],
+        )
+        carimbar_no_commit(self.session, Produto.id.in_(list(quantidades)))
+
+    async def listar_conflitos(
+        self, operador_id: Optional[int] = None, skip: int = 0, limit: int = 100
+    ) -> List[OperacaoOfflinePDV]:
+        """
+        Lista operações em conflito aguardando revisão
+
+        Args:
+            operador_id: Filtrar por operador
+            skip: Quantidade de registros para pular
+            limit: Limite de registros
+
+        Returns:
+            Operações em conflito (mais antigas primeiro)
+        """
+        query = select(OperacaoOfflinePDV).where(
+            OperacaoOfflinePDV.status == StatusOperacaoOffline.CONFLITO
+        )
+        if operador_id:
+            query = query.where(OperacaoOfflinePDV.operador_id == operador_id)
+        query = query.order_by(OperacaoOfflinePDV.registrado_em.asc()).offset(skip).limit(limit)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
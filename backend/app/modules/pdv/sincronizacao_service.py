@@ -0,0 +1,391 @@
+"""
+Service para sincronização em lote de operações offline do PDV
+
+Quando a conexão da loja cai, o PDV continua vendendo e enfileira vendas,
+sangrias e suprimentos localmente. Ao reconectar, envia a fila inteira em
+uma requisição:
+
+- Cada operação traz um id_cliente gerado no terminal. Operações já
+  APLICADAS são respondidas como DUPLICADA, sem reaplicar (reenvio seguro
+  após timeout)
+- As operações são aplicadas na ordem da fila. O saldo dos produtos é lido
+  uma vez e consumido em memória; uma venda sem saldo (ou com produto
+  inativo) vira CONFLITO e não interrompe as demais
+- Vendas aceitas são gravadas em lote: um flush para vendas/itens, um
+  executemany para as saídas de estoque e um UPDATE em lote no estoque
+- Produtos com controle de lote precisam da baixa FIFO por lote e seguem
+  pelo fluxo normal de VendasService.criar_venda, isolados em SAVEPOINT
+- Conflitos ficam gravados com o payload para revisão do operador e podem
+  ser reenviados com o mesmo id_cliente
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.pdv.models import (
+    MovimentacaoCaixa,
+    OperacaoOfflinePDV,
+    StatusOperacaoOffline,
+    TipoMovimentacaoCaixa,
+    TipoOperacaoOffline,
+)
+from app.modules.pdv.repository import CaixaRepository
+from app.modules.pdv.sincronizacao_repository import SincronizacaoPDVRepository
+from app.modules.pdv.schemas import (
+    OperacaoOfflineCreate,
+    SincronizacaoPDVRequest,
+    SincronizacaoPDVResponse,
+    ResultadoOperacaoOffline,
+    ConflitoOfflineResponse,
+    StatusSincronizacaoEnum,
+    TipoOperacaoOfflineEnum,
+)
+from app.modules.estoque.models import TipoMovimentacao
+from app.modules.produtos.indice_codigo_barras import marcar_produtos_alterados
+from app.modules.vendas.models import Venda, ItemVenda
+from app.modules.vendas.schemas import VendaCreate
+from app.modules.vendas.service import VendasService
+from app.core.exceptions import (
+    BusinessRuleException,
+    DuplicateException,
+    ERPException,
+    InsufficientStockException,
+)
+
+
+class SincronizacaoPDVService:
+    """Service para sincronização de filas offline do PDV"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = SincronizacaoPDVRepository(session)
+        self.caixa_repository = CaixaRepository(session)
+        self.vendas_service = VendasService(session)
+        # Vendas com controle de lote aplicadas pelo fluxo online (id_cliente -> venda)
+        self._vendas_com_lote: Dict[str, Venda] = {}
+
+    async def sincronizar(self, request: SincronizacaoPDVRequest) -> SincronizacaoPDVResponse:
+        """
+        Aplica a fila de operações offline de um terminal
+
+        Regras:
+        - Deve existir um caixa aberto para o operador
+        - id_cliente já APLICADO (no banco ou antes na mesma fila) é DUPLICADA
+        - Conflitos não interrompem a fila e são gravados para revisão
+
+        Args:
+            request: Operador, terminal e operações na ordem em que ocorreram
+
+        Returns:
+            SincronizacaoPDVResponse com o resultado de cada operação
+
+        Raises:
+            BusinessRuleException: Se não há caixa aberto para o operador
+            DuplicateException: Se outra sincronização gravou os mesmos IDs
+                concorrentemente (reenviar a fila)
+        """
+        caixa = await self.caixa_repository.get_caixa_aberto(request.operador_id)
+        if not caixa:
+            raise BusinessRuleException(
+                f"Não há caixa aberto para o operador {request.operador_id}. "
+                "Abra o caixa antes de sincronizar as operações offline."
+            )
+        caixa_id = caixa.id
+
+        existentes = await self.repository.get_operacoes(
+            op.id_cliente for op in request.operacoes
+        )
+        produtos = await self.repository.get_produtos_para_baixa(
+            item.produto_id
+            for op in request.operacoes
+            if op.venda is not None
+            for item in op.venda.itens
+        )
+        saldos = {produto_id: float(p.estoque_atual) for produto_id, p in produtos.items()}
+
+        resultados: Dict[str, ResultadoOperacaoOffline] = {}
+        ordem: List[ResultadoOperacaoOffline] = []
+        aceitas: List[Tuple[OperacaoOfflineCreate, Optional[Venda]]] = []
+        conflitos: Dict[str, Tuple[OperacaoOfflineCreate, str]] = {}
+
+        for op in request.operacoes:
+            anterior = resultados.get(op.id_cliente)
+            existente = existentes.get(op.id_cliente)
+            if anterior is not None:
+                resultado = anterior.model_copy(update={"status": StatusSincronizacaoEnum.DUPLICADA})
+            elif existente is not None and existente.status == StatusOperacaoOffline.APLICADA:
+                resultado = ResultadoOperacaoOffline(
+                    id_cliente=op.id_cliente,
+                    tipo=existente.tipo.value,
+                    status=StatusSincronizacaoEnum.DUPLICADA,
+                    venda_id=existente.venda_id,
+                    movimentacao_caixa_id=existente.movimentacao_caixa_id,
+                )
+            else:
+                venda = None
+                motivo = None
+                if op.tipo == TipoOperacaoOfflineEnum.VENDA:
+                    venda, motivo = await self._preparar_venda(
+                        op, request.operador_id, produtos, saldos
+                    )
+                if motivo is None:
+                    aceitas.append((op, venda))
+                    resultado = ResultadoOperacaoOffline(
+                        id_cliente=op.id_cliente, tipo=op.tipo,
+                        status=StatusSincronizacaoEnum.APLICADA,
+                    )
+                else:
+                    conflitos[op.id_cliente] = (op, motivo)
+                    resultado = ResultadoOperacaoOffline(
+                        id_cliente=op.id_cliente, tipo=op.tipo,
+                        status=StatusSincronizacaoEnum.CONFLITO, motivo=motivo,
+                    )
+                resultados[op.id_cliente] = resultado
+            ordem.append(resultado)
+
+        try:
+            await self._gravar(request, caixa_id, aceitas, conflitos, existentes, resultados)
+        except IntegrityError:
+            raise DuplicateException(
+                "Operações desta fila foram sincronizadas por outra requisição. Reenvie a fila."
+            )
+
+        # Duplicadas dentro da fila repetem os IDs gravados para a primeira ocorrência
+        for i, resultado in enumerate(ordem):
+            if resultado.status == StatusSincronizacaoEnum.DUPLICADA and resultado.id_cliente in resultados:
+                original = resultados[resultado.id_cliente]
+                ordem[i] = resultado.model_copy(update={
+                    "venda_id": original.venda_id,
+                    "movimentacao_caixa_id": original.movimentacao_caixa_id,
+                    "motivo": original.motivo,
+                })
+
+        return SincronizacaoPDVResponse(
+            caixa_id=caixa_id,
+            total=len(ordem),
+            aplicadas=sum(r.status == StatusSincronizacaoEnum.APLICADA for r in ordem),
+            duplicadas=sum(r.status == StatusSincronizacaoEnum.DUPLICADA for r in ordem),
+            conflitos=sum(r.status == StatusSincronizacaoEnum.CONFLITO for r in ordem),
+            resultados=ordem,
+        )
+
+    async def listar_conflitos(
+        self, operador_id: Optional[int] = None, skip: int = 0, limit: int = 100
+    ) -> List[ConflitoOfflineResponse]:
+        """
+        Lista operações offline em conflito aguardando revisão
+
+        Args:
+            operador_id: Filtrar por operador
+            skip: Quantidade de registros para pular
+            limit: Limite de registros
+
+        Returns:
+            Lista de ConflitoOfflineResponse
+        """
+        conflitos = await self.repository.listar_conflitos(operador_id, skip, limit)
+        return [ConflitoOfflineResponse.model_validate(c) for c in conflitos]
+
+    async def _preparar_venda(
+        self,
+        op: OperacaoOfflineCreate,
+        operador_id: int,
+        produtos: Dict,
+        saldos: Dict[int, float],
+    ) -> Tuple[Optional[Venda], Optional[str]]:
+        """
+        Valida a venda contra o saldo em memória e monta a Venda a gravar
+
+        Returns:
+            Tupla (venda, motivo do conflito). Vendas com produto que controla
+            lote já são aplicadas aqui e retornam (None, None).
+        """
+        quantidades: Dict[int, float] = defaultdict(float)
+        for item in op.venda.itens:
+            quantidades[item.produto_id] += item.quantidade
+
+        for produto_id, quantidade in quantidades.items():
+            produto = produtos.get(produto_id)
+            if produto is None:
+                return None, f"Produto {produto_id} não encontrado"
+            if not produto.ativo:
+                return None, f"Produto '{produto.descricao}' está inativo e não pode ser vendido"
+            if saldos[produto_id] < quantidade:
+                return None, InsufficientStockException(
+                    produto=produto.descricao,
+                    disponivel=saldos[produto_id],
+                    necessario=quantidade,
+                ).message
+
+        subtotal = sum(item.quantidade * item.preco_unitario for item in op.venda.itens)
+        if subtotal - op.venda.desconto < 0:
+            return None, "Desconto não pode ser maior que o subtotal da venda"
+
+        if any(produtos[produto_id].controla_lote for produto_id in quantidades):
+            motivo = await self._aplicar_venda_com_lote(op, operador_id)
+            if motivo is not None:
+                return None, motivo
+            venda = None
+        else:
+            venda = Venda(
+                cliente_id=op.venda.cliente_id,
+                vendedor_id=operador_id,
+                data_venda=op.registrado_em,
+                forma_pagamento=op.venda.forma_pagamento,
+                observacoes=op.venda.observacoes,
+                subtotal=subtotal,
+                desconto=op.venda.desconto,
+                valor_total=subtotal - op.venda.desconto,
+                itens=[
+                    ItemVenda(
+                        produto_id=item.produto_id,
+                        quantidade=item.quantidade,
+                        preco_unitario=item.preco_unitario,
+                        desconto_item=item.desconto_item,
+                        subtotal_item=item.quantidade * item.preco_unitario,
+                        total_item=item.quantidade * item.preco_unitario - item.desconto_item,
+                    )
+                    for item in op.venda.itens
+                ],
+            )
+
+        for produto_id, quantidade in quantidades.items():
+            saldos[produto_id] -= quantidade
+        return venda, None
+
+    async def _aplicar_venda_com_lote(
+        self, op: OperacaoOfflineCreate, operador_id: int
+    ) -> Optional[str]:
+        """
+        Aplica pelo fluxo online uma venda com produto que controla lote
+
+        Returns:
+            Motivo do conflito ou None se a venda foi aplicada
+        """
+        try:
+            async with self.session.begin_nested():
+                venda = await self.vendas_service.criar_venda(VendaCreate(
+                    cliente_id=op.venda.cliente_id,
+                    vendedor_id=operador_id,
+                    forma_pagamento=op.venda.forma_pagamento,
+                    desconto=op.venda.desconto,
+                    observacoes=op.venda.observacoes,
+                    itens=op.venda.itens,
+                ))
+        except ERPException as e:
+            return e.message
+
+        venda_orm = await self.session.get(Venda, venda.id)
+        venda_orm.data_venda = op.registrado_em
+        self._vendas_com_lote[op.id_cliente] = venda_orm
+        return None
+
+    async def _gravar(
+        self,
+        request: SincronizacaoPDVRequest,
+        caixa_id: int,
+        aceitas: List[Tuple[OperacaoOfflineCreate, Optional[Venda]]],
+        conflitos: Dict[str, Tuple[OperacaoOfflineCreate, str]],
+        existentes: Dict[str, OperacaoOfflinePDV],
+        resultados: Dict[str, ResultadoOperacaoOffline],
+    ) -> None:
+        """Grava em lote vendas, saídas de estoque, caixa e registros da fila"""
+        vendas = [venda for _, venda in aceitas if venda is not None]
+        self.session.add_all(vendas)
+        await self.session.flush()
+
+        saidas = []
+        quantidades: Dict[int, float] = defaultdict(float)
+        for venda in vendas:
+            for item in venda.itens:
+                saidas.append({
+                    "produto_id": item.produto_id,
+                    "tipo": TipoMovimentacao.SAIDA,
+                    "quantidade": item.quantidade,
+                    "custo_unitario": item.preco_unitario,
+                    "valor_total": item.quantidade * item.preco_unitario,
+                    "documento_referencia": f"VENDA-{venda.id}",
+                    "observacao": f"Venda #{venda.id}",
+                    "usuario_id": request.operador_id,
+                })
+                quantidades[item.produto_id] += item.quantidade
+        await self.repository.inserir_saidas_estoque(saidas)
+        await self.repository.baixar_estoque(quantidades)
+        if quantidades:
+            marcar_produtos_alterados(self.session, quantidades.keys())
+
+        movimentacoes: Dict[str, MovimentacaoCaixa] = {}
+        vendas_por_operacao: Dict[str, Venda] = {}
+        for op, venda in aceitas:
+            venda = venda or self._vendas_com_lote.get(op.id_cliente)
+            if venda is not None:
+                vendas_por_operacao[op.id_cliente] = venda
+                movimentacoes[op.id_cliente] = MovimentacaoCaixa(
+                    caixa_id=caixa_id,
+                    tipo=TipoMovimentacaoCaixa.ENTRADA,
+                    valor=venda.valor_total,
+                    descricao=f"Venda #{venda.id} - {venda.forma_pagamento}",
+                    venda_id=venda.id,
+                    created_at=op.registrado_em,
+                )
+            else:
+                dados = op.sangria or op.suprimento
+                movimentacoes[op.id_cliente] = MovimentacaoCaixa(
+                    caixa_id=caixa_id,
+                    tipo=TipoMovimentacaoCaixa(op.tipo.value),
+                    valor=dados.valor,
+                    descricao=dados.descricao,
+                    created_at=op.registrado_em,
+                )
+        self.session.add_all(movimentacoes.values())
+        await self.session.flush()
+        totais: Dict[TipoMovimentacaoCaixa, float] = defaultdict(float)
+        for movimentacao in movimentacoes.values():
+            totais[movimentacao.tipo] += float(movimentacao.valor)
+        await self.caixa_repository.incrementar_totais(caixa_id, totais)
+
+        for op, _ in aceitas:
+            venda = vendas_por_operacao.get(op.id_cliente)
+            resultado = resultados[op.id_cliente]
+            resultado.venda_id = venda.id if venda is not None else None
+            resultado.movimentacao_caixa_id = movimentacoes[op.id_cliente].id
+            self._registrar_operacao(
+                request, caixa_id, op, existentes.get(op.id_cliente),
+                StatusOperacaoOffline.APLICADA,
+                venda_id=resultado.venda_id,
+                movimentacao_caixa_id=resultado.movimentacao_caixa_id,
+            )
+        for op, motivo in conflitos.values():
+            self._registrar_operacao(
+                request, caixa_id, op, existentes.get(op.id_cliente),
+                StatusOperacaoOffline.CONFLITO, motivo=motivo,
+            )
+        await self.session.flush()
+
+    def _registrar_operacao(
+        self,
+        request: SincronizacaoPDVRequest,
+        caixa_id: int,
+        op: OperacaoOfflineCreate,
+        existente: Optional[OperacaoOfflinePDV],
+        status: StatusOperacaoOffline,
+        venda_id: Optional[int] = None,
+        movimentacao_caixa_id: Optional[int] = None,
+        motivo: Optional[str] = None,
+    ) -> None:
+        """Grava a operação (ou atualiza um conflito reenviado)"""
+        operacao = existente or OperacaoOfflinePDV(id_cliente=op.id_cliente)
+        operacao.terminal = request.terminal
+        operacao.operador_id = request.operador_id
+        operacao.caixa_id = caixa_id
+        operacao.tipo = TipoOperacaoOffline(op.tipo.value)
+        operacao.status = status
+        operacao.registrado_em = op.registrado_em
+        operacao.venda_id = venda_id
+        operacao.movimentacao_caixa_id = movimentacao_caixa_id
+        operacao.motivo = motivo
+        operacao.payload = op.model_dump_json()
+        if existente is None:
+            self.session.add(operacao)
@@ -7,6 +7,8 @@ from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from datetime import date
 
+from app.core.sequencias import proximo_numero
+
 from .models import PedidoVenda, ItemPedidoVenda, StatusPedidoVenda
 
 
@@ -96,14 +98,13 @@ class PedidoVendaRepository:
 
     async def gerar_numero_pedido(self) -> str:
         """Gerar próximo número de pedido"""
-        result = await self.db.execute(
-            select(func.max(PedidoVenda.numero_pedido))
-        )
-        ultimo_numero = result.scalar()
 
-        if not ultimo_numero:
-            return "PV000001"
+        async def ultimo_emitido(executor) -> int:
+            result = await executor.execute(
+                select(func.max(PedidoVenda.numero_pedido))
+            )
+            ultimo_numero = result.scalar()
+            return int(ultimo_numero[2:]) if ultimo_numero else 0
 
-        # Extrair número e incrementar
-        numero = int(ultimo_numero[2:]) + 1
+        numero = await proximo_numero(self.db, "pedido_venda", inicial=ultimo_emitido)
         return f"PV{numero:06d}"
@@ -1,26 +1,42 @@
 """
 Módulo de Produtos
 """
-from app.modules.produtos.models import Produto
+from app.modules.produtos.models import (
+    Produto,
+    ProdutoRemovido,
+    LoteAtualizacaoProdutos,
+    HistoricoPrecoProduto,
+)
 from app.modules.produtos.schemas import (
     ProdutoBase,
     ProdutoCreate,
     ProdutoUpdate,
     ProdutoResponse,
     ProdutoList,
+    AtualizacaoLoteRequest,
+    AtualizacaoLoteResponse,
+    CatalogoDeltaResponse,
 )
 from app.modules.produtos.repository import ProdutoRepository
 from app.modules.produtos.service import ProdutoService
+from app.modules.produtos.indice_codigo_barras import indice_codigo_barras
 from app.modules.produtos.router import router
 
 __all__ = [
     "Produto",
+    "ProdutoRemovido",
+    "LoteAtualizacaoProdutos",
+    "HistoricoPrecoProduto",
     "ProdutoBase",
     "ProdutoCreate",
     "ProdutoUpdate",
     "ProdutoResponse",
     "ProdutoList",
+    "AtualizacaoLoteRequest",
+    "AtualizacaoLoteResponse",
+    "CatalogoDeltaResponse",
     "ProdutoRepository",
     "ProdutoService",
+    "indice_codigo_barras",
     "router",
 ]
@@ -0,0 +1,234 @@
+"""
+Índice de busca de produtos em memória (n-gramas)
+
+Usado quando o banco não é PostgreSQL (SQLite em desenvolvimento/testes),
+onde não há pg_trgm/tsvector. Mantém trigramas da descrição e do código de
+barras normalizados (minúsculas, sem acentos) e responde buscas por
+substring com ranking semelhante ao da busca full-text:
+
+1. Código de barras exato
+2. Descrição começando pelo termo
+3. Palavras começando pelos termos (prefixo)
+4. Termos contidos em qualquer posição
+
+As listas de postings usam array('I') para caber um catálogo de 100k
+produtos em poucos MB. Atualizações não removem postings antigos: cada
+candidato é verificado contra o texto atual, então entradas obsoletas são
+apenas descartadas.
+
+Há um índice por banco (chave = URL da conexão). Inserções/alterações de
+Produto feitas pelo ORM atualizam o índice já carregado via eventos do
+mapper; alterações feitas fora do processo aparecem após o TTL de recarga.
+"""
+import time
+import unicodedata
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.produtos.models import Produto
+
+
+def normalizar_texto(texto: Optional[str]) -> str:
+    """Minúsculas, sem acentos e com espaços simples (equivalente a unaccent(lower()))"""
+    if not texto:
+        return ""
+    decomposto = unicodedata.normalize("NFKD", texto.lower())
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acentos.split())
+
+
+def trigramas(palavra: str) -> Iterable[str]:
+    """Trigramas de uma palavra (sem padding: a busca é por substring)"""
+    return (palavra[i:i + 3] for i in range(len(palavra) - 2))
+
+
+@dataclass
+class _DocumentoBusca:
+    descricao: str
+    texto: str
+    codigo_barras: str
+    ativo: bool
+
+
+class IndiceNGramProdutos:
+    """Índice invertido de trigramas/prefixos para busca de produtos"""
+
+    def __init__(self):
+        self._documentos: Dict[int, _DocumentoBusca] = {}
+        self._postings: Dict[str, array] = {}
+        self.carregado_em: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._documentos)
+
+    @property
+    def carregado(self) -> bool:
+        return self.carregado_em is not None
+
+    def limpar(self):
+        """Remove todos os documentos do índice"""
+        self._documentos.clear()
+        self._postings.clear()
+        self.carregado_em = None
+
+    def adicionar(
+        self, produto_id: int, descricao: str, codigo_barras: str, ativo: bool = True
+    ):
+        """Indexa (ou reindexa) um produto"""
+        texto = normalizar_texto(descricao)
+        codigo = (codigo_barras or "").lower()
+        atual = self._documentos.get(produto_id)
+        self._documentos[produto_id] = _DocumentoBusca(descricao or "", texto, codigo, ativo)
+
+        if atual and atual.texto == texto and atual.codigo_barras == codigo:
+            return
+
+        chaves = set()
+        for palavra in texto.split() + [codigo]:
+            chaves.update(trigramas(palavra))
+            # Prefixos curtos permitem buscar termos de 1-2 caracteres
+            chaves.update(palavra[:n] for n in (1, 2) if len(palavra) >= n)
+        for chave in chaves:
+            postings = self._postings.get(chave)
+            if postings is None:
+                postings = self._postings[chave] = array("I")
+            postings.append(produto_id)
+
+    def remover(self, produto_id: int):
+        """Remove um produto do índice (postings antigos são ignorados na busca)"""
+        self._documentos.pop(produto_id, None)
+
+    def buscar(
+        self,
+        termo: str,
+        skip: int = 0,
+        limit: int = 100,
+        apenas_ativos: bool = True,
+    ) -> Tuple[List[int], int]:
+        """
+        Busca produtos cuja descrição ou código de barras contém todos os termos
+
+        Args:
+            termo: Termo de busca (uma ou mais palavras)
+            skip: Quantidade de resultados para pular
+            limit: Limite de resultados
+            apenas_ativos: Se deve considerar apenas produtos ativos
+
+        Returns:
+            Tupla (IDs ordenados por relevância, total de resultados)
+        """
+        termo_normalizado = normalizar_texto(termo)
+        tokens = termo_normalizado.split()
+        if not tokens:
+            return [], 0
+
+        candidatos = self._candidatos(tokens)
+        if candidatos is None:
+            return [], 0
+
+        pontuados = []
+        for produto_id in candidatos:
+            documento = self._documentos.get(produto_id)
+            if documento is None or (apenas_ativos and not documento.ativo):
+                continue
+            pontuacao = self._pontuar(documento, termo_normalizado, tokens)
+            if pontuacao is not None:
+                pontuados.append((-pontuacao, len(documento.texto), documento.texto, produto_id))
+
+        pontuados.sort()
+        return [p[3] for p in pontuados[skip:skip + limit]], len(pontuados)
+
+    def _candidatos(self, tokens: List[str]) -> Optional[set]:
+        """Postings do n-grama mais seletivo entre todos os termos"""
+        menor: Optional[array] = None
+        for token in tokens:
+            chaves = list(trigramas(token)) or [token]
+            for chave in chaves:
+                postings = self._postings.get(chave)
+                if postings is None:
+                    return None
+                if menor is None or len(postings) < len(menor):
+                    menor = postings
+        return set(menor)
+
+    @staticmethod
+    def _pontuar(
+        documento: _DocumentoBusca, termo: str, tokens: List[str]
+    ) -> Optional[int]:
+        """Pontuação de relevância, ou None se o documento não contém os termos"""
+        if len(tokens) == 1 and documento.codigo_barras == termo:
+            return 1000
+
+        palavras = documento.texto.split()
+        pontuacao = 0
+        for token in tokens:
+            if any(p.startswith(token) for p in palavras):
+                pontuacao += 10
+            elif token in documento.texto:
+                pontuacao += 3
+            elif token in documento.codigo_barras:
+                pontuacao += 1
+            else:
+                return None
+
+        if documento.texto.startswith(termo):
+            pontuacao += 50
+        return pontuacao
+
+    def carregar_produtos(self, linhas: Iterable[Tuple[int, str, str, bool]]):
+        """Reconstrói o índice a partir de tuplas (id, descricao, codigo_barras, ativo)"""
+        self.limpar()
+        for produto_id, descricao, codigo_barras, ativo in linhas:
+            self.adicionar(produto_id, descricao, codigo_barras, ativo)
+        self.carregado_em = time.monotonic()
+
+    async def carregar(self, session: AsyncSession, tamanho_lote: int = 5000):
+        """Reconstrói o índice lendo os produtos do banco em streaming"""
+        result = await session.stream(
+            select(Produto.id, Produto.descricao, Produto.codigo_barras, Produto.ativo)
+            .execution_options(yield_per=tamanho_lote)
+        )
+        self.limpar()
+        async for produto_id, descricao, codigo_barras, ativo in result:
+            self.adicionar(produto_id, descricao, codigo_barras, ativo)
+        self.carregado_em = time.monotonic()
+
+    async def garantir_carregado(self, session: AsyncSession, ttl: float):
+        """Carrega o índice se vazio ou mais antigo que `ttl` segundos"""
+        if self.carregado_em is None or time.monotonic() - self.carregado_em > ttl:
+            await self.carregar(session)
+
+
+_indices: Dict[str, IndiceNGramProdutos] = {}
+
+
+def get_indice_produtos(chave: str) -> IndiceNGramProdutos:
+    """Retorna o índice n-grama do banco identificado por `chave` (URL)"""
+    indice = _indices.get(chave)
+    if indice is None:
+        indice = _indices[chave] = IndiceNGramProdutos()
+    return indice
+
+
+def _indice_da_conexao(connection) -> Optional[IndiceNGramProdutos]:
+    indice = _indices.get(str(connection.engine.url))
+    return indice if indice is not None and indice.carregado else None
+
+
+@event.listens_for(Produto, "after_insert")
+@event.listens_for(Produto, "after_update")
+def _indexar_produto(mapper, connection, produto: Produto):
+    indice = _indice_da_conexao(connection)
+    if indice is not None:
+        indice.adicionar(produto.id, produto.descricao, produto.codigo_barras, produto.ativo)
+
+
+@event.listens_for(Produto, "after_delete")
+def _desindexar_produto(mapper, connection, produto: Produto):
+    indice = _indice_da_conexao(connection)
+    if indice is not None:
+        indice.remover(produto.id)
@@ -0,0 +1,298 @@
+"""
+Índice em memória de código de barras -> produto (leituras do PDV)
+
+Cada worker mantém um dicionário com os dados mínimos que a frente de caixa
+precisa a cada bipe (descrição, preço, unidade e estoque), evitando uma ida
+ao banco por leitura:
+
+- Aquecido no startup da aplicação com todos os produtos ativos
+- Alterações de Produto feitas pelo ORM são registradas na sessão e, após o
+  commit, publicadas como invalidação (CacheManager.invalidate_produtos);
+  todos os workers removem as entradas afetadas. UPDATEs em lote registram
+  os produtos com marcar_produtos_alterados()
+- Miss (produto novo, invalidado ou ainda não aquecido) consulta o banco e
+  repovoa a entrada
+- Cada entrada vale PDV_INDICE_CODIGO_BARRAS_TTL segundos e depois é relida
+  do banco: sem Redis (ou com o pub/sub fora do ar) as invalidações não
+  chegam aos outros workers, e o preço/estoque não fica velho por mais que
+  esse prazo
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, NamedTuple, Optional, Set
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.core.cache import cache_manager, cache_service, CANAL_INVALIDACAO_PRODUTOS, MENSAGEM_TODOS
+from app.core.versionamento import marcar_tabelas_alteradas
+from app.modules.produtos.models import Produto
+
+logger = logging.getLogger(__name__)
+
+_CHAVE_ALTERADOS = "produtos_alterados"
+_TODOS = "*"
+
+# Tarefas em andamento (o loop guarda só referências fracas)
+_tarefas: Set[asyncio.Task] = set()
+
+
+def _agendar(corotina) -> asyncio.Task:
+    tarefa = asyncio.get_running_loop().create_task(corotina)
+    _tarefas.add(tarefa)
+    tarefa.add_done_callback(_tarefa_concluida)
+    return tarefa
+
+
+def _tarefa_concluida(tarefa: asyncio.Task):
+    _tarefas.discard(tarefa)
+    if not tarefa.cancelled() and tarefa.exception() is not None:
+        logger.error(f"Erro ao invalidar índice de código de barras: {str(tarefa.exception())}")
+
+
+class ProdutoScan(NamedTuple):
+    """Dados compactos de um produto para leitura no PDV"""
+
+    id: int
+    codigo_barras: str
+    descricao: str
+    preco_venda: float
+    unidade: str
+    estoque_atual: float
+
+    @property
+    def em_estoque(self) -> bool:
+        return self.estoque_atual > 0
+
+
+def _para_scan(
+    produto_id, codigo_barras, descricao, preco_venda, unidade, estoque_atual
+) -> ProdutoScan:
+    return ProdutoScan(
+        produto_id, codigo_barras, descricao, float(preco_venda or 0), unidade or "UN",
+        float(estoque_atual or 0),
+    )
+
+
+_COLUNAS = (
+    Produto.id,
+    Produto.codigo_barras,
+    Produto.descricao,
+    Produto.preco_venda,
+    Produto.unidade,
+    Produto.estoque_atual,
+)
+
+
+class IndiceCodigoBarras:
+    """Dicionário código de barras -> ProdutoScan com fallback para o banco"""
+
+    def __init__(self, validade: Optional[float] = None):
+        self._por_codigo: Dict[str, ProdutoScan] = {}
+        self._codigo_por_id: Dict[int, str] = {}
+        self._expira_em: Dict[str, float] = {}
+        self._validade = validade
+        self.aquecido_em: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+        self._session_factory = None
+
+    def __len__(self) -> int:
+        return len(self._por_codigo)
+
+    @property
+    def validade(self) -> float:
+        """Segundos até uma entrada ser relida do banco"""
+        if self._validade is not None:
+            return self._validade
+        return settings.PDV_INDICE_CODIGO_BARRAS_TTL
+
+    def get(self, codigo_barras: str) -> Optional[ProdutoScan]:
+        """Consulta somente a memória (sem banco); entradas vencidas são ignoradas"""
+        if self._expira_em.get(codigo_barras, 0) <= time.monotonic():
+            return None
+        return self._por_codigo.get(codigo_barras)
+
+    def definir(self, produto: ProdutoScan, agora: Optional[float] = None):
+        """Insere ou substitui a entrada de um produto"""
+        codigo_anterior = self._codigo_por_id.get(produto.id)
+        if codigo_anterior is not None and codigo_anterior != produto.codigo_barras:
+            self._por_codigo.pop(codigo_anterior, None)
+            self._expira_em.pop(codigo_anterior, None)
+        self._por_codigo[produto.codigo_barras] = produto
+        self._codigo_por_id[produto.id] = produto.codigo_barras
+        self._expira_em[produto.codigo_barras] = (agora or time.monotonic()) + self.validade
+
+    def invalidar(self, produto_ids: Iterable[int]):
+        """Remove as entradas dos produtos (recarregadas no próximo miss)"""
+        for produto_id in produto_ids:
+            codigo = self._codigo_por_id.pop(produto_id, None)
+            if codigo is not None:
+                self._por_codigo.pop(codigo, None)
+                self._expira_em.pop(codigo, None)
+
+    def limpar(self):
+        """Remove todas as entradas"""
+        self._por_codigo.clear()
+        self._codigo_por_id.clear()
+        self._expira_em.clear()
+        self.aquecido_em = None
+
+    async def aquecer(self, session: AsyncSession, tamanho_lote: int = 5000) -> int:
+        """
+        Carrega todos os produtos ativos em streaming
+
+        Returns:
+            Quantidade de produtos carregados
+        """
+        result = await session.stream(
+            select(*_COLUNAS)
+            .where(Produto.ativo == True)
+            .execution_options(yield_per=tamanho_lote)
+        )
+        self.limpar()
+        agora = time.monotonic()
+        async for linha in result:
+            self.definir(_para_scan(*linha), agora)
+        self.aquecido_em = agora
+        return len(self._por_codigo)
+
+    async def buscar(
+        self, session: AsyncSession, codigo_barras: str
+    ) -> Optional[ProdutoScan]:
+        """
+        Busca produto ativo pelo código de barras (memória, depois banco)
+
+        Returns:
+            ProdutoScan ou None se não existir produto ativo com o código
+        """
+        produto = self.get(codigo_barras)
+        if produto is not None:
+            self.hits += 1
+            return produto
+
+        self.misses += 1
+        result = await session.execute(
+            select(*_COLUNAS).where(
+                Produto.codigo_barras == codigo_barras, Produto.ativo == True
+            )
+        )
+        linha = result.first()
+        if linha is None:
+            return None
+        produto = _para_scan(*linha)
+        self.definir(produto)
+        return produto
+
+    async def processar_invalidacao(self, mensagem: str):
+        """
+        Callback do canal de invalidação de produtos
+
+        MENSAGEM_TODOS chega também quando o pub/sub do Redis cai ou volta:
+        o índice é descartado e recarregado do banco.
+        """
+        if mensagem == MENSAGEM_TODOS:
+            self.limpar()
+            if self._session_factory is not None:
+                _agendar(self._reaquecer())
+            return
+        self.invalidar(int(i) for i in mensagem.split(",") if i)
+
+    async def _reaquecer(self):
+        try:
+            async with self._session_factory() as session:
+                await self.aquecer(session)
+        except Exception as e:
+            logger.error(f"Erro ao reaquecer índice de código de barras: {str(e)}")
+
+    def estatisticas(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "produtos": len(self),
+            "aquecido": self.aquecido_em is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "taxa_acerto": round(self.hits / total * 100, 2) if total else 0.0,
+        }
+
+
+# Índice do worker
+indice_codigo_barras = IndiceCodigoBarras()
+
+
+async def iniciar_indice_codigo_barras(session_factory) -> int:
+    """
+    Assina o canal de invalidação e aquece o índice (startup da aplicação)
+
+    Args:
+        session_factory: Fábrica de AsyncSession (ex: AsyncSessionLocal)
+
+    Returns:
+        Quantidade de produtos carregados
+    """
+    indice_codigo_barras._session_factory = session_factory
+    await cache_service.subscribe(
+        CANAL_INVALIDACAO_PRODUTOS, indice_codigo_barras.processar_invalidacao
+    )
+    async with session_factory() as session:
+        total = await indice_codigo_barras.aquecer(session)
+    logger.info(f"Índice de código de barras aquecido com {total} produtos")
+    return total
+
+
+# ==================== EVENTOS DO ORM ====================
+
+
+def _marcar_alterados(session: Optional[Session], *valores):
+    if session is not None:
+        session.info.setdefault(_CHAVE_ALTERADOS, set()).update(valores)
+
+
+def marcar_produtos_alterados(
+    session: AsyncSession, produto_ids: Optional[Iterable[int]] = None
+):
+    """
+    Registra produtos alterados por UPDATE/DELETE em lote
+
+    Comandos em lote não disparam os eventos por objeto do mapper; quem os
+    executa deve chamar esta função para que o commit publique a invalidação
+    (e incremente a versão da tabela produtos usada nos ETags).
+
+    Args:
+        session: Sessão em que o comando foi executado
+        produto_ids: IDs afetados (None invalida todos os produtos)
+    """
+    valores = [_TODOS] if produto_ids is None else list(produto_ids)
+    _marcar_alterados(session.sync_session, *valores)
+    marcar_tabelas_alteradas(session, "produtos")
+
+
+@event.listens_for(Produto, "after_insert")
+@event.listens_for(Produto, "after_update")
+@event.listens_for(Produto, "after_delete")
+def _produto_alterado(mapper, connection, produto: Produto):
+    _marcar_alterados(object_session(produto), produto.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _publicar_invalidacoes(session: Session):
+    alterados = session.info.pop(_CHAVE_ALTERADOS, None)
+    if not alterados:
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        indice_codigo_barras.limpar()
+        return
+    if _TODOS in alterados:
+        _agendar(cache_manager.invalidate_all_produtos())
+    else:
+        _agendar(cache_manager.invalidate_produtos(alterados))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _descartar_alterados(session: Session, previous_transaction):
+    session.info.pop(_CHAVE_ALTERADOS, None)
@@ -2,7 +2,7 @@
 Modelos de Produtos
 """
 from datetime import datetime
-from sqlalchemy import String, DateTime, Boolean, Numeric, Integer, ForeignKey, Index
+from sqlalchemy import String, DateTime, Boolean, Numeric, Integer, ForeignKey, Index, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
@@ -58,7 +58,74 @@ class Produto(Base):
     __table_args__ = (
         Index("idx_produto_categoria_ativo", "categoria_id", "ativo"),
         Index("idx_produto_descricao", "descricao"),
+        Index("idx_produto_updated_at_id", "updated_at", "id"),
     )
 
     def __repr__(self) -> str:
         return f"<Produto(id={self.id}, codigo_barras='{self.codigo_barras}', descricao='{self.descricao}')>"
+
+
+class ProdutoRemovido(Base):
+    """Tombstone de produto excluído (sincronização incremental do catálogo)"""
+
+    __tablename__ = "produtos_removidos"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    produto_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    codigo_barras: Mapped[str] = mapped_column(String(50), nullable=True)
+    removido_em: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<ProdutoRemovido(id={self.id}, produto_id={self.produto_id})>"
+
+
+class LoteAtualizacaoProdutos(Base):
+    """Registro de uma atualização em lote de produtos (preços/ativo)"""
+
+    __tablename__ = "lotes_atualizacao_produtos"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    filtros: Mapped[str] = mapped_column(Text, nullable=False)
+    alteracoes: Mapped[str] = mapped_column(Text, nullable=False)
+    total_produtos: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    motivo: Mapped[str] = mapped_column(String(500), nullable=True)
+    usuario_id: Mapped[int] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False, index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<LoteAtualizacaoProdutos(id={self.id}, total_produtos={self.total_produtos})>"
+
+
+class HistoricoPrecoProduto(Base):
+    """Valores anteriores e novos de um produto alterado em lote"""
+
+    __tablename__ = "historico_precos_produto"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    lote_id: Mapped[int] = mapped_column(
+        ForeignKey("lotes_atualizacao_produtos.id"), nullable=False, index=True
+    )
+    produto_id: Mapped[int] = mapped_column(
+        ForeignKey("produtos.id"), nullable=False, index=True
+    )
+    preco_custo_anterior: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
+    preco_custo_novo: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
+    preco_venda_anterior: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
+    preco_venda_novo: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
+    ativo_anterior: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    ativo_novo: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    __table_args__ = (
+        Index("idx_historico_preco_lote_produto", "lote_id", "produto_id", unique=True),
+        Index("idx_historico_preco_produto_data", "produto_id", "created_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<HistoricoPrecoProduto(lote_id={self.lote_id}, produto_id={self.produto_id})>"
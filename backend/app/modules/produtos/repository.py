@@ -1,12 +1,32 @@
 """
 Repository para Produtos
 """
-from typing import Optional, List
-from sqlalchemy import select, func, or_
+import re
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional, List, Dict, Iterable, Tuple
+from sqlalchemy import (
+    select, func, or_, and_, cast, literal, literal_column, case, insert, update, Numeric, DateTime,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.produtos.models import Produto
-from app.modules.produtos.schemas import ProdutoCreate, ProdutoUpdate
+from app.core.config import settings
+from app.modules.produtos.models import (
+    Produto,
+    ProdutoRemovido,
+    LoteAtualizacaoProdutos,
+    HistoricoPrecoProduto,
+)
+from app.modules.produtos.busca import get_indice_produtos, normalizar_texto
+from app.modules.produtos.sincronizacao import carimbar_no_commit
+from app.modules.produtos.schemas import (
+    ProdutoCreate,
+    ProdutoUpdate,
+    AjustePreco,
+    FiltroProdutosLote,
+    TipoAjustePrecoEnum,
+)
 
 
 class ProdutoRepository:
@@ -37,6 +57,20 @@ class ProdutoRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_ids_por_codigos_barras(
+        self, codigos_barras: Iterable[str]
+    ) -> Dict[str, int]:
+        """Resolve vários códigos de barras em uma única consulta (código -> ID)"""
+        codigos = list(set(codigos_barras))
+        if not codigos:
+            return {}
+        result = await self.session.execute(
+            select(Produto.codigo_barras, Produto.id).where(
+                Produto.codigo_barras.in_(codigos)
+            )
+        )
+        return {codigo: produto_id for codigo, produto_id in result.all()}
+
     async def get_all(
         self,
         skip: int = 0,
@@ -124,19 +158,82 @@ class ProdutoRepository:
             limit: Limite de registros
             apenas_ativos: Se deve buscar apenas produtos ativos
         """
-        query = select(Produto).where(
-            or_(
-                Produto.descricao.ilike(f"%{termo}%"),
-                Produto.codigo_barras.ilike(f"%{termo}%"),
+        produtos, _ = await self.buscar(termo, skip, limit, apenas_ativos)
+        return produtos
+
+    async def buscar(
+        self, termo: str, skip: int = 0, limit: int = 100, apenas_ativos: bool = True
+    ) -> Tuple[List[Produto], int]:
+        """
+        Busca produtos ordenados por relevância, retornando também o total
+
+        PostgreSQL usa tsvector (portuguese_unaccent, prefixo) e pg_trgm; os
+        demais bancos usam o índice n-grama em memória (produtos/busca.py).
+        A busca ignora acentos e maiúsculas.
+
+        Args:
+            termo: Termo de busca (palavras, parte da descrição ou do código de barras)
+            skip: Quantidade de registros para pular
+            limit: Limite de registros
+            apenas_ativos: Se deve buscar apenas produtos ativos
+
+        Returns:
+            Tupla (produtos da página, total de resultados)
+        """
+        if self.session.get_bind().dialect.name == "postgresql":
+            return await self._buscar_postgres(termo, skip, limit, apenas_ativos)
+        return await self._buscar_indice(termo, skip, limit, apenas_ativos)
+
+    async def _buscar_postgres(
+        self, termo: str, skip: int, limit: int, apenas_ativos: bool
+    ) -> Tuple[List[Produto], int]:
+        """Busca full-text + trigrama (ver migration a3f8c2d61e07)"""
+        termo_normalizado = normalizar_texto(termo)
+        descricao = func.f_unaccent(func.lower(Produto.descricao))
+        condicoes = [
+            descricao.contains(termo_normalizado, autoescape=True),
+            Produto.codigo_barras.startswith(termo.strip(), autoescape=True),
+            descricao.op("%")(termo_normalizado),
+        ]
+
+        ordenacao = [(Produto.codigo_barras == termo.strip()).desc()]
+        palavras = re.findall(r"\w+", termo_normalizado)
+        if palavras:
+            consulta = func.to_tsquery(
+                cast("portuguese_unaccent", REGCONFIG),
+                " & ".join(f"{p}:*" for p in palavras),
             )
-        )
+            busca_vetor = literal_column("produtos.busca_vetor")
+            condicoes.append(busca_vetor.op("@@")(consulta))
+            ordenacao.append(func.ts_rank_cd(busca_vetor, consulta).desc())
+        ordenacao += [func.similarity(descricao, termo_normalizado).desc(), Produto.descricao]
 
+        filtro = or_(*condicoes)
         if apenas_ativos:
-            query = query.where(Produto.ativo == True)
+            filtro = filtro & (Produto.ativo == True)
 
-        query = query.offset(skip).limit(limit).order_by(Produto.descricao)
-        result = await self.session.execute(query)
-        return list(result.scalars().all())
+        total = await self.session.execute(
+            select(func.count()).select_from(Produto).where(filtro)
+        )
+        result = await self.session.execute(
+            select(Produto).where(filtro).order_by(*ordenacao).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all()), total.scalar_one()
+
+    async def _buscar_indice(
+        self, termo: str, skip: int, limit: int, apenas_ativos: bool
+    ) -> Tuple[List[Produto], int]:
+        """Busca pelo índice n-grama em memória (SQLite/desenvolvimento)"""
+        indice = get_indice_produtos(str(self.session.get_bind().url))
+        await indice.garantir_carregado(self.session, settings.PRODUTOS_BUSCA_INDICE_TTL)
+
+        ids, total = indice.buscar(termo, skip, limit, apenas_ativos)
+        if not ids:
+            return [], total
+
+        result = await self.session.execute(select(Produto).where(Produto.id.in_(ids)))
+        por_id = {p.id: p for p in result.scalars().all()}
+        return [por_id[i] for i in ids if i in por_id], total
 
     async def get_by_categoria(
         self, categoria_id: int, skip: int = 0, limit: int = 100
@@ -180,3 +277,266 @@ class ProdutoRepository:
         )
         result = await self.session.execute(query)
         return list(result.scalars().all())
+
+    # ==================== ATUALIZAÇÃO EM LOTE ====================
+
+    def condicoes_lote(self, filtro: FiltroProdutosLote) -> list:
+        """Condições WHERE que selecionam os produtos de uma atualização em lote"""
+        from app.modules.compras.models import PedidoCompra, ItemPedidoCompra
+
+        condicoes = []
+        if filtro.produto_ids:
+            condicoes.append(Produto.id.in_(filtro.produto_ids))
+        if filtro.categoria_ids:
+            condicoes.append(Produto.categoria_id.in_(filtro.categoria_ids))
+        if filtro.ncm:
+            condicoes.append(Produto.ncm.startswith(filtro.ncm))
+        if filtro.fornecedor_id:
+            condicoes.append(
+                Produto.id.in_(
+                    select(ItemPedidoCompra.produto_id)
+                    .join(PedidoCompra, PedidoCompra.id == ItemPedidoCompra.pedido_id)
+                    .where(PedidoCompra.fornecedor_id == filtro.fornecedor_id)
+                )
+            )
+        if filtro.apenas_ativos:
+            condicoes.append(Produto.ativo == True)
+        return condicoes
+
+    @staticmethod
+    def expressao_preco(coluna, ajuste: Optional[AjustePreco], preco_custo=None):
+        """
+        Expressão SQL do novo preço, arredondada em 2 casas
+
+        Args:
+            coluna: Coluna (ou expressão) com o preço atual
+            ajuste: Ajuste a aplicar (None mantém o preço)
+            preco_custo: Expressão do custo (já ajustado) para o tipo MARGEM
+        """
+        if ajuste is None:
+            return coluna
+        valor = literal(Decimal(str(ajuste.valor)), Numeric(14, 4))
+        if ajuste.tipo == TipoAjustePrecoEnum.PERCENTUAL:
+            novo = coluna * (1 + valor / 100)
+        elif ajuste.tipo == TipoAjustePrecoEnum.VALOR:
+            novo = coluna + valor
+        elif ajuste.tipo == TipoAjustePrecoEnum.MARGEM:
+            novo = preco_custo * (1 + valor / 100)
+        else:
+            novo = valor
+        return func.round(novo, 2)
+
+    def expressoes_lote(
+        self,
+        preco_custo: Optional[AjustePreco],
+        preco_venda: Optional[AjustePreco],
+        ativo: Optional[bool],
+    ) -> Tuple:
+        """Expressões (preco_custo, preco_venda, ativo) com os novos valores"""
+        preco_custo_novo = self.expressao_preco(Produto.preco_custo, preco_custo)
+        preco_venda_novo = self.expressao_preco(
+            Produto.preco_venda, preco_venda, preco_custo_novo
+        )
+        ativo_novo = Produto.ativo if ativo is None else literal(ativo)
+        return preco_custo_novo, preco_venda_novo, ativo_novo
+
+    async def criar_lote_atualizacao(self, **dados) -> LoteAtualizacaoProdutos:
+        """Registra o cabeçalho de uma atualização em lote"""
+        lote = LoteAtualizacaoProdutos(**dados)
+        self.session.add(lote)
+        await self.session.flush()
+        return lote
+
+    async def resumir_lote(
+        self, condicoes: list, preco_custo_novo, preco_venda_novo
+    ) -> Tuple[int, int, int]:
+        """
+        Conta os produtos do lote em uma única consulta
+
+        Returns:
+            Tupla (total, com venda abaixo do custo, com preço negativo)
+        """
+        result = await self.session.execute(
+            select(
+                func.count(),
+                func.coalesce(func.sum(case((preco_venda_novo < preco_custo_novo, 1), else_=0)), 0),
+                func.coalesce(
+                    func.sum(case(((preco_custo_novo < 0) | (preco_venda_novo < 0), 1), else_=0)), 0
+                ),
+            )
+            .select_from(Produto)
+            .where(*condicoes)
+        )
+        total, abaixo_custo, negativos = result.one()
+        return total, int(abaixo_custo), int(negativos)
+
+    async def previsao_lote(
+        self, condicoes: list, preco_custo_novo, preco_venda_novo, ativo_novo, limit: int = 50
+    ) -> list:
+        """Primeiros produtos do lote com valores atuais e novos"""
+        result = await self.session.execute(
+            select(
+                Produto.id,
+                Produto.codigo_barras,
+                Produto.descricao,
+                Produto.preco_custo,
+                preco_custo_novo,
+                Produto.preco_venda,
+                preco_venda_novo,
+                Produto.ativo,
+                ativo_novo,
+            )
+            .where(*condicoes)
+            .order_by(Produto.id)
+            .limit(limit)
+        )
+        return list(result.all())
+
+    async def aplicar_lote(
+        self,
+        lote_id: int,
+        condicoes: list,
+        preco_custo_novo,
+        preco_venda_novo,
+        ativo_novo,
+        colunas: Iterable[str],
+    ) -> List[int]:
+        """
+        Grava o histórico e atualiza os produtos do lote
+
+        Um INSERT ... SELECT calcula os novos valores e os registra em
+        historico_precos_produto; em seguida um único UPDATE copia esses
+        valores para os produtos, garantindo que o que foi gravado é o que
+        consta na auditoria.
+
+        Args:
+            lote_id: ID do LoteAtualizacaoProdutos
+            condicoes: Filtro dos produtos (condicoes_lote)
+            preco_custo_novo, preco_venda_novo, ativo_novo: Expressões dos novos valores
+            colunas: Colunas de Produto alteradas pelo lote
+
+        Returns:
+            IDs dos produtos atualizados
+        """
+        historico = HistoricoPrecoProduto
+        await self.session.execute(
+            insert(historico).from_select(
+                [
+                    "lote_id", "produto_id",
+                    "preco_custo_anterior", "preco_custo_novo",
+                    "preco_venda_anterior", "preco_venda_novo",
+                    "ativo_anterior", "ativo_novo", "created_at",
+                ],
+                select(
+                    literal(lote_id),
+                    Produto.id,
+                    Produto.preco_custo,
+                    preco_custo_novo,
+                    Produto.preco_venda,
+                    preco_venda_novo,
+                    Produto.ativo,
+                    ativo_novo,
+                    literal(datetime.utcnow(), DateTime),
+                ).where(*condicoes),
+            )
+        )
+
+        result = await self.session.execute(
+            select(historico.produto_id).where(historico.lote_id == lote_id)
+        )
+        produto_ids = list(result.scalars().all())
+        if not produto_ids:
+            return []
+
+        produtos_lote = select(historico.produto_id).where(historico.lote_id == lote_id)
+
+        def valor_novo(coluna: str):
+            return (
+                select(getattr(historico, f"{coluna}_novo"))
+                .where(historico.lote_id == lote_id, historico.produto_id == Produto.id)
+                .scalar_subquery()
+            )
+
+        await self.session.execute(
+            update(Produto)
+            .where(Produto.id.in_(produtos_lote))
+            .values({coluna: valor_novo(coluna) for coluna in colunas})
+            .execution_options(synchronize_session=False)
+        )
+        carimbar_no_commit(self.session, Produto.id.in_(produtos_lote))
+        await self._reindexar_busca(produtos_lote)
+        return produto_ids
+
+    async def _reindexar_busca(self, produto_ids):
+        """Atualiza o índice n-grama já carregado (UPDATE em lote não dispara eventos)"""
+        indice = get_indice_produtos(str(self.session.get_bind().url))
+        if not indice.carregado:
+            return
+        result = await self.session.execute(
+            select(Produto.id, Produto.descricao, Produto.codigo_barras, Produto.ativo)
+            .where(Produto.id.in_(produto_ids))
+        )
+        for produto_id, descricao, codigo_barras, ativo in result:
+            indice.adicionar(produto_id, descricao, codigo_barras, ativo)
+
+    # ==================== SINCRONIZAÇÃO DO CATÁLOGO ====================
+
+    async def get_alterados_desde(
+        self,
+        atualizado_em: Optional[datetime],
+        produto_id: int,
+        ate: datetime,
+        limit: int,
+    ) -> list:
+        """
+        Produtos alterados após a posição (updated_at, id), em ordem de keyset
+
+        Args:
+            atualizado_em: updated_at da última linha já enviada (None = início)
+            produto_id: ID da última linha já enviada
+            ate: Limite superior de updated_at
+            limit: Limite de linhas
+        """
+        condicoes = [Produto.updated_at <= ate]
+        if atualizado_em is not None:
+            condicoes.append(
+                or_(
+                    Produto.updated_at > atualizado_em,
+                    and_(Produto.updated_at == atualizado_em, Produto.id > produto_id),
+                )
+            )
+        result = await self.session.execute(
+            select(
+                Produto.id,
+                Produto.codigo_barras,
+                Produto.descricao,
+                Produto.categoria_id,
+                Produto.preco_venda,
+                Produto.unidade,
+                Produto.estoque_atual,
+                Produto.estoque_minimo,
+                Produto.ativo,
+                Produto.updated_at,
+            )
+            .where(*condicoes)
+            .order_by(Produto.updated_at, Produto.id)
+            .limit(limit)
+        )
+        return list(result.all())
+
+    async def get_removidos_desde(self, removido_id: int, limit: int) -> list:
+        """Tombstones (id, produto_id) com ID maior que `removido_id`"""
+        result = await self.session.execute(
+            select(ProdutoRemovido.id, ProdutoRemovido.produto_id)
+            .where(ProdutoRemovido.id > removido_id)
+            .order_by(ProdutoRemovido.id)
+            .limit(limit)
+        )
+        return list(result.all())
+
+    async def get_ultimo_removido_id(self) -> int:
+        """ID do último tombstone (0 se não houver)"""
+        result = await self.session.execute(
+            select(func.coalesce(func.max(ProdutoRemovido.id), 0))
+        )
+        return result.scalar_one()
@@ -1,16 +1,21 @@
 """
 Router para endpoints de Produtos
 """
+from typing import Optional
 from fastapi import APIRouter, Depends, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.versionamento import requisicao_condicional
 from app.modules.produtos.service import ProdutoService
 from app.modules.produtos.schemas import (
     ProdutoCreate,
     ProdutoUpdate,
     ProdutoResponse,
     ProdutoList,
+    AtualizacaoLoteRequest,
+    AtualizacaoLoteResponse,
+    CatalogoDeltaResponse,
 )
 
 router = APIRouter()
@@ -56,6 +61,7 @@ async def create_produto(
 
 @router.get(
     "/{produto_id}",
+    dependencies=[Depends(requisicao_condicional("produtos", "categorias"))],
     response_model=ProdutoResponse,
     summary="Buscar produto por ID",
     description="Retorna os dados de um produto específico",
@@ -68,6 +74,7 @@ async def get_produto(produto_id: int, db: AsyncSession = Depends(get_db)):
 
 @router.get(
     "/",
+    dependencies=[Depends(requisicao_condicional("produtos", "categorias"))],
     response_model=ProdutoList,
     summary="Listar produtos",
     description="Lista todos os produtos com paginação e filtros",
@@ -141,6 +148,7 @@ async def delete_produto(produto_id: int, db: AsyncSession = Depends(get_db)):
 
 @router.get(
     "/buscar/search",
+    dependencies=[Depends(requisicao_condicional("produtos", "categorias"))],
     response_model=ProdutoList,
     summary="Buscar produtos",
     description="Busca produtos por descrição ou código de barras",
@@ -171,6 +179,7 @@ async def search_produtos(
 
 @router.get(
     "/categoria/{categoria_id}/produtos",
+    dependencies=[Depends(requisicao_condicional("produtos", "categorias"))],
     response_model=ProdutoList,
     summary="Listar produtos por categoria",
     description="Lista todos os produtos de uma categoria específica",
@@ -195,6 +204,7 @@ async def get_produtos_by_categoria(
 
 @router.get(
     "/estoque/minimo",
+    dependencies=[Depends(requisicao_condicional("produtos", "categorias"))],
     response_model=ProdutoList,
     summary="Produtos abaixo do estoque mínimo",
     description="Lista produtos com estoque abaixo do mínimo configurado",
@@ -218,3 +228,79 @@ async def get_produtos_abaixo_estoque_minimo(
     """
     service = ProdutoService(db)
     return await service.get_produtos_abaixo_estoque_minimo(page, page_size)
+
+
+@router.post(
+    "/lote/atualizar",
+    response_model=AtualizacaoLoteResponse,
+    summary="Atualizar produtos em lote",
+    description="Reajusta preços e/ou ativa/inativa os produtos selecionados por filtro",
+)
+async def atualizar_produtos_em_lote(
+    dados: AtualizacaoLoteRequest, db: AsyncSession = Depends(get_db)
+):
+    """
+    Atualiza em lote os produtos selecionados pelo filtro.
+
+    **Filtros (combinados com E):** produto_ids, categoria_ids, fornecedor_id
+    (produtos com pedido de compra do fornecedor), ncm (ou prefixo) e
+    apenas_ativos.
+
+    **Ajustes de preço:**
+    - **PERCENTUAL**: preço * (1 + valor/100)
+    - **VALOR**: preço + valor (negativo reduz)
+    - **FIXO**: preço = valor
+    - **MARGEM** (somente venda): custo ajustado * (1 + valor/100)
+
+    **Validações:** nenhum preço negativo e preço de venda >= custo. Com
+    `dry_run` retorna a prévia (total, produtos com venda abaixo do custo e
+    amostra) sem gravar. O lote gravado fica em `lotes_atualizacao_produtos`
+    com os valores anteriores e novos de cada produto em
+    `historico_precos_produto`.
+
+    **Exemplo de requisição (reajuste de 8% nos cimentos):**
+    ```json
+    {
+        "filtro": {"ncm": "2523", "apenas_ativos": true},
+        "preco_custo": {"tipo": "PERCENTUAL", "valor": 8},
+        "preco_venda": {"tipo": "MARGEM", "valor": 30},
+        "motivo": "Reajuste fornecedor outubro",
+        "dry_run": true
+    }
+    ```
+    """
+    service = ProdutoService(db)
+    return await service.atualizar_em_lote(dados)
+
+
+@router.get(
+    "/sincronizacao/catalogo",
+    response_model=CatalogoDeltaResponse,
+    summary="Sincronizar catálogo",
+    description="Alterações do catálogo desde o último cursor (PDV e mobile)",
+)
+async def sincronizar_catalogo(
+    cursor: Optional[str] = Query(None, description="Cursor retornado pela chamada anterior"),
+    limit: int = Query(1000, ge=1, le=5000, description="Máximo de alterações por chamada"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Sincronização incremental do catálogo local de PDV/mobile.
+
+    **Fluxo:**
+    1. Primeira chamada sem `cursor`: retorna todo o catálogo (`completo=true`)
+    2. Enquanto `mais=true`, chamar novamente com o `cursor` retornado
+    3. Nas próximas aberturas, chamar com o último cursor salvo: retorna
+       apenas produtos alterados (preço, estoque, descrição) e os IDs
+       inativados/excluídos em `removidos`
+
+    Alterações muito recentes (últimos segundos) ficam para a chamada
+    seguinte, garantindo que nenhuma transação em andamento seja pulada.
+
+    **Exemplo:**
+    ```
+    GET /produtos/sincronizacao/catalogo?cursor=MjAyNi0xMC0xOFQxMD...&limit=1000
+    ```
+    """
+    service = ProdutoService(db)
+    return await service.sincronizar_catalogo(cursor, limit)
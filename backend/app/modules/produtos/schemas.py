@@ -2,8 +2,9 @@
 Schemas Pydantic para Produtos
 """
 from datetime import datetime
+from enum import Enum
 from typing import Optional
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
 from app.modules.categorias.schemas import CategoriaResponse
 
 
@@ -156,3 +157,144 @@ class ProdutoList(BaseModel):
     page: int
     page_size: int
     pages: int
+
+
+# ==================== ATUALIZAÇÃO EM LOTE ====================
+
+
+class TipoAjustePrecoEnum(str, Enum):
+    """Forma de cálculo do novo preço"""
+
+    PERCENTUAL = "PERCENTUAL"  # preço * (1 + valor/100)
+    VALOR = "VALOR"  # preço + valor (negativo para reduzir)
+    FIXO = "FIXO"  # preço = valor
+    MARGEM = "MARGEM"  # preço de venda = custo * (1 + valor/100)
+
+
+class AjustePreco(BaseModel):
+    """Ajuste aplicado a um preço dos produtos do lote"""
+
+    tipo: TipoAjustePrecoEnum
+    valor: float = Field(..., description="Percentual, valor em R$ ou margem conforme o tipo")
+
+    @model_validator(mode="after")
+    def validar_valor(self):
+        """Impede ajustes que zeram/negativam todos os preços por definição"""
+        if self.tipo == TipoAjustePrecoEnum.PERCENTUAL and self.valor <= -100:
+            raise ValueError("Percentual de ajuste deve ser maior que -100")
+        if self.tipo in (TipoAjustePrecoEnum.FIXO, TipoAjustePrecoEnum.MARGEM) and self.valor < 0:
+            raise ValueError(f"Valor não pode ser negativo para ajuste {self.tipo.value}")
+        return self
+
+
+class FiltroProdutosLote(BaseModel):
+    """Seleção dos produtos de uma atualização em lote (critérios combinados com E)"""
+
+    produto_ids: Optional[list[int]] = Field(None, min_length=1, max_length=10000, description="IDs dos produtos")
+    categoria_ids: Optional[list[int]] = Field(None, min_length=1, description="IDs das categorias")
+    fornecedor_id: Optional[int] = Field(
+        None, gt=0, description="Produtos já comprados do fornecedor (itens de pedidos de compra)"
+    )
+    ncm: Optional[str] = Field(
+        None, min_length=2, max_length=8, description="NCM ou prefixo do NCM (ex: 2523 = cimentos)"
+    )
+    apenas_ativos: bool = Field(False, description="Considerar apenas produtos ativos")
+
+    @field_validator("ncm")
+    @classmethod
+    def validar_ncm(cls, v: Optional[str]) -> Optional[str]:
+        """Remove pontos do NCM/prefixo"""
+        if v is None:
+            return None
+        v = v.replace(".", "").strip()
+        if not v.isdigit():
+            raise ValueError("NCM deve conter apenas números")
+        return v
+
+    @model_validator(mode="after")
+    def validar_criterio(self):
+        """Exige ao menos um critério para não alterar o catálogo inteiro por engano"""
+        if not (self.produto_ids or self.categoria_ids or self.fornecedor_id or self.ncm):
+            raise ValueError(
+                "Informe ao menos um filtro: produto_ids, categoria_ids, fornecedor_id ou ncm"
+            )
+        return self
+
+
+class AtualizacaoLoteRequest(BaseModel):
+    """Atualização em lote de preços e situação de produtos"""
+
+    filtro: FiltroProdutosLote
+    preco_custo: Optional[AjustePreco] = Field(None, description="Ajuste do preço de custo")
+    preco_venda: Optional[AjustePreco] = Field(
+        None, description="Ajuste do preço de venda (MARGEM usa o custo já ajustado)"
+    )
+    ativo: Optional[bool] = Field(None, description="Ativa ou inativa os produtos")
+    dry_run: bool = Field(False, description="Apenas calcula a prévia, sem gravar")
+    motivo: Optional[str] = Field(None, max_length=500, description="Motivo (auditoria)")
+    usuario_id: Optional[int] = Field(None, description="Usuário responsável")
+
+    @model_validator(mode="after")
+    def validar_alteracoes(self):
+        """Exige ao menos uma alteração; MARGEM só se aplica ao preço de venda"""
+        if self.preco_custo is None and self.preco_venda is None and self.ativo is None:
+            raise ValueError("Informe ao menos uma alteração: preco_custo, preco_venda ou ativo")
+        if self.preco_custo and self.preco_custo.tipo == TipoAjustePrecoEnum.MARGEM:
+            raise ValueError("Ajuste por MARGEM só pode ser aplicado ao preço de venda")
+        return self
+
+
+class PrevisaoAtualizacaoProduto(BaseModel):
+    """Valores atuais e novos de um produto do lote"""
+
+    produto_id: int
+    codigo_barras: str
+    descricao: str
+    preco_custo_atual: float
+    preco_custo_novo: float
+    preco_venda_atual: float
+    preco_venda_novo: float
+    ativo_atual: bool
+    ativo_novo: bool
+
+
+class AtualizacaoLoteResponse(BaseModel):
+    """Resultado (ou prévia, em dry_run) de uma atualização em lote"""
+
+    lote_id: Optional[int] = Field(None, description="ID do lote gravado (None em dry_run)")
+    dry_run: bool
+    total_produtos: int = Field(..., description="Produtos selecionados pelo filtro")
+    venda_abaixo_custo: int = Field(
+        ..., description="Produtos que ficariam com preço de venda menor que o custo"
+    )
+    amostra: list[PrevisaoAtualizacaoProduto] = Field(
+        ..., description="Primeiros produtos afetados com valores atuais e novos"
+    )
+
+
+# ==================== SINCRONIZAÇÃO DO CATÁLOGO ====================
+
+
+class ProdutoCatalogoDelta(BaseModel):
+    """Dados compactos de um produto alterado (catálogo local do PDV/mobile)"""
+
+    id: int
+    codigo_barras: str
+    descricao: str
+    categoria_id: int
+    preco_venda: float
+    unidade: str
+    em_estoque: bool
+    estoque_baixo: bool
+
+
+class CatalogoDeltaResponse(BaseModel):
+    """Alterações do catálogo desde o cursor informado"""
+
+    completo: bool = Field(
+        ..., description="Sincronização completa: o cliente deve descartar o catálogo local"
+    )
+    alterados: list[ProdutoCatalogoDelta] = Field(..., description="Produtos ativos novos ou alterados")
+    removidos: list[int] = Field(..., description="IDs de produtos inativados ou excluídos")
+    cursor: str = Field(..., description="Cursor para a próxima chamada")
+    mais: bool = Field(..., description="Há mais alterações: chamar novamente com o novo cursor")
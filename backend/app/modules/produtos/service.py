@@ -1,18 +1,28 @@
 """
 Service Layer para Produtos
 """
+from datetime import datetime, timedelta
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
 import math
 
+from app.core.config import settings
+
 from app.modules.produtos.repository import ProdutoRepository
 from app.modules.produtos.schemas import (
     ProdutoCreate,
     ProdutoUpdate,
     ProdutoResponse,
     ProdutoList,
+    AtualizacaoLoteRequest,
+    AtualizacaoLoteResponse,
+    PrevisaoAtualizacaoProduto,
+    ProdutoCatalogoDelta,
+    CatalogoDeltaResponse,
 )
 from app.modules.produtos.models import Produto
+from app.modules.produtos.indice_codigo_barras import marcar_produtos_alterados
+from app.modules.produtos.sincronizacao import CursorCatalogo
 from app.modules.categorias.repository import CategoriaRepository
 from app.core.exceptions import (
     NotFoundException,
@@ -25,6 +35,9 @@ from app.core.exceptions import (
 class ProdutoService:
     """Service para regras de negócio de Produtos"""
 
+    # Lotes maiores invalidam o cache de todos os produtos em vez de cada ID
+    LIMITE_INVALIDACAO_POR_ID = 5000
+
     def __init__(self, session: AsyncSession):
         self.repository = ProdutoRepository(session)
         self.categoria_repository = CategoriaRepository(session)
@@ -268,17 +281,11 @@ class ProdutoService:
 
         skip = (page - 1) * page_size
 
-        # Busca produtos
-        produtos = await self.repository.search_by_descricao(
+        # Busca produtos ordenados por relevância (com total)
+        produtos, total = await self.repository.buscar(
             termo, skip, page_size, apenas_ativos
         )
 
-        # Conta total (fazendo a mesma busca sem paginação)
-        todos_produtos = await self.repository.search_by_descricao(
-            termo, 0, 10000, apenas_ativos
-        )
-        total = len(todos_produtos)
-
         # Calcula total de páginas
         pages = math.ceil(total / page_size) if total > 0 else 1
 
@@ -364,3 +371,165 @@ class ProdutoService:
             page_size=page_size,
             pages=pages,
         )
+
+    async def atualizar_em_lote(
+        self, dados: AtualizacaoLoteRequest
+    ) -> AtualizacaoLoteResponse:
+        """
+        Atualiza preços e/ou situação dos produtos selecionados pelo filtro
+
+        Os novos valores são calculados no banco (INSERT ... SELECT no
+        histórico + um UPDATE), sem carregar os produtos. As mesmas regras do
+        cadastro valem para o lote inteiro: nenhum preço negativo e preço de
+        venda >= custo. Com dry_run apenas a prévia é retornada.
+
+        Args:
+            dados: Filtro, ajustes e opções do lote
+
+        Returns:
+            Totais e amostra dos produtos afetados (com lote_id se gravado)
+
+        Raises:
+            ValidationException: Se algum produto ficaria com preço negativo ou
+                (fora do dry_run) com venda abaixo do custo
+        """
+        condicoes = self.repository.condicoes_lote(dados.filtro)
+        preco_custo_novo, preco_venda_novo, ativo_novo = self.repository.expressoes_lote(
+            dados.preco_custo, dados.preco_venda, dados.ativo
+        )
+
+        total, abaixo_custo, negativos = await self.repository.resumir_lote(
+            condicoes, preco_custo_novo, preco_venda_novo
+        )
+        if negativos:
+            raise ValidationException(
+                f"{negativos} produto(s) ficariam com preço negativo após o ajuste"
+            )
+
+        linhas = await self.repository.previsao_lote(
+            condicoes, preco_custo_novo, preco_venda_novo, ativo_novo
+        )
+        resposta = AtualizacaoLoteResponse(
+            dry_run=dados.dry_run,
+            total_produtos=total,
+            venda_abaixo_custo=abaixo_custo,
+            amostra=[
+                PrevisaoAtualizacaoProduto(
+                    produto_id=linha[0],
+                    codigo_barras=linha[1],
+                    descricao=linha[2],
+                    preco_custo_atual=float(linha[3]),
+                    preco_custo_novo=float(linha[4]),
+                    preco_venda_atual=float(linha[5]),
+                    preco_venda_novo=float(linha[6]),
+                    ativo_atual=bool(linha[7]),
+                    ativo_novo=bool(linha[8]),
+                )
+                for linha in linhas
+            ],
+        )
+        if dados.dry_run or total == 0:
+            return resposta
+
+        if abaixo_custo:
+            raise ValidationException(
+                f"{abaixo_custo} produto(s) ficariam com preço de venda menor que o "
+                f"preço de custo. Use dry_run para conferir a prévia"
+            )
+
+        colunas = [
+            coluna
+            for coluna, ajuste in (
+                ("preco_custo", dados.preco_custo),
+                ("preco_venda", dados.preco_venda),
+                ("ativo", dados.ativo),
+            )
+            if ajuste is not None
+        ]
+        lote = await self.repository.criar_lote_atualizacao(
+            filtros=dados.filtro.model_dump_json(exclude_none=True),
+            alteracoes=dados.model_dump_json(include=set(colunas), exclude_none=True),
+            total_produtos=total,
+            motivo=dados.motivo,
+            usuario_id=dados.usuario_id,
+        )
+        produto_ids = await self.repository.aplicar_lote(
+            lote.id, condicoes, preco_custo_novo, preco_venda_novo, ativo_novo, colunas
+        )
+        lote.total_produtos = len(produto_ids)
+
+        # Uma única invalidação de cache (publicada no commit) para o lote
+        session = self.repository.session
+        if len(produto_ids) > self.LIMITE_INVALIDACAO_POR_ID:
+            marcar_produtos_alterados(session)
+        else:
+            marcar_produtos_alterados(session, produto_ids)
+
+        resposta.lote_id = lote.id
+        resposta.total_produtos = len(produto_ids)
+        return resposta
+
+    async def sincronizar_catalogo(
+        self, cursor: Optional[str] = None, limit: int = 1000
+    ) -> CatalogoDeltaResponse:
+        """
+        Retorna as alterações do catálogo desde o cursor (ver produtos/sincronizacao.py)
+
+        Args:
+            cursor: Cursor retornado pela chamada anterior (None = sincronização completa)
+            limit: Máximo de produtos e de tombstones por chamada
+
+        Returns:
+            Produtos alterados, IDs removidos e o próximo cursor
+
+        Raises:
+            ValidationException: Se o cursor for inválido
+        """
+        completo = cursor is None
+        if completo:
+            posicao = CursorCatalogo(None, 0, await self.repository.get_ultimo_removido_id())
+        else:
+            posicao = CursorCatalogo.decodificar(cursor)
+
+        ate = datetime.utcnow() - timedelta(seconds=settings.CATALOGO_SYNC_ATRASO_SEGUNDOS)
+        linhas = await self.repository.get_alterados_desde(
+            posicao.atualizado_em, posicao.produto_id, ate, limit + 1
+        )
+        tombstones = await self.repository.get_removidos_desde(posicao.removido_id, limit + 1)
+        mais = len(linhas) > limit or len(tombstones) > limit
+        linhas, tombstones = linhas[:limit], tombstones[:limit]
+
+        alterados, removidos = [], []
+        for linha in linhas:
+            if not linha.ativo:
+                removidos.append(linha.id)
+                continue
+            estoque_atual = float(linha.estoque_atual or 0)
+            alterados.append(
+                ProdutoCatalogoDelta(
+                    id=linha.id,
+                    codigo_barras=linha.codigo_barras,
+                    descricao=linha.descricao,
+                    categoria_id=linha.categoria_id,
+                    preco_venda=float(linha.preco_venda),
+                    unidade=linha.unidade,
+                    em_estoque=estoque_atual > 0,
+                    estoque_baixo=estoque_atual < float(linha.estoque_minimo or 0),
+                )
+            )
+        removidos.extend(produto_id for _, produto_id in tombstones)
+
+        if linhas:
+            posicao = posicao._replace(
+                atualizado_em=linhas[-1].updated_at, produto_id=linhas[-1].id
+            )
+        if tombstones:
+            posicao = posicao._replace(removido_id=tombstones[-1].id)
+
+        return CatalogoDeltaResponse(
+            completo=completo,
+            alterados=alterados,
+            removidos=removidos,
+            cursor=posicao.codificar(),
+            mais=mais,
+        )
@@ -0,0 +1,116 @@
+"""
+Sincronização incremental do catálogo de produtos (PDV e mobile)
+
+O cliente mantém um catálogo local e pede apenas o que mudou desde o último
+cursor:
+
+- Produtos alterados são lidos por keyset em (updated_at, id), índice
+  idx_produto_updated_at_id. O limite superior é "agora - atraso"
+  (CATALOGO_SYNC_ATRASO_SEGUNDOS): transações ainda abertas gravam
+  updated_at anterior ao commit, e o atraso evita que o cursor passe por
+  cima delas. O atraso cobre apenas transações curtas; UPDATEs em lote
+  (preços, inventário, vendas do PDV) registram os produtos com
+  carimbar_no_commit() e o updated_at é regravado num último UPDATE logo
+  antes do commit
+- Produtos inativos aparecem como removidos (somente o ID)
+- Exclusões físicas ficam em produtos_removidos (tombstones), lidos pelo ID
+  autoincremento
+
+O cursor é opaco para o cliente e combina as duas posições. Sem cursor, a
+sincronização é completa (todos os produtos) e o cliente deve descartar o
+catálogo local.
+"""
+import base64
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event, insert, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import ValidationException
+from app.modules.produtos.models import Produto, ProdutoRemovido
+
+_CHAVE_CARIMBAR = "catalogo_carimbar"
+
+
+class CursorCatalogo(NamedTuple):
+    """Posição de um cliente na sincronização do catálogo"""
+
+    atualizado_em: Optional[datetime]
+    produto_id: int
+    removido_id: int
+
+    def codificar(self) -> str:
+        """Serializa o cursor em texto opaco (base64 url-safe)"""
+        atualizado_em = self.atualizado_em.isoformat() if self.atualizado_em else ""
+        texto = f"{atualizado_em}|{self.produto_id}|{self.removido_id}"
+        return base64.urlsafe_b64encode(texto.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decodificar(cls, cursor: str) -> "CursorCatalogo":
+        """
+        Lê um cursor gerado por codificar()
+
+        Raises:
+            ValidationException: Se o cursor for inválido
+        """
+        try:
+            texto = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            atualizado_em, produto_id, removido_id = texto.split("|")
+            return cls(
+                datetime.fromisoformat(atualizado_em) if atualizado_em else None,
+                int(produto_id),
+                int(removido_id),
+            )
+        except (ValueError, UnicodeDecodeError):
+            raise ValidationException("Cursor de sincronização inválido")
+
+
+@event.listens_for(Produto, "after_delete")
+def _registrar_tombstone(mapper, connection, produto: Produto):
+    connection.execute(
+        insert(ProdutoRemovido).values(
+            produto_id=produto.id,
+            codigo_barras=produto.codigo_barras,
+            removido_em=datetime.utcnow(),
+        )
+    )
+
+
+def carimbar_no_commit(session: AsyncSession, criterio) -> None:
+    """
+    Regrava updated_at dos produtos de um UPDATE em lote logo antes do commit
+
+    Um lote numa transação longa grava updated_at bem antes do commit; se
+    esse atraso passar de CATALOGO_SYNC_ATRASO_SEGUNDOS, um cliente pode
+    avançar o cursor sem ver as alterações. Regravado no fim, o updated_at
+    fica a apenas um commit de distância da confirmação.
+
+    Args:
+        session: Sessão em que o comando foi executado
+        criterio: Condição sobre Produto que seleciona os produtos do lote
+    """
+    session.sync_session.info.setdefault(_CHAVE_CARIMBAR, []).append(criterio)
+
+
+@event.listens_for(Session, "before_commit")
+def _carimbar_produtos(session: Session):
+    criterios = session.info.pop(_CHAVE_CARIMBAR, None)
+    if not criterios:
+        return
+    # Alterações pendentes vão antes, para que este seja o último comando
+    session.flush()
+    session.execute(
+        update(Produto)
+        .where(or_(*criterios))
+        .values(updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _descartar_carimbos(session: Session, previous_transaction):
+    # Rollback de savepoint mantém os demais lotes da transação
+    if not session.in_transaction():
+        session.info.pop(_CHAVE_CARIMBAR, None)
@@ -12,7 +12,7 @@ Responsabilidades:
 - Atualizar status do pagamento no banco
 - Disparar eventos para outros módulos
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from enum import Enum
 import hmac
 import hashlib
@@ -80,7 +80,33 @@ class PaymentWebhookHandler:
             }
         )
 
-        # Valida assinatura do webhook
+        await self.validar_assinatura(gateway, payload, headers)
+        result = await self.interpretar(gateway, payload, headers)
+
+        logger.info(
+            f"Webhook processado com sucesso",
+            extra={
+                "gateway": gateway.value,
+                "payment_id": result.get("payment_id"),
+                "status": result.get("status"),
+                "event": result.get("event")
+            }
+        )
+
+        return result
+
+    async def validar_assinatura(
+        self,
+        gateway: PaymentGateway,
+        payload: Dict[str, Any],
+        headers: Dict[str, str]
+    ) -> None:
+        """
+        Valida a assinatura do webhook
+
+        Raises:
+            ValidationException: Se assinatura inválida
+        """
         if not await self._validate_signature(gateway, payload, headers):
             logger.warning(
                 f"Webhook com assinatura inválida - Gateway: {gateway}",
@@ -88,24 +114,61 @@ class PaymentWebhookHandler:
             )
             raise ValidationException("Assinatura do webhook inválida")
 
-        # Roteia para handler específico
+    async def interpretar(
+        self,
+        gateway: PaymentGateway,
+        payload: Dict[str, Any],
+        headers: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Normaliza o webhook (sem validar assinatura)
+
+        Raises:
+            BusinessRuleException: Se gateway não suportado
+        """
         handler = self.handlers.get(gateway)
         if not handler:
             raise BusinessRuleException(f"Gateway {gateway} não suportado para webhooks")
+        return await handler(payload, headers)
 
-        result = await handler(payload, headers)
+    def identificar_evento(
+        self,
+        gateway: PaymentGateway,
+        payload: Dict[str, Any],
+        headers: Dict[str, str]
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Identificador do evento (deduplicação) e do pagamento (ordenação)
 
-        logger.info(
-            f"Webhook processado com sucesso",
-            extra={
-                "gateway": gateway.value,
-                "payment_id": result.get("payment_id"),
-                "status": result.get("status"),
-                "event": result.get("event")
-            }
-        )
+        Usa o ID de notificação do gateway quando existe. Senão, a mudança de
+        status do pagamento somada ao hash do payload: o mesmo status pode
+        voltar a ser notificado legitimamente, com outro corpo, enquanto
+        reenvios do mesmo corpo continuam deduplicados.
 
-        return result
+        Returns:
+            (evento_id, pagamento_id)
+        """
+        hash_payload = hashlib.sha256(
+            json.dumps(payload, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+        evento_id = None
+        if gateway == PaymentGateway.CIELO:
+            pagamento_id = payload.get("PaymentId")
+            if pagamento_id:
+                evento_id = (
+                    f"{pagamento_id}:{payload.get('ChangeType')}:{payload.get('Status')}:{hash_payload[:32]}"
+                )
+        elif gateway == PaymentGateway.GETNET:
+            pagamento_id = payload.get("payment_id")
+            evento_id = payload.get("notification_id")
+            if not evento_id and pagamento_id:
+                evento_id = f"{pagamento_id}:{payload.get('status')}:{hash_payload[:32]}"
+        else:
+            pagamento_id = (payload.get("data") or {}).get("id")
+            evento_id = payload.get("id") or headers.get("x-request-id")
+
+        return str(evento_id or hash_payload), str(pagamento_id) if pagamento_id else None
 
     async def _validate_signature(
         self,
@@ -485,6 +548,9 @@ class PaymentWebhookHandler:
 
 from fastapi import APIRouter, Request, HTTPException, status, Depends
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
 
 router = APIRouter()
 
@@ -497,13 +563,21 @@ router = APIRouter()
 )
 async def receive_payment_webhook(
     gateway: str,
-    request: Request
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Recebe webhook de pagamento
 
     Suporta: cielo, getnet, mercadopago
+
+    Valida a assinatura, grava na inbox (webhooks_recebidos) e responde.
+    O processamento é feito pelos workers (app/tasks/pagamentos.py);
+    reenvios do mesmo evento retornam "duplicate".
     """
+    # Import local: webhook_inbox importa este módulo
+    from app.services.webhook_inbox import WebhookInbox
+
     try:
         # Parse gateway
         gateway_enum = PaymentGateway(gateway.lower())
@@ -517,29 +591,18 @@ async def receive_payment_webhook(
     payload = await request.json()
     headers = dict(request.headers)
 
-    # Processa webhook
-    handler = PaymentWebhookHandler()
-
     try:
-        result = await handler.process_webhook(
+        evento_id, novo = await WebhookInbox(db).registrar(
             gateway=gateway_enum,
             payload=payload,
             headers=headers
         )
 
-        # Processa evento
-        if result.get("event"):
-            await handler.handle_payment_event(
-                event=result["event"],
-                payment_data=result
-            )
-
         return JSONResponse(
             status_code=status.HTTP_200_OK,
             content={
-                "status": "processed",
-                "payment_id": result.get("payment_id"),
-                "event": result.get("event")
+                "status": "received" if novo else "duplicate",
+                "evento_id": evento_id
             }
         )
 
@@ -551,7 +614,7 @@ async def receive_payment_webhook(
         )
 
     except Exception as e:
-        logger.error(f"Erro ao processar webhook: {str(e)}", exc_info=True)
+        logger.error(f"Erro ao registrar webhook: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro ao processar webhook"
@@ -0,0 +1,254 @@
+"""
+Caixa de entrada (inbox) de webhooks dos gateways de pagamento
+
+Recebimento e processamento separados:
+- registrar: valida a assinatura e grava o webhook em webhooks_recebidos,
+  único por (gateway, evento_id). O endpoint responde logo depois do
+  INSERT; reenvios do gateway viram "duplicate" e não são reprocessados.
+- processar_lote: workers (app/tasks/pagamentos.py) processam os pendentes
+  em lotes, na ordem de chegada de cada pagamento. Se um evento falha, os
+  seguintes do mesmo pagamento esperam a próxima rodada.
+- reprocessar: devolve eventos à fila (replay).
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.modules.pagamentos.models import StatusWebhookRecebido, WebhookRecebido
+from app.services.payment_gateway_service import PaymentGateway
+from app.services.payment_webhook_handler import PaymentWebhookHandler
+
+logger = get_logger(__name__)
+
+LOTE_WEBHOOKS = 100
+MAX_TENTATIVAS_WEBHOOK = 5
+
+# Credenciais não são gravadas na inbox
+_HEADERS_NAO_GRAVADOS = {"authorization", "cookie"}
+
+_A_PROCESSAR = (StatusWebhookRecebido.PENDENTE, StatusWebhookRecebido.ERRO)
+
+
+class WebhookInbox:
+    """Grava e processa webhooks de pagamento"""
+
+    def __init__(self, db: AsyncSession, handler: Optional[PaymentWebhookHandler] = None):
+        self.db = db
+        self.handler = handler or PaymentWebhookHandler()
+
+    async def registrar(
+        self,
+        gateway: PaymentGateway,
+        payload: Dict[str, Any],
+        headers: Dict[str, str]
+    ) -> Tuple[str, bool]:
+        """
+        Valida a assinatura e grava o webhook (sem processar)
+
+        Returns:
+            (evento_id, novo); novo=False quando o evento já estava na inbox
+
+        Raises:
+            ValidationException: Se assinatura inválida
+        """
+        await self.handler.validar_assinatura(gateway, payload, headers)
+        evento_id, pagamento_id = self.handler.identificar_evento(gateway, payload, headers)
+
+        tabela = WebhookRecebido.__table__
+        linha = {
+            "gateway": gateway.value,
+            "evento_id": evento_id,
+            "pagamento_id": pagamento_id,
+            "payload": json.dumps(payload),
+            "headers": json.dumps({
+                nome: valor for nome, valor in headers.items()
+                if nome.lower() not in _HEADERS_NAO_GRAVADOS
+            }),
+            "status": StatusWebhookRecebido.PENDENTE,
+            "tentativas": 0,
+            "recebido_em": datetime.utcnow(),
+        }
+
+        dialeto = self.db.get_bind().dialect.name
+        if dialeto in ("postgresql", "sqlite"):
+            insert = pg_insert if dialeto == "postgresql" else sqlite_insert
+            result = await self.db.execute(
+                insert(tabela).values(**linha)
+                .on_conflict_do_nothing(index_elements=[tabela.c.gateway, tabela.c.evento_id])
+            )
+            novo = result.rowcount == 1
+        else:
+            existente = await self.db.execute(
+                select(tabela.c.id).where(
+                    tabela.c.gateway == gateway.value, tabela.c.evento_id == evento_id
+                )
+            )
+            novo = existente.first() is None
+            if novo:
+                await self.db.execute(tabela.insert().values(**linha))
+
+        await self.db.commit()
+        return evento_id, novo
+
+    async def processar_lote(self, lote: int = LOTE_WEBHOOKS) -> Dict[str, int]:
+        """
+        Processa um lote de webhooks pendentes (ou com erro) por ordem de chegada
+
+        Em PostgreSQL o lote é reservado com FOR UPDATE SKIP LOCKED, e vários
+        workers drenam a inbox juntos. Um pagamento cujo evento anterior ainda
+        está com outro worker (ou fora do lote) fica para a próxima rodada.
+
+        Returns:
+            Contadores: processados, erros, adiados
+        """
+        query = (
+            select(WebhookRecebido)
+            .where(WebhookRecebido.status.in_(_A_PROCESSAR))
+            .order_by(WebhookRecebido.id)
+            .limit(lote)
+        )
+        if self.db.get_bind().dialect.name == "postgresql":
+            query = query.with_for_update(skip_locked=True)
+        eventos = list((await self.db.execute(query)).scalars().all())
+
+        contadores = {"processados": 0, "erros": 0, "adiados": 0}
+        if not eventos:
+            return contadores
+
+        bloqueados = await self._pagamentos_com_evento_anterior(eventos)
+        processados: List[int] = []
+        falhas: List[Dict[str, Any]] = []
+
+        for evento in eventos:
+            chave = (evento.gateway, evento.pagamento_id)
+            if evento.pagamento_id and chave in bloqueados:
+                contadores["adiados"] += 1
+                continue
+            try:
+                await self._processar(evento)
+                processados.append(evento.id)
+            except Exception as e:
+                tentativas = evento.tentativas + 1
+                falhas.append({
+                    "b_id": evento.id,
+                    "b_tentativas": tentativas,
+                    "b_erro": str(e)[:2000],
+                    "b_status": (
+                        StatusWebhookRecebido.FALHOU if tentativas >= MAX_TENTATIVAS_WEBHOOK
+                        else StatusWebhookRecebido.ERRO
+                    ),
+                })
+                logger.error(
+                    f"Erro ao processar webhook {evento.gateway}/{evento.evento_id}: {str(e)}",
+                    extra={"gateway": evento.gateway, "evento_id": evento.evento_id},
+                )
+                # Eventos seguintes do mesmo pagamento esperam este
+                if evento.pagamento_id:
+                    bloqueados.add(chave)
+
+        tabela = WebhookRecebido.__table__
+        if processados:
+            await self.db.execute(
+                tabela.update()
+                .where(tabela.c.id.in_(processados))
+                .values(status=StatusWebhookRecebido.PROCESSADO, processado_em=datetime.utcnow(), erro=None)
+            )
+        if falhas:
+            await self.db.execute(
+                tabela.update()
+                .where(tabela.c.id == bindparam("b_id"))
+                .values(
+                    status=bindparam("b_status"),
+                    tentativas=bindparam("b_tentativas"),
+                    erro=bindparam("b_erro"),
+                ),
+                falhas,
+            )
+        await self.db.commit()
+
+        contadores["processados"] = len(processados)
+        contadores["erros"] = len(falhas)
+        return contadores
+
+    async def drenar(self, lote: int = LOTE_WEBHOOKS, max_lotes: int = 50) -> Dict[str, int]:
+        """Processa lotes até a inbox esvaziar (ou max_lotes)"""
+        total = {"processados": 0, "erros": 0, "adiados": 0}
+        for _ in range(max_lotes):
+            contadores = await self.processar_lote(lote)
+            for nome, valor in contadores.items():
+                total[nome] += valor
+            if sum(contadores.values()) < lote or not (contadores["processados"] or contadores["erros"]):
+                break
+        return total
+
+    async def reprocessar(
+        self,
+        ids: Optional[Iterable[int]] = None,
+        gateway: Optional[PaymentGateway] = None,
+        desde: Optional[datetime] = None,
+    ) -> int:
+        """
+        Devolve webhooks à fila (replay)
+
+        Com ids, reprocessa esses eventos em qualquer status; sem ids, os que
+        esgotaram as tentativas (FALHOU), filtrados por gateway e data.
+
+        Returns:
+            Quantidade de eventos devolvidos à fila
+        """
+        tabela = WebhookRecebido.__table__
+        condicoes = []
+        if ids is not None:
+            condicoes.append(tabela.c.id.in_(list(ids)))
+        else:
+            condicoes.append(tabela.c.status == StatusWebhookRecebido.FALHOU)
+        if gateway:
+            condicoes.append(tabela.c.gateway == gateway.value)
+        if desde:
+            condicoes.append(tabela.c.recebido_em >= desde)
+
+        result = await self.db.execute(
+            tabela.update()
+            .where(*condicoes)
+            .values(status=StatusWebhookRecebido.PENDENTE, tentativas=0, erro=None, processado_em=None)
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    async def _pagamentos_com_evento_anterior(self, eventos: List[WebhookRecebido]) -> set:
+        """Pagamentos do lote com evento mais antigo ainda a processar fora do lote"""
+        inicio_no_lote: Dict[Tuple[str, str], int] = {}
+        for evento in eventos:
+            if evento.pagamento_id:
+                inicio_no_lote.setdefault((evento.gateway, evento.pagamento_id), evento.id)
+        if not inicio_no_lote:
+            return set()
+
+        result = await self.db.execute(
+            select(WebhookRecebido.gateway, WebhookRecebido.pagamento_id, func.min(WebhookRecebido.id))
+            .where(
+                WebhookRecebido.status.in_(_A_PROCESSAR),
+                tuple_(WebhookRecebido.gateway, WebhookRecebido.pagamento_id).in_(list(inicio_no_lote)),
+            )
+            .group_by(WebhookRecebido.gateway, WebhookRecebido.pagamento_id)
+        )
+        return {
+            (gateway, pagamento_id)
+            for gateway, pagamento_id, primeiro in result
+            if primeiro < inicio_no_lote[(gateway, pagamento_id)]
+        }
+
+    async def _processar(self, evento: WebhookRecebido):
+        resultado = await self.handler.interpretar(
+            PaymentGateway(evento.gateway),
+            json.loads(evento.payload),
+            json.loads(evento.headers or "{}"),
+        )
+        if resultado.get("event"):
+            await self.handler.handle_payment_event(event=resultado["event"], payment_data=resultado)
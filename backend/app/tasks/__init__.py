@@ -1,3 +1,33 @@
 """
 Celery Tasks - Tarefas Assíncronas
 """
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+from app.core.database import engine
+
+T = TypeVar("T")
+
+
+def executar_async(corotina: Coroutine[Any, Any, T]) -> T:
+    """
+    Executa uma corotina dentro de uma task Celery
+
+    Cada execução roda num event loop novo (asyncio.run), mas o engine do
+    banco é global: as conexões do pool ficam presas ao loop em que foram
+    abertas. O pool é descartado ao fim de cada execução para que a
+    seguinte, no mesmo worker, abra conexões no próprio loop.
+
+    Args:
+        corotina: Corotina da task (ex: _processar_webhooks())
+
+    Returns:
+        Resultado da corotina
+    """
+    async def _executar() -> T:
+        try:
+            return await corotina
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_executar())
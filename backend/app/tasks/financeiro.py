@@ -0,0 +1,57 @@
+"""
+Celery Tasks para Financeiro
+"""
+import logging
+from typing import Dict
+
+from celery import shared_task
+
+from app.core.cache import cache_service
+from app.core.database import AsyncSessionLocal
+from app.core.versionamento import publicar_versoes
+from app.modules.financeiro.service import FinanceiroService
+from app.tasks import executar_async
+from app import models  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+async def _atualizar_status_vencidas() -> Dict[str, int]:
+    """
+    Executa a marcação das contas vencidas em uma transação
+
+    Com o Redis conectado, para que as versões de contas_pagar e
+    contas_receber cheguem aos workers da API.
+    """
+    await cache_service.connect()
+    try:
+        async with AsyncSessionLocal() as session:
+            try:
+                marcadas = await FinanceiroService(session).atualizar_status_vencidas()
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+            await publicar_versoes(session)
+        return marcadas
+    finally:
+        await cache_service.disconnect()
+
+
+@shared_task
+def atualizar_status_vencidas_task():
+    """
+    Rotina noturna: marca como ATRASADA as contas PENDENTES vencidas
+
+    Agendada em app/core/celery_app.py (beat_schedule), às 00:05.
+
+    Um UPDATE por tabela (contas_pagar e contas_receber); as leituras não
+    gravam mais o status.
+    """
+    marcadas = executar_async(_atualizar_status_vencidas())
+    logger.info(
+        f"Contas marcadas como ATRASADA: {marcadas['contas_pagar']} a pagar, "
+        f"{marcadas['contas_receber']} a receber"
+    )
+    return marcadas
+
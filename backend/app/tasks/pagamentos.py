@@ -0,0 +1,100 @@
+"""
+Celery Tasks para Pagamentos
+"""
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from celery import shared_task
+
+from app.core.cache import cache_service
+from app.core.database import AsyncSessionLocal
+from app.core.versionamento import publicar_versoes
+from app.modules.pagamentos.services.vencimentos import varrer_vencimentos
+from app.services.payment_gateway_service import PaymentGateway
+from app.services.webhook_inbox import WebhookInbox
+from app.tasks import executar_async
+from app import models  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+async def _varrer_vencimentos() -> Dict[str, int]:
+    """Executa a varredura com o Redis conectado (versões de contas_receber)"""
+    await cache_service.connect()
+    try:
+        async with AsyncSessionLocal() as session:
+            resultado = await varrer_vencimentos(session)
+            await publicar_versoes(session)
+            return resultado
+    finally:
+        await cache_service.disconnect()
+
+
+@shared_task
+def varrer_vencimentos_task():
+    """
+    Expira cobranças PIX e marca boletos vencidos
+
+    Um UPDATE por tabela; as contas a receber dos boletos vencidos passam a
+    ATRASADA na mesma transação.
+    Agendada em app/core/celery_app.py (beat_schedule), a cada 5 minutos.
+    """
+    return executar_async(_varrer_vencimentos())
+
+
+async def _processar_webhooks() -> Dict[str, int]:
+    """Drena a inbox com o Redis conectado (baixas mudam contas_receber)"""
+    await cache_service.connect()
+    try:
+        async with AsyncSessionLocal() as session:
+            try:
+                return await WebhookInbox(session).drenar()
+            finally:
+                await publicar_versoes(session)
+    finally:
+        await cache_service.disconnect()
+
+
+@shared_task
+def processar_webhooks_task():
+    """
+    Processa os webhooks de pagamento gravados na inbox
+
+    Em lotes, na ordem de chegada de cada pagamento. Agendada em
+    app/core/celery_app.py (beat_schedule), a cada 10 segundos.
+    """
+    return executar_async(_processar_webhooks())
+
+
+async def _reprocessar_webhooks(
+    ids: Optional[List[int]],
+    gateway: Optional[str],
+    desde: Optional[str],
+) -> int:
+    async with AsyncSessionLocal() as session:
+        return await WebhookInbox(session).reprocessar(
+            ids=ids,
+            gateway=PaymentGateway(gateway) if gateway else None,
+            desde=datetime.fromisoformat(desde) if desde else None,
+        )
+
+
+@shared_task
+def reprocessar_webhooks_task(
+    ids: Optional[List[int]] = None,
+    gateway: Optional[str] = None,
+    desde: Optional[str] = None,
+):
+    """
+    Devolve webhooks à inbox (replay)
+
+    Args:
+        ids: IDs em webhooks_recebidos (sem ids: os que esgotaram as tentativas)
+        gateway: Filtra por gateway (cielo, getnet, mercadopago)
+        desde: Filtra por data de recebimento (ISO 8601)
+    """
+    quantidade = executar_async(_reprocessar_webhooks(ids, gateway, desde))
+    logger.info(f"{quantidade} webhooks devolvidos à inbox")
+    return quantidade
+
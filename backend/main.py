@@ -7,6 +7,8 @@ from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.database import init_db, close_db
+from app.core.cache import cache_service
+from app.integrations.http_client import close_http_clients
 from app.core.logging import setup_logging, setup_sentry, get_logger
 from app.middleware.correlation import CorrelationIdMiddleware
 from app.middleware.rate_limit import setup_rate_limiting, limiter
@@ -33,9 +35,21 @@ async def lifespan(app: FastAPI):
     })
     await init_db()
     logger.info("Database initialized successfully")
+    await cache_service.connect()
+    try:
+        from app.core.database import AsyncSessionLocal
+        from app.modules.produtos.indice_codigo_barras import iniciar_indice_codigo_barras
+        await iniciar_indice_codigo_barras(AsyncSessionLocal)
+    except Exception as e:
+        # PDV continua funcionando consultando o banco a cada leitura
+        logger.error(f"Falha ao aquecer índice de código de barras: {str(e)}")
     yield
     # Shutdown
     logger.info("Shutting down application")
+    from app.modules.estoque.marketplace_sync_service import parar_ml_sync_worker
+    await parar_ml_sync_worker()
+    await close_http_clients()
+    await cache_service.disconnect()
     await close_db()
     logger.info("Application shutdown complete")
 
@@ -0,0 +1,113 @@
+"""
+Script para arquivar períodos fechados do ledger de movimentações de estoque
+
+Move os meses anteriores à janela de retenção para arquivos comprimidos
+(CSV gzip ou Parquet), grava snapshots de saldo por produto e garante que as
+partições dos próximos meses existam (PostgreSQL).
+
+Uso:
+    python scripts/arquivar_movimentacoes_estoque.py
+    python scripts/arquivar_movimentacoes_estoque.py --ate 2025-06 --formato parquet
+    python scripts/arquivar_movimentacoes_estoque.py --periodo 2025-01 --destino /mnt/frio
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.exceptions import ERPException
+from app.modules.estoque.arquivamento_service import ArquivamentoEstoqueService
+from app.modules.estoque.schemas import FormatoArquivoEnum
+from app import models  # noqa: F401
+
+
+def parse_periodo(valor: str) -> date:
+    """Converte 'AAAA-MM' em date do primeiro dia do mês"""
+    try:
+        ano, mes = valor.split("-")
+        return date(int(ano), int(mes), 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Período inválido: {valor} (use AAAA-MM)")
+
+
+def periodo_limite_retencao(meses_retencao: int) -> date:
+    """Último mês que pode ser arquivado mantendo a janela de retenção"""
+    hoje = date.today()
+    total = hoje.year * 12 + (hoje.month - 1) - meses_retencao - 1
+    return date(total // 12, total % 12 + 1, 1)
+
+
+async def main(args: argparse.Namespace):
+    """Executa o arquivamento"""
+    async with AsyncSessionLocal() as session:
+        service = ArquivamentoEstoqueService(session, diretorio=args.destino)
+        formato = FormatoArquivoEnum(args.formato)
+
+        try:
+            if args.periodo:
+                arquivados = [
+                    await service.arquivar_periodo(
+                        args.periodo.year, args.periodo.month, formato
+                    )
+                ]
+            else:
+                limite = args.ate or periodo_limite_retencao(args.retencao)
+                print(f"📦 Arquivando movimentações até {limite:%m/%Y}...")
+                arquivados = await service.arquivar_ate(limite.year, limite.month, formato)
+
+            await service.garantir_particoes_futuras(meses=args.particoes_futuras)
+            await session.commit()
+        except ERPException as e:
+            await session.rollback()
+            print(f"❌ {e.message}")
+            sys.exit(1)
+
+    if not arquivados:
+        print("✅ Nenhum período a arquivar")
+    for arquivo in arquivados:
+        print(
+            f"✅ {arquivo.periodo:%m/%Y}: {arquivo.total_registros} registros "
+            f"→ {arquivo.caminho_arquivo} ({arquivo.tamanho_bytes} bytes)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Arquiva períodos fechados de movimentações de estoque"
+    )
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument(
+        "--periodo", type=parse_periodo, help="Arquiva somente o mês informado (AAAA-MM)"
+    )
+    grupo.add_argument(
+        "--ate", type=parse_periodo, help="Arquiva todos os meses até o informado (AAAA-MM)"
+    )
+    parser.add_argument(
+        "--retencao",
+        type=int,
+        default=settings.ESTOQUE_MESES_RETENCAO,
+        help="Meses fechados mantidos no banco quando --ate/--periodo não é informado",
+    )
+    parser.add_argument(
+        "--formato",
+        choices=[f.value for f in FormatoArquivoEnum],
+        default=FormatoArquivoEnum.CSV.value,
+        help="Formato do arquivo (csv gzip ou parquet)",
+    )
+    parser.add_argument(
+        "--destino", default=None, help="Diretório de destino (padrão: ESTOQUE_ARQUIVO_DIR)"
+    )
+    parser.add_argument(
+        "--particoes-futuras",
+        type=int,
+        default=3,
+        help="Quantidade de partições mensais futuras a garantir (PostgreSQL)",
+    )
+
+    asyncio.run(main(parser.parse_args()))
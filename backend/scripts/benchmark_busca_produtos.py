@@ -0,0 +1,135 @@
+"""
+Benchmark da busca de produtos com índice n-grama em memória
+
+Gera um catálogo sintético (padrão: 100 mil produtos de materiais de
+construção), constrói o IndiceNGramProdutos e compara a latência das buscas
+com uma varredura linear equivalente ao ILIKE '%termo%' (seq scan), conferindo
+que ambos encontram a mesma quantidade de produtos.
+
+Uso:
+    python scripts/benchmark_busca_produtos.py
+    python scripts/benchmark_busca_produtos.py --produtos 200000 --repeticoes 20
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.modules.produtos.busca import IndiceNGramProdutos, normalizar_texto
+
+TIPOS = [
+    "Cimento", "Argamassa", "Tijolo", "Bloco de Concreto", "Telha", "Areia",
+    "Brita", "Cal Hidratada", "Vergalhão", "Tubo PVC", "Conexão PVC", "Joelho",
+    "Registro", "Torneira", "Fio Elétrico", "Cabo Flexível", "Disjuntor",
+    "Tomada", "Interruptor", "Tinta Acrílica", "Massa Corrida", "Selador",
+    "Verniz", "Piso Cerâmico", "Porcelanato", "Rejunte", "Parafuso", "Prego",
+    "Bucha", "Dobradiça", "Fechadura", "Caixa d'Água", "Impermeabilizante",
+]
+MARCAS = [
+    "Votoran", "Quartzolit", "Tigre", "Amanco", "Suvinil", "Coral", "Deca",
+    "Docol", "Pial", "Tramontina", "Eliane", "Portobello", "Gerdau", "Fortlev",
+    "Vedacit", "Sikа", "Lorenzetti", "Cipla", "Sherwin", "Belgo",
+]
+VARIANTES = [
+    "CP-II 50kg", "CP-V ARI 40kg", "AC-III 20kg", "6 furos", "1/2\"", "3/4\"",
+    "25mm", "32mm", "40mm", "100mm", "2,5mm²", "4mm²", "10A", "20A", "18L",
+    "3,6L", "Branco Neve", "Cinza Platina", "Marfim", "60x60", "45x45",
+    "4x40", "6mm", "8mm", "Inox", "Cromado", "1000L", "500L",
+]
+TERMOS = [
+    "cimento", "cimento cp", "argamassa ac", "tubo pvc 25", "tigre",
+    "porcelanato 60x60", "fio 2,5", "tinta branco", "vergalhao", "torneira cromado",
+    "caixa d agua 1000", "acrilica suvinil", "parafuso inox 6mm", "joelho 32",
+    "7891234", "disj", "ceramic",
+]
+
+
+def gerar_catalogo(quantidade: int, semente: int = 42):
+    """Gera tuplas (id, descricao, codigo_barras, ativo)"""
+    aleatorio = random.Random(semente)
+    for produto_id in range(1, quantidade + 1):
+        descricao = " ".join([
+            aleatorio.choice(TIPOS),
+            aleatorio.choice(MARCAS),
+            aleatorio.choice(VARIANTES),
+        ])
+        codigo_barras = f"789{aleatorio.randrange(10**10):010d}"
+        yield produto_id, descricao, codigo_barras, aleatorio.random() > 0.05
+
+
+def busca_linear(catalogo, termo: str, limit: int = 50):
+    """Equivalente a WHERE (descricao ILIKE '%t%' OR codigo ILIKE '%t%') por palavra"""
+    tokens = normalizar_texto(termo).split()
+    encontrados = [
+        produto_id
+        for produto_id, texto, codigo, ativo in catalogo
+        if ativo and all(t in texto or t in codigo for t in tokens)
+    ]
+    return encontrados[:limit], len(encontrados)
+
+
+def medir(funcao, repeticoes: int):
+    """Executa a função `repeticoes` vezes e retorna (tempos em ms, último resultado)"""
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos, resultado
+
+
+def resumo(tempos):
+    tempos = sorted(tempos)
+    p95 = tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))]
+    return f"p50={statistics.median(tempos):8.2f}ms  p95={p95:8.2f}ms"
+
+
+def main(args: argparse.Namespace):
+    print(f"📦 Gerando catálogo com {args.produtos} produtos...")
+    linhas = list(gerar_catalogo(args.produtos))
+    catalogo = [
+        (produto_id, normalizar_texto(descricao), codigo.lower(), ativo)
+        for produto_id, descricao, codigo, ativo in linhas
+    ]
+
+    indice = IndiceNGramProdutos()
+    inicio = time.perf_counter()
+    indice.carregar_produtos(linhas)
+    print(f"🔧 Índice construído em {time.perf_counter() - inicio:.2f}s")
+
+    print(f"\n{'termo':<22} {'total':>7}  {'índice n-grama':<30} {'varredura linear':<30}")
+    tempos_indice, tempos_linear = [], []
+    for termo in TERMOS:
+        t_indice, (_, total_indice) = medir(
+            lambda: indice.buscar(termo, limit=50), args.repeticoes
+        )
+        t_linear, (_, total_linear) = medir(
+            lambda: busca_linear(catalogo, termo), max(1, args.repeticoes // 5)
+        )
+        if total_indice != total_linear:
+            print(f"❌ {termo}: índice={total_indice} linear={total_linear}")
+            sys.exit(1)
+        tempos_indice += t_indice
+        tempos_linear += t_linear
+        print(f"{termo:<22} {total_indice:>7}  {resumo(t_indice):<30} {resumo(t_linear):<30}")
+
+    print(f"\n✅ Geral   índice: {resumo(tempos_indice)}   linear: {resumo(tempos_linear)}")
+    print(
+        f"   Ganho mediano: "
+        f"{statistics.median(tempos_linear) / statistics.median(tempos_indice):.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark da busca de produtos (índice n-grama x varredura)"
+    )
+    parser.add_argument("--produtos", type=int, default=100_000, help="Tamanho do catálogo")
+    parser.add_argument("--repeticoes", type=int, default=10, help="Repetições por termo")
+    main(parser.parse_args())
@@ -13,6 +13,7 @@ from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 from app.core.database import Base, get_db
+from app.integrations import http_client
 from app.modules.auth.models import User, Role, Permission
 from app.modules.auth.security import get_password_hash, create_access_token
 from main import app
@@ -21,6 +22,21 @@ from main import app
 from app import models  # noqa: F401
 
 
+# ============================================================================
+# Integrações HTTP
+# ============================================================================
+
+@pytest.fixture(autouse=True)
+def isolar_integracoes_http():
+    """
+    Clientes HTTP compartilhados e tokens OAuth em cache não passam de um
+    teste para outro (os testes trocam httpx.AsyncClient por mocks)
+    """
+    yield
+    http_client._clients.clear()
+    http_client.token_cache.limpar()
+
+
 # ============================================================================
 # Database Fixtures
 # ============================================================================
@@ -0,0 +1,133 @@
+"""
+Servidor mock local da API do Mercado Livre
+
+Implementa os endpoints usados pela sincronização de estoque
+(PUT/GET /items/{item_id}) mantendo estado em memória, com:
+- Histórico de requisições recebidas
+- Contagem de requisições simultâneas (pico de concorrência)
+- Simulação de rate limit (429 + Retry-After) e de falhas 5xx
+- Token "expirado" responde 401
+- Latência artificial configurável
+
+Uso em testes (in-process, sem rede):
+    mock = MercadoLivreMock()
+    http_client = mock.http_client()
+    client = MercadoLivreClient("id", "secret", base_url=MOCK_BASE_URL, http_client=http_client)
+
+Uso como servidor local:
+    python -m tests.mocks.mercadolivre_mock  # http://127.0.0.1:8089
+"""
+import asyncio
+from typing import Dict, Any, List
+
+import httpx
+from fastapi import FastAPI, Header, Request
+from fastapi.responses import JSONResponse
+
+MOCK_BASE_URL = "http://ml-mock"
+
+
+class MercadoLivreMock:
+    """Estado e aplicação ASGI do mock do Mercado Livre"""
+
+    def __init__(self, latencia: float = 0.0):
+        """
+        Args:
+            latencia: Atraso artificial (segundos) em cada resposta
+        """
+        self.latencia = latencia
+        self.itens: Dict[str, Dict[str, Any]] = {}
+        self.requisicoes: List[Dict[str, Any]] = []
+        self.falhas_rate_limit = 0
+        self.retry_after = "0"
+        self.falhas_servidor = 0
+        self.em_andamento = 0
+        self.pico_concorrencia = 0
+        self.app = self._criar_app()
+
+    def reset(self):
+        """Limpa estado do mock"""
+        self.itens.clear()
+        self.requisicoes.clear()
+        self.falhas_rate_limit = 0
+        self.falhas_servidor = 0
+        self.em_andamento = 0
+        self.pico_concorrencia = 0
+
+    def simular_rate_limit(self, quantidade: int, retry_after: str = "0"):
+        """Faz as próximas `quantidade` requisições responderem 429"""
+        self.falhas_rate_limit = quantidade
+        self.retry_after = retry_after
+
+    def simular_falha_servidor(self, quantidade: int):
+        """Faz as próximas `quantidade` requisições responderem 503"""
+        self.falhas_servidor = quantidade
+
+    def http_client(self) -> httpx.AsyncClient:
+        """Cliente httpx que envia as requisições direto para o app ASGI"""
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.app), base_url=MOCK_BASE_URL
+        )
+
+    def requisicoes_item(self, item_id: str) -> List[Dict[str, Any]]:
+        """Requisições PUT recebidas para um anúncio"""
+        return [
+            r for r in self.requisicoes
+            if r["item_id"] == item_id and r["metodo"] == "PUT"
+        ]
+
+    def _criar_app(self) -> FastAPI:
+        app = FastAPI(title="Mercado Livre Mock")
+        mock = self
+
+        @app.put("/items/{item_id}")
+        async def atualizar_item(
+            item_id: str, request: Request, authorization: str = Header(None)
+        ):
+            payload = await request.json()
+            mock.requisicoes.append(
+                {"metodo": "PUT", "item_id": item_id, "payload": payload}
+            )
+
+            if authorization in (None, "Bearer expirado") or not authorization.startswith("Bearer "):
+                return JSONResponse({"message": "invalid_token"}, status_code=401)
+
+            if mock.falhas_rate_limit > 0:
+                mock.falhas_rate_limit -= 1
+                return JSONResponse(
+                    {"message": "too_many_requests"},
+                    status_code=429,
+                    headers={"Retry-After": mock.retry_after},
+                )
+
+            if mock.falhas_servidor > 0:
+                mock.falhas_servidor -= 1
+                return JSONResponse({"message": "unavailable"}, status_code=503)
+
+            mock.em_andamento += 1
+            mock.pico_concorrencia = max(mock.pico_concorrencia, mock.em_andamento)
+            try:
+                if mock.latencia:
+                    await asyncio.sleep(mock.latencia)
+                item = mock.itens.setdefault(
+                    item_id, {"id": item_id, "status": "active", "available_quantity": 0}
+                )
+                item.update(payload)
+                return item
+            finally:
+                mock.em_andamento -= 1
+
+        @app.get("/items/{item_id}")
+        async def obter_item(item_id: str):
+            item = mock.itens.get(item_id)
+            if not item:
+                return JSONResponse({"message": "not_found"}, status_code=404)
+            return item
+
+        return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(MercadoLivreMock().app, host="127.0.0.1", port=8089)
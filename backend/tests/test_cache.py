@@ -7,7 +7,9 @@ Testa:
 - CacheManager
 - Rate limiting
 - Geração de chaves
+- Pub/sub com reconexão
 """
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, Mock, patch, MagicMock
 import pickle
@@ -16,6 +18,7 @@ import hashlib
 from app.core.cache import (
     CacheService,
     CacheManager,
+    MENSAGEM_TODOS,
     cached,
     cache_service,
     cache_manager
@@ -325,6 +328,63 @@ class TestCacheServiceRedis:
         assert result is False
 
 
+class PubSubFalso:
+    """PubSub do Redis que entrega mensagens e depois cai (ou fica aberto)"""
+
+    def __init__(self, mensagens=(), cair=False, falhar_ao_assinar=False):
+        self.mensagens = list(mensagens)
+        self.cair = cair
+        self.falhar_ao_assinar = falhar_ao_assinar
+        self.canais = []
+
+    async def subscribe(self, *canais):
+        if self.falhar_ao_assinar:
+            raise ConnectionError("Redis indisponível")
+        self.canais.extend(canais)
+
+    async def listen(self):
+        yield {"type": "subscribe", "channel": b"canal", "data": 1}
+        for mensagem in self.mensagens:
+            yield {"type": "message", "channel": b"canal", "data": mensagem.encode()}
+        if self.cair:
+            raise ConnectionError("Conexão com o Redis perdida")
+        await asyncio.Event().wait()
+
+    async def close(self):
+        pass
+
+
+class TestPubSubReconexao:
+    """Listener do pub/sub sobrevive a quedas do Redis"""
+
+    @pytest.mark.asyncio
+    async def test_reassina_apos_queda_e_avisa_assinantes(self, redis_cache):
+        pubsubs = [
+            PubSubFalso(["1,2"], cair=True),
+            PubSubFalso(falhar_ao_assinar=True),
+            PubSubFalso(["3"]),
+        ]
+        redis_cache._redis_client.pubsub = Mock(side_effect=pubsubs)
+        redis_cache.ESPERA_RECONEXAO_MIN = 0.001
+        recebidas = []
+
+        async def receber(mensagem: str):
+            recebidas.append(mensagem)
+
+        await redis_cache.subscribe("canal", receber)
+        try:
+            for _ in range(200):
+                if len(recebidas) >= 4:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await redis_cache.disconnect()
+
+        # Um aviso ao cair (não a cada tentativa) e outro ao reassinar
+        assert recebidas == ["1,2", MENSAGEM_TODOS, MENSAGEM_TODOS, "3"]
+        assert pubsubs[2].canais == ["canal"]
+
+
 # ========== Testes Decorator @cached ==========
 
 class TestCachedDecorator:
@@ -14,8 +14,9 @@ import sys
 
 class MockCeleryApp:
     """Mock do Celery App"""
-    def __init__(self, name, broker=None, backend=None):
+    def __init__(self, name, broker=None, backend=None, include=None):
         self.main = name
+        self.include = include or []
         self.conf = Mock()
         self.conf.broker_url = broker
         self.conf.result_backend = backend
@@ -71,6 +72,7 @@ mock_celery_module.exceptions.Retry = MockRetry
 
 sys.modules['celery'] = mock_celery_module
 sys.modules['celery.exceptions'] = mock_celery_module.exceptions
+sys.modules['celery.schedules'] = mock_celery_module.schedules
 
 
 # Agora podemos importar os módulos
@@ -134,6 +136,21 @@ class TestCeleryAppConfiguration:
         # Verificar que autodiscover foi chamado
         celery_module.celery_app.autodiscover_tasks.assert_called_once_with(["app.tasks"])
 
+    @patch('app.core.celery_app.Celery', MockCeleryApp)
+    def test_celery_include_e_beat_schedule(self):
+        """Worker e beat devem importar os módulos das tasks agendadas"""
+        import importlib
+        import app.core.celery_app as celery_module
+        importlib.reload(celery_module)
+
+        celery_app = celery_module.celery_app
+        for entrada in celery_app.conf.beat_schedule.values():
+            modulo = entrada["task"].rsplit(".", 1)[0]
+            assert modulo in celery_app.include
+        assert "financeiro-atualizar-status-vencidas" in celery_app.conf.beat_schedule
+        assert "pagamentos-varrer-vencimentos" in celery_app.conf.beat_schedule
+        assert "pagamentos-processar-webhooks" in celery_app.conf.beat_schedule
+
 
 # ========== Testes Tasks de Webhook (Lógica de Negócio) ==========
 
@@ -0,0 +1,48 @@
+"""
+Testes do registro das tasks e do agendamento (celery beat)
+
+Testa:
+- core/celery_app.py - Módulos de tasks importados pelo worker e beat_schedule
+
+Requer o Celery instalado; tests/test_celery.py substitui o módulo por um
+mock quando ele não está disponível.
+"""
+import types
+
+import pytest
+
+celery = pytest.importorskip("celery")
+if not isinstance(celery, types.ModuleType):
+    pytest.skip("celery substituído por mock", allow_module_level=True)
+
+from app.core.celery_app import celery_app  # noqa: E402
+
+# Entrada do beat_schedule -> task agendada
+AGENDAMENTOS = {
+    "financeiro-atualizar-status-vencidas": "app.tasks.financeiro.atualizar_status_vencidas_task",
+    "pagamentos-varrer-vencimentos": "app.tasks.pagamentos.varrer_vencimentos_task",
+    "pagamentos-processar-webhooks": "app.tasks.pagamentos.processar_webhooks_task",
+}
+
+
+@pytest.fixture(scope="module")
+def tasks_registradas():
+    # O worker e o beat importam os módulos de `include` ao iniciar
+    celery_app.loader.import_default_modules()
+    return celery_app.tasks
+
+
+@pytest.mark.parametrize("entrada,task", AGENDAMENTOS.items())
+def test_task_agendada_registrada(tasks_registradas, entrada, task):
+    assert celery_app.conf.beat_schedule[entrada]["task"] == task
+    assert task in tasks_registradas
+
+
+def test_rotina_de_vencidas_apos_virada_do_dia():
+    schedule = celery_app.conf.beat_schedule["financeiro-atualizar-status-vencidas"]["schedule"]
+    assert schedule.hour == {0}
+    assert schedule.minute == {5}
+
+
+def test_task_de_replay_de_webhooks_registrada(tasks_registradas):
+    assert "app.tasks.pagamentos.reprocessar_webhooks_task" in tasks_registradas
@@ -0,0 +1,126 @@
+"""
+Testes da geração de remessa CNAB
+
+Testa:
+- services/cnab_service.py - Remessa 240/400 em streaming, contadores e
+  totais dos trailers acumulados durante a geração
+- router.py - Download da remessa
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.pagamentos.models import Boleto, ConfiguracaoBoleto
+from app.modules.pagamentos.services import cnab_service as modulo
+from app.modules.pagamentos.services.cnab_service import CNABService
+
+DIA = date(2026, 10, 15)
+
+
+@pytest.fixture
+async def config_boletos(db_session: AsyncSession):
+    """Cinco boletos, o último já registrado no banco"""
+    config = ConfiguracaoBoleto(
+        banco_codigo="001", banco_nome="Banco do Brasil", agencia="1234", conta="12345", conta_dv="6",
+        cedente_nome="EMPRESA TESTE LTDA", cedente_documento="12345678000190", carteira="18",
+        percentual_juros=Decimal("1.00"), percentual_multa=Decimal("2.00"),
+    )
+    db_session.add(config)
+    await db_session.flush()
+
+    db_session.add_all([
+        Boleto(
+            configuracao_id=config.id, nosso_numero=f"{i:011d}", numero_documento=str(i),
+            valor=Decimal("100.00") + i, data_emissao=DIA, data_vencimento=DIA,
+            sacado_nome="JOSÉ DA SILVA", sacado_documento="12345678901", sacado_cep="01001000",
+            registrado=(i == 5),
+        )
+        for i in range(1, 6)
+    ])
+    await db_session.commit()
+    return config
+
+
+async def _gerar(service: CNABService, config, formato: str, **kwargs) -> str:
+    blocos = [bloco async for bloco in service.gerar_remessa_streaming(config, formato, **kwargs)]
+    return b"".join(blocos).decode(modulo.ENCODING_CNAB)
+
+
+class TestRemessaStreaming:
+    """Testes da remessa em blocos"""
+
+    @pytest.mark.asyncio
+    async def test_cnab240_trailers_incrementais(self, db_session, config_boletos, monkeypatch):
+        monkeypatch.setattr(modulo, "LOTE_REMESSA", 2)
+        service = CNABService(db_session)
+
+        conteudo = await _gerar(service, config_boletos, "240", numero_remessa=7)
+        assert conteudo.endswith("\r\n")
+        linhas = conteudo.split("\r\n")[:-1]
+
+        # Boletos não registrados: 4 x (P, Q, R) + 2 headers + 2 trailers
+        assert len(linhas) == 4 * 3 + 4
+        assert all(len(linha) == 240 for linha in linhas)
+        assert [linha[13] for linha in linhas[2:-2]] == ["P", "Q", "R"] * 4
+        assert linhas[2][37:48] == "00000000001"
+        assert "JOSE DA SILVA" not in conteudo and "JOSÉ DA SILVA" in conteudo
+
+        trailer_lote, trailer_arquivo = linhas[-2], linhas[-1]
+        assert trailer_lote[17:23] == "000014"
+        assert trailer_lote[23:29] == "000004"
+        assert int(trailer_lote[29:46]) == 41000  # 101 + 102 + 103 + 104
+        assert trailer_arquivo[23:29] == "000016"
+
+    @pytest.mark.asyncio
+    async def test_cnab400_por_ids_igual_a_remessa_em_memoria(self, db_session, config_boletos, monkeypatch):
+        monkeypatch.setattr(modulo, "LOTE_REMESSA", 2)
+        service = CNABService(db_session)
+        boletos = (await db_session.execute(select(Boleto).order_by(Boleto.id))).scalars().all()
+
+        conteudo = await _gerar(service, config_boletos, "400", boleto_ids=[b.id for b in boletos][::-1])
+        em_memoria = await service.gerar_cnab400_remessa(config_boletos.id, list(boletos))
+
+        linhas = conteudo.split("\r\n")[:-1]
+        assert len(linhas) == 5 + 2
+        assert all(len(linha) == 400 for linha in linhas)
+        assert linhas[-1][394:400] == "000007"
+        # Mesmo conteúdo, exceto a data de geração do header
+        assert linhas[1:] == em_memoria.split("\r\n")[1:]
+
+
+class TestRemessaRouter:
+    """Testes do download da remessa"""
+
+    @pytest.mark.asyncio
+    async def test_download(self, client, auth_headers, async_db_session):
+        config = ConfiguracaoBoleto(
+            banco_codigo="001", banco_nome="Banco do Brasil", agencia="1234", conta="12345", conta_dv="6",
+            cedente_nome="EMPRESA TESTE LTDA", cedente_documento="12345678000190", carteira="18",
+        )
+        async_db_session.add(config)
+        await async_db_session.flush()
+        async_db_session.add(Boleto(
+            configuracao_id=config.id, nosso_numero="00000000001", numero_documento="1",
+            valor=Decimal("50.00"), data_vencimento=DIA, sacado_nome="CLIENTE", sacado_documento="12345678901",
+        ))
+        await async_db_session.commit()
+
+        response = await client.post(
+            "/api/v1/pagamentos/cnab/remessa/arquivo",
+            json={"configuracao_id": config.id, "formato": "240"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert "attachment" in response.headers["content-disposition"]
+        assert len(response.content.splitlines()) == 3 + 4
+
+        response = await client.post(
+            "/api/v1/pagamentos/cnab/remessa/arquivo",
+            json={"configuracao_id": 999, "formato": "240"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 404
@@ -0,0 +1,165 @@
+"""
+Testes do processamento em lote do retorno CNAB
+
+Testa:
+- services/cnab_service.py - Leitura linha a linha, boletos por IN (...),
+  liquidações em um UPDATE e baixa das contas a receber
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.financeiro.models import ContaReceber, StatusFinanceiro
+from app.modules.pagamentos.models import Boleto, ConfiguracaoBoleto, StatusBoleto
+from app.modules.pagamentos.services import cnab_service as modulo
+from app.modules.pagamentos.services.cnab_service import CNABService
+
+DIA = date(2026, 10, 15)
+
+
+def _linha(tamanho: int, campos: dict) -> str:
+    linha = [" "] * tamanho
+    for inicio, valor in campos.items():
+        linha[inicio:inicio + len(valor)] = valor
+    return "".join(linha)
+
+
+def _centavos(valor: str, tamanho: int) -> str:
+    return str(int(Decimal(valor) * 100)).zfill(tamanho)
+
+
+def _segmento_t(nosso_numero: str, ocorrencia: str, centavos: str, data: str = "15102026") -> str:
+    return _linha(240, {
+        7: "3", 13: "T", 15: ocorrencia, 37: nosso_numero.ljust(20), 77: centavos.rjust(15, "0"), 137: data,
+    })
+
+
+def _detalhe_400(nosso_numero: str, ocorrencia: str, valor: str, data: str = "151026") -> str:
+    return _linha(400, {
+        0: "1", 62: nosso_numero, 108: ocorrencia, 110: data,
+        253: _centavos(valor, 13),
+    })
+
+
+@pytest.fixture
+async def boletos(db_session: AsyncSession):
+    """Três boletos; os dois primeiros com conta a receber"""
+    config = ConfiguracaoBoleto(
+        banco_codigo="001", banco_nome="Banco do Brasil", agencia="1234", conta="12345", conta_dv="6",
+        cedente_nome="EMPRESA TESTE LTDA", cedente_documento="12345678000190", carteira="18",
+    )
+    db_session.add(config)
+    await db_session.flush()
+
+    db_session.add_all([
+        Boleto(
+            configuracao_id=config.id, nosso_numero=f"{i:011d}", numero_documento=str(i),
+            valor=Decimal("100.00"), data_vencimento=DIA, sacado_nome="CLIENTE", sacado_documento="12345678901",
+        )
+        for i in range(1, 4)
+    ] + [
+        ContaReceber(
+            cliente_id=1, descricao=f"Venda {i}", valor_original=100, valor_recebido=0, documento=f"{i:011d}",
+            data_emissao=DIA, data_vencimento=DIA, status=StatusFinanceiro.PENDENTE,
+        )
+        for i in range(1, 3)
+    ])
+    await db_session.commit()
+    return config
+
+
+async def _estado(db_session: AsyncSession):
+    db_session.expire_all()
+    boletos = {
+        b.nosso_numero: b for b in (await db_session.execute(select(Boleto))).scalars()
+    }
+    contas = {
+        c.documento: c for c in (await db_session.execute(select(ContaReceber))).scalars()
+    }
+    return boletos, contas
+
+
+class TestRetornoCNAB240:
+    """Testes do retorno CNAB 240"""
+
+    @pytest.mark.asyncio
+    async def test_liquida_boletos_e_baixa_contas(self, db_session, boletos):
+        arquivo = "\r\n".join([
+            _linha(240, {7: "0"}),                               # header: ignorado
+            _segmento_t("00000000001", "06", "10000"),
+            _segmento_t("00000000002", "06", "10250"),           # com juros
+            _segmento_t("00000000003", "02", "0"),               # entrada confirmada
+            _segmento_t("99999999999", "06", "1000"),            # boleto inexistente
+            _segmento_t("00000000003", "06", "ABC"),             # valor inválido
+        ])
+
+        resultado = await CNABService(db_session).processar_cnab240_retorno(boletos.id, arquivo)
+
+        assert resultado["total_registros"] == 4
+        assert (resultado["boletos_atualizados"], resultado["boletos_pagos"]) == (3, 2)
+        assert resultado["contas_receber_baixadas"] == 2
+        assert [e["linha"] for e in resultado["erros"]] == [6]
+
+        boletos_db, contas = await _estado(db_session)
+        assert boletos_db["00000000001"].status == StatusBoleto.PAGO
+        assert boletos_db["00000000002"].valor_pago == Decimal("102.50")
+        assert boletos_db["00000000002"].data_pagamento == DIA
+        assert boletos_db["00000000003"].status != StatusBoleto.PAGO
+        # Juros do boleto não entram no título
+        assert {c.status for c in contas.values()} == {StatusFinanceiro.RECEBIDA}
+        assert float(contas["00000000002"].valor_recebido) == 100.0
+        assert contas["00000000002"].data_recebimento == DIA
+
+    @pytest.mark.asyncio
+    async def test_consultas_em_lote(self, db_session, boletos, monkeypatch):
+        """Boletos por IN (...) em lotes e um único UPDATE de liquidação"""
+        monkeypatch.setattr(modulo, "LOTE_RETORNO", 2)
+        arquivo = "\n".join(
+            [_segmento_t(f"{i:011d}", "06", "10000") for i in range(1, 4)]
+            + [_segmento_t(f"{i:011d}", "06", "100") for i in range(100, 110)]
+        )
+
+        comandos = []
+        engine = db_session.bind.sync_engine
+        contar = lambda *args: comandos.append(args[2].split()[0])  # noqa: E731
+        event.listen(engine, "before_cursor_execute", contar)
+        try:
+            resultado = await CNABService(db_session).processar_cnab240_retorno(
+                boletos.id, arquivo, baixar_contas_receber=False
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", contar)
+
+        assert resultado["boletos_pagos"] == 3
+        assert resultado["contas_receber_baixadas"] == 0
+        # 13 nosso números em lotes de 2
+        assert comandos.count("SELECT") == 7
+        assert comandos.count("UPDATE") == 1
+
+
+class TestRetornoCNAB400:
+    """Testes do retorno CNAB 400"""
+
+    @pytest.mark.asyncio
+    async def test_liquida_e_baixa(self, db_session, boletos):
+        arquivo = iter([
+            _linha(400, {0: "0"}) + "\n",
+            _detalhe_400("00000000001", "06", "100.00") + "\n",
+            _detalhe_400("00000000003", "06", "100.00", data="      ") + "\n",
+        ])
+
+        resultado = await CNABService(db_session).processar_cnab400_retorno(boletos.id, arquivo)
+
+        assert (resultado["total_registros"], resultado["boletos_pagos"]) == (2, 2)
+        # Boleto 3 não tem conta a receber
+        assert resultado["contas_receber_baixadas"] == 1
+
+        boletos_db, contas = await _estado(db_session)
+        assert boletos_db["00000000001"].data_pagamento == DIA
+        assert boletos_db["00000000003"].status == StatusBoleto.PAGO
+        assert boletos_db["00000000003"].data_pagamento is None
+        assert contas["00000000001"].status == StatusFinanceiro.RECEBIDA
+        assert contas["00000000002"].status == StatusFinanceiro.PENDENTE
@@ -0,0 +1,203 @@
+"""
+Testes da conciliação aproximada por valor e data
+
+Testa:
+- services/conciliacao_aproximada.py - Varredura 1:1, agrupamento N:1 e confiança
+- services/conciliacao_service.py - Sugestões contra contas a receber e gravação
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.financeiro.models import ContaReceber, StatusFinanceiro
+from app.modules.financeiro.repository import ContaReceberRepository
+from app.modules.pagamentos.models import ConciliacaoBancaria, ConciliacaoContaReceber, ExtratoBancario
+from app.modules.pagamentos.services.conciliacao_aproximada import (
+    LancamentoCredito,
+    ParametrosConciliacao,
+    TituloAberto,
+    calcular_confianca,
+    conciliar_por_valor_data,
+)
+from app.modules.pagamentos.services.conciliacao_service import ConciliacaoService
+
+DIA = date(2026, 10, 15)
+
+
+def _lancamento(id: int, valor: str, dias: int = 0) -> LancamentoCredito:
+    return LancamentoCredito(id, DIA + timedelta(days=dias), Decimal(valor))
+
+
+def _titulo(id: int, valor: str, dias: int = 0) -> TituloAberto:
+    return TituloAberto(id, DIA + timedelta(days=dias), Decimal(valor))
+
+
+class TestMotorUmParaUm:
+    """Testes da varredura por valor e data"""
+
+    def test_casa_dentro_das_janelas(self):
+        sugestoes = conciliar_por_valor_data(
+            [_lancamento(1, "100.00"), _lancamento(2, "250.01", dias=2), _lancamento(3, "80.00")],
+            [_titulo(10, "250.00"), _titulo(11, "100.00"), _titulo(12, "80.00", dias=10)],
+            ParametrosConciliacao(max_titulos=1),
+        )
+
+        assert [(s.extrato_id, s.titulo_ids) for s in sugestoes] == [(1, [11]), (2, [10])]
+        assert sugestoes[0].confianca == 1.0
+        assert sugestoes[1].diferenca == Decimal("0.01")
+        assert sugestoes[1].confianca == calcular_confianca(Decimal("0.01"), 2, ParametrosConciliacao())
+
+    def test_prefere_data_mais_proxima_e_nao_reutiliza_titulo(self):
+        sugestoes = conciliar_por_valor_data(
+            [_lancamento(1, "50.00"), _lancamento(2, "50.00", dias=3)],
+            [_titulo(10, "50.00", dias=3), _titulo(11, "50.00")],
+        )
+
+        assert {s.extrato_id: s.titulo_ids for s in sugestoes} == {1: [11], 2: [10]}
+        # Valores iguais: alternativas reduzem a confiança
+        assert all(s.confianca < 1.0 for s in sugestoes)
+
+
+class TestMotorAgrupado:
+    """Testes do agrupamento N:1 (subset-sum)"""
+
+    def test_deposito_cobre_varios_titulos(self):
+        sugestoes = conciliar_por_valor_data(
+            [_lancamento(1, "370.00")],
+            [
+                _titulo(10, "100.00", dias=-1), _titulo(11, "200.00"), _titulo(12, "70.00", dias=1),
+                _titulo(13, "55.00"), _titulo(14, "999.00"),
+            ],
+        )
+
+        assert len(sugestoes) == 1
+        assert sugestoes[0].titulo_ids == [10, 11, 12]
+        assert sugestoes[0].valor_titulos == Decimal("370.00")
+        assert 0 < sugestoes[0].confianca < 1.0
+
+    def test_menor_grupo_primeiro_e_limite_de_titulos(self):
+        titulos = [_titulo(10, "60.00"), _titulo(11, "40.00"), _titulo(12, "30.00"), _titulo(13, "30.00")]
+
+        dois = conciliar_por_valor_data([_lancamento(1, "100.00")], titulos)
+        assert dois[0].titulo_ids == [10, 11]
+
+        # 4 títulos de 25: só agrupa se o limite permitir
+        quatro = [_titulo(20 + i, "25.00") for i in range(4)]
+        assert conciliar_por_valor_data(
+            [_lancamento(1, "100.00")], quatro, ParametrosConciliacao(max_titulos=3)
+        ) == []
+        assert len(conciliar_por_valor_data([_lancamento(1, "100.00")], quatro)[0].titulo_ids) == 4
+
+    def test_um_para_um_tem_prioridade(self):
+        sugestoes = conciliar_por_valor_data(
+            [_lancamento(1, "100.00"), _lancamento(2, "90.00")],
+            [_titulo(10, "100.00"), _titulo(11, "50.00"), _titulo(12, "40.00")],
+        )
+
+        assert {s.extrato_id: s.titulo_ids for s in sugestoes} == {1: [10], 2: [11, 12]}
+
+
+@pytest.fixture
+async def extrato_e_titulos(db_session: AsyncSession):
+    """Dois créditos sem documento e três contas a receber"""
+    db_session.add_all([
+        ExtratoBancario(
+            banco_codigo="001", agencia="1234", conta="12345-6", data=DIA, descricao="CIELO",
+            valor=Decimal(valor), tipo="C", conciliado=False,
+        )
+        for valor in ("150.00", "300.00")
+    ] + [
+        ContaReceber(
+            cliente_id=1, descricao=f"Venda cartão {valor}", valor_original=valor, valor_recebido=0,
+            data_emissao=DIA - timedelta(days=30), data_vencimento=DIA, status=StatusFinanceiro.PENDENTE,
+        )
+        for valor in (150, 120, 180)
+    ])
+    await db_session.commit()
+
+
+class TestConciliacaoPorValorService:
+    """Testes da conciliação por valor/data no service"""
+
+    @pytest.mark.asyncio
+    async def test_somente_sugere_sem_aplicar(self, db_session, extrato_e_titulos):
+        resultado = await ConciliacaoService(db_session).conciliar_por_valor_data("001", DIA, DIA)
+
+        assert (resultado["total_lancamentos"], resultado["total_titulos"]) == (2, 3)
+        assert [len(s["conta_receber_ids"]) for s in resultado["sugestoes"]] == [1, 2]
+        assert resultado["conciliados"] == 0
+        assert (await db_session.execute(select(ConciliacaoBancaria))).first() is None
+
+    @pytest.mark.asyncio
+    async def test_aplica_e_baixa_titulos(self, db_session, extrato_e_titulos):
+        service = ConciliacaoService(db_session)
+        resultado = await service.conciliar_por_valor_data(
+            "001", DIA, DIA, confianca_minima=0.5, aplicar=True, baixar_titulos=True
+        )
+
+        assert resultado["conciliados"] == 2
+        assert all(s["aplicada"] for s in resultado["sugestoes"])
+
+        extratos = (await db_session.execute(select(ExtratoBancario))).scalars().all()
+        assert all(e.conciliado and e.conciliacao_id for e in extratos)
+        itens = (await db_session.execute(select(ConciliacaoContaReceber))).scalars().all()
+        assert sorted(float(i.valor) for i in itens) == [120.0, 150.0, 180.0]
+
+        contas = (await db_session.execute(select(ContaReceber))).scalars().all()
+        assert {c.status for c in contas} == {StatusFinanceiro.RECEBIDA}
+        assert {c.data_recebimento for c in contas} == {DIA}
+
+        # Nova execução não encontra nada em aberto
+        resultado = await service.conciliar_por_valor_data("001", DIA, DIA, aplicar=True)
+        assert (resultado["total_lancamentos"], resultado["total_titulos"]) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_confianca_minima_filtra(self, db_session, extrato_e_titulos):
+        resultado = await ConciliacaoService(db_session).conciliar_por_valor_data(
+            "001", DIA, DIA, confianca_minima=0.95, aplicar=True
+        )
+
+        # Somente o 1:1 exato atinge 0.95; o agrupado fica para revisão manual
+        assert [s["aplicada"] for s in resultado["sugestoes"]] == [True, False]
+        assert resultado["pendentes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_baixa_rejeitada_nao_concilia(self, db_session, extrato_e_titulos, monkeypatch):
+        titulo_120 = (await db_session.execute(
+            select(ContaReceber.id).where(ContaReceber.valor_original == 120)
+        )).scalar_one()
+        get_para_baixa = ContaReceberRepository.get_para_baixa
+
+        async def recebimento_concorrente(repo, conta_ids):
+            # Outra baixa altera o saldo entre a sugestão e o lote
+            await repo.session.execute(
+                update(ContaReceber).where(ContaReceber.id == titulo_120).values(valor_recebido=10)
+            )
+            return await get_para_baixa(repo, conta_ids)
+
+        monkeypatch.setattr(ContaReceberRepository, "get_para_baixa", recebimento_concorrente)
+        resultado = await ConciliacaoService(db_session).conciliar_por_valor_data(
+            "001", DIA, DIA, confianca_minima=0.5, aplicar=True, baixar_titulos=True
+        )
+
+        # O depósito de 300 (120 + 180) não é conciliado; o de 150 sim
+        assert resultado["conciliados"] == 1
+        assert [s["aplicada"] for s in resultado["sugestoes"]] == [True, False]
+        assert [r["conta_receber_id"] for r in resultado["rejeitadas"]] == [titulo_120]
+        assert "não pode exceder" in resultado["rejeitadas"][0]["erro"]
+
+        db_session.expire_all()
+        itens = (await db_session.execute(select(ConciliacaoContaReceber))).scalars().all()
+        assert [float(i.valor) for i in itens] == [150.0]
+        contas = {
+            float(c.valor_original): c
+            for c in (await db_session.execute(select(ContaReceber))).scalars()
+        }
+        assert contas[150].status == StatusFinanceiro.RECEBIDA
+        # A baixa do outro título do grupo foi desfeita
+        assert (contas[180].status, float(contas[180].valor_recebido)) == (StatusFinanceiro.PENDENTE, 0)
+        extratos = {float(e.valor): e for e in (await db_session.execute(select(ExtratoBancario))).scalars()}
+        assert extratos[150].conciliado and not extratos[300].conciliado
@@ -0,0 +1,143 @@
+"""
+Testes da conciliação automática em lote
+
+Testa:
+- services/conciliacao_service.py - Candidatos carregados por IN (...), matching
+  em memória e gravação em lote das conciliações
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.pagamentos.models import (
+    Boleto,
+    ChavePix,
+    ConciliacaoBancaria,
+    ConfiguracaoBoleto,
+    ExtratoBancario,
+    TipoChavePix,
+    TransacaoPix,
+)
+from app.modules.pagamentos.services import conciliacao_service as modulo
+from app.modules.pagamentos.services.conciliacao_service import ConciliacaoService
+
+DIA = date(2026, 10, 15)
+
+
+def _extrato(documento, valor, conciliado=False) -> ExtratoBancario:
+    return ExtratoBancario(
+        banco_codigo="001", agencia="1234", conta="12345-6", data=DIA,
+        descricao="CREDITO", documento=documento, valor=Decimal(valor), tipo="C",
+        conciliado=conciliado,
+    )
+
+
+@pytest.fixture
+async def cobrancas(db_session: AsyncSession):
+    """Três transações PIX e dois boletos"""
+    chave = ChavePix(tipo=TipoChavePix.CNPJ, chave="12345678000190", banco="001", agencia="1234", conta="12345-6")
+    config = ConfiguracaoBoleto(
+        banco_codigo="001", banco_nome="Banco do Brasil", agencia="1234", conta="12345", conta_dv="6",
+        cedente_nome="EMPRESA TESTE LTDA", cedente_documento="12345678000190", carteira="18",
+    )
+    db_session.add_all([chave, config])
+    await db_session.flush()
+
+    pix = [
+        TransacaoPix(txid=f"TX{i:033d}", e2e_id=f"E{i:031d}", chave_pix_id=chave.id, valor=Decimal("150.00"))
+        for i in range(3)
+    ]
+    boletos = [
+        Boleto(
+            configuracao_id=config.id, nosso_numero=f"{i:020d}", numero_documento=str(i),
+            valor=Decimal("500.00"), data_vencimento=DIA, sacado_nome="CLIENTE", sacado_documento="12345678901",
+        )
+        for i in range(1, 3)
+    ]
+    db_session.add_all(pix + boletos)
+    await db_session.commit()
+    return pix, boletos
+
+
+class TestConciliacaoAutomaticaLote:
+    """Testes do matching em memória"""
+
+    @pytest.mark.asyncio
+    async def test_concilia_pix_e_boleto(self, db_session, cobrancas):
+        pix, boletos = cobrancas
+        db_session.add_all([
+            _extrato(pix[0].e2e_id, "150.00"),
+            _extrato(pix[1].e2e_id, "150.01"),           # dentro da tolerância
+            _extrato(pix[2].e2e_id, "150.02"),           # fora da tolerância
+            _extrato(boletos[0].nosso_numero, "500.00"),
+            _extrato(boletos[0].nosso_numero, "500.00"),  # boleto já usado no lote
+            _extrato("E9999", "10.00"),
+            _extrato(None, "5.00"),
+        ])
+        await db_session.commit()
+
+        resultado = await ConciliacaoService(db_session).conciliar_automaticamente("001", DIA, DIA)
+
+        assert resultado["total_lancamentos"] == 7
+        assert resultado["conciliados_automaticamente"] == 3
+        assert resultado["pendentes"] == 4
+
+        extratos = (await db_session.execute(
+            select(ExtratoBancario).order_by(ExtratoBancario.id)
+        )).scalars().all()
+        assert [e.conciliado for e in extratos] == [True, True, False, True, False, False, False]
+
+        conciliacoes = {
+            c.id: c for c in (await db_session.execute(select(ConciliacaoBancaria))).scalars()
+        }
+        assert conciliacoes[extratos[0].conciliacao_id].transacao_pix_id == pix[0].id
+        assert conciliacoes[extratos[1].conciliacao_id].diferenca == Decimal("0.01")
+        assert conciliacoes[extratos[3].conciliacao_id].boleto_id == boletos[0].id
+        assert all(c.automatica for c in conciliacoes.values())
+
+    @pytest.mark.asyncio
+    async def test_nao_reconcilia_transacao_ja_conciliada(self, db_session, cobrancas):
+        pix, _ = cobrancas
+        db_session.add(_extrato(pix[0].e2e_id, "150.00"))
+        await db_session.commit()
+        service = ConciliacaoService(db_session)
+        await service.conciliar_automaticamente("001", DIA, DIA)
+
+        # Lançamento duplicado importado depois não usa a mesma transação
+        db_session.add(_extrato(pix[0].e2e_id, "150.00"))
+        await db_session.commit()
+        resultado = await service.conciliar_automaticamente("001", DIA, DIA)
+
+        assert (resultado["total_lancamentos"], resultado["conciliados_automaticamente"]) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_consultas_independem_do_numero_de_lancamentos(
+        self, db_session, cobrancas, monkeypatch
+    ):
+        """Candidatos e escrita em lotes: nada de uma consulta por lançamento"""
+        monkeypatch.setattr(modulo, "LOTE_CONCILIACAO", 2)
+        pix, boletos = cobrancas
+        db_session.add_all(
+            [_extrato(p.e2e_id, "150.00") for p in pix]
+            + [_extrato(b.nosso_numero, "500.00") for b in boletos]
+            + [_extrato(f"E{i:031d}", "1.00") for i in range(100, 140)]
+        )
+        await db_session.commit()
+
+        comandos = []
+        engine = db_session.bind.sync_engine
+        contar = lambda *args: comandos.append(args[2].split()[0])  # noqa: E731
+        event.listen(engine, "before_cursor_execute", contar)
+        try:
+            resultado = await ConciliacaoService(db_session).conciliar_automaticamente("001", DIA, DIA)
+        finally:
+            event.remove(engine, "before_cursor_execute", contar)
+
+        assert resultado["conciliados_automaticamente"] == 5
+        # 1 SELECT de lançamentos + 22 lotes de PIX + 1 de boletos; 3 lotes de INSERT e UPDATE
+        assert comandos.count("SELECT") == 1 + 22 + 1
+        assert comandos.count("INSERT") == 3
+        assert comandos.count("UPDATE") == 3
@@ -0,0 +1,147 @@
+"""
+Testes do arquivamento do ledger de movimentações de estoque
+
+Testa:
+- estoque/arquivamento_service.py - Arquivamento por período e snapshots
+- estoque/repository.py - Saldo calculado a partir de snapshot + ledger
+"""
+import csv
+import gzip
+import pytest
+from datetime import datetime
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.categorias.models import Categoria
+from app.modules.produtos.models import Produto
+from app.modules.estoque.models import (
+    MovimentacaoEstoque,
+    SnapshotSaldoEstoque,
+    TipoMovimentacao,
+)
+from app.modules.estoque.repository import MovimentacaoEstoqueRepository
+from app.modules.estoque.arquivamento_service import ArquivamentoEstoqueService
+from app.core.exceptions import BusinessRuleException, DuplicateException
+
+
+@pytest.fixture
+async def produto(db_session: AsyncSession) -> Produto:
+    """Produto com movimentações em três meses distintos"""
+    categoria = Categoria(nome="Cimentos", ativa=True)
+    db_session.add(categoria)
+    await db_session.flush()
+
+    produto = Produto(
+        codigo_barras="7891000000001",
+        descricao="Cimento CP-II 50kg",
+        categoria_id=categoria.id,
+        preco_custo=25,
+        preco_venda=35,
+        estoque_atual=0,
+        estoque_minimo=0,
+    )
+    db_session.add(produto)
+    await db_session.flush()
+
+    movimentos = [
+        (TipoMovimentacao.ENTRADA, 100, datetime(2024, 1, 5)),
+        (TipoMovimentacao.SAIDA, 30, datetime(2024, 1, 20)),
+        (TipoMovimentacao.AJUSTE, -5, datetime(2024, 1, 31, 23, 59)),
+        (TipoMovimentacao.ENTRADA, 50, datetime(2024, 2, 10)),
+        (TipoMovimentacao.DEVOLUCAO, 2, datetime(2024, 2, 11)),
+        (TipoMovimentacao.SAIDA, 10, datetime(2024, 3, 1)),
+    ]
+    for tipo, quantidade, data in movimentos:
+        db_session.add(
+            MovimentacaoEstoque(
+                produto_id=produto.id,
+                tipo=tipo,
+                quantidade=quantidade,
+                custo_unitario=25,
+                valor_total=abs(quantidade) * 25,
+                created_at=data,
+            )
+        )
+    await db_session.commit()
+    return produto
+
+
+class TestArquivamentoEstoque:
+    """Testes do arquivamento de períodos"""
+
+    @pytest.mark.asyncio
+    async def test_arquivar_periodo_mantem_saldo(self, db_session, produto, tmp_path):
+        """Saldo deve ser o mesmo antes e depois de arquivar"""
+        repository = MovimentacaoEstoqueRepository(db_session)
+        saldo_antes = await repository.get_saldo_atual(produto.id)
+        assert saldo_antes == 107.0
+
+        service = ArquivamentoEstoqueService(db_session, diretorio=str(tmp_path))
+        arquivo = await service.arquivar_periodo(2024, 1)
+        await db_session.commit()
+
+        assert arquivo.total_registros == 3
+        assert await repository.get_saldo_atual(produto.id) == saldo_antes
+
+        snapshot = await repository.get_ultimo_snapshot(produto.id)
+        assert float(snapshot.saldo_acumulado) == 65.0
+        assert float(snapshot.quantidade_ajustes) == -5.0
+
+        restantes = await db_session.execute(select(func.count(MovimentacaoEstoque.id)))
+        assert restantes.scalar_one() == 3
+
+    @pytest.mark.asyncio
+    async def test_arquivo_csv_contem_movimentacoes(self, db_session, produto, tmp_path):
+        """Arquivo gzip deve conter cabeçalho e todas as linhas do período"""
+        service = ArquivamentoEstoqueService(db_session, diretorio=str(tmp_path))
+        arquivo = await service.arquivar_periodo(2024, 1)
+
+        with gzip.open(arquivo.caminho_arquivo, "rt", encoding="utf-8") as f:
+            linhas = list(csv.DictReader(f))
+
+        assert len(linhas) == 3
+        assert [l["tipo"] for l in linhas] == ["ENTRADA", "SAIDA", "AJUSTE"]
+        assert len(arquivo.checksum_sha256) == 64
+
+    @pytest.mark.asyncio
+    async def test_arquivar_ate_acumula_snapshots(self, db_session, produto, tmp_path):
+        """Arquivamento sequencial deve acumular saldo entre snapshots"""
+        service = ArquivamentoEstoqueService(db_session, diretorio=str(tmp_path))
+        arquivados = await service.arquivar_ate(2024, 3)
+        await db_session.commit()
+
+        assert [a.periodo.month for a in arquivados] == [1, 2, 3]
+
+        snapshots = await db_session.execute(
+            select(SnapshotSaldoEstoque.saldo_acumulado).order_by(SnapshotSaldoEstoque.periodo)
+        )
+        assert [float(s) for s in snapshots.scalars()] == [65.0, 117.0, 107.0]
+
+        repository = MovimentacaoEstoqueRepository(db_session)
+        assert await repository.get_saldo_atual(produto.id) == 107.0
+
+    @pytest.mark.asyncio
+    async def test_arquivar_fora_de_ordem(self, db_session, produto, tmp_path):
+        """Não deve arquivar mês com movimentações anteriores ainda no ledger"""
+        service = ArquivamentoEstoqueService(db_session, diretorio=str(tmp_path))
+
+        with pytest.raises(BusinessRuleException):
+            await service.arquivar_periodo(2024, 2)
+
+    @pytest.mark.asyncio
+    async def test_arquivar_periodo_duplicado(self, db_session, produto, tmp_path):
+        """Não deve arquivar o mesmo período duas vezes"""
+        service = ArquivamentoEstoqueService(db_session, diretorio=str(tmp_path))
+        await service.arquivar_periodo(2024, 1)
+
+        with pytest.raises(DuplicateException):
+            await service.arquivar_periodo(2024, 1)
+
+    @pytest.mark.asyncio
+    async def test_arquivar_periodo_aberto(self, db_session, tmp_path):
+        """Não deve arquivar o mês corrente"""
+        hoje = datetime.utcnow()
+        service = ArquivamentoEstoqueService(db_session, diretorio=str(tmp_path))
+
+        with pytest.raises(BusinessRuleException):
+            await service.arquivar_periodo(hoje.year, hoje.month)
@@ -0,0 +1,197 @@
+"""
+Testes da importação de extrato em streaming
+
+Testa:
+- services/extrato_parser.py - Leitura de CSV/OFX em blocos e hash do lançamento
+- services/conciliacao_service.py - Gravação em lotes e reimportação sem duplicar
+- router.py - Upload do arquivo
+"""
+import base64
+import io
+import threading
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.pagamentos.models import ExtratoBancario
+from app.modules.pagamentos.schemas import ImportCSVRequest
+from app.modules.pagamentos.services import conciliacao_service as modulo
+from app.modules.pagamentos.services import extrato_parser
+from app.modules.pagamentos.services.conciliacao_service import ConciliacaoService
+from app.modules.pagamentos.services.extrato_parser import (
+    ErroLeitura,
+    LinhaExtrato,
+    hash_lancamento,
+    ler_csv,
+    ler_ofx,
+    linhas_do_arquivo,
+)
+
+CSV_JANEIRO = """data,descricao,documento,valor,tipo,saldo
+2026-01-10,PIX RECEBIDO,E123,150.00,C,1150.00
+2026-01-10,TARIFA,,5.00,D,
+2026-01-10,TARIFA,,5.00,D,
+2026-01-11,BOLETO PAGO,00012345678901234567,"1000,50",C,
+invalido,ERRO,,ABC,C,
+"""
+
+CSV_JANEIRO_FEVEREIRO = """data,descricao,documento,valor,tipo,saldo
+2026-01-11,BOLETO PAGO,00012345678901234567,1000.50,C,
+2026-02-01,PIX RECEBIDO,E456,80.00,C,
+"""
+
+OFX = """OFXHEADER:100
+DATA:OFXSGML
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20260115120000[-3:BRT]
+<TRNAMT>250.00
+<FITID>202601150001
+<CHECKNUM>DOC1
+<MEMO>TED RECEBIDA
+</STMTTRN>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20260116<TRNAMT>-12,90<FITID>202601160002<NAME>TARIFA PACOTE</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<TRNAMT>10.00
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+def _arquivo(conteudo: str, encoding: str = "utf-8") -> io.BytesIO:
+    return io.BytesIO(conteudo.encode(encoding))
+
+
+class TestParser:
+    """Testes dos leitores em streaming"""
+
+    def test_linhas_atravessando_blocos(self, monkeypatch):
+        monkeypatch.setattr(extrato_parser, "TAMANHO_BLOCO", 7)
+        conteudo = "descrição um\r\nlinha dois\nçã\núltima sem quebra"
+
+        linhas = list(linhas_do_arquivo(_arquivo(conteudo)))
+
+        assert "".join(linhas) == conteudo
+        assert [linha.rstrip("\r\n") for linha in linhas] == conteudo.splitlines()
+
+    def test_csv(self):
+        itens = list(ler_csv(linhas_do_arquivo(_arquivo(CSV_JANEIRO))))
+
+        assert len(itens) == 5
+        assert itens[0] == LinhaExtrato(
+            1, date(2026, 1, 10), "PIX RECEBIDO", "E123", Decimal("150.00"), "C", Decimal("1150.00")
+        )
+        assert itens[1].documento is None and itens[1].saldo is None
+        assert itens[3].valor == Decimal("1000.50")
+        assert isinstance(itens[4], ErroLeitura) and itens[4].linha == 5
+
+    def test_ofx(self):
+        itens = list(ler_ofx(linhas_do_arquivo(_arquivo(OFX))))
+
+        assert itens[0] == LinhaExtrato(
+            1, date(2026, 1, 15), "TED RECEBIDA", "DOC1", Decimal("250.00"), "C",
+            identificador="202601150001",
+        )
+        assert (itens[1].tipo, itens[1].valor, itens[1].descricao) == ("D", Decimal("12.90"), "TARIFA PACOTE")
+        assert itens[2] == ErroLeitura(3, "Campo DTPOSTED faltando")
+
+    def test_hash_usa_fitid_e_ocorrencia(self):
+        linha = LinhaExtrato(1, date(2026, 1, 10), "TARIFA", None, Decimal("5.00"), "D")
+
+        assert hash_lancamento("001", "1234", "1", linha) != hash_lancamento("001", "1234", "1", linha, 2)
+        assert hash_lancamento("001", "1234", "1", linha) != hash_lancamento("001", "1234", "2", linha)
+        # Com FITID, descrição e linha no arquivo não importam
+        ofx_a = LinhaExtrato(1, date(2026, 1, 10), "TED", None, Decimal("5"), "C", identificador="X1")
+        ofx_b = LinhaExtrato(9, date(2026, 1, 10), "TED RECEBIDA", None, Decimal("5"), "C", identificador="X1")
+        assert hash_lancamento("001", "1234", "1", ofx_a) == hash_lancamento("001", "1234", "1", ofx_b)
+
+
+class TestImportacaoService:
+    """Testes da gravação em lotes"""
+
+    @pytest.mark.asyncio
+    async def test_reimportacao_sobreposta_nao_duplica(self, db_session: AsyncSession, monkeypatch):
+        monkeypatch.setattr(modulo, "LOTE_IMPORTACAO", 2)
+        service = ConciliacaoService(db_session)
+        progresso = []
+
+        async def registrar(contadores):
+            progresso.append(contadores)
+
+        primeiro = await service.importar_extrato(
+            _arquivo(CSV_JANEIRO), "csv", "001", "1234", "12345-6", ao_progredir=registrar
+        )
+        assert (primeiro["lancamentos_criados"], primeiro["duplicados"], primeiro["total_erros"]) == (4, 0, 1)
+        assert primeiro["erros"] == ["Linha 5: time data 'invalido' does not match format '%Y-%m-%d'"]
+        assert [p["lancamentos_criados"] for p in progresso] == [2, 4]
+
+        segundo = await service.importar_extrato(
+            _arquivo(CSV_JANEIRO_FEVEREIRO), "csv", "001", "1234", "12345-6"
+        )
+        assert (segundo["lancamentos_criados"], segundo["duplicados"]) == (1, 1)
+
+        extratos = (await db_session.execute(
+            select(ExtratoBancario).order_by(ExtratoBancario.id)
+        )).scalars().all()
+        assert [e.descricao for e in extratos] == [
+            "PIX RECEBIDO", "TARIFA", "TARIFA", "BOLETO PAGO", "PIX RECEBIDO"
+        ]
+        assert len({e.hash_conteudo for e in extratos}) == 5
+
+    @pytest.mark.asyncio
+    async def test_ofx_e_csv_base64(self, db_session: AsyncSession):
+        service = ConciliacaoService(db_session)
+
+        resultado = await service.importar_extrato(_arquivo(OFX), "ofx", "001", "1234", "12345-6")
+        assert (resultado["lancamentos_criados"], resultado["total_erros"]) == (2, 1)
+        resultado = await service.importar_extrato(_arquivo(OFX), "ofx", "001", "1234", "12345-6")
+        assert (resultado["lancamentos_criados"], resultado["duplicados"]) == (0, 2)
+
+        resultado = await service.importar_extrato_csv(ImportCSVRequest(
+            banco_codigo="001", agencia="1234", conta="12345-6",
+            arquivo_base64=base64.b64encode(CSV_JANEIRO.encode("latin-1")).decode(),
+            encoding="latin-1",
+        ))
+        assert resultado["lancamentos_criados"] == 4
+
+        total = (await db_session.execute(select(func.count(ExtratoBancario.id)))).scalar_one()
+        assert total == 6
+
+    @pytest.mark.asyncio
+    async def test_leitura_fora_do_event_loop(self, db_session: AsyncSession):
+        """O upload (arquivo em disco) não é lido na thread do event loop"""
+        threads = set()
+
+        class ArquivoUpload(io.BytesIO):
+            def read(self, *args):
+                threads.add(threading.get_ident())
+                return super().read(*args)
+
+        arquivo = ArquivoUpload(CSV_JANEIRO.encode("latin-1"))
+        resultado = await ConciliacaoService(db_session).importar_extrato(
+            arquivo, "csv", "001", "1234", "12345-6", encoding="latin-1"
+        )
+
+        assert resultado["lancamentos_criados"] == 4
+        assert threads and threading.get_ident() not in threads
+
+
+class TestImportacaoRouter:
+    """Testes do upload de extrato"""
+
+    @pytest.mark.asyncio
+    async def test_upload_ofx(self, client, auth_headers):
+        response = await client.post(
+            "/api/v1/pagamentos/conciliacao/importar-extrato",
+            files={"arquivo": ("extrato.ofx", OFX.encode(), "application/x-ofx")},
+            data={"banco_codigo": "001", "agencia": "1234", "conta": "12345-6", "formato": "ofx"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["lancamentos_criados"] == 2
@@ -26,6 +26,7 @@ from app.modules.financeiro.schemas import (
     ContaReceberUpdate,
     BaixaRecebimentoCreate,
 )
+from app.core.cache import cache_service
 from app.core.exceptions import (
     NotFoundException,
     ValidationException,
@@ -302,34 +303,112 @@ class TestFinanceiroServiceFluxoCaixa:
     """Testes de fluxo de caixa"""
 
     @pytest.mark.asyncio
-    async def test_get_fluxo_caixa_sucesso(self, financeiro_service, mock_conta_pagar, mock_conta_receber):
+    async def test_get_fluxo_caixa_sucesso(self, financeiro_service, mock_session):
         """Deve calcular fluxo de caixa com sucesso"""
-        # Mock contas a pagar pendentes
-        mock_conta_pagar.valor_pago = Decimal("0.00")
-        mock_conta_pagar.status = StatusFinanceiro.PENDENTE
+        mock_session.sync_session = Mock(info={})
+        await cache_service.delete("financeiro:fluxo_caixa")
 
-        # Mock contas a receber pendentes
-        mock_conta_receber.valor_recebido = Decimal("0.00")
-        mock_conta_receber.status = StatusFinanceiro.PENDENTE
-
-        # Mock get_all para contas pendentes
-        financeiro_service.conta_pagar_repo.get_all.return_value = [mock_conta_pagar]
-        financeiro_service.conta_receber_repo.get_all.return_value = [mock_conta_receber]
-
-        # Mock get_vencidas
-        financeiro_service.conta_pagar_repo.get_vencidas.return_value = []
-        financeiro_service.conta_receber_repo.get_vencidas.return_value = []
+        financeiro_service.conta_pagar_repo.calcular_resumo_fluxo.return_value = {
+            "pendente": 500.0, "pago": 120.0, "vencidas": 1, "valor_vencido": 200.0,
+        }
+        financeiro_service.conta_receber_repo.calcular_resumo_fluxo.return_value = {
+            "pendente": 1000.0, "recebido": 300.0, "vencidas": 0, "valor_vencido": 0.0,
+        }
 
         result = await financeiro_service.get_fluxo_caixa()
 
-        # Verificar que os métodos foram chamados
-        assert financeiro_service.conta_pagar_repo.get_all.called
-        assert financeiro_service.conta_receber_repo.get_all.called
+        # Verificar que os totais vieram da agregação no banco
+        financeiro_service.conta_pagar_repo.calcular_resumo_fluxo.assert_called_once()
+        financeiro_service.conta_receber_repo.calcular_resumo_fluxo.assert_called_once()
+        financeiro_service.conta_pagar_repo.get_all.assert_not_called()
 
         # Verificar valores calculados
         assert result.total_a_pagar == 500.0  # valor_original - valor_pago
         assert result.total_a_receber == 1000.0  # valor_original - valor_recebido
         assert result.saldo_projetado == 500.0  # 1000 - 500
+        assert result.total_pago == 120.0
+        assert result.contas_vencidas_pagar == 1
+
+        # Segunda chamada sem escritas vem do cache
+        await financeiro_service.get_fluxo_caixa()
+        financeiro_service.conta_pagar_repo.calcular_resumo_fluxo.assert_called_once()
+
+
+class TestFluxoCaixaAgregado:
+    """Testes da agregação e do cache do fluxo de caixa com banco"""
+
+    @pytest.fixture(autouse=True)
+    async def limpar_cache(self):
+        await cache_service.delete("financeiro:fluxo_caixa")
+
+    @staticmethod
+    def _conta_pagar(valor: float, vencimento: date, **kwargs) -> ContaPagar:
+        return ContaPagar(
+            fornecedor_id=1, descricao="Conta", valor_original=valor, data_emissao=vencimento - timedelta(days=30),
+            data_vencimento=vencimento, **kwargs,
+        )
+
+    @staticmethod
+    def _conta_receber(valor: float, vencimento: date, **kwargs) -> ContaReceber:
+        return ContaReceber(
+            cliente_id=1, descricao="Conta", valor_original=valor, data_emissao=vencimento - timedelta(days=30),
+            data_vencimento=vencimento, **kwargs,
+        )
+
+    @pytest.mark.asyncio
+    async def test_totais_por_agregacao(self, db_session):
+        hoje = date.today()
+        db_session.add_all([
+            self._conta_pagar(100, hoje + timedelta(days=5), status=StatusFinanceiro.PENDENTE, valor_pago=40),
+            self._conta_pagar(50, hoje - timedelta(days=2), status=StatusFinanceiro.PENDENTE, valor_pago=0),
+            self._conta_pagar(70, hoje - timedelta(days=9), status=StatusFinanceiro.ATRASADA, valor_pago=10),
+            self._conta_pagar(80, hoje - timedelta(days=9), status=StatusFinanceiro.PAGA, valor_pago=80),
+            self._conta_pagar(999, hoje - timedelta(days=9), status=StatusFinanceiro.CANCELADA, valor_pago=0),
+            self._conta_receber(300, hoje + timedelta(days=1), status=StatusFinanceiro.PENDENTE, valor_recebido=0),
+            self._conta_receber(120, hoje - timedelta(days=1), status=StatusFinanceiro.RECEBIDA, valor_recebido=120),
+        ])
+        await db_session.commit()
+
+        fluxo = await FinanceiroService(db_session).get_fluxo_caixa()
+
+        assert fluxo.total_a_pagar == 110.0  # só PENDENTE: 60 + 50
+        assert fluxo.total_a_receber == 300.0
+        assert fluxo.saldo_projetado == 190.0
+        assert fluxo.total_pago == 80.0
+        assert fluxo.total_recebido == 120.0
+        assert fluxo.contas_vencidas_pagar == 2
+        assert fluxo.valor_vencido_pagar == 110.0  # 50 + 60
+        assert fluxo.contas_vencidas_receber == 0
+
+    @pytest.mark.asyncio
+    async def test_cache_invalidado_por_escritas(self, db_session):
+        hoje = date.today()
+        service = FinanceiroService(db_session)
+        conta = await service.criar_conta_pagar(ContaPagarCreate(
+            fornecedor_id=1, descricao="Aluguel", valor_original=Decimal("1000.00"),
+            data_emissao=hoje, data_vencimento=hoje + timedelta(days=10),
+        ))
+
+        # Escrita pendente na sessão: calcula sem usar o cache
+        assert (await service.get_fluxo_caixa()).total_a_pagar == 1000.0
+        await db_session.commit()
+        assert (await service.get_fluxo_caixa()).total_a_pagar == 1000.0
+
+        with patch.object(service.conta_pagar_repo, "calcular_resumo_fluxo") as calcular:
+            assert (await service.get_fluxo_caixa()).total_a_pagar == 1000.0
+            calcular.assert_not_called()
+
+        # Pagamento parcial gravado pelo ORM
+        conta_orm = await db_session.get(ContaPagar, conta.id)
+        conta_orm.valor_pago = Decimal("400.00")
+        conta_orm.data_pagamento = hoje
+        await db_session.commit()
+        fluxo = await service.get_fluxo_caixa()
+        assert fluxo.total_a_pagar == 600.0
+
+        await service.cancelar_conta_pagar(conta.id)
+        await db_session.commit()
+        assert (await service.get_fluxo_caixa()).total_a_pagar == 0.0
 
 
 # ========== Testes ContaPagarRepository ==========
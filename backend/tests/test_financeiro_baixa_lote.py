@@ -0,0 +1,165 @@
+"""
+Testes da baixa em lote de contas a pagar e a receber
+
+Testa:
+- financeiro/repository.py - Leitura do lote em uma consulta e UPDATE executemany
+- financeiro/service.py - Validação por item, status e projeção diária
+- financeiro/router.py - POST /contas-pagar/baixa-lote e /contas-receber/baixa-lote
+"""
+from datetime import date, timedelta
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache_service
+from app.modules.financeiro.models import ContaPagar, ContaReceber, FluxoCaixaDiario, StatusFinanceiro
+from app.modules.financeiro.schemas import BaixaLoteCreate, BaixaRecebimentoCreate
+from app.modules.financeiro.service import FinanceiroService
+
+HOJE = date.today()
+
+
+@pytest.fixture
+async def recebiveis(db_session: AsyncSession) -> list[ContaReceber]:
+    """Quatro títulos de 100: três pendentes e um cancelado"""
+    contas = [
+        ContaReceber(
+            cliente_id=1, descricao=f"Boleto {i}", valor_original=100, valor_recebido=0,
+            data_emissao=HOJE - timedelta(days=30), data_vencimento=HOJE + timedelta(days=5),
+            status=StatusFinanceiro.CANCELADA if i == 3 else StatusFinanceiro.PENDENTE,
+        )
+        for i in range(4)
+    ]
+    db_session.add_all(contas)
+    await db_session.commit()
+    return contas
+
+
+async def _estado(db_session: AsyncSession, modelo, conta_id: int):
+    liquidado = modelo.valor_recebido if modelo is ContaReceber else modelo.valor_pago
+    result = await db_session.execute(
+        select(modelo.status, liquidado, modelo.observacoes).where(modelo.id == conta_id)
+    )
+    status, valor, observacoes = result.one()
+    return status, float(valor), observacoes
+
+
+class TestBaixaLoteService:
+    """Testes do service de baixa em lote"""
+
+    @pytest.mark.asyncio
+    async def test_recebimentos_com_resultado_por_item(self, db_session, recebiveis):
+        ids = [c.id for c in recebiveis]
+        resposta = await FinanceiroService(db_session).baixar_recebimentos_lote(BaixaLoteCreate(itens=[
+            {"conta_id": ids[0], "valor": 100, "data": HOJE, "forma_pagamento": "boleto"},
+            {"conta_id": ids[1], "valor": 40, "data": HOJE, "observacoes": "Parcial"},
+            {"conta_id": ids[2], "valor": 100.01, "data": HOJE},
+            {"conta_id": ids[3], "valor": 10, "data": HOJE},
+            {"conta_id": 99999, "valor": 10, "data": HOJE},
+        ]))
+        await db_session.commit()
+
+        assert (resposta.total, resposta.baixadas, resposta.rejeitadas) == (5, 2, 3)
+        assert [r.sucesso for r in resposta.resultados] == [True, True, False, False, False]
+        assert resposta.resultados[0].status == "RECEBIDA"
+        assert resposta.resultados[1].valor_liquidado == 40.0
+        assert "não pode exceder valor original (R$ 100.00)" in resposta.resultados[2].erro
+        assert resposta.resultados[3].erro == "Não é possível receber conta cancelada"
+        assert resposta.resultados[4].erro == "Conta a receber 99999 não encontrada"
+
+        assert await _estado(db_session, ContaReceber, ids[0]) == (StatusFinanceiro.RECEBIDA, 100.0, "[BOLETO]")
+        assert await _estado(db_session, ContaReceber, ids[1]) == (StatusFinanceiro.PENDENTE, 40.0, "Parcial")
+        assert await _estado(db_session, ContaReceber, ids[2]) == (StatusFinanceiro.PENDENTE, 0.0, None)
+
+    @pytest.mark.asyncio
+    async def test_projecao_e_resumo_atualizados(self, db_session, recebiveis):
+        await cache_service.delete("financeiro:fluxo_caixa")
+        service = FinanceiroService(db_session)
+        assert (await service.get_fluxo_caixa()).total_a_receber == 300.0
+
+        await service.baixar_recebimentos_lote(BaixaLoteCreate(itens=[
+            {"conta_id": recebiveis[0].id, "valor": 100, "data": HOJE},
+            {"conta_id": recebiveis[1].id, "valor": 30, "data": HOJE},
+        ]))
+        await db_session.commit()
+
+        dias = {
+            d.data: d for d in (await db_session.execute(select(FluxoCaixaDiario))).scalars()
+        }
+        assert float(dias[HOJE].realizado_entradas) == 130.0
+        assert float(dias[HOJE + timedelta(days=5)].previsto_entradas) == 170.0
+
+        fluxo = await service.get_fluxo_caixa()
+        assert fluxo.total_a_receber == 170.0
+        assert fluxo.total_recebido == 100.0
+
+    @pytest.mark.asyncio
+    async def test_pagamento_parcial_mantem_atrasada(self, db_session):
+        conta = ContaPagar(
+            fornecedor_id=1, descricao="Frete", valor_original=200, valor_pago=0,
+            data_emissao=HOJE - timedelta(days=40), data_vencimento=HOJE - timedelta(days=10),
+            status=StatusFinanceiro.ATRASADA, observacoes="NF 123",
+        )
+        db_session.add(conta)
+        await db_session.commit()
+
+        resposta = await FinanceiroService(db_session).baixar_pagamentos_lote(BaixaLoteCreate(itens=[
+            {"conta_id": conta.id, "valor": 50, "data": HOJE, "forma_pagamento": "PIX"},
+        ]))
+        await db_session.commit()
+
+        assert resposta.resultados[0].status == "ATRASADA"
+        assert await _estado(db_session, ContaPagar, conta.id) == (
+            StatusFinanceiro.ATRASADA, 50.0, "NF 123\n[PIX]",
+        )
+
+        # Conta já quitada é rejeitada
+        await FinanceiroService(db_session).baixar_pagamentos_lote(BaixaLoteCreate(itens=[
+            {"conta_id": conta.id, "valor": 150, "data": HOJE},
+        ]))
+        await db_session.commit()
+        repetida = await FinanceiroService(db_session).baixar_pagamentos_lote(BaixaLoteCreate(itens=[
+            {"conta_id": conta.id, "valor": 1, "data": HOJE},
+        ]))
+        assert repetida.resultados[0].erro == "Conta já está com status 'PAGA'"
+
+    @pytest.mark.asyncio
+    async def test_baixa_individual_com_valores_do_banco(self, db_session, recebiveis):
+        """Valores Numeric (Decimal) do banco somados ao float do schema"""
+        resposta = await FinanceiroService(db_session).baixar_recebimento(
+            recebiveis[0].id, BaixaRecebimentoCreate(valor_recebido=60.5, data_recebimento=HOJE),
+        )
+        await db_session.commit()
+        assert resposta.valor_recebido == 60.5
+        assert resposta.status == "PENDENTE"
+
+    def test_conta_repetida_no_lote(self):
+        with pytest.raises(ValidationError):
+            BaixaLoteCreate(itens=[
+                {"conta_id": 1, "valor": 10, "data": HOJE},
+                {"conta_id": 1, "valor": 5, "data": HOJE},
+            ])
+
+
+class TestBaixaLoteRouter:
+    """Testes dos endpoints de baixa em lote"""
+
+    @pytest.mark.asyncio
+    async def test_endpoint_baixa_lote_receber(self, client, async_db_session):
+        conta = ContaReceber(
+            cliente_id=1, descricao="Cartão", valor_original=80, valor_recebido=0,
+            data_emissao=HOJE, data_vencimento=HOJE, status=StatusFinanceiro.PENDENTE,
+        )
+        async_db_session.add(conta)
+        await async_db_session.commit()
+
+        response = await client.post("/api/v1/financeiro/contas-receber/baixa-lote", json={
+            "itens": [{"conta_id": conta.id, "valor": 80, "data": HOJE.isoformat(), "forma_pagamento": "CARTAO"}],
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["baixadas"] == 1
+        assert data["resultados"][0]["status"] == "RECEBIDA"
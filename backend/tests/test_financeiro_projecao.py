@@ -0,0 +1,211 @@
+"""
+Testes da projeção diária do fluxo de caixa
+
+Testa:
+- financeiro/projecao.py - Manutenção incremental da tabela fluxo_caixa_diario
+- financeiro/service.py - Série diária, saldo acumulado e detalhe paginado
+- financeiro/router.py - GET /financeiro/fluxo-caixa/periodo
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationException
+from app.modules.financeiro.models import ContaPagar, ContaReceber, FluxoCaixaDiario, StatusFinanceiro
+from app.modules.financeiro.schemas import (
+    BaixaLoteCreate, BaixaRecebimentoCreate, ContaPagarCreate, ContaReceberCreate, ItemBaixaLote,
+)
+from app.modules.financeiro.service import FinanceiroService
+
+DIA = date(2026, 11, 10)
+
+
+async def _projecao(db_session: AsyncSession) -> dict:
+    result = await db_session.execute(select(FluxoCaixaDiario).order_by(FluxoCaixaDiario.data))
+    return {
+        d.data: (
+            float(d.previsto_entradas), float(d.previsto_saidas),
+            float(d.realizado_entradas), float(d.realizado_saidas),
+        )
+        for d in result.scalars()
+        if any((d.previsto_entradas, d.previsto_saidas, d.realizado_entradas, d.realizado_saidas))
+    }
+
+
+def _receber(valor: float, vencimento: date) -> ContaReceberCreate:
+    return ContaReceberCreate(
+        cliente_id=1, descricao="Venda a prazo", valor_original=valor,
+        data_emissao=vencimento - timedelta(days=30), data_vencimento=vencimento,
+    )
+
+
+def _pagar(valor: float, vencimento: date) -> ContaPagarCreate:
+    return ContaPagarCreate(
+        fornecedor_id=1, descricao="Compra de cimento", valor_original=valor,
+        data_emissao=vencimento - timedelta(days=30), data_vencimento=vencimento,
+    )
+
+
+class TestProjecaoIncremental:
+    """Testes da manutenção da tabela pelos eventos do ORM"""
+
+    @pytest.mark.asyncio
+    async def test_criacao_baixa_e_cancelamento(self, db_session):
+        service = FinanceiroService(db_session)
+        receber = await service.criar_conta_receber(_receber(300, DIA))
+        pagar = await service.criar_conta_pagar(_pagar(120, DIA))
+        await service.criar_conta_pagar(_pagar(80, DIA + timedelta(days=1)))
+        await db_session.commit()
+
+        assert await _projecao(db_session) == {
+            DIA: (300.0, 120.0, 0.0, 0.0),
+            DIA + timedelta(days=1): (0.0, 80.0, 0.0, 0.0),
+        }
+
+        # Recebimento parcial antecipado: sai do previsto, entra no realizado
+        conta = await db_session.get(ContaReceber, receber.id)
+        conta.valor_recebido = Decimal("100.00")
+        conta.data_recebimento = DIA - timedelta(days=3)
+        await db_session.commit()
+
+        assert await _projecao(db_session) == {
+            DIA - timedelta(days=3): (0.0, 0.0, 100.0, 0.0),
+            DIA: (200.0, 120.0, 0.0, 0.0),
+            DIA + timedelta(days=1): (0.0, 80.0, 0.0, 0.0),
+        }
+
+        # Cancelamento remove o previsto; o já recebido continua realizado
+        await service.cancelar_conta_receber(receber.id)
+        await service.cancelar_conta_pagar(pagar.id)
+        await db_session.commit()
+
+        assert await _projecao(db_session) == {
+            DIA - timedelta(days=3): (0.0, 0.0, 100.0, 0.0),
+            DIA + timedelta(days=1): (0.0, 80.0, 0.0, 0.0),
+        }
+
+    @pytest.mark.asyncio
+    async def test_baixas_parciais_em_dias_diferentes(self, db_session):
+        service = FinanceiroService(db_session)
+        individual = await service.criar_conta_receber(_receber(300, DIA))
+        em_lote = await service.criar_conta_receber(_receber(200, DIA))
+        await db_session.commit()
+
+        for conta_id, valor in [(individual.id, 100), (em_lote.id, 50)]:
+            await service.baixar_recebimento(
+                conta_id, BaixaRecebimentoCreate(valor_recebido=valor, data_recebimento=DIA - timedelta(days=3))
+            )
+        await db_session.commit()
+
+        # Segunda baixa: só o incremento entra no novo dia
+        await service.baixar_recebimento(
+            individual.id, BaixaRecebimentoCreate(valor_recebido=150, data_recebimento=DIA - timedelta(days=1))
+        )
+        resposta = await service.baixar_recebimentos_lote(BaixaLoteCreate(itens=[
+            ItemBaixaLote(conta_id=em_lote.id, valor=30, data=DIA - timedelta(days=1)),
+        ]))
+        await db_session.commit()
+
+        assert resposta.baixadas == 1
+        assert await _projecao(db_session) == {
+            DIA - timedelta(days=3): (0.0, 0.0, 150.0, 0.0),
+            DIA - timedelta(days=1): (0.0, 0.0, 180.0, 0.0),
+            DIA: (170.0, 0.0, 0.0, 0.0),
+        }
+
+    @pytest.mark.asyncio
+    async def test_alteracao_de_vencimento_e_remocao(self, db_session):
+        conta = ContaPagar(
+            fornecedor_id=1, descricao="Frete", valor_original=50, valor_pago=0,
+            data_emissao=DIA, data_vencimento=DIA, status=StatusFinanceiro.PENDENTE,
+        )
+        db_session.add(conta)
+        await db_session.commit()
+
+        conta.data_vencimento = DIA + timedelta(days=7)
+        conta.valor_original = Decimal("65.00")
+        await db_session.commit()
+        assert await _projecao(db_session) == {DIA + timedelta(days=7): (0.0, 65.0, 0.0, 0.0)}
+
+        await db_session.delete(conta)
+        await db_session.commit()
+        assert await _projecao(db_session) == {}
+
+    @pytest.mark.asyncio
+    async def test_rollback_desfaz_projecao(self, db_session):
+        await FinanceiroService(db_session).criar_conta_receber(_receber(90, DIA))
+        await db_session.rollback()
+        assert await _projecao(db_session) == {}
+
+
+class TestFluxoPeriodo:
+    """Testes da série diária retornada por get_fluxo_periodo"""
+
+    @pytest.mark.asyncio
+    async def test_serie_diaria_com_saldo_acumulado(self, db_session):
+        service = FinanceiroService(db_session)
+        await service.criar_conta_receber(_receber(500, DIA - timedelta(days=5)))
+        await service.criar_conta_receber(_receber(300, DIA + timedelta(days=1)))
+        await service.criar_conta_pagar(_pagar(200, DIA))
+        await db_session.commit()
+
+        fluxo = await service.get_fluxo_periodo(DIA, DIA + timedelta(days=2))
+
+        assert fluxo.saldo_inicial == 500.0
+        assert [(d.data, d.saldo_dia, d.saldo_acumulado) for d in fluxo.dias] == [
+            (DIA, -200.0, 300.0),
+            (DIA + timedelta(days=1), 300.0, 600.0),
+            (DIA + timedelta(days=2), 0.0, 600.0),
+        ]
+        assert (fluxo.total_a_receber, fluxo.total_a_pagar) == (300.0, 200.0)
+        assert fluxo.contas_pagar == [] and fluxo.contas_receber == []
+        assert fluxo.total_contas_pagar is None
+
+    @pytest.mark.asyncio
+    async def test_detalhe_paginado(self, db_session):
+        service = FinanceiroService(db_session)
+        for dias in range(5):
+            await service.criar_conta_pagar(_pagar(10 + dias, DIA + timedelta(days=dias)))
+        await db_session.commit()
+
+        fluxo = await service.get_fluxo_periodo(
+            DIA, DIA + timedelta(days=10), detalhar=True, page=2, page_size=2
+        )
+
+        assert fluxo.total_contas_pagar == 5
+        assert fluxo.total_contas_receber == 0
+        assert [c.valor_original for c in fluxo.contas_pagar] == [12.0, 13.0]
+        assert (fluxo.page, fluxo.page_size) == (2, 2)
+        assert fluxo.total_a_pagar == 60.0
+
+    @pytest.mark.asyncio
+    async def test_periodo_invalido(self, db_session):
+        service = FinanceiroService(db_session)
+        with pytest.raises(ValidationException):
+            await service.get_fluxo_periodo(DIA, DIA - timedelta(days=1))
+        with pytest.raises(ValidationException):
+            await service.get_fluxo_periodo(DIA, DIA + timedelta(days=5000))
+
+
+class TestFluxoPeriodoRouter:
+    """Testes do endpoint de fluxo por período"""
+
+    @pytest.mark.asyncio
+    async def test_endpoint_periodo(self, client, async_db_session):
+        await FinanceiroService(async_db_session).criar_conta_receber(_receber(250, DIA))
+        await async_db_session.commit()
+
+        response = await client.get(
+            "/api/v1/financeiro/fluxo-caixa/periodo",
+            params={"data_inicio": DIA.isoformat(), "data_fim": (DIA + timedelta(days=1)).isoformat()},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["dias"]) == 2
+        assert data["dias"][0]["previsto_entradas"] == 250.0
+        assert data["dias"][1]["saldo_acumulado"] == 250.0
+        assert data["contas_receber"] == []
@@ -0,0 +1,145 @@
+"""
+Testes da rotina de vencimentos e do aging financeiro
+
+Testa:
+- financeiro/repository.py - UPDATE único por tabela e aging em uma consulta agrupada
+- financeiro/service.py - Leituras sem escrita e faixas do aging
+- financeiro/router.py - GET /financeiro/aging
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationException
+from app.core.versionamento import tabelas_alteradas_na_sessao
+from app.modules.financeiro.models import ContaPagar, ContaReceber, StatusFinanceiro
+from app.modules.financeiro.service import FinanceiroService
+
+HOJE = date(2026, 10, 19)
+
+
+def _receber(dias_atraso: int, valor: float = 100, recebido: float = 0, status=StatusFinanceiro.PENDENTE):
+    vencimento = HOJE - timedelta(days=dias_atraso)
+    return ContaReceber(
+        cliente_id=1, descricao=f"Venda {dias_atraso}", valor_original=valor, valor_recebido=recebido,
+        data_emissao=vencimento - timedelta(days=30), data_vencimento=vencimento, status=status,
+    )
+
+
+@pytest.fixture
+async def recebiveis(db_session: AsyncSession) -> list[ContaReceber]:
+    """Títulos em todas as faixas, além de um a vencer, um recebido e um cancelado"""
+    contas = [
+        _receber(1, 100),
+        _receber(30, 50, recebido=20),
+        _receber(31, 70, status=StatusFinanceiro.ATRASADA),
+        _receber(75, 40),
+        _receber(91, 10),
+        _receber(400, 15, status=StatusFinanceiro.ATRASADA),
+        _receber(0, 999),
+        _receber(-5, 999),
+        _receber(10, 999, recebido=999, status=StatusFinanceiro.RECEBIDA),
+        _receber(10, 999, status=StatusFinanceiro.CANCELADA),
+    ]
+    db_session.add_all(contas)
+    await db_session.commit()
+    return contas
+
+
+class TestRotinaVencimentos:
+    """Testes da marcação em lote das contas vencidas"""
+
+    @pytest.mark.asyncio
+    async def test_marca_somente_pendentes_vencidas(self, db_session, recebiveis):
+        db_session.add(ContaPagar(
+            fornecedor_id=1, descricao="Aluguel", valor_original=800, valor_pago=0,
+            data_emissao=HOJE - timedelta(days=40), data_vencimento=HOJE - timedelta(days=3),
+            status=StatusFinanceiro.PENDENTE,
+        ))
+        await db_session.commit()
+
+        service = FinanceiroService(db_session)
+        marcadas = await service.atualizar_status_vencidas(HOJE)
+        assert "contas_receber" in tabelas_alteradas_na_sessao(db_session)
+        await db_session.commit()
+
+        assert marcadas == {"contas_pagar": 1, "contas_receber": 4}
+        result = await db_session.execute(
+            select(ContaReceber.descricao, ContaReceber.status).order_by(ContaReceber.id)
+        )
+        status = dict(result.all())
+        assert status["Venda 1"] == StatusFinanceiro.ATRASADA
+        assert status["Venda 91"] == StatusFinanceiro.ATRASADA
+        assert status["Venda 0"] == StatusFinanceiro.PENDENTE
+        assert status["Venda -5"] == StatusFinanceiro.PENDENTE
+
+        # Segunda execução não encontra nada a marcar
+        assert await service.atualizar_status_vencidas(HOJE) == {"contas_pagar": 0, "contas_receber": 0}
+
+    @pytest.mark.asyncio
+    async def test_leituras_nao_gravam_status(self, db_session):
+        conta = _receber(5)
+        conta.data_vencimento = date.today() - timedelta(days=5)
+        db_session.add(conta)
+        await db_session.commit()
+
+        service = FinanceiroService(db_session)
+        resposta = await service.get_conta_receber(conta.id)
+        lista = await service.list_contas_receber()
+        vencidas = await service.get_contas_receber_vencidas()
+
+        assert resposta.status == "ATRASADA"
+        assert lista.items[0].status == "ATRASADA"
+        assert (vencidas.total, vencidas.items[0].status) == (1, "ATRASADA")
+        assert not db_session.dirty and not db_session.new
+        await db_session.refresh(conta)
+        assert conta.status == StatusFinanceiro.PENDENTE
+
+
+class TestAging:
+    """Testes do aging por faixa de atraso"""
+
+    @pytest.mark.asyncio
+    async def test_faixas_com_saldo_em_aberto(self, db_session, recebiveis):
+        aging = await FinanceiroService(db_session).get_aging("receber", HOJE)
+
+        assert [(f.faixa, f.quantidade, f.valor) for f in aging.faixas] == [
+            ("0-30", 2, 130.0),
+            ("31-60", 1, 70.0),
+            ("61-90", 1, 40.0),
+            ("90+", 2, 25.0),
+        ]
+        assert (aging.total_quantidade, aging.total_valor) == (6, 265.0)
+
+    @pytest.mark.asyncio
+    async def test_faixas_vazias_e_tipo_invalido(self, db_session):
+        service = FinanceiroService(db_session)
+        aging = await service.get_aging("pagar", HOJE)
+        assert [f.quantidade for f in aging.faixas] == [0, 0, 0, 0]
+        assert aging.total_valor == 0.0
+
+        with pytest.raises(ValidationException):
+            await service.get_aging("clientes", HOJE)
+
+
+class TestAgingRouter:
+    """Testes do endpoint de aging"""
+
+    @pytest.mark.asyncio
+    async def test_endpoint_aging(self, client, async_db_session):
+        conta = _receber(45, 120)
+        conta.data_vencimento = date.today() - timedelta(days=45)
+        async_db_session.add(conta)
+        await async_db_session.commit()
+
+        response = await client.get("/api/v1/financeiro/aging", params={"tipo": "receber"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["faixas"][1] == {"faixa": "31-60", "quantidade": 1, "valor": 120.0}
+        assert data["total_quantidade"] == 1
+
+        response = await client.get("/api/v1/financeiro/aging", params={"tipo": "outro"})
+        assert response.status_code == 422
@@ -415,7 +415,7 @@ async def test_capture_payment(mock_client, getnet_client):
     mock_instance.__aexit__ = AsyncMock()
 
     # Set token to avoid OAuth call
-    getnet_client._access_token = "test_token"
+    getnet_client._get_access_token = AsyncMock(return_value="test_token")
 
     mock_client.return_value = mock_instance
 
@@ -448,7 +448,7 @@ async def test_cancel_payment(mock_client, getnet_client):
     mock_instance.__aexit__ = AsyncMock()
 
     # Set token
-    getnet_client._access_token = "test_token"
+    getnet_client._get_access_token = AsyncMock(return_value="test_token")
 
     mock_client.return_value = mock_instance
 
@@ -476,7 +476,7 @@ async def test_query_payment(mock_client, getnet_client, mock_credit_card_respon
     mock_instance.__aexit__ = AsyncMock()
 
     # Set token
-    getnet_client._access_token = "test_token"
+    getnet_client._get_access_token = AsyncMock(return_value="test_token")
 
     mock_client.return_value = mock_instance
 
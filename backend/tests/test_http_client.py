@@ -0,0 +1,92 @@
+"""
+Testes dos clientes HTTP compartilhados e do cache de tokens OAuth2
+
+Testa:
+- integrations/http_client.py - Registro de clientes e TokenCache
+- integrations/sicoob.py - Token compartilhado e renovação após 401
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.integrations import http_client
+from app.integrations.http_client import TokenCache, get_http_client, set_http_client
+from app.integrations.sicoob import SicoobClient
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self) -> float:
+        return self.agora
+
+
+class TestTokenCache:
+    """Cache de tokens com renovação antecipada e single-flight"""
+
+    @pytest.mark.asyncio
+    async def test_uma_renovacao_para_chamadas_concorrentes(self):
+        cache = TokenCache()
+        pedidos = []
+
+        async def renovar():
+            pedidos.append(1)
+            await asyncio.sleep(0.01)
+            return {"access_token": f"token-{len(pedidos)}", "expires_in": 3600}
+
+        tokens = await asyncio.gather(*[cache.obter("sicoob", renovar) for _ in range(10)])
+
+        assert tokens == ["token-1"] * 10
+        assert len(pedidos) == 1
+
+    @pytest.mark.asyncio
+    async def test_renova_antes_de_expirar(self, monkeypatch):
+        relogio = Relogio()
+        monkeypatch.setattr(http_client.time, "monotonic", relogio)
+        cache = TokenCache(margem_renovacao=60)
+        emitidos = iter(["A", "B", "C"])
+
+        async def renovar():
+            return {"access_token": next(emitidos), "expires_in": 3600}
+
+        assert await cache.obter("getnet", renovar) == "A"
+        relogio.agora += 3539
+        assert await cache.obter("getnet", renovar) == "A"
+        relogio.agora += 2
+        assert await cache.obter("getnet", renovar) == "B"
+
+        cache.invalidar("getnet")
+        assert await cache.obter("getnet", renovar) == "C"
+
+
+class TestClientesCompartilhados:
+    """Clientes HTTP por integração"""
+
+    def test_instancias_usam_o_mesmo_cliente(self):
+        assert SicoobClient().client is SicoobClient().client
+        assert get_http_client("sicoob") is not get_http_client("getnet")
+
+    @pytest.mark.asyncio
+    async def test_sicoob_token_compartilhado_e_renovado_apos_401(self):
+        tokens_emitidos = []
+        recusar = {"token-1"}
+
+        def responder(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/token"):
+                tokens_emitidos.append(f"token-{len(tokens_emitidos) + 1}")
+                return httpx.Response(200, json={"access_token": tokens_emitidos[-1], "expires_in": 300})
+            if request.headers["Authorization"].removeprefix("Bearer ") in recusar:
+                return httpx.Response(401)
+            return httpx.Response(200, json={"txid": "abc", "status": "ATIVA"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(responder)) as mock:
+            set_http_client("sicoob", mock)
+
+            primeira = await SicoobClient().query_pix_charge("abc")
+            segunda = await SicoobClient().query_pix_charge("abc")
+
+        assert primeira == segunda == {"txid": "abc", "status": "ATIVA"}
+        # token-1 recusado uma vez; token-2 reaproveitado pela segunda instância
+        assert tokens_emitidos == ["token-1", "token-2"]
@@ -0,0 +1,211 @@
+"""
+Testes da contagem de inventário em lote
+
+Testa:
+- estoque/inventario_service.py - Contagens em lote e via NDJSON
+- estoque/inventario_repository.py - Atualizações em lote e ajuste de estoque
+"""
+import json
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.categorias.models import Categoria
+from app.modules.produtos.models import Produto
+from app.modules.estoque.models import (
+    FichaInventario,
+    ItemInventario,
+    LocalizacaoEstoque,
+    StatusInventario,
+    TipoInventario,
+    TipoLocalizacao,
+)
+from app.modules.estoque.inventario_service import InventarioService
+from app.modules.estoque.schemas import (
+    ContagemLoteItem,
+    FinalizarContagemRequest,
+    StatusContagemLoteEnum,
+)
+
+
+@pytest.fixture
+async def ficha(db_session: AsyncSession) -> dict:
+    """Ficha em andamento com três produtos, um deles em duas localizações"""
+    categoria = Categoria(nome="Ferragens", ativa=True)
+    db_session.add(categoria)
+    await db_session.flush()
+
+    produtos = []
+    for i, estoque in enumerate([10, 20, 30], start=1):
+        produto = Produto(
+            codigo_barras=f"789000000000{i}",
+            descricao=f"Parafuso {i}",
+            categoria_id=categoria.id,
+            preco_custo=1,
+            preco_venda=2,
+            estoque_atual=estoque,
+            estoque_minimo=0,
+        )
+        db_session.add(produto)
+        produtos.append(produto)
+
+    localizacoes = [
+        LocalizacaoEstoque(codigo=f"A-0{i}", descricao=f"Prateleira {i}", tipo=TipoLocalizacao.PRATELEIRA)
+        for i in (1, 2)
+    ]
+    db_session.add_all(localizacoes)
+
+    ficha = FichaInventario(tipo=TipoInventario.PARCIAL, status=StatusInventario.EM_ANDAMENTO)
+    db_session.add(ficha)
+    await db_session.flush()
+
+    p1, p2, p3 = produtos
+    db_session.add_all([
+        ItemInventario(ficha_id=ficha.id, produto_id=p1.id, quantidade_sistema=10),
+        ItemInventario(ficha_id=ficha.id, produto_id=p2.id, quantidade_sistema=20),
+        ItemInventario(
+            ficha_id=ficha.id, produto_id=p3.id, quantidade_sistema=12,
+            localizacao_id=localizacoes[0].id,
+        ),
+        ItemInventario(
+            ficha_id=ficha.id, produto_id=p3.id, quantidade_sistema=18,
+            localizacao_id=localizacoes[1].id,
+        ),
+    ])
+    await db_session.commit()
+    return {"ficha": ficha, "produtos": produtos, "localizacoes": localizacoes}
+
+
+async def _contagens(db_session: AsyncSession, ficha_id: int) -> dict:
+    result = await db_session.execute(
+        select(ItemInventario.produto_id, ItemInventario.localizacao_id,
+               ItemInventario.quantidade_contada, ItemInventario.divergencia)
+        .where(ItemInventario.ficha_id == ficha_id)
+    )
+    return {
+        (p, l): (float(q) if q is not None else None, float(d) if d is not None else None)
+        for p, l, q, d in result.all()
+    }
+
+
+async def _ndjson(linhas: list):
+    """Simula o corpo em streaming, quebrando linhas entre blocos"""
+    corpo = "\n".join(linhas).encode()
+    for i in range(0, len(corpo), 7):
+        yield corpo[i:i + 7]
+
+
+class TestContagemLote:
+    """Testes do registro de contagens em lote"""
+
+    @pytest.mark.asyncio
+    async def test_resolve_codigos_e_registra(self, db_session, ficha):
+        """Deve resolver código de barras e produto_id e calcular divergência"""
+        f, (p1, p2, _) = ficha["ficha"], ficha["produtos"]
+        service = InventarioService(db_session)
+
+        resposta = await service.registrar_contagens_lote([
+            ContagemLoteItem(ficha_id=f.id, codigo_barras=p1.codigo_barras, quantidade_contada=8),
+            ContagemLoteItem(ficha_id=f.id, produto_id=p2.id, quantidade_contada=20),
+        ])
+
+        assert resposta.registradas == 2
+        assert resposta.erros == 0
+        assert resposta.resultados[0].produto_id == p1.id
+        assert resposta.resultados[0].divergencia == -2
+
+        contagens = await _contagens(db_session, f.id)
+        assert contagens[(p1.id, None)] == (8.0, -2.0)
+        assert contagens[(p2.id, None)] == (20.0, 0.0)
+
+    @pytest.mark.asyncio
+    async def test_acumular_soma_leituras(self, db_session, ficha):
+        """Leituras unitárias do mesmo item devem ser somadas, inclusive entre lotes"""
+        f, p1 = ficha["ficha"], ficha["produtos"][0]
+        service = InventarioService(db_session)
+        leitura = ContagemLoteItem(ficha_id=f.id, codigo_barras=p1.codigo_barras, quantidade_contada=1)
+
+        resposta = await service.registrar_contagens_lote([leitura] * 7, acumular=True)
+        assert resposta.itens_atualizados == 1
+        assert resposta.resultados[-1].quantidade_contada == 7
+
+        await service.registrar_contagens_lote([leitura] * 5, acumular=True)
+        contagens = await _contagens(db_session, f.id)
+        assert contagens[(p1.id, None)] == (12.0, 2.0)
+
+    @pytest.mark.asyncio
+    async def test_erros_por_linha(self, db_session, ficha):
+        """Linhas inválidas devem retornar erro sem impedir as demais"""
+        f, (p1, _, p3) = ficha["ficha"], ficha["produtos"]
+        service = InventarioService(db_session)
+
+        resposta = await service.registrar_contagens_lote([
+            ContagemLoteItem(ficha_id=f.id, codigo_barras="000", quantidade_contada=1),
+            ContagemLoteItem(ficha_id=999, produto_id=p1.id, quantidade_contada=1),
+            ContagemLoteItem(ficha_id=f.id, produto_id=p3.id, quantidade_contada=1),
+            ContagemLoteItem(
+                ficha_id=f.id, produto_id=p3.id, quantidade_contada=11,
+                localizacao_id=ficha["localizacoes"][0].id,
+            ),
+        ])
+
+        status = [r.status for r in resposta.resultados]
+        assert status == [StatusContagemLoteEnum.ERRO] * 3 + [StatusContagemLoteEnum.REGISTRADA]
+        assert "não cadastrado" in resposta.resultados[0].erro
+        assert "não encontrada" in resposta.resultados[1].erro
+        assert "localizacao_id" in resposta.resultados[2].erro
+        assert resposta.resultados[3].divergencia == -1
+
+    @pytest.mark.asyncio
+    async def test_ficha_fora_de_andamento(self, db_session, ficha):
+        """Não deve registrar contagem em ficha concluída"""
+        f, p1 = ficha["ficha"], ficha["produtos"][0]
+        f.status = StatusInventario.CONCLUIDA
+        await db_session.commit()
+
+        resposta = await InventarioService(db_session).registrar_contagens_lote([
+            ContagemLoteItem(ficha_id=f.id, produto_id=p1.id, quantidade_contada=1),
+        ])
+
+        assert resposta.erros == 1
+        assert "não está em andamento" in resposta.resultados[0].erro
+
+    @pytest.mark.asyncio
+    async def test_ndjson_em_streaming(self, db_session, ficha):
+        """Deve processar NDJSON quebrado em blocos, reportando linhas inválidas"""
+        f, p1 = ficha["ficha"], ficha["produtos"][0]
+        linha = json.dumps({"ficha_id": f.id, "codigo_barras": p1.codigo_barras, "quantidade_contada": 1})
+        linhas = [linha, linha, "", "{invalido", json.dumps({"ficha_id": f.id, "quantidade_contada": 1}), linha]
+
+        resposta = await InventarioService(db_session).registrar_contagens_ndjson(
+            _ndjson(linhas), acumular=True
+        )
+
+        assert resposta.total_linhas == 5
+        assert resposta.registradas == 3
+        assert [r.linha for r in resposta.resultados if r.erro] == [4, 5]
+        assert "JSON inválido" in resposta.resultados[2].erro
+        contagens = await _contagens(db_session, f.id)
+        assert contagens[(p1.id, None)][0] == 3.0
+
+    @pytest.mark.asyncio
+    async def test_finalizar_aplica_divergencias(self, db_session, ficha):
+        """Finalização deve ajustar estoque somando divergências por produto"""
+        f, (p1, p2, p3) = ficha["ficha"], ficha["produtos"]
+        l1, l2 = ficha["localizacoes"]
+        service = InventarioService(db_session)
+        await service.registrar_contagens_lote([
+            ContagemLoteItem(ficha_id=f.id, produto_id=p1.id, quantidade_contada=8),
+            ContagemLoteItem(ficha_id=f.id, produto_id=p2.id, quantidade_contada=20),
+            ContagemLoteItem(ficha_id=f.id, produto_id=p3.id, quantidade_contada=15, localizacao_id=l1.id),
+            ContagemLoteItem(ficha_id=f.id, produto_id=p3.id, quantidade_contada=18, localizacao_id=l2.id),
+        ])
+
+        await service.finalizar_inventario(f.id, FinalizarContagemRequest(ajustar_estoque=True))
+        await db_session.commit()
+
+        result = await db_session.execute(
+            select(Produto.id, Produto.estoque_atual).order_by(Produto.id)
+        )
+        estoques = {pid: float(e) for pid, e in result.all()}
+        assert estoques == {p1.id: 8.0, p2.id: 20.0, p3.id: 33.0}
@@ -0,0 +1,147 @@
+"""
+Testes da sincronização de estoque com o Mercado Livre
+
+Testa:
+- estoque/marketplace_sync_service.py - Worker com concorrência, backoff e debounce
+- integrations/mercadolivre.py - Client usando cliente HTTP compartilhado
+
+Usa o servidor mock local (tests/mocks/mercadolivre_mock.py) via ASGI.
+"""
+import asyncio
+import pytest
+import httpx
+
+from app.integrations.mercadolivre import MercadoLivreClient
+from app.modules.estoque.marketplace_sync_service import (
+    MarketplaceSyncService,
+    MercadoLivreSyncWorker,
+)
+from app.utils.retry import RetryConfig
+from tests.mocks.mercadolivre_mock import MercadoLivreMock, MOCK_BASE_URL
+
+
+@pytest.fixture
+def ml_mock():
+    """Mock do Mercado Livre com latência para medir concorrência"""
+    return MercadoLivreMock(latencia=0.02)
+
+
+@pytest.fixture
+async def worker(ml_mock):
+    """Worker apontando para o mock, com janelas curtas para os testes"""
+    http_client = ml_mock.http_client()
+    client = MercadoLivreClient(
+        "client-id", "secret", base_url=MOCK_BASE_URL, http_client=http_client
+    )
+    worker = MercadoLivreSyncWorker(
+        client,
+        concorrencia=3,
+        debounce=0.05,
+        espera_maxima=0.5,
+        retry_config=RetryConfig(max_attempts=4, initial_delay=0.01, jitter=False),
+    )
+    yield worker
+    await worker.parar()
+    await http_client.aclose()
+
+
+class TestSincronizacaoLote:
+    """Testes do envio em lote com concorrência limitada"""
+
+    @pytest.mark.asyncio
+    async def test_lote_respeita_limite_concorrencia(self, worker, ml_mock):
+        """Deve enviar todos os itens sem ultrapassar a concorrência configurada"""
+        service = MarketplaceSyncService(db=None, worker=worker)
+        produtos = [
+            {"produto_id": i, "ml_item_id": f"MLB{i}", "quantidade": i}
+            for i in range(1, 11)
+        ]
+
+        resultado = await service.sincronizar_lote_ml(produtos, access_token="APP_USR-1")
+
+        assert resultado["sucessos"] == 10
+        assert resultado["falhas"] == 0
+        assert [r["produto_id"] for r in resultado["resultados"]] == list(range(1, 11))
+        assert 1 < ml_mock.pico_concorrencia <= 3
+        assert ml_mock.itens["MLB7"]["available_quantity"] == 7
+
+
+class TestBackoff:
+    """Testes de retry e rate limit"""
+
+    @pytest.mark.asyncio
+    async def test_retenta_apos_rate_limit(self, worker, ml_mock):
+        """Deve respeitar 429 e concluir após novas tentativas"""
+        ml_mock.simular_rate_limit(2, retry_after="0")
+
+        resposta = await worker.enviar("MLB1", 5, "APP_USR-1")
+
+        assert resposta["quantidade"] == 5
+        assert len(ml_mock.requisicoes_item("MLB1")) == 3
+
+    @pytest.mark.asyncio
+    async def test_retenta_erro_servidor(self, worker, ml_mock):
+        """Deve retentar respostas 5xx"""
+        ml_mock.simular_falha_servidor(1)
+
+        resposta = await worker.enviar("MLB1", 2, "APP_USR-1")
+
+        assert resposta["quantidade"] == 2
+
+    @pytest.mark.asyncio
+    async def test_esgota_tentativas(self, worker, ml_mock):
+        """Deve propagar o erro quando as tentativas se esgotam"""
+        ml_mock.simular_rate_limit(10, retry_after="0")
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await worker.enviar("MLB1", 2, "APP_USR-1")
+
+        assert len(ml_mock.requisicoes_item("MLB1")) == 4
+
+    @pytest.mark.asyncio
+    async def test_nao_retenta_erro_cliente(self, worker, ml_mock):
+        """Erros 4xx (exceto 429) não devem ser retentados"""
+        with pytest.raises(httpx.HTTPStatusError) as exc:
+            await worker.enviar("MLB1", 2, "expirado")
+
+        assert exc.value.response.status_code == 401
+        assert len(ml_mock.requisicoes_item("MLB1")) == 1
+
+
+class TestDebounce:
+    """Testes do debounce por SKU"""
+
+    @pytest.mark.asyncio
+    async def test_vendas_do_mesmo_sku_viram_um_envio(self, worker, ml_mock):
+        """20 vendas do mesmo item na janela devem gerar um único envio"""
+        for estoque in range(20, 0, -1):
+            worker.agendar(1, "MLB1", estoque, "APP_USR-1")
+            await asyncio.sleep(0.001)
+        worker.agendar(2, "MLB2", 7, "APP_USR-1")
+
+        await asyncio.sleep(0.3)
+
+        envios = ml_mock.requisicoes_item("MLB1")
+        assert len(envios) == 1
+        assert envios[0]["payload"] == {"available_quantity": 1}
+        assert len(ml_mock.requisicoes_item("MLB2")) == 1
+
+    @pytest.mark.asyncio
+    async def test_espera_maxima_limita_debounce(self, worker, ml_mock):
+        """SKU vendendo sem parar deve ser enviado ao atingir a espera máxima"""
+        for estoque in range(40, 0, -1):
+            worker.agendar(1, "MLB1", estoque, "APP_USR-1")
+            await asyncio.sleep(0.02)
+
+        assert len(ml_mock.requisicoes_item("MLB1")) >= 1
+
+    @pytest.mark.asyncio
+    async def test_parar_descarrega_pendentes(self, worker, ml_mock):
+        """Ao parar, atualizações pendentes devem ser enviadas"""
+        worker.debounce = 60
+        worker.espera_maxima = 60
+        worker.agendar(1, "MLB1", 3, "APP_USR-1")
+
+        await worker.parar()
+
+        assert ml_mock.itens["MLB1"]["available_quantity"] == 3
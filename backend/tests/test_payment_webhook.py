@@ -439,8 +439,15 @@ class TestWebhookRouter:
     def client(self):
         """Client de teste"""
         from fastapi import FastAPI
+        from app.core.database import get_db
+
+        async def _sem_db():
+            yield None
+
         app = FastAPI()
         app.include_router(router)
+        # A inbox é substituída por mock nestes testes
+        app.dependency_overrides[get_db] = _sem_db
         return TestClient(app)
 
     def test_webhook_test_endpoint(self, client):
@@ -462,15 +469,10 @@ class TestWebhookRouter:
         assert response.status_code == 400
         assert "Gateway inválido" in response.json()["detail"]
 
-    @patch('app.services.payment_webhook_handler.PaymentWebhookHandler.process_webhook')
-    def test_receive_cielo_webhook_success(self, mock_process, client):
-        """Teste de recebimento bem-sucedido de webhook Cielo"""
-        mock_process.return_value = {
-            "gateway": "cielo",
-            "payment_id": "test-123",
-            "status": PaymentStatus.CAPTURED,
-            "event": WebhookEvent.PAYMENT_APPROVED
-        }
+    @patch('app.services.webhook_inbox.WebhookInbox.registrar')
+    def test_receive_cielo_webhook_success(self, mock_registrar, client):
+        """Teste de recebimento bem-sucedido de webhook Cielo (gravado na inbox)"""
+        mock_registrar.return_value = ("test-123:1:2", True)
 
         payload = {
             "PaymentId": "test-123",
@@ -486,14 +488,13 @@ class TestWebhookRouter:
 
         assert response.status_code == 200
         data = response.json()
-        assert data["status"] == "processed"
-        assert data["payment_id"] == "test-123"
-        assert data["event"] == "payment.approved"
+        assert data["status"] == "received"
+        assert data["evento_id"] == "test-123:1:2"
 
-    @patch('app.services.payment_webhook_handler.PaymentWebhookHandler.process_webhook')
-    def test_receive_webhook_validation_error(self, mock_process, client):
+    @patch('app.services.webhook_inbox.WebhookInbox.registrar')
+    def test_receive_webhook_validation_error(self, mock_registrar, client):
         """Teste de webhook com erro de validação"""
-        mock_process.side_effect = ValidationException("Assinatura inválida")
+        mock_registrar.side_effect = ValidationException("Assinatura inválida")
 
         payload = {
             "PaymentId": "test-123"
@@ -507,10 +508,10 @@ class TestWebhookRouter:
         assert response.status_code == 401
         assert "Assinatura inválida" in response.json()["detail"]
 
-    @patch('app.services.payment_webhook_handler.PaymentWebhookHandler.process_webhook')
-    def test_receive_webhook_general_error(self, mock_process, client):
+    @patch('app.services.webhook_inbox.WebhookInbox.registrar')
+    def test_receive_webhook_general_error(self, mock_registrar, client):
         """Teste de webhook com erro geral"""
-        mock_process.side_effect = Exception("Erro inesperado")
+        mock_registrar.side_effect = Exception("Erro inesperado")
 
         payload = {
             "PaymentId": "test-123"
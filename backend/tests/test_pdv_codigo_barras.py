@@ -0,0 +1,179 @@
+"""
+Testes do índice de código de barras do PDV
+
+Testa:
+- produtos/indice_codigo_barras.py - Índice em memória, invalidação e fallback
+- pdv/service.py - Leitura de código de barras
+"""
+import asyncio
+import importlib
+import time
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache_service, CANAL_INVALIDACAO_PRODUTOS
+from app.core.exceptions import NotFoundException
+from app.modules.categorias.models import Categoria
+from app.modules.produtos.models import Produto
+from app.modules.produtos.indice_codigo_barras import (
+    IndiceCodigoBarras,
+    indice_codigo_barras,
+    marcar_produtos_alterados,
+)
+from app.modules.pdv.service import PDVService
+
+# O pacote produtos exporta o objeto indice_codigo_barras com o mesmo nome do módulo
+modulo_indice = importlib.import_module("app.modules.produtos.indice_codigo_barras")
+
+
+@pytest.fixture
+async def produtos(db_session: AsyncSession) -> list:
+    categoria = Categoria(nome="Elétrica", ativa=True)
+    db_session.add(categoria)
+    await db_session.flush()
+    produtos = [
+        Produto(
+            codigo_barras=f"78930000000{i}", descricao=f"Disjuntor {i * 10}A",
+            categoria_id=categoria.id, preco_custo=8, preco_venda=15 + i,
+            estoque_atual=i, estoque_minimo=0,
+        )
+        for i in range(3)
+    ]
+    db_session.add_all(produtos)
+    await db_session.commit()
+    return produtos
+
+
+@pytest.fixture
+async def indice(db_session):
+    """Índice global aquecido e assinando o canal de invalidação"""
+    await cache_service.subscribe(CANAL_INVALIDACAO_PRODUTOS, indice_codigo_barras.processar_invalidacao)
+    yield indice_codigo_barras
+    cache_service.unsubscribe(CANAL_INVALIDACAO_PRODUTOS, indice_codigo_barras.processar_invalidacao)
+    indice_codigo_barras.limpar()
+
+
+class TestIndiceCodigoBarras:
+    """Testes do índice em memória"""
+
+    @pytest.mark.asyncio
+    async def test_aquecer_carrega_apenas_ativos(self, db_session, produtos):
+        """Deve carregar produtos ativos com dados compactos"""
+        produtos[2].ativo = False
+        await db_session.commit()
+
+        indice = IndiceCodigoBarras()
+        assert await indice.aquecer(db_session) == 2
+
+        scan = indice.get(produtos[1].codigo_barras)
+        assert scan.descricao == "Disjuntor 10A"
+        assert scan.preco_venda == 16.0
+        assert scan.em_estoque is True
+        assert indice.get(produtos[0].codigo_barras).em_estoque is False
+        assert indice.get(produtos[2].codigo_barras) is None
+
+    @pytest.mark.asyncio
+    async def test_miss_busca_no_banco(self, db_session, produtos):
+        """Miss deve consultar o banco e repovoar o índice"""
+        indice = IndiceCodigoBarras()
+
+        scan = await indice.buscar(db_session, produtos[0].codigo_barras)
+        assert scan.id == produtos[0].id
+        assert indice.misses == 1
+
+        await indice.buscar(db_session, produtos[0].codigo_barras)
+        assert indice.hits == 1
+        assert await indice.buscar(db_session, "000") is None
+
+    @pytest.mark.asyncio
+    async def test_latencia_leitura(self, db_session, produtos):
+        """Leituras em memória devem ficar abaixo de 1ms"""
+        indice = IndiceCodigoBarras()
+        await indice.aquecer(db_session)
+        codigo = produtos[1].codigo_barras
+
+        inicio = time.perf_counter()
+        for _ in range(10_000):
+            await indice.buscar(db_session, codigo)
+        media_ms = (time.perf_counter() - inicio) * 1000 / 10_000
+
+        assert media_ms < 1.0
+
+    @pytest.mark.asyncio
+    async def test_entrada_vencida_relida_do_banco(self, db_session, produtos, monkeypatch):
+        """Sem invalidação (Redis fora do ar) o preço é relido após a validade"""
+        indice = IndiceCodigoBarras(validade=60)
+        await indice.aquecer(db_session)
+        codigo = produtos[0].codigo_barras
+        await db_session.execute(update(Produto).where(Produto.id == produtos[0].id).values(preco_venda=99))
+        await db_session.commit()
+
+        assert (await indice.buscar(db_session, codigo)).preco_venda == 15.0
+
+        depois = time.monotonic() + 61
+        monkeypatch.setattr(modulo_indice.time, "monotonic", lambda: depois)
+        assert indice.get(codigo) is None
+        assert (await indice.buscar(db_session, codigo)).preco_venda == 99.0
+        assert indice.get(codigo).preco_venda == 99.0
+
+    @pytest.mark.asyncio
+    async def test_commit_invalida_produto_alterado(self, db_session, produtos, indice):
+        """Alteração via ORM deve invalidar a entrada após o commit"""
+        await indice.aquecer(db_session)
+        produtos[1].preco_venda = 99
+        await db_session.flush()
+        assert indice.get(produtos[1].codigo_barras) is not None
+
+        await db_session.commit()
+        await asyncio.sleep(0)
+
+        assert indice.get(produtos[1].codigo_barras) is None
+        assert indice.get(produtos[0].codigo_barras) is not None
+        scan = await indice.buscar(db_session, produtos[1].codigo_barras)
+        assert scan.preco_venda == 99.0
+
+    @pytest.mark.asyncio
+    async def test_rollback_nao_invalida(self, db_session, produtos, indice):
+        """Alterações desfeitas não devem invalidar o índice"""
+        await indice.aquecer(db_session)
+        codigo = produtos[1].codigo_barras
+        produtos[1].preco_venda = 99
+        await db_session.flush()
+        await db_session.rollback()
+        await asyncio.sleep(0)
+
+        assert indice.get(codigo) is not None
+
+    @pytest.mark.asyncio
+    async def test_update_em_lote_marcado(self, db_session, produtos, indice):
+        """UPDATE em lote marcado deve invalidar apenas os IDs informados"""
+        await indice.aquecer(db_session)
+        await db_session.execute(
+            update(Produto), [{"id": produtos[0].id, "estoque_atual": 5}]
+        )
+        marcar_produtos_alterados(db_session, [produtos[0].id])
+        await db_session.commit()
+        await asyncio.sleep(0)
+
+        assert indice.get(produtos[0].codigo_barras) is None
+        assert indice.get(produtos[2].codigo_barras) is not None
+
+
+class TestLeituraPDV:
+    """Testes da leitura de código de barras no PDV"""
+
+    @pytest.mark.asyncio
+    async def test_ler_codigo_barras(self, db_session, produtos, indice):
+        """Deve retornar dados do produto lido"""
+        resposta = await PDVService(db_session).ler_codigo_barras(produtos[2].codigo_barras)
+
+        assert resposta.id == produtos[2].id
+        assert resposta.unidade == "UN"
+        assert resposta.em_estoque is True
+
+    @pytest.mark.asyncio
+    async def test_codigo_inexistente(self, db_session, produtos, indice):
+        """Código não cadastrado deve gerar NotFoundException"""
+        with pytest.raises(NotFoundException):
+            await PDVService(db_session).ler_codigo_barras("999")
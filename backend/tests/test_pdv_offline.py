@@ -0,0 +1,264 @@
+"""
+Testes da sincronização em lote de operações offline do PDV
+
+Testa:
+- pdv/sincronizacao_service.py - Idempotência, ordem, baixa em lote e conflitos
+- pdv/router.py - POST /pdv/sincronizacao e GET /pdv/sincronizacao/conflitos
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import BusinessRuleException
+from app.modules.categorias.models import Categoria
+from app.modules.estoque.models import LoteEstoque, MovimentacaoEstoque
+from app.modules.pdv.models import (
+    Caixa,
+    MovimentacaoCaixa,
+    OperacaoOfflinePDV,
+    StatusCaixa,
+    StatusOperacaoOffline,
+    TipoMovimentacaoCaixa,
+)
+from app.modules.pdv.schemas import OperacaoOfflineCreate, SincronizacaoPDVRequest
+from app.modules.pdv.sincronizacao_service import SincronizacaoPDVService
+from app.modules.produtos.models import Produto
+from app.modules.vendas.models import Venda
+
+INICIO = datetime(2026, 10, 18, 14, 0, 0)
+
+
+@pytest.fixture
+async def loja(db_session: AsyncSession) -> dict:
+    """Caixa aberto do operador 1, cimento (10 un) e areia (5 un)"""
+    categoria = Categoria(nome="Básicos", ativa=True)
+    db_session.add(categoria)
+    await db_session.flush()
+    cimento = Produto(
+        codigo_barras="7893000000001", descricao="Cimento CP-II 50kg", categoria_id=categoria.id,
+        preco_custo=25, preco_venda=32.90, estoque_atual=10,
+    )
+    areia = Produto(
+        codigo_barras="7893000000002", descricao="Areia Média 20kg", categoria_id=categoria.id,
+        preco_custo=4, preco_venda=7.50, estoque_atual=5,
+    )
+    caixa = Caixa(operador_id=1, valor_abertura=100, status=StatusCaixa.ABERTO)
+    db_session.add_all([cimento, areia, caixa])
+    await db_session.commit()
+    return {"cimento": cimento, "areia": areia, "caixa": caixa}
+
+
+def _venda(id_cliente: str, minutos: int, *itens) -> dict:
+    return {
+        "id_cliente": id_cliente,
+        "tipo": "VENDA",
+        "registrado_em": INICIO + timedelta(minutes=minutos),
+        "venda": {
+            "forma_pagamento": "dinheiro",
+            "itens": [
+                {"produto_id": produto_id, "quantidade": quantidade, "preco_unitario": preco}
+                for produto_id, quantidade, preco in itens
+            ],
+        },
+    }
+
+
+def _fila(*operacoes) -> SincronizacaoPDVRequest:
+    return SincronizacaoPDVRequest(operador_id=1, terminal="PDV-02", operacoes=list(operacoes))
+
+
+async def _estoque(db_session: AsyncSession, produto: Produto) -> float:
+    result = await db_session.execute(
+        select(Produto.estoque_atual).where(Produto.id == produto.id)
+    )
+    return float(result.scalar_one())
+
+
+class TestSincronizacaoService:
+    """Testes do service de sincronização offline"""
+
+    @pytest.mark.asyncio
+    async def test_aplica_fila_com_baixa_em_lote(self, db_session, loja):
+        """Vendas, sangria e suprimento devem ser aplicados com saídas de estoque e caixa"""
+        cimento, areia = loja["cimento"].id, loja["areia"].id
+        service = SincronizacaoPDVService(db_session)
+        resposta = await service.sincronizar(_fila(
+            _venda("venda-0001", 1, (cimento, 2, 32.90), (areia, 1, 7.50)),
+            _venda("venda-0002", 5, (cimento, 3, 32.90)),
+            {"id_cliente": "sangria-0001", "tipo": "SANGRIA", "registrado_em": INICIO + timedelta(minutes=9),
+             "sangria": {"valor": 50, "descricao": "Cofre"}},
+            {"id_cliente": "suprimento-0001", "tipo": "SUPRIMENTO", "registrado_em": INICIO + timedelta(minutes=10),
+             "suprimento": {"valor": 20, "descricao": "Troco"}},
+        ))
+        await db_session.commit()
+
+        assert (resposta.aplicadas, resposta.duplicadas, resposta.conflitos) == (4, 0, 0)
+        assert await _estoque(db_session, loja["cimento"]) == 5
+        assert await _estoque(db_session, loja["areia"]) == 4
+
+        venda = await db_session.get(Venda, resposta.resultados[0].venda_id)
+        assert float(venda.valor_total) == 73.30
+        assert venda.data_venda == INICIO + timedelta(minutes=1)
+        assert venda.forma_pagamento == "DINHEIRO"
+
+        saidas = await db_session.execute(
+            select(MovimentacaoEstoque.documento_referencia, func.sum(MovimentacaoEstoque.quantidade))
+            .group_by(MovimentacaoEstoque.documento_referencia)
+        )
+        assert {doc: float(q) for doc, q in saidas} == {
+            f"VENDA-{resposta.resultados[0].venda_id}": 3,
+            f"VENDA-{resposta.resultados[1].venda_id}": 3,
+        }
+
+        movimentacoes = await db_session.execute(
+            select(MovimentacaoCaixa.tipo, MovimentacaoCaixa.valor)
+            .where(MovimentacaoCaixa.caixa_id == loja["caixa"].id)
+            .order_by(MovimentacaoCaixa.created_at)
+        )
+        assert [(t, float(v)) for t, v in movimentacoes] == [
+            (TipoMovimentacaoCaixa.ENTRADA, 73.30),
+            (TipoMovimentacaoCaixa.ENTRADA, 98.70),
+            (TipoMovimentacaoCaixa.SANGRIA, 50.00),
+            (TipoMovimentacaoCaixa.SUPRIMENTO, 20.00),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_reenvio_idempotente(self, db_session, loja):
+        """Reenviar a mesma fila não deve aplicar nada de novo"""
+        fila = _fila(
+            _venda("venda-0001", 1, (loja["cimento"].id, 2, 32.90)),
+            _venda("venda-0001", 1, (loja["cimento"].id, 2, 32.90)),
+        )
+        primeira = await SincronizacaoPDVService(db_session).sincronizar(fila)
+        await db_session.commit()
+        segunda = await SincronizacaoPDVService(db_session).sincronizar(fila)
+        await db_session.commit()
+
+        assert [r.status for r in primeira.resultados] == ["APLICADA", "DUPLICADA"]
+        assert primeira.resultados[1].venda_id == primeira.resultados[0].venda_id
+        assert [r.status for r in segunda.resultados] == ["DUPLICADA", "DUPLICADA"]
+        assert segunda.resultados[0].venda_id == primeira.resultados[0].venda_id
+        assert await _estoque(db_session, loja["cimento"]) == 8
+        total_vendas = await db_session.execute(select(func.count(Venda.id)))
+        assert total_vendas.scalar_one() == 1
+
+    @pytest.mark.asyncio
+    async def test_conflito_de_estoque_nao_interrompe_fila(self, db_session, loja):
+        """Venda sem saldo vira conflito; as demais seguem e o conflito pode ser reenviado"""
+        areia = loja["areia"].id
+        fila = _fila(
+            _venda("venda-0001", 1, (areia, 3, 7.50)),
+            _venda("venda-0002", 2, (areia, 3, 7.50)),
+            _venda("venda-0003", 3, (areia, 2, 7.50)),
+        )
+        resposta = await SincronizacaoPDVService(db_session).sincronizar(fila)
+        await db_session.commit()
+
+        assert [r.status for r in resposta.resultados] == ["APLICADA", "CONFLITO", "APLICADA"]
+        assert "Disponível: 2.0, Necessário: 3.0" in resposta.resultados[1].motivo
+        assert await _estoque(db_session, loja["areia"]) == 0
+
+        conflitos = await SincronizacaoPDVService(db_session).listar_conflitos(operador_id=1)
+        assert [c.id_cliente for c in conflitos] == ["venda-0002"]
+        assert OperacaoOfflineCreate.model_validate_json(conflitos[0].payload).venda.itens[0].quantidade == 3
+
+        # Após a entrada de estoque, o conflito é reenviado com o mesmo id_cliente
+        produto = await db_session.get(Produto, areia)
+        produto.estoque_atual = 10
+        await db_session.commit()
+        reenvio = await SincronizacaoPDVService(db_session).sincronizar(fila)
+        await db_session.commit()
+
+        assert [r.status for r in reenvio.resultados] == ["DUPLICADA", "APLICADA", "DUPLICADA"]
+        assert await _estoque(db_session, loja["areia"]) == 7
+        operacao = (await db_session.execute(
+            select(OperacaoOfflinePDV).where(OperacaoOfflinePDV.id_cliente == "venda-0002")
+        )).scalar_one()
+        assert operacao.status == StatusOperacaoOffline.APLICADA
+        assert operacao.motivo is None
+
+    @pytest.mark.asyncio
+    async def test_produto_com_lote_segue_fluxo_online(self, db_session, loja):
+        """Produto que controla lote deve ter baixa FIFO no lote"""
+        produto = loja["cimento"]
+        produto.controla_lote = True
+        lote = LoteEstoque(
+            produto_id=produto.id, numero_lote="L-001", data_validade=date(2027, 1, 31),
+            quantidade_inicial=10, quantidade_atual=10, custo_unitario=25,
+        )
+        db_session.add(lote)
+        await db_session.commit()
+
+        resposta = await SincronizacaoPDVService(db_session).sincronizar(_fila(
+            _venda("venda-0001", 1, (produto.id, 4, 32.90)),
+        ))
+        await db_session.commit()
+
+        assert resposta.resultados[0].status == "APLICADA"
+        venda = await db_session.get(Venda, resposta.resultados[0].venda_id)
+        assert venda.data_venda == INICIO + timedelta(minutes=1)
+        await db_session.refresh(lote)
+        assert float(lote.quantidade_atual) == 6
+        assert await _estoque(db_session, produto) == 6
+
+    @pytest.mark.asyncio
+    async def test_sem_caixa_aberto(self, db_session, loja):
+        with pytest.raises(BusinessRuleException):
+            await SincronizacaoPDVService(db_session).sincronizar(SincronizacaoPDVRequest(
+                operador_id=2,
+                operacoes=[_venda("venda-0001", 1, (loja["cimento"].id, 1, 32.90))],
+            ))
+
+    def test_operacao_exige_dados_do_tipo(self):
+        with pytest.raises(ValidationError):
+            OperacaoOfflineCreate(id_cliente="venda-0001", tipo="VENDA", registrado_em=INICIO)
+        with pytest.raises(ValidationError):
+            OperacaoOfflineCreate(
+                id_cliente="sangria-0001", tipo="SANGRIA", registrado_em=INICIO,
+                sangria={"valor": 10, "descricao": "Cofre"},
+                suprimento={"valor": 10, "descricao": "Troco"},
+            )
+
+
+class TestSincronizacaoRouter:
+    """Testes dos endpoints de sincronização offline"""
+
+    @pytest.mark.asyncio
+    async def test_endpoint_sincronizacao(self, client, async_db_session):
+        categoria = Categoria(nome="Tintas", ativa=True)
+        async_db_session.add(categoria)
+        await async_db_session.flush()
+        produto = Produto(
+            codigo_barras="7893000000009", descricao="Tinta Acrílica 18L", categoria_id=categoria.id,
+            preco_custo=200, preco_venda=280, estoque_atual=1,
+        )
+        async_db_session.add_all([produto, Caixa(operador_id=1, valor_abertura=0, status=StatusCaixa.ABERTO)])
+        await async_db_session.commit()
+
+        response = await client.post("/api/v1/pdv/sincronizacao", json={
+            "operador_id": 1,
+            "operacoes": [
+                {
+                    "id_cliente": "6f1c2a9e-5b7d-4e38-9a0f-2d4c8b1e7a53",
+                    "tipo": "VENDA",
+                    "registrado_em": "2026-10-18T14:32:05-03:00",
+                    "venda": {
+                        "forma_pagamento": "PIX",
+                        "itens": [{"produto_id": produto.id, "quantidade": 2, "preco_unitario": 280}],
+                    },
+                },
+            ],
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["conflitos"] == 1
+        assert data["resultados"][0]["status"] == "CONFLITO"
+
+        response = await client.get("/api/v1/pdv/sincronizacao/conflitos?operador_id=1")
+        assert response.status_code == 200
+        conflito = response.json()[0]
+        assert conflito["registrado_em"] == "2026-10-18T17:32:05"
@@ -0,0 +1,130 @@
+"""
+Testes dos totais correntes do caixa
+
+Testa:
+- pdv/repository.py - Incremento atômico e recálculo pelo ledger
+- pdv/service.py - Saldo pelos totais correntes e conferência no fechamento
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.categorias.models import Categoria
+from app.modules.pdv.models import Caixa, MovimentacaoCaixa, StatusCaixa, TipoMovimentacaoCaixa
+from app.modules.pdv.repository import CaixaRepository
+from app.modules.pdv.schemas import (
+    FecharCaixaCreate,
+    SangriaCreate,
+    SuprimentoCreate,
+    VendaPDVCreate,
+    SincronizacaoPDVRequest,
+)
+from app.modules.pdv.service import PDVService
+from app.modules.pdv.sincronizacao_service import SincronizacaoPDVService
+from app.modules.produtos.models import Produto
+
+
+@pytest.fixture
+async def caixa(db_session: AsyncSession) -> Caixa:
+    caixa = Caixa(operador_id=1, valor_abertura=100, status=StatusCaixa.ABERTO)
+    db_session.add(caixa)
+    await db_session.commit()
+    return caixa
+
+
+@pytest.fixture
+async def produto(db_session: AsyncSession) -> Produto:
+    categoria = Categoria(nome="Básicos", ativa=True)
+    db_session.add(categoria)
+    await db_session.flush()
+    produto = Produto(
+        codigo_barras="7894000000001", descricao="Cimento CP-II 50kg", categoria_id=categoria.id,
+        preco_custo=25, preco_venda=32.90, estoque_atual=50,
+    )
+    db_session.add(produto)
+    await db_session.commit()
+    return produto
+
+
+class TestTotaisCorrentes:
+    """Testes dos totais mantidos no registro do caixa"""
+
+    @pytest.mark.asyncio
+    async def test_movimentacoes_atualizam_totais(self, db_session, caixa, produto):
+        service = PDVService(db_session)
+        await service.registrar_venda_pdv(1, VendaPDVCreate(
+            forma_pagamento="DINHEIRO",
+            itens=[{"produto_id": produto.id, "quantidade": 2, "preco_unitario": 32.90}],
+        ))
+        await service.registrar_sangria(1, SangriaCreate(valor=40, descricao="Cofre"))
+        await service.registrar_suprimento(1, SuprimentoCreate(valor=15.5, descricao="Troco"))
+        await db_session.commit()
+
+        await db_session.refresh(caixa)
+        assert float(caixa.total_entradas) == 65.80
+        assert float(caixa.total_sangrias) == 40.00
+        assert float(caixa.total_suprimentos) == 15.50
+        assert float(caixa.total_saidas) == 0
+
+        saldo = await service.calcular_saldo_caixa(caixa.id)
+        assert saldo.total_entradas == 65.80
+        assert saldo.saldo_esperado == 141.30
+        assert await CaixaRepository(db_session).get_total_por_tipo(
+            caixa.id, TipoMovimentacaoCaixa.SANGRIA
+        ) == 40.00
+
+    @pytest.mark.asyncio
+    async def test_incremento_relativo(self, db_session, caixa):
+        """Incrementos devem se acumular sobre o valor do banco"""
+        repository = CaixaRepository(db_session)
+
+        await repository.incrementar_totais(caixa.id, {
+            TipoMovimentacaoCaixa.ENTRADA: 10,
+            TipoMovimentacaoCaixa.SAIDA: 2.35,
+        })
+        await repository.incrementar_totais(caixa.id, {TipoMovimentacaoCaixa.ENTRADA: 5.1})
+
+        totais = await repository.calcular_saldo_caixa(caixa.id)
+        assert totais == {"entradas": 15.10, "saidas": 2.35, "sangrias": 0.0, "suprimentos": 0.0}
+
+    @pytest.mark.asyncio
+    async def test_sincronizacao_offline_atualiza_totais(self, db_session, caixa):
+        await SincronizacaoPDVService(db_session).sincronizar(SincronizacaoPDVRequest(
+            operador_id=1,
+            operacoes=[
+                {"id_cliente": f"sangria-000{i}", "tipo": "SANGRIA", "registrado_em": datetime(2026, 10, 18, 9, i),
+                 "sangria": {"valor": 30, "descricao": "Cofre"}}
+                for i in range(3)
+            ],
+        ))
+        await db_session.commit()
+
+        saldo = await PDVService(db_session).calcular_saldo_caixa(caixa.id)
+        assert saldo.total_sangrias == 90.00
+        assert saldo.saldo_esperado == 10.00
+
+
+class TestConferenciaFechamento:
+    """Testes da conferência dos totais contra o ledger"""
+
+    @pytest.mark.asyncio
+    async def test_fechamento_corrige_totais_divergentes(self, db_session, caixa):
+        """Movimentação gravada sem atualizar os totais deve ser corrigida no fechamento"""
+        service = PDVService(db_session)
+        await service.registrar_suprimento(1, SuprimentoCreate(valor=20, descricao="Troco"))
+        db_session.add(MovimentacaoCaixa(
+            caixa_id=caixa.id, tipo=TipoMovimentacaoCaixa.SANGRIA, valor=50, descricao="Gravada fora do repository",
+        ))
+        await db_session.commit()
+
+        assert (await service.calcular_saldo_caixa(caixa.id)).total_sangrias == 0
+
+        await service.fechar_caixa(1, FecharCaixaCreate(valor_fechamento=70))
+        await db_session.commit()
+
+        saldo = await service.calcular_saldo_caixa(caixa.id)
+        assert saldo.total_sangrias == 50.00
+        assert saldo.total_suprimentos == 20.00
+        assert saldo.saldo_esperado == 70.00
+        assert await service.conferir_totais_caixa(caixa.id) is True
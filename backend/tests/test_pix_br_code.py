@@ -0,0 +1,165 @@
+"""
+Testes do BR Code PIX e do QR Code em cache
+
+Testa:
+- services/br_code.py - TLV EMV, CRC16 e renderização PNG/SVG
+- services/pix_service.py - QR Code estático servido do cache
+- router.py - QR Code da chave
+"""
+import base64
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache_service
+from app.modules.pagamentos.models import ChavePix, StatusPagamento, TipoChavePix
+from app.modules.pagamentos.schemas import TransacaoPixCreate, WebhookPixPayload
+from app.modules.pagamentos.services import pix_service as modulo
+from app.modules.pagamentos.services.br_code import (
+    chave_cache_qr_code,
+    crc16_ccitt,
+    gerar_br_code,
+    renderizar_qr_code,
+)
+from app.modules.pagamentos.services.pix_service import PixService
+
+# Exemplo do Manual de Padrões para Iniciação do PIX (BACEN)
+EXEMPLO_BACEN = (
+    "00020126580014br.gov.bcb.pix0136123e4567-e12b-12d1-a456-426655440000"
+    "5204000053039865802BR5913Fulano de Tal6008BRASILIA62070503***63041D3D"
+)
+
+
+def campos_emv(payload: str) -> Dict[str, str]:
+    """Decodifica um nível do TLV EMV (ID 2 dígitos, tamanho 2 dígitos, valor)"""
+    campos, i = {}, 0
+    while i < len(payload):
+        tamanho = int(payload[i + 2:i + 4])
+        campos[payload[i:i + 2]] = payload[i + 4:i + 4 + tamanho]
+        i += 4 + tamanho
+    return campos
+
+
+@pytest.fixture
+async def chave_pix(db_session: AsyncSession):
+    chave = ChavePix(
+        tipo=TipoChavePix.CNPJ, chave="12345678000190", banco="001", agencia="1234", conta="12345-6",
+    )
+    db_session.add(chave)
+    await db_session.commit()
+    return chave
+
+
+class TestBRCode:
+    """Testes do payload EMV"""
+
+    def test_exemplo_do_manual(self):
+        payload = gerar_br_code("123e4567-e12b-12d1-a456-426655440000", "Fulano de Tal", "BRASILIA")
+
+        assert payload == EXEMPLO_BACEN
+        assert crc16_ccitt(payload[:-4]) == "1D3D"
+
+    def test_cobranca_com_valor_e_txid(self):
+        payload = gerar_br_code(
+            "12345678000190", "José Conceição & Filhos Materiais", "São João del-Rei",
+            valor=Decimal("1500.5"), txid="a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4", descricao="Pedido nº 10",
+        )
+
+        assert payload.startswith("000201" "010212")
+        assert "5407" "1500.50" in payload
+        assert "5925" "Jose Conceicao  Filhos Ma" in payload
+        assert "6015" "Sao Joao del-Re" in payload
+        assert "62290525" "a1b2c3d4e5f6a1b2c3d4e5f6a" in payload
+        assert "0212" "Pedido no 10" in payload
+        assert payload[-8:-4] == "6304" and crc16_ccitt(payload[:-4]) == payload[-4:]
+
+    @pytest.mark.asyncio
+    async def test_renderiza_png_e_svg(self):
+        png = await renderizar_qr_code(EXEMPLO_BACEN, "png")
+        svg = await renderizar_qr_code(EXEMPLO_BACEN, "svg")
+
+        assert base64.b64decode(png.split(",")[1]).startswith(b"\x89PNG")
+        assert svg.startswith("data:image/svg+xml;base64,")
+        assert b"<svg" in base64.b64decode(svg.split(",")[1])
+        with pytest.raises(ValueError):
+            await renderizar_qr_code(EXEMPLO_BACEN, "gif")
+
+
+class TestQRCodeEmCache:
+    """Testes do cache por hash do payload"""
+
+    @pytest.mark.asyncio
+    async def test_qr_code_estatico_renderizado_uma_vez(self, db_session, chave_pix, monkeypatch):
+        renderizacoes = []
+        original = modulo.renderizar_qr_code
+
+        async def contar(payload, formato="png"):
+            renderizacoes.append((payload, formato))
+            return await original(payload, formato)
+
+        monkeypatch.setattr(modulo, "renderizar_qr_code", contar)
+        service = PixService(db_session)
+        valor = Decimal("37.90")
+        texto = service._gerar_pix_copia_cola(chave_pix.chave, valor)
+        await cache_service.delete(chave_cache_qr_code(texto, "svg"))
+
+        primeiro = await service.gerar_qr_code_estatico(chave_pix.id, valor, formato="svg")
+        segundo = await service.gerar_qr_code_estatico(chave_pix.id, valor, formato="svg")
+
+        assert primeiro == segundo
+        assert primeiro["qr_code_texto"] == texto
+        assert renderizacoes == [(texto, "svg")]
+
+    @pytest.mark.asyncio
+    async def test_cobranca_com_txid_e_svg(self, db_session, chave_pix):
+        transacao = await PixService(db_session).criar_cobranca_pix(TransacaoPixCreate(
+            chave_pix_id=chave_pix.id, valor=Decimal("10.00"), formato_qr_code="svg",
+        ))
+
+        assert transacao.txid in transacao.qr_code_texto
+        assert transacao.qr_code_imagem.startswith("data:image/svg+xml;base64,")
+
+    @pytest.mark.asyncio
+    async def test_webhook_com_txid_lido_do_qr_code(self, db_session, chave_pix):
+        service = PixService(db_session)
+        transacao = await service.criar_cobranca_pix(TransacaoPixCreate(
+            chave_pix_id=chave_pix.id, valor=Decimal("10.00"),
+        ))
+
+        # O PSP devolve o txid do campo 62-05 do QR Code pago
+        txid = campos_emv(campos_emv(transacao.qr_code_texto)["62"])["05"]
+        assert txid == transacao.txid
+
+        paga = await service.processar_webhook_pagamento(WebhookPixPayload(
+            txid=txid, e2e_id="E00000000202610191200ABCDEFGHIJK", valor=Decimal("10.00"),
+            pagador_nome="CLIENTE", pagador_documento="12345678901",
+            data_pagamento=datetime(2026, 10, 19, 12, 0),
+        ))
+        assert paga.id == transacao.id
+        assert paga.status == StatusPagamento.APROVADO
+
+
+class TestQRCodeRouter:
+    """Testes do QR Code da chave"""
+
+    @pytest.mark.asyncio
+    async def test_qr_code_da_chave(self, client, auth_headers, async_db_session):
+        chave = ChavePix(
+            tipo=TipoChavePix.EMAIL, chave="pix@empresa.com.br", banco="001", agencia="1234", conta="1",
+        )
+        async_db_session.add(chave)
+        await async_db_session.commit()
+
+        response = await client.get(
+            f"/api/v1/pagamentos/pix/chaves/{chave.id}/qrcode", params={"valor": "5.00"}, headers=auth_headers
+        )
+        assert response.status_code == 200
+        dados = response.json()
+        assert "0118pix@empresa.com.br" in dados["qr_code_texto"]
+        assert dados["qr_code_imagem"].startswith("data:image/png;base64,")
+
+        response = await client.get("/api/v1/pagamentos/pix/chaves/999/qrcode", headers=auth_headers)
+        assert response.status_code == 404
@@ -0,0 +1,112 @@
+"""
+Testes da busca de produtos
+
+Testa:
+- produtos/busca.py - Índice n-grama em memória (fallback sem full-text)
+- produtos/repository.py - Busca ranqueada com total
+"""
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.categorias.models import Categoria
+from app.modules.produtos.models import Produto
+from app.modules.produtos.busca import IndiceNGramProdutos, normalizar_texto
+from app.modules.produtos.repository import ProdutoRepository
+
+
+@pytest.fixture
+def indice() -> IndiceNGramProdutos:
+    indice = IndiceNGramProdutos()
+    indice.carregar_produtos([
+        (1, "Cimento CP-II 50kg Votoran", "7891000000011", True),
+        (2, "Argamassa AC-III Cimentcola", "7891000000028", True),
+        (3, "Tubo PVC Soldável 25mm", "7891000000035", True),
+        (4, "Vergalhão CA-50 10mm", "7891000000042", True),
+        (5, "Cimento Branco Estrutural", "7891000000059", False),
+        (6, "Conexão Joelho PVC 25mm", "7891000000066", True),
+    ])
+    return indice
+
+
+class TestIndiceNGram:
+    """Testes do índice n-grama"""
+
+    def test_normalizar_texto(self):
+        """Deve remover acentos, maiúsculas e espaços extras"""
+        assert normalizar_texto("  Vergalhão   CA-50 ") == "vergalhao ca-50"
+
+    def test_busca_ignora_acentos(self, indice):
+        """Termo sem acento deve encontrar descrição acentuada e vice-versa"""
+        assert indice.buscar("vergalhao") == ([4], 1)
+        assert indice.buscar("CONEXÃO") == ([6], 1)
+
+    def test_busca_varias_palavras(self, indice):
+        """Todas as palavras devem estar presentes, em qualquer ordem"""
+        assert indice.buscar("25mm pvc") == ([3, 6], 2)
+        assert indice.buscar("tubo joelho") == ([], 0)
+
+    def test_ranking_prefixo_antes_de_substring(self, indice):
+        """Descrição iniciando pelo termo vem antes de termo no meio da palavra"""
+        ids, total = indice.buscar("ciment", apenas_ativos=False)
+        assert total == 3
+        assert ids[-1] == 2
+
+    def test_codigo_barras_exato_primeiro(self, indice):
+        """Código de barras exato deve ser o primeiro resultado"""
+        ids, _ = indice.buscar("7891000000035")
+        assert ids[0] == 3
+        assert indice.buscar("78910000000")[1] == 5
+
+    def test_termo_curto_por_prefixo(self, indice):
+        """Termos de 1-2 caracteres usam prefixo de palavra"""
+        assert indice.buscar("tu")[0] == [3]
+
+    def test_apenas_ativos_e_paginacao(self, indice):
+        """Deve filtrar inativos e paginar mantendo o total"""
+        assert indice.buscar("cimento")[1] == 1
+        ids, total = indice.buscar("25", skip=1, limit=1)
+        assert total == 2
+        assert len(ids) == 1
+
+    def test_reindexar_produto(self, indice):
+        """Alterar a descrição deve refletir na busca sem reconstruir o índice"""
+        indice.adicionar(3, "Tubo Esgoto 100mm", "7891000000035", True)
+        assert indice.buscar("soldavel") == ([], 0)
+        assert indice.buscar("esgoto") == ([3], 1)
+        indice.remover(3)
+        assert indice.buscar("esgoto") == ([], 0)
+
+
+class TestBuscaRepository:
+    """Testes da busca pelo repository (SQLite usa o índice em memória)"""
+
+    @pytest.mark.asyncio
+    async def test_busca_com_total_e_atualizacao(self, db_session: AsyncSession):
+        """Deve retornar produtos ranqueados e acompanhar alterações via ORM"""
+        categoria = Categoria(nome="Hidráulica", ativa=True)
+        db_session.add(categoria)
+        await db_session.flush()
+        for i, descricao in enumerate(["Registro de Gaveta 3/4", "Torneira Jardim", "Registro Pressão"]):
+            db_session.add(Produto(
+                codigo_barras=f"78920000000{i}", descricao=descricao, categoria_id=categoria.id,
+                preco_custo=10, preco_venda=20, estoque_atual=1, estoque_minimo=0,
+            ))
+        await db_session.commit()
+
+        repository = ProdutoRepository(db_session)
+        produtos, total = await repository.buscar("registro", 0, 1)
+        assert total == 2
+        assert len(produtos) == 1
+        assert produtos[0].descricao.startswith("Registro")
+
+        novo = Produto(
+            codigo_barras="789200000099", descricao="Registro Esfera PVC", categoria_id=categoria.id,
+            preco_custo=10, preco_venda=20, estoque_atual=1, estoque_minimo=0,
+        )
+        db_session.add(novo)
+        await db_session.commit()
+        assert (await repository.buscar("esfera"))[1] == 1
+
+        novo.ativo = False
+        await db_session.commit()
+        assert await repository.search_by_descricao("esfera") == []
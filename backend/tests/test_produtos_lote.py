@@ -0,0 +1,223 @@
+"""
+Testes da atualização em lote de produtos
+
+Testa:
+- produtos/repository.py - Filtro, expressões e UPDATE em lote
+- produtos/service.py - Prévia (dry_run), validações e auditoria
+- produtos/router.py - POST /produtos/lote/atualizar
+"""
+import json
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationException
+from app.modules.categorias.models import Categoria
+from app.modules.compras.models import PedidoCompra, ItemPedidoCompra
+from app.modules.fornecedores.models import Fornecedor
+from app.modules.produtos.models import (
+    Produto,
+    LoteAtualizacaoProdutos,
+    HistoricoPrecoProduto,
+)
+from app.modules.produtos.indice_codigo_barras import _CHAVE_ALTERADOS
+from app.modules.produtos.schemas import AtualizacaoLoteRequest
+from app.modules.produtos.service import ProdutoService
+
+
+@pytest.fixture
+async def catalogo(db_session: AsyncSession) -> dict:
+    """Cimentos (NCM 2523), tubos (outra categoria) e um fornecedor de tubos"""
+    cimentos = Categoria(nome="Cimentos", ativa=True)
+    hidraulica = Categoria(nome="Hidráulica", ativa=True)
+    db_session.add_all([cimentos, hidraulica])
+    await db_session.flush()
+
+    produtos = [
+        Produto(codigo_barras="7891000000001", descricao="Cimento CP-II 50kg", categoria_id=cimentos.id,
+                preco_custo=25.00, preco_venda=32.90, ncm="25232910"),
+        Produto(codigo_barras="7891000000002", descricao="Cimento CP-V 40kg", categoria_id=cimentos.id,
+                preco_custo=28.00, preco_venda=36.50, ncm="25232910"),
+        Produto(codigo_barras="7891000000003", descricao="Tubo PVC 25mm", categoria_id=hidraulica.id,
+                preco_custo=10.00, preco_venda=15.00, ncm="39172300"),
+        Produto(codigo_barras="7891000000004", descricao="Tubo PVC 50mm", categoria_id=hidraulica.id,
+                preco_custo=20.00, preco_venda=29.00, ncm="39172300", ativo=False),
+    ]
+    db_session.add_all(produtos)
+
+    fornecedor = Fornecedor(razao_social="Tubos SA", cnpj="12.345.678/0001-90")
+    db_session.add(fornecedor)
+    await db_session.flush()
+    pedido = PedidoCompra(
+        fornecedor_id=fornecedor.id, data_pedido=date(2026, 9, 1), data_entrega_prevista=date(2026, 9, 10),
+    )
+    db_session.add(pedido)
+    await db_session.flush()
+    db_session.add(ItemPedidoCompra(
+        pedido_id=pedido.id, produto_id=produtos[2].id, quantidade_solicitada=10,
+        preco_unitario=10, subtotal_item=100,
+    ))
+    await db_session.commit()
+    return {"produtos": produtos, "cimentos": cimentos, "fornecedor": fornecedor}
+
+
+async def _precos(db_session: AsyncSession) -> dict:
+    result = await db_session.execute(
+        select(Produto.codigo_barras, Produto.preco_custo, Produto.preco_venda, Produto.ativo)
+    )
+    return {c: (float(custo), float(venda), ativo) for c, custo, venda, ativo in result}
+
+
+class TestAtualizacaoLoteService:
+    """Testes do service de atualização em lote"""
+
+    @pytest.mark.asyncio
+    async def test_dry_run_nao_grava(self, db_session, catalogo):
+        """Prévia deve calcular os novos preços sem alterar produtos nem gravar lote"""
+        service = ProdutoService(db_session)
+        resposta = await service.atualizar_em_lote(AtualizacaoLoteRequest(
+            filtro={"ncm": "2523"},
+            preco_venda={"tipo": "PERCENTUAL", "valor": 10},
+            dry_run=True,
+        ))
+
+        assert resposta.dry_run is True
+        assert resposta.lote_id is None
+        assert resposta.total_produtos == 2
+        assert [p.preco_venda_novo for p in resposta.amostra] == [36.19, 40.15]
+        assert (await _precos(db_session))["7891000000001"][1] == 32.90
+        total_lotes = await db_session.execute(select(LoteAtualizacaoProdutos))
+        assert total_lotes.first() is None
+
+    @pytest.mark.asyncio
+    async def test_reajuste_percentual_por_categoria_com_auditoria(self, db_session, catalogo):
+        """Deve atualizar a categoria em um lote e registrar valores anteriores/novos"""
+        service = ProdutoService(db_session)
+        resposta = await service.atualizar_em_lote(AtualizacaoLoteRequest(
+            filtro={"categoria_ids": [catalogo["cimentos"].id]},
+            preco_custo={"tipo": "PERCENTUAL", "valor": 8},
+            preco_venda={"tipo": "PERCENTUAL", "valor": 8},
+            motivo="Reajuste Votoran",
+            usuario_id=7,
+        ))
+        await db_session.commit()
+
+        assert resposta.total_produtos == 2
+        precos = await _precos(db_session)
+        assert precos["7891000000001"] == (27.00, 35.53, True)
+        assert precos["7891000000002"] == (30.24, 39.42, True)
+        assert precos["7891000000003"] == (10.00, 15.00, True)
+
+        lote = await db_session.get(LoteAtualizacaoProdutos, resposta.lote_id)
+        assert lote.total_produtos == 2
+        assert lote.usuario_id == 7
+        assert json.loads(lote.alteracoes)["preco_venda"] == {"tipo": "PERCENTUAL", "valor": 8.0}
+
+        result = await db_session.execute(
+            select(HistoricoPrecoProduto).where(HistoricoPrecoProduto.lote_id == lote.id)
+            .order_by(HistoricoPrecoProduto.produto_id)
+        )
+        historico = result.scalars().all()
+        assert [(float(h.preco_custo_anterior), float(h.preco_custo_novo)) for h in historico] == [
+            (25.00, 27.00), (28.00, 30.24),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_margem_sobre_custo_ajustado(self, db_session, catalogo):
+        """MARGEM deve calcular o preço de venda sobre o custo já ajustado"""
+        service = ProdutoService(db_session)
+        await service.atualizar_em_lote(AtualizacaoLoteRequest(
+            filtro={"produto_ids": [catalogo["produtos"][0].id]},
+            preco_custo={"tipo": "VALOR", "valor": 5},
+            preco_venda={"tipo": "MARGEM", "valor": 40},
+        ))
+        await db_session.commit()
+
+        assert (await _precos(db_session))["7891000000001"] == (30.00, 42.00, True)
+
+    @pytest.mark.asyncio
+    async def test_filtro_fornecedor_e_inativacao(self, db_session, catalogo):
+        """Fornecedor deve selecionar produtos dos pedidos de compra; ativo é alterado sem mexer em preços"""
+        service = ProdutoService(db_session)
+        resposta = await service.atualizar_em_lote(AtualizacaoLoteRequest(
+            filtro={"fornecedor_id": catalogo["fornecedor"].id},
+            ativo=False,
+        ))
+        await db_session.commit()
+
+        assert resposta.total_produtos == 1
+        precos = await _precos(db_session)
+        assert precos["7891000000003"] == (10.00, 15.00, False)
+        assert precos["7891000000001"][2] is True
+
+    @pytest.mark.asyncio
+    async def test_venda_abaixo_do_custo_rejeita_lote(self, db_session, catalogo):
+        """Lote com venda < custo deve ser rejeitado (e apenas reportado no dry_run)"""
+        service = ProdutoService(db_session)
+        dados = {
+            "filtro": {"ncm": "2523"},
+            "preco_custo": {"tipo": "FIXO", "valor": 40},
+        }
+        previa = await service.atualizar_em_lote(AtualizacaoLoteRequest(**dados, dry_run=True))
+        assert previa.venda_abaixo_custo == 2
+
+        with pytest.raises(ValidationException):
+            await service.atualizar_em_lote(AtualizacaoLoteRequest(**dados))
+
+        with pytest.raises(ValidationException):
+            await service.atualizar_em_lote(AtualizacaoLoteRequest(
+                filtro={"ncm": "2523"},
+                preco_venda={"tipo": "VALOR", "valor": -50},
+                dry_run=True,
+            ))
+        assert (await _precos(db_session))["7891000000001"] == (25.00, 32.90, True)
+
+    @pytest.mark.asyncio
+    async def test_uma_invalidacao_por_lote(self, db_session, catalogo):
+        """Os produtos do lote devem ser registrados para uma única invalidação no commit"""
+        service = ProdutoService(db_session)
+        await service.atualizar_em_lote(AtualizacaoLoteRequest(
+            filtro={"categoria_ids": [catalogo["cimentos"].id]},
+            preco_venda={"tipo": "VALOR", "valor": 1},
+        ))
+
+        alterados = db_session.sync_session.info[_CHAVE_ALTERADOS]
+        assert alterados == {catalogo["produtos"][0].id, catalogo["produtos"][1].id}
+
+    def test_request_exige_filtro_e_alteracao(self):
+        """Request sem filtro, sem alteração ou com MARGEM no custo deve ser inválido"""
+        with pytest.raises(ValidationError):
+            AtualizacaoLoteRequest(filtro={"apenas_ativos": True}, ativo=False)
+        with pytest.raises(ValidationError):
+            AtualizacaoLoteRequest(filtro={"ncm": "2523"})
+        with pytest.raises(ValidationError):
+            AtualizacaoLoteRequest(filtro={"ncm": "2523"}, preco_custo={"tipo": "MARGEM", "valor": 10})
+
+
+class TestAtualizacaoLoteRouter:
+    """Testes do endpoint de atualização em lote"""
+
+    @pytest.mark.asyncio
+    async def test_endpoint_dry_run(self, client, async_db_session):
+        categoria = Categoria(nome="Tintas", ativa=True)
+        async_db_session.add(categoria)
+        await async_db_session.flush()
+        async_db_session.add(Produto(
+            codigo_barras="7892000000001", descricao="Tinta Acrílica 18L", categoria_id=categoria.id,
+            preco_custo=200, preco_venda=280,
+        ))
+        await async_db_session.commit()
+
+        response = await client.post("/api/v1/produtos/lote/atualizar", json={
+            "filtro": {"categoria_ids": [categoria.id]},
+            "preco_venda": {"tipo": "PERCENTUAL", "valor": -5},
+            "dry_run": True,
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_produtos"] == 1
+        assert data["amostra"][0]["preco_venda_novo"] == 266.0
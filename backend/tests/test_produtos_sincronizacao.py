@@ -0,0 +1,159 @@
+"""
+Testes da sincronização incremental do catálogo de produtos
+
+Testa:
+- produtos/sincronizacao.py - Cursor e tombstones
+- produtos/service.py - Deltas por keyset em (updated_at, id)
+- produtos/router.py - GET /produtos/sincronizacao/catalogo
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import ValidationException
+from app.modules.categorias.models import Categoria
+from app.modules.produtos.models import Produto
+from app.modules.produtos.schemas import AtualizacaoLoteRequest
+from app.modules.produtos.service import ProdutoService
+from app.modules.produtos.sincronizacao import CursorCatalogo
+
+
+@pytest.fixture(autouse=True)
+def sem_atraso(monkeypatch):
+    """Sem atraso do limite superior (produtos dos testes acabaram de ser gravados)"""
+    monkeypatch.setattr(settings, "CATALOGO_SYNC_ATRASO_SEGUNDOS", 0)
+
+
+@pytest.fixture
+async def produtos(db_session: AsyncSession) -> list:
+    categoria = Categoria(nome="Hidráulica", ativa=True)
+    db_session.add(categoria)
+    await db_session.flush()
+    produtos = [
+        Produto(
+            codigo_barras=f"78940000000{i}", descricao=f"Joelho PVC {20 + i * 5}mm",
+            categoria_id=categoria.id, preco_custo=1, preco_venda=2 + i,
+            estoque_atual=i, estoque_minimo=1,
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(produtos)
+    await db_session.commit()
+    return produtos
+
+
+async def _sincronizar_tudo(service: ProdutoService, cursor=None, limit=1000):
+    """Chama a sincronização até mais=False, acumulando as respostas"""
+    respostas = [await service.sincronizar_catalogo(cursor, limit)]
+    while respostas[-1].mais:
+        respostas.append(await service.sincronizar_catalogo(respostas[-1].cursor, limit))
+    return respostas
+
+
+class TestCursorCatalogo:
+    """Testes do cursor opaco"""
+
+    def test_codificar_decodificar(self):
+        cursor = CursorCatalogo(datetime(2026, 10, 18, 9, 30, 0, 123456), 42, 7)
+        assert CursorCatalogo.decodificar(cursor.codificar()) == cursor
+
+    def test_cursor_invalido(self):
+        with pytest.raises(ValidationException):
+            CursorCatalogo.decodificar("nao-e-um-cursor")
+
+
+class TestSincronizacaoCatalogo:
+    """Testes do delta do catálogo"""
+
+    @pytest.mark.asyncio
+    async def test_sincronizacao_completa_paginada(self, db_session, produtos):
+        """Sem cursor deve retornar todo o catálogo em páginas sem repetir produtos"""
+        service = ProdutoService(db_session)
+        respostas = await _sincronizar_tudo(service, limit=2)
+
+        assert len(respostas) == 3
+        assert respostas[0].completo is True
+        ids = [p.id for r in respostas for p in r.alterados]
+        assert sorted(ids) == sorted(p.id for p in produtos)
+        delta = next(p for r in respostas for p in r.alterados if p.id == produtos[0].id)
+        assert delta.em_estoque is False
+        assert delta.estoque_baixo is True
+
+    @pytest.mark.asyncio
+    async def test_delta_apenas_alterados(self, db_session, produtos):
+        """Com cursor deve retornar só os produtos alterados e inativados"""
+        service = ProdutoService(db_session)
+        cursor = (await _sincronizar_tudo(service))[-1].cursor
+
+        vazio = await service.sincronizar_catalogo(cursor)
+        assert vazio.alterados == [] and vazio.removidos == []
+        assert vazio.completo is False
+
+        produtos[1].preco_venda = 9.90
+        produtos[3].ativo = False
+        await db_session.commit()
+
+        delta = await service.sincronizar_catalogo(cursor)
+        assert [(p.id, p.preco_venda) for p in delta.alterados] == [(produtos[1].id, 9.90)]
+        assert delta.removidos == [produtos[3].id]
+
+    @pytest.mark.asyncio
+    async def test_exclusao_gera_tombstone(self, db_session, produtos):
+        """Exclusão física deve aparecer em removidos pelo tombstone"""
+        service = ProdutoService(db_session)
+        cursor = (await _sincronizar_tudo(service))[-1].cursor
+        produto_id = produtos[4].id
+
+        await db_session.delete(produtos[4])
+        await db_session.commit()
+
+        delta = await service.sincronizar_catalogo(cursor)
+        assert delta.removidos == [produto_id]
+        assert (await service.sincronizar_catalogo(delta.cursor)).removidos == []
+
+    @pytest.mark.asyncio
+    async def test_lote_regrava_updated_at_no_commit(self, db_session, produtos):
+        """Lote em transação longa deve aparecer para cursores gerados antes do commit"""
+        service = ProdutoService(db_session)
+        ids = [produtos[0].id, produtos[2].id]
+        await service.atualizar_em_lote(AtualizacaoLoteRequest(
+            filtro={"produto_ids": ids},
+            preco_venda={"tipo": "VALOR", "valor": 1},
+        ))
+        # O UPDATE do lote gravou updated_at muito antes do commit
+        await db_session.execute(
+            update(Produto).where(Produto.id.in_(ids)).values(updated_at=datetime(2000, 1, 1))
+        )
+        cursor = (await _sincronizar_tudo(service))[-1].cursor
+        await db_session.commit()
+
+        delta = await service.sincronizar_catalogo(cursor)
+        assert sorted(p.id for p in delta.alterados) == ids
+
+    @pytest.mark.asyncio
+    async def test_atraso_adia_alteracoes_recentes(self, db_session, produtos, monkeypatch):
+        """Alterações dentro do atraso devem ficar para a chamada seguinte"""
+        monkeypatch.setattr(settings, "CATALOGO_SYNC_ATRASO_SEGUNDOS", 3600)
+        service = ProdutoService(db_session)
+
+        resposta = await service.sincronizar_catalogo()
+        assert resposta.alterados == []
+        assert CursorCatalogo.decodificar(resposta.cursor).atualizado_em is None
+
+
+class TestSincronizacaoRouter:
+    """Testes do endpoint de sincronização"""
+
+    @pytest.mark.asyncio
+    async def test_endpoint(self, client):
+        response = await client.get("/api/v1/produtos/sincronizacao/catalogo", params={"limit": 10})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["completo"] is True
+        assert data["mais"] is False
+
+        response = await client.get("/api/v1/produtos/sincronizacao/catalogo", params={"cursor": "x"})
+        assert response.status_code == 400
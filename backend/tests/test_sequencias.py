@@ -0,0 +1,132 @@
+"""
+Testes da numeração sequencial
+
+Testa:
+- core/sequencias.py - Reserva por UPDATE ... RETURNING, blocos por worker
+  e emissões concorrentes sem números repetidos
+- Boletos, pedidos de venda e NFC-e usando as sequências
+"""
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.sequencias import AlocadorSequencias, Sequencia
+from app.modules.nfe.schemas import EmitirNFCeCreate
+from app.modules.nfe.service import NotaFiscalService
+from app.modules.pagamentos.models import Boleto, ConfiguracaoBoleto
+from app.modules.pagamentos.services.boleto_service import BoletoService
+from app.modules.pedidos_venda.models import PedidoVenda
+from app.modules.pedidos_venda.repository import PedidoVendaRepository
+
+
+class AlocadorComBloco(AlocadorSequencias):
+    """Alocador que reserva blocos também em SQLite (simula um worker em PostgreSQL)"""
+
+    dialetos_sem_bloco = ()
+
+
+async def _emitir(fabrica, alocador: AlocadorSequencias, nome: str, quantidade: int) -> list:
+    numeros = []
+    for _ in range(quantidade):
+        async with fabrica() as session:
+            numeros.append(await alocador.proximo(session, nome, bloco=5))
+            await session.commit()
+    return numeros
+
+
+class TestAlocador:
+    """Testes do alocador"""
+
+    @pytest.mark.asyncio
+    async def test_emissoes_concorrentes_sem_repeticao(self, async_db_engine):
+        fabrica = async_sessionmaker(async_db_engine, class_=AsyncSession, expire_on_commit=False)
+        # Quatro workers com blocos próprios + emissões na transação do chamador
+        workers = [AlocadorComBloco() for _ in range(4)]
+        tarefas = [_emitir(fabrica, worker, "teste", 12) for worker in workers for _ in range(3)]
+        tarefas += [_emitir(fabrica, AlocadorSequencias(), "teste", 12) for _ in range(4)]
+
+        resultados = await asyncio.gather(*tarefas)
+
+        numeros = [n for lista in resultados for n in lista]
+        assert len(numeros) == 16 * 12
+        assert len(set(numeros)) == len(numeros)
+        # Cada worker tem no máximo um bloco parcialmente usado
+        async with fabrica() as session:
+            reservado = (await session.execute(
+                select(Sequencia.valor).where(Sequencia.nome == "teste")
+            )).scalar_one()
+        assert max(numeros) <= reservado <= len(numeros) + 4 * 5
+
+    @pytest.mark.asyncio
+    async def test_bloco_sem_ida_ao_banco(self, db_session: AsyncSession):
+        alocador = AlocadorComBloco()
+
+        async def inicial(executor) -> int:
+            return 100
+
+        numeros = [await alocador.proximo(db_session, "bloco", inicial, bloco=3) for _ in range(4)]
+
+        assert numeros == [101, 102, 103, 104]
+        valor = (await db_session.execute(
+            select(Sequencia.valor).where(Sequencia.nome == "bloco")
+        )).scalar_one()
+        assert valor == 106
+
+    @pytest.mark.asyncio
+    async def test_reserva_segue_rollback_do_chamador(self, db_session: AsyncSession):
+        alocador = AlocadorSequencias()
+
+        assert await alocador.proximo(db_session, "pedido") == 1
+        await db_session.commit()
+        assert await alocador.proximo(db_session, "pedido") == 2
+        await db_session.rollback()
+
+        assert await alocador.proximo(db_session, "pedido") == 2
+
+
+class TestUsoDasSequencias:
+    """Testes dos documentos numerados"""
+
+    @pytest.mark.asyncio
+    async def test_nosso_numero_continua_do_ultimo_boleto(self, db_session: AsyncSession):
+        config = ConfiguracaoBoleto(
+            banco_codigo="001", banco_nome="Banco do Brasil", agencia="1234", conta="12345", conta_dv="6",
+            cedente_nome="EMPRESA TESTE LTDA", cedente_documento="12345678000190", carteira="18",
+        )
+        db_session.add(config)
+        await db_session.flush()
+        db_session.add(Boleto(
+            configuracao_id=config.id, nosso_numero="00000000041", numero_documento="1",
+            valor=Decimal("10.00"), data_vencimento=date(2026, 10, 15),
+            sacado_nome="CLIENTE", sacado_documento="12345678901",
+        ))
+        await db_session.flush()
+
+        service = BoletoService(db_session)
+        assert await service._gerar_nosso_numero(config) == "00000000042"
+        assert await service._gerar_nosso_numero(config) == "00000000043"
+
+    @pytest.mark.asyncio
+    async def test_numero_pedido_continua_do_maior(self, db_session: AsyncSession):
+        repository = PedidoVendaRepository(db_session)
+        maior = (await db_session.execute(
+            select(PedidoVenda.numero_pedido).order_by(PedidoVenda.numero_pedido.desc()).limit(1)
+        )).scalar()
+        esperado = int(maior[2:]) + 1 if maior else 1
+
+        assert await repository.gerar_numero_pedido() == f"PV{esperado:06d}"
+        assert await repository.gerar_numero_pedido() == f"PV{esperado + 1:06d}"
+
+    @pytest.mark.asyncio
+    async def test_nfce_numerada_por_serie(self, db_session: AsyncSession):
+        service = NotaFiscalService(db_session)
+
+        primeira = await service.emitir_nfce(EmitirNFCeCreate(venda_id=1, serie="1"))
+        segunda = await service.emitir_nfce(EmitirNFCeCreate(venda_id=2, serie="1"))
+        outra_serie = await service.emitir_nfce(EmitirNFCeCreate(venda_id=3, serie="2"))
+
+        assert (primeira.numero, segunda.numero, outra_serie.numero) == ("1", "2", "1")
@@ -240,7 +240,7 @@ async def test_query_pix_charge(mock_client, sicoob_client, mock_pix_charge_resp
     mock_instance.__aexit__ = AsyncMock()
 
     # Set token
-    sicoob_client._access_token = "test_token"
+    sicoob_client._get_access_token = AsyncMock(return_value="test_token")
 
     mock_client.return_value = mock_instance
 
@@ -273,7 +273,7 @@ async def test_query_pix_payment(mock_client, sicoob_client):
     mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
     mock_instance.__aexit__ = AsyncMock()
 
-    sicoob_client._access_token = "test_token"
+    sicoob_client._get_access_token = AsyncMock(return_value="test_token")
 
     mock_client.return_value = mock_instance
 
@@ -306,7 +306,7 @@ async def test_refund_pix_payment(mock_client, sicoob_client):
     mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
     mock_instance.__aexit__ = AsyncMock()
 
-    sicoob_client._access_token = "test_token"
+    sicoob_client._get_access_token = AsyncMock(return_value="test_token")
 
     mock_client.return_value = mock_instance
 
@@ -382,7 +382,7 @@ async def test_query_boleto(mock_client, sicoob_client, mock_boleto_response):
     mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
     mock_instance.__aexit__ = AsyncMock()
 
-    sicoob_client._access_token = "test_token"
+    sicoob_client._get_access_token = AsyncMock(return_value="test_token")
 
     mock_client.return_value = mock_instance
 
@@ -407,7 +407,7 @@ async def test_cancel_boleto(mock_client, sicoob_client):
     mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
     mock_instance.__aexit__ = AsyncMock()
 
-    sicoob_client._access_token = "test_token"
+    sicoob_client._get_access_token = AsyncMock(return_value="test_token")
 
     mock_client.return_value = mock_instance
 
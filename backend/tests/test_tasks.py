@@ -0,0 +1,50 @@
+"""
+Testes da execução de corotinas nas tasks Celery
+
+Testa:
+- tasks/__init__.py - executar_async: um event loop por execução e pool
+  do engine descartado ao fim
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+import app.tasks as tasks
+from app.tasks import executar_async
+
+
+@pytest.fixture
+def engine_worker(tmp_path, monkeypatch):
+    """Engine com pool (como o global) trocado no módulo de tasks"""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'worker.db'}", poolclass=AsyncAdaptedQueuePool
+    )
+    monkeypatch.setattr(tasks, "engine", engine)
+    return engine
+
+
+def test_execucoes_seguidas_no_mesmo_worker(engine_worker):
+    sessoes = async_sessionmaker(engine_worker)
+
+    async def consultar():
+        async with sessoes() as session:
+            return (await session.execute(text("SELECT 1"))).scalar()
+
+    assert executar_async(consultar()) == 1
+    assert engine_worker.pool.checkedin() == 0
+    # Segunda execução em outro event loop não reaproveita conexões do primeiro
+    assert executar_async(consultar()) == 1
+
+
+def test_descarta_pool_mesmo_com_erro(engine_worker):
+    sessoes = async_sessionmaker(engine_worker)
+
+    async def falhar():
+        async with sessoes() as session:
+            await session.execute(text("SELECT 1"))
+        raise RuntimeError("falha na task")
+
+    with pytest.raises(RuntimeError):
+        executar_async(falhar())
+    assert engine_worker.pool.checkedin() == 0
@@ -0,0 +1,124 @@
+"""
+Testes da varredura de vencimentos de PIX e boletos
+
+Testa:
+- services/vencimentos.py - Um UPDATE por tabela; contas a receber dos
+  boletos vencidos passam a ATRASADA
+- services/boleto_service.py - Boleto vencido listado e cancelável
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.financeiro.models import ContaReceber, StatusFinanceiro
+from app.modules.pagamentos.models import (
+    Boleto,
+    ChavePix,
+    ConfiguracaoBoleto,
+    StatusBoleto,
+    StatusPagamento,
+    TipoChavePix,
+    TransacaoPix,
+)
+from app.modules.pagamentos.services.boleto_service import BoletoService
+from app.modules.pagamentos.services.vencimentos import varrer_vencimentos
+
+AGORA = datetime(2026, 10, 15, 12, 0)
+HOJE = AGORA.date()
+
+
+@pytest.fixture
+async def cobrancas_e_boletos(db_session: AsyncSession):
+    chave = ChavePix(tipo=TipoChavePix.CNPJ, chave="12345678000190", banco="001", agencia="1234", conta="1")
+    config = ConfiguracaoBoleto(
+        banco_codigo="001", banco_nome="Banco do Brasil", agencia="1234", conta="12345", conta_dv="6",
+        cedente_nome="EMPRESA TESTE LTDA", cedente_documento="12345678000190", carteira="18",
+    )
+    db_session.add_all([chave, config])
+    await db_session.flush()
+
+    pix = [
+        ("PIXEXPIRADO1", StatusPagamento.PENDENTE, AGORA - timedelta(minutes=1)),
+        ("PIXEXPIRADO2", StatusPagamento.PENDENTE, AGORA - timedelta(days=3)),
+        ("PIXVALIDO", StatusPagamento.PENDENTE, AGORA + timedelta(minutes=30)),
+        ("PIXSEMPRAZO", StatusPagamento.PENDENTE, None),
+        ("PIXPAGO", StatusPagamento.APROVADO, AGORA - timedelta(days=1)),
+    ]
+    boletos = [
+        ("00000000001", StatusBoleto.ABERTO, HOJE - timedelta(days=1)),
+        ("00000000002", StatusBoleto.REGISTRADO, HOJE - timedelta(days=10)),
+        ("00000000003", StatusBoleto.REGISTRADO, HOJE),
+        ("00000000004", StatusBoleto.PAGO, HOJE - timedelta(days=5)),
+    ]
+    db_session.add_all([
+        TransacaoPix(txid=txid, chave_pix_id=chave.id, valor=Decimal("10.00"), status=status, data_expiracao=expiracao)
+        for txid, status, expiracao in pix
+    ] + [
+        Boleto(
+            configuracao_id=config.id, nosso_numero=nosso_numero, numero_documento=nosso_numero,
+            valor=Decimal("100.00"), data_vencimento=vencimento, status=status,
+            sacado_nome="CLIENTE", sacado_documento="12345678901",
+        )
+        for nosso_numero, status, vencimento in boletos
+    ] + [
+        ContaReceber(
+            cliente_id=1, descricao=f"Boleto {nosso_numero}", valor_original=Decimal("100.00"),
+            valor_recebido=0, data_emissao=vencimento - timedelta(days=30),
+            data_vencimento=vencimento, status=StatusFinanceiro.PENDENTE, documento=nosso_numero,
+        )
+        for nosso_numero, _, vencimento in boletos[:3]
+    ])
+    await db_session.commit()
+
+
+class TestVarreduraVencimentos:
+    """Testes da varredura em lote"""
+
+    @pytest.mark.asyncio
+    async def test_um_update_por_tabela(self, db_session, cobrancas_e_boletos):
+        comandos = []
+        engine = db_session.bind.sync_engine
+        contar = lambda *args: comandos.append(args[2].split()[0])  # noqa: E731
+        event.listen(engine, "before_cursor_execute", contar)
+        try:
+            resultado = await varrer_vencimentos(db_session, agora=AGORA, hoje=HOJE)
+            novamente = await varrer_vencimentos(db_session, agora=AGORA, hoje=HOJE)
+        finally:
+            event.remove(engine, "before_cursor_execute", contar)
+
+        assert resultado == {"pix_expiradas": 2, "boletos_vencidos": 2, "contas_atrasadas": 2}
+        assert novamente == {"pix_expiradas": 0, "boletos_vencidos": 0, "contas_atrasadas": 0}
+        assert comandos.count("UPDATE") == 5
+        assert comandos.count("SELECT") == 0
+
+        db_session.expire_all()
+        pix = {t.txid: t.status for t in (await db_session.execute(select(TransacaoPix))).scalars()}
+        boletos = {b.nosso_numero: b.status for b in (await db_session.execute(select(Boleto))).scalars()}
+        assert pix["PIXVALIDO"] == pix["PIXSEMPRAZO"] == StatusPagamento.PENDENTE
+        assert pix["PIXPAGO"] == StatusPagamento.APROVADO
+        assert boletos == {
+            "00000000001": StatusBoleto.VENCIDO,
+            "00000000002": StatusBoleto.VENCIDO,
+            "00000000003": StatusBoleto.REGISTRADO,
+            "00000000004": StatusBoleto.PAGO,
+        }
+        contas = {c.documento: c.status for c in (await db_session.execute(select(ContaReceber))).scalars()}
+        assert contas == {
+            "00000000001": StatusFinanceiro.ATRASADA,
+            "00000000002": StatusFinanceiro.ATRASADA,
+            "00000000003": StatusFinanceiro.PENDENTE,
+        }
+
+    @pytest.mark.asyncio
+    async def test_boleto_vencido_listado_e_cancelavel(self, db_session, cobrancas_e_boletos):
+        await varrer_vencimentos(db_session, agora=AGORA, hoje=HOJE)
+        service = BoletoService(db_session)
+
+        vencidos = await service.listar_vencidos()
+        assert {b.nosso_numero for b in vencidos} >= {"00000000001", "00000000002"}
+
+        cancelado = await service.cancelar_boleto(vencidos[0].id)
+        assert cancelado.status == StatusBoleto.CANCELADO
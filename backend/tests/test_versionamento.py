@@ -0,0 +1,224 @@
+"""
+Testes do GET condicional por versão de tabela
+
+Testa:
+- core/versionamento.py - Contadores, eventos da sessão e dependency
+- Endpoints de categorias e produtos com ETag / If-None-Match
+"""
+from email.utils import formatdate
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import database
+from app.core.cache import CacheService
+from app.core.versionamento import (
+    VersoesTabelas,
+    versoes_tabelas,
+    requisicao_condicional,
+    marcar_tabelas_alteradas,
+    publicar_versoes,
+)
+from app.modules.categorias.models import Categoria
+from app.modules.produtos.models import Produto
+
+
+class _PipelineFalso:
+    def __init__(self, redis):
+        self.redis = redis
+        self.comandos = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def hsetnx(self, *args):
+        self.comandos.append((self.redis.hsetnx, args))
+
+    def hincrby(self, *args):
+        self.comandos.append((self.redis.hincrby, args))
+
+    def hset(self, *args):
+        self.comandos.append((self.redis.hset, args))
+
+    async def execute(self):
+        for comando, args in self.comandos:
+            await comando(*args)
+
+
+class RedisVersoesFalso:
+    """Hash do Redis em memória (somente os comandos usados pelas versões)"""
+
+    def __init__(self):
+        self.hash = {}
+
+    async def hmget(self, chave, campos):
+        return [self.hash.get(campo) for campo in campos]
+
+    async def hsetnx(self, chave, campo, valor):
+        if campo in self.hash:
+            return 0
+        self.hash[campo] = str(valor)
+        return 1
+
+    async def hincrby(self, chave, campo, quantidade):
+        self.hash[campo] = str(int(self.hash.get(campo, 0)) + quantidade)
+
+    async def hset(self, chave, campo, valor):
+        self.hash[campo] = str(valor)
+
+    def pipeline(self, transaction=True):
+        return _PipelineFalso(self)
+
+
+@pytest.fixture
+def redis_versoes(monkeypatch):
+    """Versões compartilhadas (como com Redis) sem servidor Redis"""
+    redis = RedisVersoesFalso()
+    monkeypatch.setattr(VersoesTabelas, "_redis", property(lambda self: redis))
+    return redis
+
+
+class TestVersoesTabelas:
+    """Testes dos contadores de versão"""
+
+    @pytest.mark.asyncio
+    async def test_incrementar(self):
+        versoes = VersoesTabelas(CacheService())
+        (inicial,), _ = await versoes.obter(["categorias"])
+
+        await versoes.incrementar(["categorias"])
+
+        (atual,), _ = await versoes.obter(["categorias"])
+        assert atual == inicial + 1
+
+    def test_tabela_nao_versionada(self):
+        with pytest.raises(ValueError):
+            requisicao_condicional("vendas")
+
+    @pytest.mark.asyncio
+    async def test_commit_incrementa_versao(self, db_session: AsyncSession):
+        """Escrita pelo ORM deve incrementar a versão somente após o commit"""
+        (antes,), _ = await versoes_tabelas.obter(["categorias"])
+
+        db_session.add(Categoria(nome="Pisos", ativa=True))
+        await db_session.flush()
+        assert (await versoes_tabelas.obter(["categorias"]))[0] == [antes]
+
+        await db_session.commit()
+        assert (await versoes_tabelas.obter(["categorias"]))[0] == [antes + 1]
+
+    @pytest.mark.asyncio
+    async def test_rollback_nao_incrementa(self, db_session: AsyncSession):
+        (antes,), _ = await versoes_tabelas.obter(["categorias"])
+
+        db_session.add(Categoria(nome="Telhas", ativa=True))
+        await db_session.flush()
+        await db_session.rollback()
+
+        assert (await versoes_tabelas.obter(["categorias"]))[0] == [antes]
+
+    @pytest.mark.asyncio
+    async def test_update_em_lote_marcado(self, db_session: AsyncSession):
+        """UPDATE em lote deve incrementar a versão quando marcado explicitamente"""
+        (antes,), _ = await versoes_tabelas.obter(["categorias"])
+
+        await db_session.execute(
+            update(Categoria).values(ativa=False).execution_options(synchronize_session=False)
+        )
+        marcar_tabelas_alteradas(db_session, "categorias")
+        await db_session.commit()
+
+        assert (await versoes_tabelas.obter(["categorias"]))[0] == [antes + 1]
+
+    @pytest.mark.asyncio
+    async def test_get_db_publica_antes_de_terminar(self, async_db_engine, redis_versoes, monkeypatch):
+        """Com Redis, o incremento é aguardado por get_db (antes da resposta)"""
+        monkeypatch.setattr(database, "AsyncSessionLocal", async_sessionmaker(async_db_engine))
+        (antes,), _ = await versoes_tabelas.obter(["categorias"])
+
+        dependencia = database.get_db()
+        session = await dependencia.__anext__()
+        session.add(Categoria(nome="Tintas", ativa=True))
+        # Commit feito pelo service: a versão só muda ao fim da requisição
+        await session.commit()
+        assert (await versoes_tabelas.obter(["categorias"]))[0] == [antes]
+
+        with pytest.raises(StopAsyncIteration):
+            await dependencia.__anext__()
+        assert (await versoes_tabelas.obter(["categorias"]))[0] == [antes + 1]
+
+
+@pytest.mark.usefixtures("redis_versoes")
+class TestGetCondicional:
+    """Testes dos endpoints com ETag"""
+
+    @pytest.mark.asyncio
+    async def test_if_none_match_retorna_304(self, client):
+        response = await client.get("/api/v1/categorias/")
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+        response = await client.get("/api/v1/categorias/", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    @pytest.mark.asyncio
+    async def test_etag_depende_dos_parametros(self, client):
+        etag_1 = (await client.get("/api/v1/categorias/?page=1")).headers["ETag"]
+        etag_2 = (await client.get("/api/v1/categorias/?page=2")).headers["ETag"]
+        assert etag_1 != etag_2
+
+    @pytest.mark.asyncio
+    async def test_escrita_invalida_etag(self, client, async_db_session: AsyncSession):
+        """Após escrita em categorias, o ETag antigo deve receber 200 com o novo conteúdo"""
+        etag = (await client.get("/api/v1/produtos/")).headers["ETag"]
+
+        categoria = Categoria(nome="Ferragens", ativa=True)
+        async_db_session.add(categoria)
+        await async_db_session.flush()
+        async_db_session.add(Produto(
+            codigo_barras="7895000000001", descricao="Dobradiça 3\"", categoria_id=categoria.id,
+            preco_custo=5, preco_venda=9,
+        ))
+        await async_db_session.commit()
+        await publicar_versoes(async_db_session)
+
+        response = await client.get("/api/v1/produtos/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+        assert response.headers["ETag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_if_modified_since(self, client):
+        _, alterado_em = await versoes_tabelas.obter(["condicoes_pagamento", "parcelas_padrao"])
+
+        response = await client.get(
+            "/api/v1/condicoes-pagamento/ativas/list",
+            headers={"If-Modified-Since": formatdate(int(alterado_em) + 60, usegmt=True)},
+        )
+        assert response.status_code == 304
+
+        response = await client.get(
+            "/api/v1/condicoes-pagamento/ativas/list",
+            headers={"If-Modified-Since": formatdate(int(alterado_em) - 60, usegmt=True)},
+        )
+        assert response.status_code == 200
+
+
+class TestGetCondicionalSemRedis:
+    """Sem Redis cada worker teria as próprias versões: sem ETag nem 304"""
+
+    @pytest.mark.asyncio
+    async def test_sem_etag(self, client):
+        response = await client.get("/api/v1/categorias/")
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+
+        response = await client.get("/api/v1/categorias/", headers={"If-None-Match": "*"})
+        assert response.status_code == 200
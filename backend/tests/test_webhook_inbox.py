@@ -0,0 +1,201 @@
+"""
+Testes da inbox de webhooks de pagamento
+
+Testa:
+- services/webhook_inbox.py - Gravação idempotente, lotes em ordem por
+  pagamento, tentativas e replay
+- services/payment_webhook_handler.py - Endpoint responde após gravar
+"""
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.exceptions import ValidationException
+from app.modules.pagamentos.models import StatusWebhookRecebido, WebhookRecebido
+from app.services.payment_gateway_service import PaymentGateway
+from app.services.payment_webhook_handler import PaymentWebhookHandler, WebhookEvent, router
+from app.services.webhook_inbox import MAX_TENTATIVAS_WEBHOOK, WebhookInbox
+
+HEADERS_GETNET = {"Authorization": "Bearer valid-token", "X-Trace": "abc"}
+
+
+def webhook_getnet(notificacao: str, pagamento: str, status: str = "APPROVED") -> Dict[str, Any]:
+    return {
+        "notification_id": notificacao,
+        "notification_type": "payment",
+        "status": status,
+        "payment_id": pagamento,
+        "order_id": f"ORDER-{pagamento}",
+    }
+
+
+class HandlerRegistrador(PaymentWebhookHandler):
+    """Registra os eventos processados; falha para os pagamentos em `falhar`"""
+
+    def __init__(self, falhar=()):
+        super().__init__()
+        self.falhar = set(falhar)
+        self.eventos: List[tuple] = []
+
+    async def handle_payment_event(self, event: WebhookEvent, payment_data: Dict[str, Any]) -> None:
+        if payment_data["payment_id"] in self.falhar:
+            raise RuntimeError("ERP indisponível")
+        self.eventos.append((payment_data["payment_id"], event))
+
+
+async def status_por_evento(db: AsyncSession) -> Dict[str, StatusWebhookRecebido]:
+    db.expire_all()
+    result = await db.execute(select(WebhookRecebido))
+    return {w.evento_id: w.status for w in result.scalars()}
+
+
+class TestRegistro:
+    """Gravação na inbox"""
+
+    @pytest.mark.asyncio
+    async def test_registra_sem_processar_e_deduplica(self, db_session):
+        handler = HandlerRegistrador()
+        inbox = WebhookInbox(db_session, handler)
+
+        primeiro = await inbox.registrar(PaymentGateway.GETNET, webhook_getnet("N1", "P1"), HEADERS_GETNET)
+        reenvio = await inbox.registrar(PaymentGateway.GETNET, webhook_getnet("N1", "P1"), HEADERS_GETNET)
+
+        assert primeiro == ("N1", True)
+        assert reenvio == ("N1", False)
+        assert handler.eventos == []
+
+        webhook = (await db_session.execute(select(WebhookRecebido))).scalar_one()
+        assert webhook.status == StatusWebhookRecebido.PENDENTE
+        assert webhook.pagamento_id == "P1"
+        assert "X-Trace" in webhook.headers
+        assert "Bearer" not in webhook.headers
+
+    @pytest.mark.asyncio
+    async def test_assinatura_invalida_nao_grava(self, db_session):
+        inbox = WebhookInbox(db_session)
+
+        with pytest.raises(ValidationException):
+            await inbox.registrar(PaymentGateway.GETNET, webhook_getnet("N1", "P1"), {})
+
+        assert (await db_session.execute(select(WebhookRecebido))).first() is None
+
+    @pytest.mark.asyncio
+    async def test_sem_id_de_notificacao_distingue_pelo_corpo(self, db_session):
+        """Sem notification_id, mesmo pagamento e status com outro corpo é outro evento"""
+        inbox = WebhookInbox(db_session)
+        primeiro = webhook_getnet(None, "P1", status="PENDING")
+        primeiro["date"] = "2026-10-18T10:00:00"
+        repetido = dict(primeiro, date="2026-10-18T10:05:00")
+
+        evento_1, novo_1 = await inbox.registrar(PaymentGateway.GETNET, primeiro, HEADERS_GETNET)
+        evento_2, novo_2 = await inbox.registrar(PaymentGateway.GETNET, repetido, HEADERS_GETNET)
+        _, reenvio = await inbox.registrar(PaymentGateway.GETNET, dict(primeiro), HEADERS_GETNET)
+
+        assert novo_1 and novo_2 and not reenvio
+        assert evento_1 != evento_2
+        assert evento_1.startswith("P1:PENDING:")
+
+
+class TestProcessamento:
+    """Processamento em lotes"""
+
+    @pytest.mark.asyncio
+    async def test_lote_em_ordem_e_pagamento_bloqueado_apos_falha(self, db_session):
+        handler = HandlerRegistrador(falhar={"P2"})
+        inbox = WebhookInbox(db_session, handler)
+        for notificacao, pagamento, status in [
+            ("N1", "P1", "APPROVED"),
+            ("N2", "P2", "APPROVED"),
+            ("N3", "P1", "CANCELED"),
+            ("N4", "P2", "CANCELED"),
+        ]:
+            await inbox.registrar(PaymentGateway.GETNET, webhook_getnet(notificacao, pagamento, status), HEADERS_GETNET)
+
+        contadores = await inbox.processar_lote()
+
+        assert contadores == {"processados": 2, "erros": 1, "adiados": 1}
+        assert handler.eventos == [
+            ("P1", WebhookEvent.PAYMENT_APPROVED),
+            ("P1", WebhookEvent.PAYMENT_CANCELLED),
+        ]
+        assert await status_por_evento(db_session) == {
+            "N1": StatusWebhookRecebido.PROCESSADO,
+            "N2": StatusWebhookRecebido.ERRO,
+            "N3": StatusWebhookRecebido.PROCESSADO,
+            "N4": StatusWebhookRecebido.PENDENTE,
+        }
+
+        # Com o ERP de volta, o pagamento P2 segue na ordem de chegada
+        handler.falhar.clear()
+        await inbox.processar_lote()
+        assert handler.eventos[2:] == [
+            ("P2", WebhookEvent.PAYMENT_APPROVED),
+            ("P2", WebhookEvent.PAYMENT_CANCELLED),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_evento_anterior_fora_do_lote_adia_pagamento(self, db_session):
+        inbox = WebhookInbox(db_session, HandlerRegistrador())
+        for notificacao, pagamento in [("N1", "P1"), ("N2", "P2"), ("N3", "P1")]:
+            await inbox.registrar(PaymentGateway.GETNET, webhook_getnet(notificacao, pagamento), HEADERS_GETNET)
+
+        # Lote sem N1 (reservado por outro worker): N3 não passa à frente
+        result = await db_session.execute(
+            select(WebhookRecebido).where(WebhookRecebido.evento_id.in_(["N2", "N3"]))
+        )
+        bloqueados = await inbox._pagamentos_com_evento_anterior(list(result.scalars()))
+
+        assert bloqueados == {("getnet", "P1")}
+
+    @pytest.mark.asyncio
+    async def test_esgota_tentativas_e_reprocessa(self, db_session):
+        handler = HandlerRegistrador(falhar={"P1"})
+        inbox = WebhookInbox(db_session, handler)
+        await inbox.registrar(PaymentGateway.GETNET, webhook_getnet("N1", "P1"), HEADERS_GETNET)
+
+        for _ in range(MAX_TENTATIVAS_WEBHOOK):
+            await inbox.processar_lote()
+
+        assert await status_por_evento(db_session) == {"N1": StatusWebhookRecebido.FALHOU}
+        assert await inbox.processar_lote() == {"processados": 0, "erros": 0, "adiados": 0}
+
+        handler.falhar.clear()
+        assert await inbox.reprocessar(gateway=PaymentGateway.GETNET) == 1
+        assert await inbox.drenar() == {"processados": 1, "erros": 0, "adiados": 0}
+        assert await status_por_evento(db_session) == {"N1": StatusWebhookRecebido.PROCESSADO}
+
+        # Replay explícito de evento já processado
+        webhook = (await db_session.execute(select(WebhookRecebido))).scalar_one()
+        assert await inbox.reprocessar(ids=[webhook.id]) == 1
+        await inbox.drenar()
+        assert handler.eventos == [("P1", WebhookEvent.PAYMENT_APPROVED)] * 2
+
+
+class TestEndpoint:
+    """Endpoint de recebimento"""
+
+    @pytest.mark.asyncio
+    async def test_responde_apos_gravar(self, db_session):
+        async def _get_test_db():
+            yield db_session
+
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_db] = _get_test_db
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            url = "/webhooks/payments/getnet"
+            primeiro = await ac.post(url, json=webhook_getnet("N1", "P1"), headers=HEADERS_GETNET)
+            reenvio = await ac.post(url, json=webhook_getnet("N1", "P1"), headers=HEADERS_GETNET)
+            sem_auth = await ac.post(url, json=webhook_getnet("N2", "P1"))
+
+        assert primeiro.status_code == 200
+        assert primeiro.json() == {"status": "received", "evento_id": "N1"}
+        assert reenvio.json() == {"status": "duplicate", "evento_id": "N1"}
+        assert sem_auth.status_code == 401
+        assert await status_por_evento(db_session) == {"N1": StatusWebhookRecebido.PENDENTE}